@@ -1,26 +1,112 @@
 import os
-import random
+import json
+import hashlib
 
+from dto.render_settings import FIELD_TO_KEY, RenderSettings
+from dto.render_variant import RenderVariant
 from util import utils
 
 
 class Project:
-    def __init__(self, file_path):
+    __slots__ = ("file_path", "unique_name", "preview_path", "settings", "source_settings", "source_changed",
+                 "variants", "pinned_version")
+
+    # Длина хеша в id: 48 бит, коллизии на десятках тысяч файлов практически исключены
+    ID_HASH_LENGTH = 12
+
+    def __init__(self, file_path, use_content_hash: bool = False):
         self.file_path = file_path
-        self.unique_name = self.generate_unique_name()
+        self.unique_name = self.generate_unique_name(use_content_hash)
         self.preview_path = self.get_thumbnail_path()
-        self.settings = {}
+        # None - настройки еще не прочитаны из .blend
+        self.settings = None
+        # Настройки в том виде, в каком их последний раз прочитали из .blend; по ним видно правки пользователя
+        self.source_settings = None
+        # Выставляется наблюдателем, если .blend изменился после постановки в очередь
+        self.source_changed = False
+        # Пустой список - один рендер с настройками проекта
+        self.variants = []
+        # Версия Blender ("3.6") или путь к бинарнику; None - по версии из заголовка .blend
+        self.pinned_version = None
 
-    def generate_unique_name(self):
+    def generate_unique_name(self, use_content_hash: bool = False):
         base_name = os.path.basename(self.file_path)  # Получаем имя файла без пути
 
-        return f"{base_name}_{random.randint(1000, 9999)}"
+        # id зависит только от нормализованного пути (и, по желанию, содержимого файла)
+        key = utils.normalize_path(self.file_path)
+        if use_content_hash:
+            key += ":" + utils.file_content_hash(self.file_path)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:self.ID_HASH_LENGTH]
+
+        return f"{base_name}_{digest}"
 
     def get_thumbnail_path(self):
         return utils.path_to_thumbnail(self.unique_name)
 
     def set_settings(self, new_settings):
+        if isinstance(new_settings, dict):
+            new_settings = RenderSettings.from_dict(new_settings)
+        if new_settings is not None and not isinstance(new_settings, RenderSettings):
+            raise TypeError(f"Settings must be RenderSettings, got {type(new_settings)}")
         self.settings = new_settings
 
+    def apply_source_settings(self, source_settings: RenderSettings) -> None:
+        """Take settings re-read from the .blend, keeping the fields the user changed since the last read."""
+        if not isinstance(source_settings, RenderSettings):
+            raise TypeError(f"Settings must be RenderSettings, got {type(source_settings)}")
+        current, previous = self.settings, self.source_settings
+        if current is None:
+            merged = source_settings.copy()
+        elif previous is None:
+            # Настройки восстановлены из индекса без исходных: неизвестно, что правил пользователь, ничего не теряем
+            merged = current
+        else:
+            merged = source_settings.copy()
+            for field_name in FIELD_TO_KEY:
+                value = getattr(current, field_name)
+                if value != getattr(previous, field_name):
+                    setattr(merged, field_name, value)
+        # Объект заменяется целиком: задания, уже прочитавшие старые настройки, их не видят наполовину измененными
+        self.source_settings = source_settings.copy()
+        self.settings = merged
+
+    def add_variant(self, variant):
+        if isinstance(variant, dict):
+            variant = RenderVariant.from_dict(variant)
+        if not isinstance(variant, RenderVariant):
+            raise TypeError(f"Variant must be RenderVariant, got {type(variant)}")
+        if any(existing.name == variant.name for existing in self.variants):
+            raise ValueError(f"Variant {variant.name} already exists")
+        self.variants.append(variant)
+
+    def to_dict(self) -> dict:
+        return {
+            "file_path": self.file_path,
+            "unique_name": self.unique_name,
+            "settings": self.settings.to_dict() if self.settings else None,
+            "variants": [variant.to_dict() for variant in self.variants],
+            "pinned_version": self.pinned_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Project":
+        project = cls.__new__(cls)
+        project.file_path = data["file_path"]
+        project.unique_name = data["unique_name"]
+        project.preview_path = project.get_thumbnail_path()
+        project.settings = RenderSettings.from_dict(data["settings"]) if data.get("settings") else None
+        project.source_settings = None
+        project.source_changed = False
+        project.variants = [RenderVariant.from_dict(variant) for variant in data.get("variants", [])]
+        project.pinned_version = data.get("pinned_version")
+        return project
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str) -> "Project":
+        return cls.from_dict(json.loads(data))
+
     def __repr__(self):
         return f"Project(name={self.unique_name}, unique_name={self.unique_name}, file_path={self.file_path})"
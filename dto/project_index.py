@@ -0,0 +1,97 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+from util import utils
+
+
+class ProjectIndex:
+    """Projects indexed by id, by normalized file path and by output directory."""
+
+    def __init__(self):
+        self._by_id: Dict[str, object] = {}
+        self._by_path: Dict[str, str] = {}
+        self._by_output_dir: Dict[str, Dict[str, None]] = {}
+        self._output_dir_of: Dict[str, str] = {}
+
+    @staticmethod
+    def output_dir_key(project) -> str:
+        """Return the normalized output directory of a project or an empty string."""
+        if not project.settings or not project.settings.output_path:
+            return ""
+
+        output_path = project.settings.output_path
+        # Пути вида //render/ в Blender отсчитываются от папки .blend
+        if output_path.startswith("//"):
+            output_path = os.path.join(os.path.dirname(project.file_path), output_path[2:])
+        return utils.normalize_path(output_path)
+
+    def add(self, project) -> bool:
+        """Add a project and return False if its file is already indexed."""
+        path_key = utils.normalize_path(project.file_path)
+        if path_key in self._by_path or project.unique_name in self._by_id:
+            return False
+
+        self._by_id[project.unique_name] = project
+        self._by_path[path_key] = project.unique_name
+        self.refresh_output_dir(project)
+        return True
+
+    def remove(self, project_id: str) -> Optional[object]:
+        """Remove a project by id and return it."""
+        project = self._by_id.pop(project_id, None)
+        if project is None:
+            return None
+
+        self._by_path.pop(utils.normalize_path(project.file_path), None)
+        self._drop_output_dir(project_id)
+        return project
+
+    def refresh_output_dir(self, project) -> None:
+        """Re-index a project's output directory after its settings changed."""
+        if project.unique_name not in self._by_id:
+            return
+
+        output_key = self.output_dir_key(project)
+        if self._output_dir_of.get(project.unique_name) == output_key:
+            return
+
+        self._drop_output_dir(project.unique_name)
+        if output_key:
+            self._by_output_dir.setdefault(output_key, {})[project.unique_name] = None
+            self._output_dir_of[project.unique_name] = output_key
+
+    def _drop_output_dir(self, project_id: str) -> None:
+        old_key = self._output_dir_of.pop(project_id, None)
+        if old_key is None:
+            return
+        project_ids = self._by_output_dir.get(old_key)
+        if project_ids is not None:
+            project_ids.pop(project_id, None)
+            if not project_ids:
+                del self._by_output_dir[old_key]
+
+    def get(self, project_id: str, default=None):
+        return self._by_id.get(project_id, default)
+
+    def by_path(self, file_path: str) -> Optional[object]:
+        project_id = self._by_path.get(utils.normalize_path(file_path))
+        return self._by_id.get(project_id) if project_id else None
+
+    def by_output_dir(self, output_dir: str) -> List[object]:
+        project_ids = self._by_output_dir.get(utils.normalize_path(output_dir), {})
+        return [self._by_id[project_id] for project_id in project_ids]
+
+    def values(self):
+        return self._by_id.values()
+
+    def __getitem__(self, project_id: str):
+        return self._by_id[project_id]
+
+    def __contains__(self, project_id: str) -> bool:
+        return project_id in self._by_id
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -0,0 +1,153 @@
+import sys
+import json
+from dataclasses import dataclass, fields, replace
+from typing import Iterable, Tuple
+
+# Видео-форматы у Blender называются иначе, чем в enum file_format, поэтому список фиксированный
+MOVIE_FILE_FORMATS: Tuple[str, ...] = ('AVI_JPEG', 'AVI_RAW', 'FFMPEG')
+
+# Одна общая копия списка форматов изображений на все проекты
+_image_file_formats: Tuple[str, ...] = ()
+
+DEVICES = ("CPU", "GPU")
+
+# Соответствие полей настроек ключам, которые понимают скрипты рендера
+FIELD_TO_KEY = {
+    "resolution_x": "ResolutionX",
+    "resolution_y": "ResolutionY",
+    "resolution_scale": "Resolution Scale",
+    "fps": "FPS",
+    "fps_base": "FPS Base",
+    "frame_start": "Frame Start",
+    "frame_end": "Frame End",
+    "frame_step": "Frame Step",
+    "frame": "Frame",
+    "render_engine": "Render Engine",
+    "cycles_samples": "CYCLES Samples",
+    "denoising": "Denoising",
+    "device": "Device",
+    "threads": "Threads",
+    "eevee_samples": "EEVEE Samples",
+    "file_format": "File Format",
+    "output_path": "Output Path",
+}
+KEY_TO_FIELD = {key: field_name for field_name, key in FIELD_TO_KEY.items()}
+
+# Ключи старого формата, которые больше не хранятся в каждом проекте
+LEGACY_FORMAT_KEYS = ("File Formats Image", "File Formats Movie")
+
+
+def set_image_file_formats(formats: Iterable[str]) -> Tuple[str, ...]:
+    """Store the shared list of image formats, reusing the existing tuple when unchanged."""
+    global _image_file_formats
+    new_formats = tuple(formats)
+    if new_formats != _image_file_formats:
+        _image_file_formats = tuple(sys.intern(str(file_format)) for file_format in new_formats)
+    return _image_file_formats
+
+
+def get_image_file_formats() -> Tuple[str, ...]:
+    """Return the shared list of image formats."""
+    return _image_file_formats
+
+
+@dataclass(slots=True)
+class RenderSettings:
+    # Format
+    resolution_x: int = 1920
+    resolution_y: int = 1080
+    resolution_scale: int = 100
+    fps: int = 24
+    fps_base: float = 1.0
+
+    # Frame range
+    frame_start: int = 1
+    frame_end: int = 250
+    frame_step: int = 1
+    frame: int = 1
+
+    # Engines
+    render_engine: str = "CYCLES"
+
+    # CYCLES
+    cycles_samples: int = 128
+    denoising: bool = False
+    device: str = "CPU"
+    threads: int = 0
+
+    # EEVEE
+    eevee_samples: int = 64
+
+    # Output
+    file_format: str = "PNG"
+    output_path: str = ""
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self) -> None:
+        """Check field types and ranges, raising TypeError or ValueError on invalid values."""
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.type is int and (not isinstance(value, int) or isinstance(value, bool)):
+                raise TypeError(f"{field.name} must be an integer, got {type(value)}")
+            if field.type is float and (not isinstance(value, (int, float)) or isinstance(value, bool)):
+                raise TypeError(f"{field.name} must be a number, got {type(value)}")
+            if field.type is bool and not isinstance(value, bool):
+                raise TypeError(f"{field.name} must be a boolean, got {type(value)}")
+            if field.type is str and not isinstance(value, str):
+                raise TypeError(f"{field.name} must be a string, got {type(value)}")
+
+        if self.resolution_x < 1 or self.resolution_y < 1:
+            raise ValueError("Resolution must be positive")
+        if self.resolution_scale < 1:
+            raise ValueError("Resolution scale must be positive")
+        if self.fps < 1 or self.fps_base <= 0:
+            raise ValueError("FPS must be positive")
+        if self.frame_step < 1:
+            raise ValueError("Frame step must be positive")
+        if self.cycles_samples < 1 or self.eevee_samples < 1:
+            raise ValueError("Samples must be positive")
+        if self.threads < 0:
+            raise ValueError("Threads cannot be negative")
+        if self.device not in DEVICES:
+            raise ValueError(f"Unknown device: {self.device}")
+        if not self.render_engine:
+            raise ValueError("Render engine cannot be empty")
+
+    @property
+    def file_formats_image(self) -> Tuple[str, ...]:
+        return get_image_file_formats()
+
+    @property
+    def file_formats_movie(self) -> Tuple[str, ...]:
+        return MOVIE_FILE_FORMATS
+
+    def copy(self) -> "RenderSettings":
+        return replace(self)
+
+    def to_dict(self) -> dict:
+        """Return settings keyed the way the render scripts expect."""
+        return {key: getattr(self, field_name) for field_name, key in FIELD_TO_KEY.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RenderSettings":
+        """Build validated settings from a dict with render script keys."""
+        if not isinstance(data, dict):
+            raise TypeError(f"Settings must be a dict, got {type(data)}")
+
+        values = {}
+        for key, value in data.items():
+            if key in LEGACY_FORMAT_KEYS:
+                continue
+            if key not in KEY_TO_FIELD:
+                raise ValueError(f"Unknown settings key: {key}")
+            values[KEY_TO_FIELD[key]] = value
+        return cls(**values)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str) -> "RenderSettings":
+        return cls.from_dict(json.loads(data))
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dto.render_settings import KEY_TO_FIELD
+
+
+@dataclass(slots=True)
+class RenderVariant:
+    """One output of a batch job: scene, camera, view layer and settings overrides."""
+    name: str
+    scene: Optional[str] = None
+    camera: Optional[str] = None
+    view_layer: Optional[str] = None
+    # Ключи как в RenderSettings.to_dict, например {"ResolutionX": 3840}
+    overrides: dict = field(default_factory=dict)
+    animation: bool = False
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self) -> None:
+        """Check the variant, raising TypeError or ValueError on invalid values."""
+        if not isinstance(self.name, str) or not self.name:
+            raise ValueError("Variant name must be a non-empty string")
+        for attribute in ("scene", "camera", "view_layer"):
+            value = getattr(self, attribute)
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"{attribute} must be a string, got {type(value)}")
+        if not isinstance(self.overrides, dict):
+            raise TypeError(f"Overrides must be a dict, got {type(self.overrides)}")
+        unknown_keys = [key for key in self.overrides if key not in KEY_TO_FIELD]
+        if unknown_keys:
+            raise ValueError(f"Unknown override keys: {unknown_keys}")
+        if not isinstance(self.animation, bool):
+            raise TypeError(f"Animation must be a boolean, got {type(self.animation)}")
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "scene": self.scene,
+            "camera": self.camera,
+            "view_layer": self.view_layer,
+            "overrides": dict(self.overrides),
+            "animation": self.animation,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RenderVariant":
+        if not isinstance(data, dict):
+            raise TypeError(f"Variant must be a dict, got {type(data)}")
+        return cls(**data)
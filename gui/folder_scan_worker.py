@@ -0,0 +1,43 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+import util.utils as utils
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('FolderScanWorker')
+
+
+class FolderScanWorker(QThread):
+    """Scan a directory tree for .blend files and stream them to the GUI in batches."""
+    files_found = pyqtSignal(list)
+    scan_finished = pyqtSignal(int)
+
+    # Сколько путей копим перед отправкой в GUI-поток
+    BATCH_SIZE = 100
+
+    def __init__(self, root_directory: str, parent=None):
+        super().__init__(parent)
+        self.root_directory = root_directory
+
+    def run(self) -> None:
+        logger.info(f"Scanning folder for .blend files: {self.root_directory}")
+        batch = []
+        total = 0
+        try:
+            for file_path in utils.scan_blend_files(self.root_directory):
+                if self.isInterruptionRequested():
+                    logger.info(f"Folder scan interrupted: {self.root_directory}")
+                    break
+
+                batch.append(utils.transform_path_to_standard(file_path))
+                if len(batch) >= self.BATCH_SIZE:
+                    total += len(batch)
+                    self.files_found.emit(batch)
+                    batch = []
+        except Exception as e:
+            logger.error(f"Error scanning folder {self.root_directory}: {str(e)}")
+
+        if batch:
+            total += len(batch)
+            self.files_found.emit(batch)
+        self.scan_finished.emit(total)
@@ -0,0 +1,150 @@
+import time
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionProgressBar
+
+from managers.job_engine import RUNNING
+from managers.job_progress import JobProgress, ProgressTracker
+from managers.dependency_scanner import format_size
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('JobTableModel')
+
+COLUMNS = ("Project", "Status", "Frames", "Samples", "Progress", "Elapsed", "ETA", "Frames/min", "Input")
+PROGRESS_COLUMN = COLUMNS.index("Progress")
+# Колонки, которые меняются со временем без новых строк вывода
+TIME_COLUMNS = (COLUMNS.index("Elapsed"), COLUMNS.index("ETA"), COLUMNS.index("Frames/min"))
+INPUT_COLUMN = COLUMNS.index("Input")
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format seconds as H:MM:SS or M:SS, '-' when unknown."""
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class JobTableModel(QAbstractTableModel):
+    """Table of render jobs over snapshots from a ProgressTracker, refreshed by the GUI at a fixed rate."""
+
+    def __init__(self, tracker: ProgressTracker, parent=None):
+        super().__init__(parent)
+        self._tracker = tracker
+        self._version = 0
+        self._batch = tracker.batch
+        self._rows: List[JobProgress] = []
+        self._row_of: Dict[str, int] = {}
+        # Один момент времени на кадр, чтобы строки не расходились
+        self._now = time.time()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        job = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.UserRole and column == PROGRESS_COLUMN:
+            fraction = job.fraction()
+            return None if fraction is None else int(fraction * 100)
+        if role == Qt.ToolTipRole:
+            return job.key
+        if role != Qt.DisplayRole:
+            return None
+
+        # Значения считаются только для строк, которые рисует представление
+        if column == 0:
+            return job.name
+        if column == 1:
+            return job.state
+        if column == 2:
+            total = job.frames_total if job.frames_total is not None else "?"
+            return f"{job.frames_done}/{total}" + (f" (frame {job.frame})" if job.frame is not None else "")
+        if column == 3:
+            return f"{job.samples_done}/{job.samples_total}" if job.samples_total and job.state == RUNNING else ""
+        if column == PROGRESS_COLUMN:
+            fraction = job.fraction()
+            return "" if fraction is None else f"{fraction:.0%}"
+        if column == TIME_COLUMNS[0]:
+            return format_duration(job.elapsed(self._now)) if job.started_at else ""
+        if column == TIME_COLUMNS[1]:
+            return format_duration(job.remaining_seconds(self._now))
+        if column == TIME_COLUMNS[2]:
+            rate = job.frames_per_minute(self._now)
+            return f"{rate:.1f}" if rate is not None else ""
+        if column == INPUT_COLUMN:
+            return format_size(job.input_bytes)
+        return None
+
+    def refresh(self) -> None:
+        """Pull the jobs changed since the last refresh and repaint only what changed."""
+        self._now = time.time()
+        batch = self._tracker.batch
+        if batch != self._batch:
+            # Трекер удалил завершенные задания прошлых пачек, строки собираются заново
+            self.beginResetModel()
+            self._batch = batch
+            self._version = 0
+            self._rows = []
+            self._row_of = {}
+            self.endResetModel()
+        version, changed = self._tracker.changes(self._version)
+        self._version = version
+
+        new_jobs = [job for job in changed if job.key not in self._row_of]
+        if new_jobs:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_jobs) - 1)
+            for job in new_jobs:
+                self._row_of[job.key] = len(self._rows)
+                self._rows.append(job)
+            self.endInsertRows()
+            logger.debug(f"Added {len(new_jobs)} jobs to the progress table")
+
+        updated_rows = []
+        for job in changed:
+            row = self._row_of[job.key]
+            if self._rows[row] is not job:
+                self._rows[row] = job
+                updated_rows.append(row)
+        if updated_rows:
+            # Один сигнал на диапазон вместо сигнала на каждую строку
+            self.dataChanged.emit(self.index(min(updated_rows), 0),
+                                  self.index(max(updated_rows), len(COLUMNS) - 1))
+
+        running_rows = [row for row, job in enumerate(self._rows) if job.state == RUNNING]
+        if running_rows:
+            self.dataChanged.emit(self.index(min(running_rows), TIME_COLUMNS[0]),
+                                  self.index(max(running_rows), TIME_COLUMNS[-1]))
+
+
+class ProgressBarDelegate(QStyledItemDelegate):
+    """Draws the progress column as a progress bar."""
+
+    def paint(self, painter, option, index):
+        value = index.data(Qt.UserRole)
+        if value is None:
+            super().paint(painter, option, index)
+            return
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 2, -2, -2)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = value
+        bar.text = f"{value}%"
+        bar.textVisible = True
+        QApplication.style().drawControl(QStyle.CE_ProgressBar, bar, painter)
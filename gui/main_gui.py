@@ -1,37 +1,43 @@
 import os
 import sys
-import logging
-from logging.handlers import RotatingFileHandler
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
+from PyQt5.QtGui import QTextCursor
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QFileDialog, QListWidget, QListWidgetItem,
-    QSpinBox, QGroupBox, QComboBox, QCheckBox, QTextEdit, QDoubleSpinBox
+    QLabel, QLineEdit, QPushButton, QFileDialog, QListView,
+    QSpinBox, QGroupBox, QComboBox, QCheckBox, QTextEdit, QDoubleSpinBox,
+    QTableView, QProgressBar, QHeaderView
 )
 
 import util.utils as utils
 from managers.blender_manager import BlenderManager
+from managers.project_watcher import ProjectWatcher
+from managers.dependency_scanner import format_size
 from dto.project import Project
+from dto.project_index import ProjectIndex
+from gui.folder_scan_worker import FolderScanWorker
+from gui.project_list_model import ProjectListModel
+from gui.thumbnail_loader import ThumbnailLoader
+from gui.telemetry_dialog import TelemetryDialog
+from gui.ui_update_pump import UiUpdatePump
+from gui.job_table_model import JobTableModel, ProgressBarDelegate, PROGRESS_COLUMN, format_duration
+from util import log_config
+from util.blender_versions import format_version, parse_version
+from util.log_config import get_logger
+
+# Размер превью в правой панели
+PREVIEW_SIZE = QSize(512, 288)
+# Предел строк в панели вывода
+MAX_OUTPUT_BLOCKS = 2000
+# Версия Blender выбирается по заголовку .blend
+AUTO_BLENDER_VERSION = "Auto (from file)"
 
 # Configure logging
-logger = logging.getLogger('BlenderInterface')
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# File handler with rotation
-file_handler = RotatingFileHandler('blender_interface.log', maxBytes=1048576, backupCount=5)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
+logger = get_logger('BlenderInterface', console=True)
 
 class BlenderInterface(QWidget):
     signal = pyqtSignal(str)
+    thumbnail_signal = pyqtSignal(str)
 
     def __init__(self) -> None:
         super().__init__()
@@ -39,14 +45,30 @@ class BlenderInterface(QWidget):
 
         try:
             self.blender_paths = utils.get_blender_paths()
-            self.projects = {}
+            self.projects = ProjectIndex()
             self.file_settings = {}
             self.preview_paths = {}
             self.current_project = None
             self.current_bin = None
-
-            self.signal.connect(self.update_output)
+            self.folder_scan_workers = []
+
+            self.thumbnail_loader = ThumbnailLoader(parent=self)
+            self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+            self.thumbnail_loader.thumbnail_failed.connect(self.on_thumbnail_failed)
+            self.project_list_model = ProjectListModel(self.projects, self, thumbnail_loader=self.thumbnail_loader)
+
+            # Рабочие потоки кладут сообщения в очередь напрямую, GUI забирает их пачками по таймеру
+            self.ui_pump = UiUpdatePump(self)
+            self.ui_pump.messages_ready.connect(self.append_output)
+            self.ui_pump.status_ready.connect(self.update_status)
+            self.signal.connect(self.queue_output, Qt.DirectConnection)
+            self.thumbnail_signal.connect(self.on_thumbnail_updated)
             self.blender_manager = BlenderManager(self)
+            self.job_table_model = JobTableModel(self.blender_manager.progress, self)
+            self.ui_pump.tick.connect(self.refresh_progress)
+
+            self.project_watcher = ProjectWatcher(self)
+            self.project_watcher.projects_changed.connect(self.on_projects_changed)
 
             self.init_ui()
         except Exception as e:
@@ -120,8 +142,11 @@ class BlenderInterface(QWidget):
         start_render_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.start_render_button = QPushButton("Start")
         self.start_render_button.clicked.connect(self.start_render_queue)
+        self.render_stats_button = QPushButton("Stats")
+        self.render_stats_button.clicked.connect(self.show_render_stats)
         start_render_layout.addWidget(start_render_label)
         start_render_layout.addWidget(self.start_render_button)
+        start_render_layout.addWidget(self.render_stats_button)
 
         # Blend file selection
         blend_file_layout = QHBoxLayout()
@@ -129,8 +154,11 @@ class BlenderInterface(QWidget):
         blend_file_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.blend_file_button = QPushButton("Add")
         self.blend_file_button.clicked.connect(self.add_blend_file)
+        self.blend_folder_button = QPushButton("Add folder")
+        self.blend_folder_button.clicked.connect(self.add_blend_folder)
         blend_file_layout.addWidget(blend_file_label)
         blend_file_layout.addWidget(self.blend_file_button)
+        blend_file_layout.addWidget(self.blend_folder_button)
 
         # Settings group
         settings_group = QGroupBox("Blender settings")
@@ -144,17 +172,46 @@ class BlenderInterface(QWidget):
         self.left_layout.addWidget(settings_group)
 
         # Blend files list
-        self.blend_files_list = QListWidget()
-        self.blend_files_list.setSelectionMode(QListWidget.SingleSelection)
-        self.blend_files_list.itemClicked.connect(self.show_file_details)
+        self.blend_files_list = QListView()
+        self.blend_files_list.setModel(self.project_list_model)
+        self.blend_files_list.setSelectionMode(QListView.SingleSelection)
+        self.blend_files_list.setUniformItemSizes(True)
+        self.blend_files_list.setIconSize(ProjectListModel.ICON_SIZE)
+        self.blend_files_list.setLayoutMode(QListView.Batched)
+        self.blend_files_list.clicked.connect(self.show_file_details)
         self.left_layout.addWidget(self.blend_files_list)
 
+        # Render jobs progress
+        self.jobs_view = QTableView()
+        self.jobs_view.setModel(self.job_table_model)
+        self.jobs_view.setItemDelegateForColumn(PROGRESS_COLUMN, ProgressBarDelegate(self.jobs_view))
+        self.jobs_view.setEditTriggers(QTableView.NoEditTriggers)
+        self.jobs_view.verticalHeader().setVisible(False)
+        self.jobs_view.verticalHeader().setDefaultSectionSize(20)
+        self.jobs_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.jobs_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.left_layout.addWidget(self.jobs_view)
+
+        batch_layout = QHBoxLayout()
+        self.batch_progress = QProgressBar()
+        self.batch_progress.setRange(0, 100)
+        self.batch_progress.setValue(0)
+        self.batch_eta_label = QLabel("")
+        batch_layout.addWidget(self.batch_progress, stretch=2)
+        batch_layout.addWidget(self.batch_eta_label, stretch=1)
+        self.left_layout.addLayout(batch_layout)
+
         # Progress output
         self.progress_output = QTextEdit()
         self.progress_output.setReadOnly(True)
         self.progress_output.setPlaceholderText("Logs")
+        # Старые строки удаляются, полный вывод Blender лежит в файлах заданий
+        self.progress_output.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
         self.left_layout.addWidget(self.progress_output)
 
+        self.status_label = QLabel("")
+        self.left_layout.addWidget(self.status_label)
+
     def create_right_layout(self):
         logger.debug("Creating right layout")
         self.right_layout = QVBoxLayout()
@@ -181,6 +238,17 @@ class BlenderInterface(QWidget):
         # Project settings section
         settings_layout = QVBoxLayout()
 
+        # Blender version pinning
+        blender_pin_layout = QHBoxLayout()
+        blender_pin_label = QLabel("Blender:")
+        blender_pin_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.blender_pin = QComboBox()
+        self.blender_pin.addItem(AUTO_BLENDER_VERSION)
+        self.blender_pin.addItems(self.installed_blender_versions())
+        blender_pin_layout.addWidget(blender_pin_label)
+        blender_pin_layout.addWidget(self.blender_pin)
+        settings_layout.addLayout(blender_pin_layout)
+
         # Render type selection
         render_type_layout = QHBoxLayout()
         render_type_label = QLabel("Render type:")
@@ -415,8 +483,8 @@ class BlenderInterface(QWidget):
                 self.fps_base.setHidden(True)
 
                 self.output_format_combobox.clear()
-                self.output_format_combobox.addItems(settings["File Formats Image"])
-                self.frame_current.setValue(settings["Frame"])
+                self.output_format_combobox.addItems(list(settings.file_formats_image))
+                self.frame_current.setValue(settings.frame)
 
             elif self.render_type.currentText() == "Movie":
                 self.frame_current_label.setHidden(True)
@@ -433,14 +501,14 @@ class BlenderInterface(QWidget):
                 self.fps_base.setHidden(False)
 
                 self.output_format_combobox.clear()
-                self.output_format_combobox.addItems(settings["File Formats Movie"])
-                self.frame_start.setValue(settings["Frame Start"])
-                self.frame_end.setValue(settings["Frame End"])
-                self.frame_step.setValue(settings["Frame Step"])
+                self.output_format_combobox.addItems(list(settings.file_formats_movie))
+                self.frame_start.setValue(settings.frame_start)
+                self.frame_end.setValue(settings.frame_end)
+                self.frame_step.setValue(settings.frame_step)
 
-            if self.output_format_combobox.findText(settings["File Format"]) != -1:
+            if self.output_format_combobox.findText(settings.file_format) != -1:
                 self.output_format_combobox.setCurrentIndex(
-                    self.output_format_combobox.findText(settings["File Format"])
+                    self.output_format_combobox.findText(settings.file_format)
                 )
         except Exception as e:
             logger.error(f"Error updating render type: {str(e)}")
@@ -456,16 +524,16 @@ class BlenderInterface(QWidget):
             if self.render_engine.currentText() == "CYCLES":
                 self.cycles_settings.setHidden(False)
                 self.eevee_settings.setHidden(True)
-                self.cycles_samples.setValue(settings["CYCLES Samples"])
-                self.cycles_denoising.setChecked(settings["Denoising"])
-                self.cycles_device.setCurrentIndex(self.cycles_device.findText(settings["Device"]))
-                if settings["Device"] == "CPU":
+                self.cycles_samples.setValue(settings.cycles_samples)
+                self.cycles_denoising.setChecked(settings.denoising)
+                self.cycles_device.setCurrentIndex(self.cycles_device.findText(settings.device))
+                if settings.device == "CPU":
                     self.cycles_threads_label.setHidden(False)
                     self.cycles_threads.setHidden(False)
             else:
                 self.cycles_settings.setHidden(True)
                 self.eevee_settings.setHidden(False)
-                self.eevee_samples.setValue(settings["EEVEE Samples"])
+                self.eevee_samples.setValue(settings.eevee_samples)
         except Exception as e:
             logger.error(f"Error updating render engine: {str(e)}")
 
@@ -503,6 +571,11 @@ class BlenderInterface(QWidget):
         except Exception as e:
             logger.error(f"Error updating blender binary: {str(e)}")
 
+    def installed_blender_versions(self):
+        """Return the distinct major.minor versions of the known Blender binaries."""
+        versions = {parse_version(label)[:2] for label in self.blender_paths.values() if parse_version(label)}
+        return [format_version(version) for version in sorted(versions)]
+
     def add_blend_file(self):
         logger.debug("Adding blend file")
         try:
@@ -511,20 +584,81 @@ class BlenderInterface(QWidget):
                 self, "Add .blend file", "", "Blender Files (*.blend);;All Files (*)"
             )
 
-            for file_path in file_paths:
-                file_path = utils.transform_path_to_standard(file_path)
-                project = Project(file_path)
-                item = QListWidgetItem(utils.get_file_name_from_path(project.file_path))
-                item.setData(Qt.UserRole, project.unique_name)
-                self.blend_files_list.addItem(item)
-
-                project.settings = self.blender_manager.get_settings_from_project(file_path)
-                self.projects[project.unique_name] = project
-                logger.info(f"Added blend file: {file_path}")
+            self.add_projects_from_paths(
+                [utils.transform_path_to_standard(file_path) for file_path in file_paths]
+            )
         except Exception as e:
             logger.error(f"Error adding blend file: {str(e)}")
             self.update_output(f"Error adding blend file: {str(e)}")
 
+    def add_projects_from_paths(self, file_paths):
+        """Create projects for the given paths, show them in the list and read settings in background."""
+        new_projects = []
+        for file_path in file_paths:
+            project = Project(file_path)
+            if not self.projects.add(project):
+                logger.debug(f"Blend file already added: {file_path}")
+                continue
+            new_projects.append(project)
+            logger.debug(f"Added blend file: {file_path}")
+
+        self.project_list_model.add_projects([project.unique_name for project in new_projects])
+        self.project_watcher.watch([project.file_path for project in new_projects])
+        # Настройки читаются в фоне; выбранный проект загружается сразу при клике
+        self.blender_manager.extract_settings_in_background(new_projects)
+        logger.info(f"Added {len(new_projects)} blend files")
+
+    def add_blend_folder(self):
+        logger.debug("Adding blend folder")
+        try:
+            folder = QFileDialog.getExistingDirectory(self, "Add folder with .blend files")
+            if not folder:
+                return
+
+            worker = FolderScanWorker(folder, self)
+            worker.files_found.connect(self.add_projects_from_paths)
+            worker.scan_finished.connect(
+                lambda total, scanned=folder: self.on_folder_scan_finished(scanned, total)
+            )
+            worker.finished.connect(lambda done=worker: self.folder_scan_workers.remove(done))
+            self.folder_scan_workers.append(worker)
+            worker.start()
+            self.update_output(f"Scanning folder: {folder}")
+        except Exception as e:
+            logger.error(f"Error adding blend folder: {str(e)}")
+            self.update_output(f"Error adding blend folder: {str(e)}")
+
+    def on_projects_changed(self, file_paths):
+        """Refresh settings and thumbnails of projects whose .blend changed on disk."""
+        logger.debug(f"Projects changed on disk: {file_paths}")
+        try:
+            changed_projects = [
+                project for project in map(self.projects.by_path, file_paths) if project is not None
+            ]
+            if not changed_projects:
+                return
+
+            for project in changed_projects:
+                # Предупреждение нужно только заданиям, которые еще ждут рендера или рендерятся
+                if self.blender_manager.progress.is_active(project.unique_name):
+                    project.source_changed = True
+                self.thumbnail_loader.invalidate(project.preview_path)
+
+            existing_projects = [project for project in changed_projects if os.path.exists(project.file_path)]
+            # Настройки перечитываются в фоне и сливаются с правками пользователя
+            self.blender_manager.extract_settings_in_background(existing_projects, refresh=True)
+            if existing_projects:
+                self.blender_manager.start_render_projects(existing_projects, True)
+
+            self.update_output(f"{len(changed_projects)} project files changed on disk, refreshing")
+        except Exception as e:
+            logger.error(f"Error refreshing changed projects: {str(e)}")
+            self.update_output(f"Error refreshing changed projects: {str(e)}")
+
+    def on_folder_scan_finished(self, folder, total):
+        logger.info(f"Folder scan finished: {folder}, found {total} files")
+        self.update_output(f"Found {total} .blend files in {folder}")
+
     def add_blender_bin(self):
         logger.debug("Adding blender binary")
         try:
@@ -541,6 +675,9 @@ class BlenderInterface(QWidget):
                     self.blender_bin.clear()
                     self.blender_bin.addItems(self.blender_paths.keys())
                     self.blender_bin.setCurrentIndex(-1)
+                    self.blender_pin.clear()
+                    self.blender_pin.addItem(AUTO_BLENDER_VERSION)
+                    self.blender_pin.addItems(self.installed_blender_versions())
                     logger.info(f"Added new blender binary: {file_path}")
                 else:
                     logger.warning(f"Invalid blender binary: {file_path}")
@@ -552,77 +689,119 @@ class BlenderInterface(QWidget):
             logger.error(f"Error adding blender binary: {str(e)}")
             self.update_output(f"Error adding blender binary: {str(e)}")
 
+    def ensure_project_settings(self, project) -> bool:
+        """Load project settings on first use and report whether they are available."""
+        if project.settings:
+            # Настройки могли прийти из фонового потока, минуя индекс
+            self.projects.refresh_output_dir(project)
+            return True
+
+        settings = self.blender_manager.get_settings_from_project(project.file_path)
+        if not settings:
+            logger.warning(f"Settings not available for: {project.file_path}")
+            return False
+
+        project.apply_source_settings(settings)
+        self.projects.refresh_output_dir(project)
+        return True
+
     # TODO: Fix other project get another settings in cycles
-    def show_file_details(self, item):
-        logger.debug(f"Showing details for file: {item.text()}")
+    def show_file_details(self, index):
+        logger.debug(f"Showing details for file: {index.data(Qt.DisplayRole)}")
         try:
             if self.current_project:
                 self.update_render_settings()
 
-            self.current_project = self.projects[item.data(Qt.UserRole)]
-            preview_image_path = utils.path_to_thumbnail(self.current_project.unique_name)
-
-            if preview_image_path and os.path.exists(preview_image_path):
-                try:
-                    pixmap = QPixmap(preview_image_path)
-                    if not pixmap.isNull():
-                        self.preview.setPixmap(QPixmap(preview_image_path))
-                        # self.preview.setPixmap(pixmap.scaled(
-                        #     self.preview.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                        # ))
-                    else:
-                        self.preview.setText("Invalid preview image")
-                        logger.warning(f"Invalid preview image: {preview_image_path}")
-                except Exception as e:
-                    logger.error(f"Error loading preview image: {str(e)}")
-                    self.preview.setText("Error loading preview")
-            else:
-                self.preview.setText("Preview not available")
-                logger.info(f"No preview available for: {self.current_project.unique_name}")
+            project = self.projects[index.data(Qt.UserRole)]
+            if not self.ensure_project_settings(project):
+                self.update_output(f"Unable to read settings from {project.file_path}")
+                return
+
+            self.current_project = project
+            self.show_project_preview(self.current_project)
+
+            pin_index = self.blender_pin.findText(self.current_project.pinned_version or AUTO_BLENDER_VERSION)
+            self.blender_pin.setCurrentIndex(max(pin_index, 0))
 
             settings = self.current_project.settings
             self.render_type.setCurrentIndex(self.render_type.findText("Image"))
-            self.frame_current.setValue(settings["Frame"])
+            self.frame_current.setValue(settings.frame)
 
             self.render_type.setCurrentIndex(self.render_type.findText("Movie"))
-            self.frame_start.setValue(settings["Frame Start"])
-            self.frame_end.setValue(settings["Frame End"])
-            self.frame_step.setValue(settings["Frame Step"])
-            self.fps_value.setValue(settings["FPS"])
-            self.fps_base.setValue(settings["FPS Base"])
+            self.frame_start.setValue(settings.frame_start)
+            self.frame_end.setValue(settings.frame_end)
+            self.frame_step.setValue(settings.frame_step)
+            self.fps_value.setValue(settings.fps)
+            self.fps_base.setValue(settings.fps_base)
 
-            if settings["File Format"] in settings["File Formats Image"]:
+            if settings.file_format in settings.file_formats_image:
                 self.render_type.setCurrentIndex(self.render_type.findText("Image"))
-            elif settings["File Format"] in settings["File Formats Movie"]:
+            elif settings.file_format in settings.file_formats_movie:
                 self.render_type.setCurrentIndex(self.render_type.findText("Movie"))
             else:
-                logger.error(f"Unknown file format: {settings['File Format']}")
-                raise ValueError(f"Unknown file format: {settings['File Format']}")
+                logger.error(f"Unknown file format: {settings.file_format}")
+                raise ValueError(f"Unknown file format: {settings.file_format}")
 
-            self.resolution_x.setValue(settings["ResolutionX"])
-            self.resolution_y.setValue(settings["ResolutionY"])
-            self.resolution_scale.setValue(settings["Resolution Scale"])
-            self.render_engine.setCurrentIndex(self.render_engine.findText(settings["Render Engine"]))
+            self.resolution_x.setValue(settings.resolution_x)
+            self.resolution_y.setValue(settings.resolution_y)
+            self.resolution_scale.setValue(settings.resolution_scale)
+            self.render_engine.setCurrentIndex(self.render_engine.findText(settings.render_engine))
 
             self.cycles_threads.setValue(
-                settings["Threads"] if settings["Threads"] != 0 else utils.get_cpu_count()
+                settings.threads if settings.threads != 0 else utils.get_cpu_count()
             )
 
             self.output_format_combobox.setCurrentIndex(
-                self.output_format_combobox.findText(settings["File Format"])
+                self.output_format_combobox.findText(settings.file_format)
             )
-            self.output_folder.setText(settings["Output Path"])
+            self.output_folder.setText(settings.output_path)
 
             logger.info(f"Displayed details for project: {self.current_project.unique_name}")
         except Exception as e:
             logger.error(f"Error showing file details: {str(e)}")
             self.update_output(f"Error showing file details: {str(e)}")
 
+    def show_project_preview(self, project):
+        """Show a cached preview for the project or request it from the thumbnail loader."""
+        preview_image_path = project.preview_path
+        if not preview_image_path or not os.path.exists(preview_image_path):
+            self.preview.setText("Preview not available")
+            logger.info(f"No preview available for: {project.unique_name}")
+            return
+
+        pixmap = self.thumbnail_loader.request(preview_image_path, PREVIEW_SIZE)
+        if pixmap is not None:
+            self.preview.setPixmap(pixmap)
+        else:
+            self.preview.setText("Loading preview...")
+
+    def on_thumbnail_ready(self, path, pixmap):
+        if self.current_project and self.current_project.preview_path == path:
+            self.preview.setPixmap(pixmap)
+
+    def on_thumbnail_updated(self, unique_name):
+        """Drop the cached preview of a re-rendered thumbnail and show the new one."""
+        project = self.projects.get(unique_name)
+        if project is None:
+            return
+
+        self.thumbnail_loader.invalidate(project.preview_path)
+        self.project_list_model.refresh_thumbnail(unique_name)
+        if project is self.current_project:
+            # Старое превью остается на экране, пока не декодируется новое
+            self.thumbnail_loader.request(project.preview_path, PREVIEW_SIZE)
+
+    def on_thumbnail_failed(self, path):
+        if self.current_project and self.current_project.preview_path == path:
+            self.preview.setText("Invalid preview image")
+
     def update_project_preview(self):
         logger.debug("Updating project preview")
         try:
             if self.current_project:
-                self.blender_manager.render_project_thumbnail(self.current_project)
+                self.thumbnail_loader.invalidate(self.current_project.preview_path)
+                # Кнопка всегда запускает настоящий рендер, а не встроенное превью
+                self.blender_manager.render_project_thumbnail(self.current_project, force_render=True)
                 logger.info(f"Requested preview update for: {self.current_project.unique_name}")
             else:
                 logger.warning("No project selected for preview update")
@@ -638,43 +817,89 @@ class BlenderInterface(QWidget):
                 return
 
             settings = self.current_project.settings
-            settings["Frame Start"] = self.frame_start.value()
-            settings["Frame End"] = self.frame_end.value()
-            settings["Frame Step"] = self.frame_step.value()
-            settings["Frame"] = self.frame_current.value()
-            settings["ResolutionX"] = self.resolution_x.value()
-            settings["ResolutionY"] = self.resolution_y.value()
-            settings["Resolution Scale"] = self.resolution_scale.value()
-            settings["File Format"] = self.output_format_combobox.currentText()
-            settings["Output Path"] = self.output_folder.text()
-            settings["Render Engine"] = self.render_engine.currentText()
-            settings["CYCLES Samples"] = self.cycles_samples.value()
-            settings["Denoising"] = self.cycles_denoising.isChecked()
-            settings["Device"] = self.cycles_device.currentText()
-            settings["Threads"] = self.cycles_threads.value()
-            settings["EEVEE Samples"] = self.eevee_samples.value()
+            settings.frame_start = self.frame_start.value()
+            settings.frame_end = self.frame_end.value()
+            settings.frame_step = self.frame_step.value()
+            settings.frame = self.frame_current.value()
+            settings.resolution_x = self.resolution_x.value()
+            settings.resolution_y = self.resolution_y.value()
+            settings.resolution_scale = self.resolution_scale.value()
+            if self.output_format_combobox.currentText():
+                settings.file_format = self.output_format_combobox.currentText()
+            settings.output_path = self.output_folder.text()
+            # Пустой выбор в комбобоксе не должен затирать значение из файла
+            if self.render_engine.currentText():
+                settings.render_engine = self.render_engine.currentText()
+            settings.cycles_samples = self.cycles_samples.value()
+            settings.denoising = self.cycles_denoising.isChecked()
+            if self.cycles_device.currentText():
+                settings.device = self.cycles_device.currentText()
+            settings.threads = self.cycles_threads.value()
+            settings.eevee_samples = self.eevee_samples.value()
 
             self.current_project.settings = settings.copy()
+            pinned_version = self.blender_pin.currentText()
+            if pinned_version in ("", AUTO_BLENDER_VERSION):
+                pinned_version = None
+            self.current_project.pinned_version = pinned_version
+            self.projects.refresh_output_dir(self.current_project)
             logger.info(f"Updated render settings for: {self.current_project.unique_name}")
         except Exception as e:
             logger.error(f"Error updating render settings: {str(e)}")
             self.update_output(f"Error updating render settings: {str(e)}")
 
+    def queue_output(self, message):
+        # Вызывается в потоке отправителя: только очередь, без виджетов и без повторного логирования
+        self.ui_pump.push(message)
+        if not message.startswith(("STDOUT: ", "STDERR: ")):
+            self.ui_pump.set_status("activity", message.strip())
+
     def update_output(self, message):
-        logger.info(f"Output message: {message}")
+        self.queue_output(message)
+
+    def append_output(self, messages):
         try:
-            self.progress_output.append(message)
+            # Одна вставка на пачку вместо append на каждую строку
+            cursor = QTextCursor(self.progress_output.document())
+            cursor.movePosition(QTextCursor.End)
+            if not self.progress_output.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText("\n".join(messages))
+            scroll_bar = self.progress_output.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
         except Exception as e:
             logger.error(f"Error updating output: {str(e)}")
 
+    def refresh_progress(self):
+        self.job_table_model.refresh()
+        summary = self.blender_manager.progress.summary(lanes=len(self.blender_manager.resource_allocator.slots))
+        if not summary["jobs"]:
+            return
+        if summary["fraction"] is not None:
+            self.batch_progress.setValue(int(summary["fraction"] * 100))
+        eta = format_duration(summary["eta"])
+        if summary["unestimated"]:
+            # Для части заданий нет ни истории, ни готовых кадров
+            eta = f"{eta}+"
+        self.batch_eta_label.setText(
+            f"Jobs {summary['finished']}/{summary['jobs']}, frames {summary['frames_done']}/{summary['frames_total']}, "
+            f"ETA {eta}" + (f", input {format_size(summary['input_bytes'])}" if summary["input_bytes"] else "")
+        )
+
+    def update_status(self, status):
+        activity = status.get("activity")
+        if activity is not None:
+            self.status_label.setText(activity)
+
     def start_render_queue(self):
         logger.debug("Starting render queue")
         try:
             self.update_render_settings()
-            projects_to_render = [
-                self.projects[self.blend_files_list.item(index).data(Qt.UserRole)]
-                for index in range(self.blend_files_list.count())
-            ]
+            projects_to_render = [self.projects[project_id] for project_id in self.project_list_model.project_ids()]
+            for project in projects_to_render:
+                # Непрочитанные настройки загрузит BlenderManager в потоке подготовки заданий
+                if project.settings:
+                    self.projects.refresh_output_dir(project)
 
             if not projects_to_render:
                 logger.warning("No projects to render")
@@ -687,12 +912,39 @@ class BlenderInterface(QWidget):
             logger.error(f"Error starting render queue: {str(e)}")
             self.update_output(f"Error starting render queue: {str(e)}")
 
+    def show_render_stats(self):
+        logger.debug("Opening render statistics")
+        try:
+            dialog = TelemetryDialog(self.blender_manager.telemetry, self)
+            dialog.exec_()
+        except Exception as e:
+            logger.error(f"Error showing render statistics: {str(e)}")
+            self.update_output(f"Error showing render statistics: {str(e)}")
+
+    def closeEvent(self, event):
+        """Stop folder scans and wait for queued uploads and post-processing before the window closes."""
+        logger.info("Closing BlenderInterface")
+        try:
+            # Поток QThread нельзя уничтожать работающим: просим остановиться и ждем
+            for worker in list(self.folder_scan_workers):
+                worker.requestInterruption()
+            for worker in list(self.folder_scan_workers):
+                worker.wait()
+            self.blender_manager.shutdown()
+        except Exception as e:
+            logger.error(f"Error shutting down background workers: {str(e)}")
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     try:
         work_directory = os.path.dirname(os.path.abspath(__file__))
         utils.set_config_value("work_directory", work_directory)
         logger.info(f"Set working directory: {work_directory}")
+        try:
+            log_config.configure_levels(utils.get_config_value("log_levels"))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid log_levels in config: {str(e)}")
 
         app = QApplication(sys.argv)
 
@@ -0,0 +1,137 @@
+import os
+from typing import Dict, List, Optional, Set
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('ProjectListModel')
+
+
+class ProjectListModel(QAbstractListModel):
+    """List model over project ids that exposes rows to the view in batches."""
+
+    # Сколько строк отдаем представлению за один fetchMore
+    BATCH_SIZE = 200
+    # Размер иконки превью в строке списка
+    ICON_SIZE = QSize(48, 48)
+
+    def __init__(self, projects: dict, parent=None, thumbnail_loader=None):
+        """Initialize the model over a shared dict of unique_name -> Project and an optional ThumbnailLoader."""
+        super().__init__(parent)
+        self._projects = projects
+        self._ids = []
+        self._rows: Dict[str, int] = {}
+        self._loaded_count = 0
+        # Путь превью -> строка, для которой идет декодирование
+        self._pending_icons: Dict[str, int] = {}
+        self._failed_icons: Set[str] = set()
+        self._thumbnail_loader = thumbnail_loader
+        if thumbnail_loader is not None:
+            thumbnail_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+            thumbnail_loader.thumbnail_failed.connect(self._on_thumbnail_failed)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._loaded_count
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._loaded_count < len(self._ids)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        remaining = len(self._ids) - self._loaded_count
+        batch = min(remaining, self.BATCH_SIZE)
+        if batch <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._loaded_count, self._loaded_count + batch - 1)
+        self._loaded_count += batch
+        self.endInsertRows()
+        logger.debug(f"Fetched {batch} rows, {self._loaded_count}/{len(self._ids)} visible")
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded_count:
+            return None
+
+        project = self._projects.get(self._ids[index.row()])
+        if project is None:
+            return None
+
+        # Метаданные проекта читаем только для строк, которые запросило представление
+        if role == Qt.DisplayRole:
+            return os.path.basename(project.file_path)
+        if role == Qt.ToolTipRole:
+            return project.file_path
+        if role == Qt.UserRole:
+            return project.unique_name
+        if role == Qt.DecorationRole:
+            return self._icon(index.row(), project)
+        return None
+
+    def _icon(self, row: int, project) -> Optional[object]:
+        # Превью декодируется, только когда строка попала в видимую область и представление спросило иконку
+        path = project.preview_path
+        if self._thumbnail_loader is None or not path or path in self._failed_icons:
+            return None
+        pixmap = self._thumbnail_loader.cached(path, self.ICON_SIZE)
+        if pixmap is not None or path in self._pending_icons:
+            return pixmap
+        if not os.path.exists(path):
+            return None
+        self._pending_icons[path] = row
+        return self._thumbnail_loader.request(path, self.ICON_SIZE)
+
+    def _on_thumbnail_ready(self, path: str, pixmap) -> None:
+        row = self._pending_icons.pop(path, None)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _on_thumbnail_failed(self, path: str) -> None:
+        if self._pending_icons.pop(path, None) is not None:
+            self._failed_icons.add(path)
+
+    def refresh_thumbnail(self, project_id: str) -> None:
+        """Ask the view to load the icon of a project again, e.g. after its preview was re-rendered."""
+        row = self._rows.get(project_id)
+        project = self._projects.get(project_id)
+        if row is None or project is None or row >= self._loaded_count:
+            return
+        # Декодирование старого изображения отменено инвалидацией загрузчика, иконка запрашивается заново
+        self._pending_icons.pop(project.preview_path, None)
+        self._failed_icons.discard(project.preview_path)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def add_projects(self, project_ids: List[str]) -> int:
+        """Append project ids to the model and return how many were added."""
+        new_ids = [project_id for project_id in dict.fromkeys(project_ids) if project_id not in self._rows]
+        if not new_ids:
+            return 0
+
+        was_fully_loaded = not self.canFetchMore()
+        self._rows.update((project_id, len(self._ids) + offset) for offset, project_id in enumerate(new_ids))
+        self._ids.extend(new_ids)
+
+        # Если представление уже показало все строки, отдаем ему следующий пакет сами
+        if was_fully_loaded:
+            self.fetchMore()
+
+        logger.info(f"Added {len(new_ids)} projects to list model, total: {len(self._ids)}")
+        return len(new_ids)
+
+    def project_ids(self) -> List[str]:
+        """Return all project ids, including rows not yet fetched by the view."""
+        return list(self._ids)
+
+    def project_at(self, row: int) -> Optional[object]:
+        """Return the project for a visible row or None."""
+        if row < 0 or row >= self._loaded_count:
+            return None
+        return self._projects.get(self._ids[row])
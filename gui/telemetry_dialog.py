@@ -0,0 +1,89 @@
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+    QPushButton, QComboBox, QLabel, QHeaderView
+)
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('TelemetryDialog')
+
+# Период отчета: подпись -> дней назад (None - вся история)
+PERIODS = {"All time": None, "Last 30 days": 30, "Last 7 days": 7, "Last 24 hours": 1}
+
+JOB_COLUMNS = ("id", "project", "kind", "blender_version", "engine", "samples", "frame_count", "queue_wait",
+               "startup", "file_load", "setup", "render", "shutdown", "post_process", "peak_memory_mb",
+               "return_code", "attempt", "failure")
+
+
+class TelemetryDialog(QDialog):
+    """Render history report: expensive projects, Blender version comparison and recent jobs."""
+
+    def __init__(self, telemetry_store, parent=None):
+        super().__init__(parent)
+        self.telemetry_store = telemetry_store
+        self.setWindowTitle("Render Statistics")
+        self.resize(1100, 600)
+
+        self.period = QComboBox()
+        self.period.addItems(PERIODS.keys())
+        self.period.currentIndexChanged.connect(self.refresh)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Period:"))
+        controls_layout.addWidget(self.period)
+        controls_layout.addStretch()
+        controls_layout.addWidget(refresh_button)
+
+        self.projects_table = self._create_table()
+        self.versions_table = self._create_table()
+        self.jobs_table = self._create_table()
+        tabs = QTabWidget()
+        tabs.addTab(self.projects_table, "Projects")
+        tabs.addTab(self.versions_table, "Blender versions")
+        tabs.addTab(self.jobs_table, "Recent jobs")
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls_layout)
+        layout.addWidget(tabs)
+        self.setLayout(layout)
+
+        self.refresh()
+
+    @staticmethod
+    def _create_table() -> QTableWidget:
+        table = QTableWidget()
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSortingEnabled(True)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        return table
+
+    @staticmethod
+    def _fill_table(table: QTableWidget, rows, columns=None) -> None:
+        columns = list(columns or (rows[0].keys() if rows else []))
+        table.setSortingEnabled(False)
+        table.clear()
+        table.setColumnCount(len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for column_index, column in enumerate(columns):
+                value = row.get(column)
+                text = "-" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+                table.setItem(row_index, column_index, QTableWidgetItem(text))
+        table.setSortingEnabled(True)
+
+    def refresh(self) -> None:
+        days = PERIODS[self.period.currentText()]
+        try:
+            since = time.time() - days * 86400 if days else None
+            self._fill_table(self.projects_table, self.telemetry_store.project_summary(since=since))
+            self._fill_table(self.versions_table, self.telemetry_store.version_comparison())
+            self._fill_table(self.jobs_table, self.telemetry_store.jobs(since=since), JOB_COLUMNS)
+            logger.debug("Telemetry report refreshed")
+        except Exception as e:
+            logger.error(f"Error loading telemetry report: {str(e)}")
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('ThumbnailLoader')
+
+
+class _ThumbnailSignals(QObject):
+    """Signals used by decode tasks to hand results back to the GUI thread."""
+    decoded = pyqtSignal(str, int, int, int, QImage)
+    failed = pyqtSignal(str, int, int, int, str)
+
+
+class _ThumbnailTask(QRunnable):
+    """Decode and downscale a single image file off the GUI thread."""
+
+    def __init__(self, path: str, size: QSize, generation: int, signals: _ThumbnailSignals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.generation = generation
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            reader = QImageReader(self.path)
+            reader.setAutoTransform(True)
+            source_size = reader.size()
+            if source_size.isValid():
+                # Декодируем сразу в нужном размере, полное изображение в память не попадает
+                reader.setScaledSize(source_size.scaled(self.size, Qt.KeepAspectRatio))
+
+            image = reader.read()
+            if image.isNull():
+                self.signals.failed.emit(self.path, self.size.width(), self.size.height(), self.generation,
+                                         reader.errorString())
+                return
+            self.signals.decoded.emit(self.path, self.size.width(), self.size.height(), self.generation, image)
+        except Exception as e:
+            self.signals.failed.emit(self.path, self.size.width(), self.size.height(), self.generation, str(e))
+
+
+class ThumbnailLoader(QObject):
+    """Load thumbnails asynchronously and keep an LRU cache of ready pixmaps."""
+    thumbnail_ready = pyqtSignal(str, QPixmap)
+    thumbnail_failed = pyqtSignal(str)
+
+    def __init__(self, cache_size: int = 256, max_threads: int = 2, parent=None):
+        super().__init__(parent)
+        if cache_size < 1:
+            raise ValueError("Cache size must be positive")
+
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending = set()
+        # Номер поколения файла растет при каждой инвалидации, результаты старых декодирований отбрасываются
+        self._generations: Dict[str, int] = {}
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+
+        self._signals = _ThumbnailSignals()
+        self._signals.decoded.connect(self._on_decoded)
+        self._signals.failed.connect(self._on_failed)
+        logger.info(f"Initializing ThumbnailLoader, cache size: {cache_size}, threads: {max_threads}")
+
+    @staticmethod
+    def _key(path: str, size: QSize) -> Tuple[str, int, int]:
+        return path, size.width(), size.height()
+
+    def cached(self, path: str, size: QSize) -> Optional[QPixmap]:
+        """Return a cached pixmap for path and size, marking it as recently used."""
+        key = self._key(path, size)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+        return pixmap
+
+    def request(self, path: str, size: QSize) -> Optional[QPixmap]:
+        """Return a cached pixmap or schedule decoding and return None."""
+        pixmap = self.cached(path, size)
+        if pixmap is not None:
+            return pixmap
+
+        key = self._key(path, size)
+        if key in self._pending:
+            return None
+
+        self._pending.add(key)
+        self._pool.start(_ThumbnailTask(path, QSize(size), self._generations.get(path, 0), self._signals))
+        logger.debug(f"Scheduled thumbnail decode: {path}")
+        return None
+
+    def invalidate(self, path: str) -> None:
+        """Drop every cached size of the given image and ignore decodes still in flight, e.g. after a re-render."""
+        for key in [key for key in self._cache if key[0] == path]:
+            del self._cache[key]
+        self._pending = {key for key in self._pending if key[0] != path}
+        self._generations[path] = self._generations.get(path, 0) + 1
+        logger.debug(f"Invalidated cached thumbnail: {path}")
+
+    def _is_stale(self, path: str, generation: int) -> bool:
+        return generation != self._generations.get(path, 0)
+
+    def _on_decoded(self, path: str, width: int, height: int, generation: int, image: QImage) -> None:
+        if self._is_stale(path, generation):
+            logger.debug(f"Dropped outdated thumbnail: {path}")
+            return
+        key = (path, width, height)
+        self._pending.discard(key)
+
+        # QPixmap создается только в GUI-потоке
+        pixmap = QPixmap.fromImage(image)
+        self._cache[key] = pixmap
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        self.thumbnail_ready.emit(path, pixmap)
+
+    def _on_failed(self, path: str, width: int, height: int, generation: int, error: str) -> None:
+        if self._is_stale(path, generation):
+            return
+        self._pending.discard((path, width, height))
+        logger.warning(f"Failed to decode thumbnail {path}: {error}")
+        self.thumbnail_failed.emit(path)
@@ -0,0 +1,81 @@
+import threading
+from collections import deque
+from typing import Any, Dict
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('UiUpdatePump')
+
+# Сколько раз в секунду обновляется интерфейс
+DEFAULT_FRAME_RATE = 20
+# Больше строк за кадр не выводим, остаток ждет следующего кадра
+DEFAULT_MAX_BATCH = 500
+# Предел очереди: при переполнении отбрасываются самые старые строки, полный вывод есть в файлах заданий
+DEFAULT_MAX_PENDING = 20000
+
+
+class UiUpdatePump(QObject):
+    """Collect messages and status from worker threads and hand them to the GUI thread in batches at a fixed rate."""
+    messages_ready = pyqtSignal(list)
+    status_ready = pyqtSignal(dict)
+    # Каждый кадр, даже без новых сообщений: по нему обновляются индикаторы прогресса
+    tick = pyqtSignal()
+
+    def __init__(self, parent=None, frame_rate: int = DEFAULT_FRAME_RATE, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        super().__init__(parent)
+        if frame_rate < 1 or max_batch < 1 or max_pending < 1:
+            raise ValueError("Frame rate, batch size and queue size must be positive")
+
+        self.max_batch = max_batch
+        # append и popleft у deque атомарны: рабочие потоки не берут блокировок и не ждут GUI
+        self._messages = deque(maxlen=max_pending)
+        # Статус по ключу: за кадр доходит только последнее значение
+        self._status: Dict[str, Any] = {}
+        self._status_lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, 1000 // frame_rate))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def push(self, message: str) -> None:
+        """Queue a message for the output panel; safe to call from any thread."""
+        self._messages.append(message)
+
+    def set_status(self, key: str, value: Any) -> None:
+        """Set the latest value of a status field; older values of the same field are never shown."""
+        with self._status_lock:
+            self._status[key] = value
+
+    def flush(self) -> None:
+        """Deliver queued messages and status on the GUI thread; called by the timer."""
+        overflow = len(self._messages) == self._messages.maxlen
+        batch = []
+        try:
+            for _ in range(self.max_batch):
+                batch.append(self._messages.popleft())
+        except IndexError:
+            pass
+        if overflow:
+            batch.insert(0, "... older output skipped, see the job log files ...")
+        if batch:
+            self.messages_ready.emit(batch)
+
+        with self._status_lock:
+            status, self._status = self._status, {}
+        if status:
+            self.status_ready.emit(status)
+        self.tick.emit()
+
+    def pending(self) -> int:
+        return len(self._messages)
+
+    def stop(self) -> None:
+        """Stop the timer and deliver what is left."""
+        self._timer.stop()
+        while self._messages:
+            self.flush()
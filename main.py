@@ -1,28 +1,16 @@
-import logging
 import os
 import sys
-from logging.handlers import RotatingFileHandler
 
 from PyQt5.QtWidgets import QApplication
 from PyQt5 import QtGui
 
 import util.utils as utils
 from gui.main_gui import BlenderInterface
+from util import log_config
+from util.log_config import get_logger
 
 # Configure logging
-logger = logging.getLogger('BlenderMain')
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# File handler with rotation
-file_handler = RotatingFileHandler('blender_interface.log', maxBytes=1048576, backupCount=5)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+logger = get_logger('BlenderMain', console=True)
 
 
 def apply_stylesheet(app):
@@ -41,6 +29,10 @@ if __name__ == "__main__":
         work_directory = os.path.dirname(os.path.abspath(__file__))
         utils.set_config_value("work_directory", work_directory)
         logger.info(f"Set working directory: {work_directory}")
+        try:
+            log_config.configure_levels(utils.get_config_value("log_levels"))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid log_levels in config: {str(e)}")
 
         app = QApplication(sys.argv + ['-platform', 'windows:darkmode=1'])
 
@@ -0,0 +1,297 @@
+import os
+import re
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from util import utils
+from util.blend_file import read_external_paths
+from managers.dependency_scanner import MAX_LIBRARY_DEPTH, reference_files
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('AssetCache')
+
+DEFAULT_MAX_SIZE_GB = 50
+# mtime: файл перекопируется при любом изменении размера или времени; hash: сначала сравнивается содержимое
+VALIDATE_MODES = ("mtime", "hash")
+DEFAULT_VALIDATE = "mtime"
+INDEX_FILE = "index.json"
+FILES_DIRECTORY = "files"
+PARTIAL_SUFFIX = ".part"
+
+
+def validate_asset_cache_config(config) -> dict:
+    """Validate the asset_cache config like {"directory": "D:\\cache", "max_size_gb": 50, "validate": "mtime"}."""
+    if not isinstance(config, dict):
+        raise TypeError(f"Asset cache config must be a dict, got {type(config)}")
+    unknown_keys = set(config) - {"directory", "max_size_gb", "validate"}
+    if unknown_keys:
+        raise ValueError(f"Unknown asset cache config keys: {sorted(unknown_keys)}")
+    directory = config.get("directory")
+    if not isinstance(directory, str) or not directory:
+        raise ValueError("Asset cache directory must be a non-empty string")
+    max_size_gb = config.get("max_size_gb", DEFAULT_MAX_SIZE_GB)
+    if not isinstance(max_size_gb, (int, float)) or isinstance(max_size_gb, bool) or max_size_gb <= 0:
+        raise ValueError("Asset cache max_size_gb must be a positive number")
+    validate = config.get("validate", DEFAULT_VALIDATE)
+    if validate not in VALIDATE_MODES:
+        raise ValueError(f"Unknown asset cache validate mode: {validate}")
+    return {"directory": directory, "max_size_gb": max_size_gb, "validate": validate}
+
+
+class CacheEntry:
+    """A local copy of one shared file."""
+    __slots__ = ("source", "local", "size", "mtime", "digest", "references", "last_used")
+
+    def __init__(self, source: str, local: str, size: int, mtime: float, digest: Optional[str] = None,
+                 references: Optional[List[str]] = None, last_used: Optional[float] = None):
+        self.source = source
+        self.local = local
+        self.size = size
+        self.mtime = mtime
+        self.digest = digest
+        # Для .blend: нормализованные пути файлов, на которые он ссылается
+        self.references = references
+        self.last_used = last_used if last_used is not None else time.time()
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheEntry":
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return f"CacheEntry(source={self.source}, size={self.size})"
+
+
+class StagedFiles:
+    """Local copies of a .blend and its dependencies, kept in the cache until released."""
+    __slots__ = ("blend_file", "source_blend_file", "path_map")
+
+    def __init__(self, blend_file: str, source_blend_file: str, path_map: Dict[str, str]):
+        self.blend_file = blend_file
+        self.source_blend_file = source_blend_file
+        # Нормализованный путь в хранилище -> локальная копия
+        self.path_map = path_map
+
+    def __repr__(self) -> str:
+        return f"StagedFiles(blend_file={self.blend_file}, files={len(self.path_map)})"
+
+
+class AssetCache:
+    """Node-local LRU cache of .blend files and the libraries and images they use."""
+
+    def __init__(self, directory: str, max_bytes: int, validate: str = DEFAULT_VALIDATE):
+        if not isinstance(directory, str) or not directory:
+            raise ValueError("Cache directory must be a non-empty string")
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        if validate not in VALIDATE_MODES:
+            raise ValueError(f"Unknown validate mode: {validate}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self._entries: Dict[str, CacheEntry] = {}
+        # Файлы заданий, которые сейчас рендерятся или копируются, не вытесняются
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Один файл копирует один поток, остальные ждут его копию
+        self._copy_locks: Dict[str, threading.Lock] = {}
+        self._index_lock = threading.Lock()
+        self._prefetch_executor = None
+        self._load_index()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def local_path(self, source: str) -> str:
+        """Return where a shared file is kept in the cache, mirroring its absolute path."""
+        drive, rest = os.path.splitdrive(source)
+        # Структура папок повторяет хранилище, поэтому относительные пути // внутри файлов остаются верными
+        parts = [part for part in re.split(r"[\\/:]", drive + os.sep + rest) if part]
+        return os.path.join(self.directory, FILES_DIRECTORY, *parts)
+
+    def stage(self, blend_file: str) -> StagedFiles:
+        """Copy a .blend and its dependencies into the cache, or reuse valid copies, and pin them."""
+        source_blend = utils.normalize_path(blend_file)
+        path_map = {}
+        try:
+            pending = [(source_blend, 0)]
+            while pending:
+                source, depth = pending.pop()
+                if source in path_map:
+                    continue
+                self._pin(source)
+                path_map[source] = None
+                entry = self._stage_file(source, is_blend=source.endswith(".blend"))
+                if entry is None:
+                    self._unpin([source])
+                    continue
+                path_map[source] = entry.local
+                if entry.references is not None and depth < MAX_LIBRARY_DEPTH:
+                    pending.extend((reference, depth + 1) for reference in entry.references)
+        except Exception:
+            self._unpin([source for source, local in path_map.items() if local] + [source])
+            raise
+        if path_map[source_blend] is None:
+            self._unpin([source for source, local in path_map.items() if local])
+            raise FileNotFoundError(f"Project file not found: {blend_file}")
+
+        self._save_index()
+        staged = StagedFiles(path_map[source_blend], blend_file,
+                             {source: local for source, local in path_map.items() if local})
+        logger.info(f"Staged {len(staged.path_map)} files for {blend_file}")
+        return staged
+
+    def release(self, staged: StagedFiles) -> None:
+        """Allow the files of a finished job to be evicted again."""
+        self._unpin(staged.path_map)
+
+    def prefetch(self, blend_files: Iterable[str]) -> None:
+        """Stage files in the background, in order, so they are local before their jobs start."""
+        with self._lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset_prefetch")
+            for blend_file in blend_files:
+                self._prefetch_executor.submit(self._prefetch, blend_file)
+
+    def _prefetch(self, blend_file: str) -> None:
+        try:
+            self.release(self.stage(blend_file))
+        except Exception as e:
+            logger.warning(f"Unable to prefetch {blend_file}: {str(e)}")
+
+    def _stage_file(self, source: str, is_blend: bool = False) -> Optional[CacheEntry]:
+        """Return a valid cache entry for a shared file, copying it when needed; None when it does not exist."""
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            logger.warning(f"Dependency not found: {source}")
+            return None
+
+        with self._lock:
+            copy_lock = self._copy_locks.setdefault(source, threading.Lock())
+        with copy_lock:
+            with self._lock:
+                entry = self._entries.get(source)
+            if entry and self._is_valid(entry, stat):
+                entry.last_used = time.time()
+                return entry
+            return self._copy(source, stat, is_blend)
+
+    def _is_valid(self, entry: CacheEntry, stat: os.stat_result) -> bool:
+        if not os.path.isfile(entry.local):
+            return False
+        if entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+            return True
+        if self.validate != "hash" or entry.size != stat.st_size or not entry.digest:
+            return False
+        # Файл перезаписан тем же содержимым: копия остается, обновляется только mtime
+        if utils.file_content_hash(entry.source) != entry.digest:
+            return False
+        entry.mtime = stat.st_mtime
+        return True
+
+    def _copy(self, source: str, stat: os.stat_result, is_blend: bool) -> CacheEntry:
+        local = self.local_path(source)
+        with self._lock:
+            old_entry = self._entries.pop(source, None)
+            self._make_room(stat.st_size)
+            # Место под копию занято сразу, чтобы параллельные копирования не переполнили кэш
+            entry = self._entries[source] = CacheEntry(source, local, stat.st_size, stat.st_mtime)
+        if old_entry:
+            logger.info(f"Cached copy of {source} is outdated, copying again")
+
+        try:
+            os.makedirs(os.path.dirname(local), exist_ok=True)
+            shutil.copyfile(source, local + PARTIAL_SUFFIX)
+            os.replace(local + PARTIAL_SUFFIX, local)
+            if self.validate == "hash":
+                entry.digest = utils.file_content_hash(local)
+            if is_blend:
+                # Зависимости читаются из локальной копии, по сети файл проходит один раз;
+                # последовательности кадров и тайлы UDIM копируются всеми файлами
+                entry.references = sorted({path for reference in read_external_paths(local)
+                                           for path in reference_files(source, reference)})
+        except Exception:
+            with self._lock:
+                self._entries.pop(source, None)
+            if os.path.exists(local + PARTIAL_SUFFIX):
+                os.remove(local + PARTIAL_SUFFIX)
+            raise
+        logger.debug(f"Copied {source} to cache ({stat.st_size} bytes)")
+        return entry
+
+    def _make_room(self, size: int) -> None:
+        # Вызывается под self._lock
+        used = sum(entry.size for entry in self._entries.values())
+        if used + size <= self.max_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda item: item.last_used):
+            if self._pins.get(entry.source):
+                continue
+            del self._entries[entry.source]
+            try:
+                os.remove(entry.local)
+            except FileNotFoundError:
+                pass
+            used -= entry.size
+            logger.debug(f"Evicted {entry.source} from cache")
+            if used + size <= self.max_bytes:
+                return
+        raise OSError(f"Asset cache is full: {size} bytes do not fit into {self.max_bytes} with pinned files")
+
+    def _pin(self, source: str) -> None:
+        with self._lock:
+            self._pins[source] = self._pins.get(source, 0) + 1
+
+    def _unpin(self, sources: Iterable[str]) -> None:
+        with self._lock:
+            for source in sources:
+                count = self._pins.get(source, 0) - 1
+                if count > 0:
+                    self._pins[source] = count
+                else:
+                    self._pins.pop(source, None)
+
+    def _load_index(self) -> None:
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                entries = [CacheEntry.from_dict(data) for data in json.load(f)]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Unable to read asset cache index {index_path}, starting empty: {str(e)}")
+            return
+        # Копии, удаленные вручную, забываются
+        self._entries = {entry.source: entry for entry in entries if os.path.isfile(entry.local)}
+        logger.info(f"Loaded asset cache with {len(self._entries)} files from {self.directory}")
+
+    def _save_index(self) -> None:
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        with self._lock:
+            data = [entry.to_dict() for entry in self._entries.values()]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._index_lock:
+                with open(index_path + PARTIAL_SUFFIX, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(index_path + PARTIAL_SUFFIX, index_path)
+        except OSError as e:
+            logger.warning(f"Unable to save asset cache index {index_path}: {str(e)}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop background prefetching and save the index."""
+        with self._lock:
+            executor, self._prefetch_executor = self._prefetch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        self._save_index()
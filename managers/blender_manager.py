@@ -1,29 +1,49 @@
-import json
+import os
+import copy
+import time
+import queue
+import platform
 import subprocess
 import threading
-import logging
-from logging.handlers import RotatingFileHandler
-from typing import List, Callable, Optional
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 import bpy
 from PyQt5.QtCore import QObject
 
+from dto.render_settings import RenderSettings, set_image_file_formats
 from util import utils
+from util import job_spec
+from util import blend_file
+from util.preview_tiers import DEFAULT_PREVIEW_TIERS, validate_preview_tiers, parse_tier_marker
+from util.blender_output import OutputStats, OutputTail, parse_saved_path
+from util.phase_markers import phase_durations
+from util.blender_versions import file_version, format_version, select_binary
+from util.render_failures import RetryPolicy, classify_failure, remaining_render_spec, IO_ERROR
+from managers.job_engine import JobEngine, RenderJob, RENDER, THUMBNAIL, DONE, FAILED, SKIPPED, RETRY_WAIT
+from managers.job_progress import ProgressTracker, count_frames
+from managers.post_processor import PostProcessor, validate_post_process_steps
+from managers.output_uploader import OutputUploader, UploadBatch, resolve_output_dir, validate_scratch_config
+from managers.asset_cache import AssetCache, StagedFiles, validate_asset_cache_config
+from managers.dependency_scanner import DependencyScanner, validate_dependency_scan_config
+from managers.preflight import PreflightResult, SceneInfoCache, check_render_spec, run_preflight
+from managers.resource_allocator import CpuSlot, ResourceAllocator, affinity_command_prefix, apply_affinity
+from managers.telemetry_store import TelemetryStore, DEFAULT_DB_PATH
+from util import log_config
+from util.log_config import get_logger
 
 # Configure logging
-logger = logging.getLogger('BlenderManager')
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = get_logger('BlenderManager', console=True)
 
-# File handler with rotation
-file_handler = RotatingFileHandler('blender_interface.log', maxBytes=1048576, backupCount=5)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+# Полный вывод каждого запуска Blender пишется в отдельный файл в этой папке
+DEFAULT_JOB_LOG_DIRECTORY = "logs"
+# Столько последних строк вывода попадает в общий лог при ошибке задания
+FAILURE_TAIL_LINES = 30
+# Хвосты вывода хранятся только для последних запущенных проектов
+MAX_OUTPUT_TAILS = 50
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+# Скрипт Blender для каждого вида задания
+JOB_SCRIPTS = {RENDER: "render_script.py", THUMBNAIL: "render_preview_script.py"}
 
 
 # TODO: Add script for Movie render type
@@ -32,12 +52,90 @@ class BlenderManager(QObject):
         """Initialize BlenderManager with a parent QObject."""
         super().__init__(parent)
         self.qt_signal = parent.signal if parent else None
+        # Необязательный сигнал с unique_name проекта, чья миниатюра обновилась
+        self.thumbnail_signal = getattr(parent, 'thumbnail_signal', None) if parent else None
         logger.info("Initializing BlenderManager")
         if not self.qt_signal:
             logger.warning("No Qt signal provided, signal emissions will be ignored")
 
-    def render_project_thumbnail(self, project) -> None:
-        """Start rendering a thumbnail for the given project in a separate thread."""
+        # bpy не потокобезопасен, поэтому открытие файлов в процессе сериализуется
+        self._bpy_lock = threading.Lock()
+        self._metadata_queue = queue.Queue()
+        self._metadata_thread = None
+        self._metadata_thread_lock = threading.Lock()
+        # Обработка результатов идет в своем пуле и не задерживает следующий рендер
+        self.post_processor = PostProcessor(self.qt_signal)
+        # Ядра делятся между одновременными рендерами, чтобы они не вытесняли друг друга
+        self.resource_allocator = ResourceAllocator(self._get_concurrent_renders())
+        # История рендеров для отчетов о производительности
+        self.telemetry = TelemetryStore(self._get_telemetry_db_path())
+        # Временные сбои рендера перезапускаются с растущей паузой
+        self.retry_policy = self._get_retry_policy()
+        # Рендер в локальную папку, кадры переносятся в папку вывода в фоне
+        self.scratch = self._get_scratch_config()
+        self.uploader = OutputUploader(self.qt_signal, self.scratch["uploads"], self.scratch["verify"],
+                                       self.scratch["upload_timeout"]) if self.scratch else None
+        # Локальные копии .blend, библиотек и текстур вместо чтения из общего хранилища
+        self.asset_cache = self._create_asset_cache()
+        # Внешние файлы проектов: объем данных задания и проверка до запуска Blender
+        self.dependency_scan = self._get_dependency_scan_config()
+        self.dependency_scanner = DependencyScanner(self.dependency_scan["backend"], self._bpy_lock)
+        # Сцены и камеры файлов для проверки заданий до запуска Blender
+        self.scene_info = SceneInfoCache()
+        # Пачки заданий, которые сейчас выполняются
+        self._engines: List[JobEngine] = []
+        self._engines_lock = threading.Lock()
+        # Последние строки вывода каждого проекта для GUI и разбора ошибок
+        self.output_tails = OrderedDict()
+        self._output_tails_lock = threading.Lock()
+        # Кадры, сэмплы и оценка времени заданий рендера для таблицы в GUI
+        self.progress = ProgressTracker()
+
+    def extract_settings_in_background(self, projects: List, refresh: bool = False) -> None:
+        """Queue projects for settings extraction on the background metadata thread; refresh re-reads loaded ones."""
+        if not isinstance(projects, list):
+            logger.error(f"Invalid projects type: {type(projects)}, expected list")
+            return
+
+        for project in projects:
+            self._metadata_queue.put((project, refresh))
+
+        with self._metadata_thread_lock:
+            if self._metadata_thread is None or not self._metadata_thread.is_alive():
+                self._metadata_thread = threading.Thread(target=self._extract_settings_worker, daemon=True)
+                self._metadata_thread.start()
+                logger.debug("Started metadata extraction thread")
+
+        logger.info(f"Queued {len(projects)} projects for settings extraction")
+
+    def _extract_settings_worker(self) -> None:
+        """Extract settings for queued projects until the queue is drained."""
+        while True:
+            try:
+                project, refresh = self._metadata_queue.get(timeout=1)
+            except queue.Empty:
+                with self._metadata_thread_lock:
+                    if self._metadata_queue.empty():
+                        self._metadata_thread = None
+                        logger.debug("Metadata extraction thread finished")
+                        return
+                continue
+
+            try:
+                # Проект мог быть уже загружен при выборе в списке
+                if project.settings and not refresh:
+                    continue
+                settings = self.get_settings_from_project(project.file_path)
+                # Старые настройки остаются у проекта, пока не прочитаны новые
+                if settings and (refresh or not project.settings):
+                    project.apply_source_settings(settings)
+            except Exception as e:
+                logger.error(f"Error extracting settings for {project.file_path}: {str(e)}")
+            finally:
+                self._metadata_queue.task_done()
+
+    def render_project_thumbnail(self, project, force_render: bool = False) -> None:
+        """Start a thumbnail job in a separate thread; force_render skips the embedded preview."""
         if not project or not hasattr(project, 'file_path') or not hasattr(project, 'unique_name'):
             logger.error("Invalid project object provided for thumbnail rendering")
             if self.qt_signal:
@@ -45,16 +143,8 @@ class BlenderManager(QObject):
             return
 
         logger.info(f"Starting thumbnail render for project: {project.file_path}")
-        if self.qt_signal:
-            self.qt_signal.emit(f"Start render thumbnail: {project.file_path}")
-
         try:
-            render_thread = threading.Thread(
-                target=self._start_render_thumbnail,
-                args=(project, lambda: self._on_render_thumbnails_complete([]))
-            )
-            render_thread.start()
-            logger.debug(f"Started render thread for thumbnail: {project.file_path}")
+            self._start_engine([RenderJob(project, THUMBNAIL, force_render)], thumbnails=True)
         except Exception as e:
             logger.error(f"Error starting thumbnail render thread for {project.file_path}: {str(e)}")
             if self.qt_signal:
@@ -75,307 +165,760 @@ class BlenderManager(QObject):
 
         logger.info(f"Starting render for {len(projects)} projects, isCreatingThumbnails: {isCreatingThumbnails}")
         try:
-            # Запускаем рендер в отдельном потоке
-            render_thread = threading.Thread(
-                target=self._render_next_thumbnail if isCreatingThumbnails else self._render_next,
-                args=(projects,)
-            )
-            render_thread.start()
-            logger.debug("Started render thread for projects")
+            kind = THUMBNAIL if isCreatingThumbnails else RENDER
+            self._start_engine([RenderJob(project, kind) for project in projects], thumbnails=isCreatingThumbnails)
         except Exception as e:
             logger.error(f"Error starting render thread: {str(e)}")
             if self.qt_signal:
                 self.qt_signal.emit(f"Error starting render: {str(e)}")
 
-    def _render_next_thumbnail(self, projects_without_thumbnails: List) -> None:
-        """Render the next thumbnail in the queue."""
-        if not projects_without_thumbnails:
-            # Если очередь пуста, завершаем выполнение
-            logger.info("All thumbnail renders completed")
-            if self.qt_signal:
-                self.qt_signal.emit("All thumbnail renders completed.\n")
-            return
+    def _start_engine(self, jobs: List[RenderJob], thumbnails: bool = False) -> JobEngine:
+        """Run a batch of jobs on background lanes: thumbnails on one, renders on one per CPU slot."""
+        if thumbnails:
+            engine = JobEngine(self._execute_job, jobs, on_finished=self._on_thumbnails_finished)
+        else:
+            # Несколько потоков разбирают одну очередь, каждый со своим набором ядер; проверки идут в фоне
+            engine = JobEngine(self._execute_job, jobs, lanes=len(self.resource_allocator.slots),
+                               allocator=self.resource_allocator, on_finished=self._on_renders_finished,
+                               prepare=self._prepare_renders)
+        with self._engines_lock:
+            self._engines.append(engine)
+        engine.start()
+        return engine
+
+    def _prepare_renders(self, jobs: List[RenderJob]) -> List[RenderJob]:
+        """Load settings, track, pre-flight and prefetch a render batch on the engine's thread; return the jobs to run."""
+        self._load_missing_settings(jobs)
+        self._track_progress(jobs)
+        # Задания с ошибками отсеиваются до запуска первого процесса Blender
+        jobs = self._preflight(jobs)
+        if self.asset_cache:
+            # Файлы следующих заданий копируются, пока рендерятся первые
+            self.asset_cache.prefetch([job.project.file_path for job in jobs
+                                       if isinstance(getattr(job.project, 'file_path', None), str)])
+        return jobs
+
+    def _load_missing_settings(self, jobs: List[RenderJob]) -> None:
+        """Read settings of queued projects that were not loaded yet; failures are reported by the reader."""
+        for job in jobs:
+            project = job.project
+            if not isinstance(getattr(project, 'file_path', None), str) or getattr(project, 'settings', True):
+                continue
+            settings = self.get_settings_from_project(project.file_path)
+            # Фоновый поток извлечения мог прочитать настройки раньше
+            if settings and not project.settings:
+                project.apply_source_settings(settings)
+
+    def _track_progress(self, jobs: List[RenderJob]) -> None:
+        """Add render jobs to the progress table with their frame counts and historical frame times."""
+        try:
+            self.progress.set_history(self.telemetry.average_frame_seconds())
+        except Exception as e:
+            logger.warning(f"Unable to read frame times from telemetry: {str(e)}")
+        # Завершенные задания прошлых пачек не должны попадать в счетчики и ETA новой
+        self.progress.start_batch()
+        for job in jobs:
+            project = job.project
+            if not hasattr(project, 'unique_name') or not hasattr(project, 'file_path'):
+                continue
+            try:
+                frames_total = count_frames(self._build_render_spec(project))
+            except (TypeError, ValueError, KeyError, AttributeError):
+                # Настройки еще не прочитаны или неверны: число кадров станет известно при запуске
+                frames_total = None
+            self.progress.add(project.unique_name, os.path.basename(project.file_path), frames_total)
+
+    def _on_thumbnails_finished(self, engine: JobEngine) -> None:
+        """Report the end of a thumbnail batch."""
+        self._forget_engine(engine)
+        logger.info(f"All thumbnail renders completed: {engine.counts()}")
+        if self.qt_signal:
+            self.qt_signal.emit("All thumbnail renders completed.\n")
 
-        # Берем первый файл из очереди
-        project = projects_without_thumbnails.pop(0)
+    def _on_renders_finished(self, engine: JobEngine) -> None:
+        """Report the end of a render batch and post-processing that is still running."""
+        self._forget_engine(engine)
+        logger.info(f"All renders completed: {engine.counts()}")
+        if self.qt_signal:
+            self.qt_signal.emit("All renders completed.\n")
+            pending = self.post_processor.pending()
+            if pending:
+                self.qt_signal.emit(f"Post-processing still running for {pending} jobs")
+
+    def _forget_engine(self, engine: JobEngine) -> None:
+        with self._engines_lock:
+            if engine in self._engines:
+                self._engines.remove(engine)
+
+    def _execute_job(self, job: RenderJob, slot: Optional[CpuSlot] = None) -> None:
+        """Run one attempt of a job taken from the engine queue."""
+        project = job.project
         if not hasattr(project, 'file_path') or not hasattr(project, 'unique_name'):
-            logger.error("Invalid project object in thumbnail queue")
+            logger.error(f"Invalid project object in {job.kind} queue")
             if self.qt_signal:
                 self.qt_signal.emit("Error: Invalid project object")
-            self._on_render_thumbnails_complete(projects_without_thumbnails)
+            job.state = SKIPPED
+            return
+        if job.kind == RENDER and not hasattr(project, 'settings'):
+            logger.error("Invalid project object in render queue")
+            if self.qt_signal:
+                self.qt_signal.emit("Error: Invalid project object")
+            job.state = SKIPPED
+            self.progress.set_state(project.unique_name, SKIPPED)
             return
 
         # Выводим информацию о начале рендера
-        logger.info(f"Starting thumbnail render: {project.file_path}")
-        if self.qt_signal:
-            self.qt_signal.emit(f"Start render thumbnail: {project.file_path}")
+        if job.attempt == 1:
+            label = "render thumbnail" if job.kind == THUMBNAIL else "render"
+            logger.info(f"Starting {label}: {project.file_path}")
+            if self.qt_signal:
+                self.qt_signal.emit(f"Start {label}: {project.file_path}")
+        if job.kind == RENDER and getattr(project, 'source_changed', False):
+            logger.warning(f"Source changed since the job was queued: {project.file_path}")
+            if self.qt_signal:
+                self.qt_signal.emit(f"Source changed since queued, rendering latest version: {project.file_path}")
+            project.source_changed = False
 
         try:
-            self._start_render_thumbnail(project, lambda: self._on_render_thumbnails_complete(projects_without_thumbnails))
-        except Exception as e:
-            logger.error(f"Error rendering thumbnail for {project.file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Error rendering thumbnail: {str(e)}")
-            self._on_render_thumbnails_complete(projects_without_thumbnails)
+            self._run_job(job, slot)
+        finally:
+            if job.kind == RENDER:
+                self.progress.set_state(project.unique_name, job.state)
+            if job.state != RETRY_WAIT:
+                logger.info(f"Job finished: {job}")
+                if self.qt_signal:
+                    self.qt_signal.emit("Render ends\n")
+
+    def _fail_job(self, job: RenderJob, log_message: str, signal_message: str) -> None:
+        logger.error(log_message)
+        if self.qt_signal:
+            self.qt_signal.emit(signal_message)
+        job.state = FAILED
 
-    def _start_render_thumbnail(self, project, callback: Callable) -> None:
-        """Execute the thumbnail rendering process for a project."""
+    def _run_job(self, job: RenderJob, slot: Optional[CpuSlot] = None) -> None:
+        """Run a render or thumbnail job in Blender and set its state: done, failed or waiting for a retry."""
+        project = job.project
         file_path = project.file_path
-        unique_name = project.unique_name
-        logger.debug(f"Preparing to render thumbnail for {file_path} with unique name {unique_name}")
+        is_thumbnail = job.kind == THUMBNAIL
+        logger.debug(f"Preparing {job.kind} job for {file_path} (attempt {job.attempt})")
 
         # Проверяем существование файлов
         if not utils.is_path_exists(file_path):
-            logger.error(f"Project file not found: {file_path}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"File {file_path} not found.")
-            callback()
+            self._fail_job(job, f"Project file not found: {file_path}", f"File {file_path} not found.")
             return
 
+        # Встроенное превью читается прямо из файла, без запуска Blender
+        if is_thumbnail and not job.force_render and self._extract_embedded_thumbnail(project):
+            job.state = DONE
+            return
+
+        script_name = JOB_SCRIPTS[job.kind]
         script_path = utils.transform_path_to_standard(
-            utils.get_config_value("work_directory") + "\\scripts\\render_preview_script.py"
+            utils.get_config_value("work_directory") + "\\scripts\\" + script_name
         )
         if not utils.is_path_exists(script_path):
-            logger.error(f"Render script not found: {script_path}")
-            if self.qt_signal:
-                self.qt_signal.emit("File render_preview_script.py not found.")
-            callback()
+            self._fail_job(job, f"Render script not found: {script_path}", f"File {script_name} not found.")
             return
 
-        # Команда для запуска Blender
-        blender_executable = utils.get_config_value("current_bin")
-        if not blender_executable or not utils.is_path_exists(blender_executable):
-            logger.error(f"Blender executable not found: {blender_executable}")
-            if self.qt_signal:
-                self.qt_signal.emit("Blender executable not found.")
-            callback()
+        # Настройки передаются через файл спецификации, а не одной строкой в argv
+        try:
+            # Повторная попытка получает спецификацию, суженную до несделанной работы
+            spec = job.spec or self._build_job_spec(job)
+        except (TypeError, ValueError, AttributeError) as e:
+            self._fail_job(job, f"Failed to serialize settings for {file_path}: {str(e)}",
+                           f"Error serializing settings: {str(e)}")
             return
 
-        command = [
-            blender_executable,
-            "--background",  # Запуск в фоновом режиме
-            "--python", "./scripts/render_preview_script.py",  # Скрипт для выполнения
-            "--",  # Разделитель для аргументов скрипта
-            file_path,
-            unique_name,
-        ]
-        logger.debug(f"Executing command: {' '.join(command)}")
+        # Команда для запуска Blender той версии, что подходит файлу
+        blender_executable = self._select_blender_executable(project)
+        if not blender_executable or not utils.is_path_exists(blender_executable):
+            self._fail_job(job, f"Blender executable not found: {blender_executable}",
+                           "Blender executable not found.")
+            return
 
+        threads = 0
+        if not is_thumbnail:
+            # Первая попытка задает общее число кадров, повторы продолжают счет
+            self.progress.start(project.unique_name, count_frames(spec) if job.attempt == 1 else None)
+            # Число потоков не больше ядер слота; 0 оставляет выбор Blender
+            threads = slot.threads_for(project.settings.threads) if slot else project.settings.threads
+            spec["settings"]["Threads"] = threads
+
+        # Blender пишет кадры на локальный диск; spec с настоящей папкой вывода нужен для повтора
+        upload, run_spec = self._prepare_scratch(job, spec) if not is_thumbnail and self.uploader else (None, spec)
+        staged, run_spec = self._stage_assets(job, run_spec) if not is_thumbnail and self.asset_cache \
+            else (None, run_spec)
+
+        # Процесс привязывается к ядрам слота при запуске; без numactl и taskset - сразу после него
+        affinity_prefix = affinity_command_prefix(slot) if slot else []
+        spec_path = None
+        log_job_id = None
+        uploaded = {}
         try:
-            with subprocess.Popen(
-                    command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1,  # Line buffering
-                    universal_newlines=True
-            ) as process:
-                # Function to read output in real time
-                def read_output(pipe, label: str):
-                    try:
-                        for line in iter(pipe.readline, ''):
-                            if line:
-                                logger.debug(f"{label}: {line.strip()}")
-                                if self.qt_signal:
-                                    self.qt_signal.emit(f"{label}: {line.strip()}")
-                    except Exception as e:
-                        logger.error(f"Error reading {label} for {file_path}: {str(e)}")
-
-                logger.info(f"Blender process started for thumbnail: {file_path}")
-                if self.qt_signal:
-                    self.qt_signal.emit(f"Blender starts with file: {file_path}")
-
-                # Start threads to read stdout and stderr
-                stdout_thread = threading.Thread(target=read_output, args=(process.stdout, "STDOUT"))
-                stderr_thread = threading.Thread(target=read_output, args=(process.stderr, "STDERR"))
-                stdout_thread.start()
-                stderr_thread.start()
-
-                # Wait for process to complete
-                process.wait()
-                stdout_thread.join()
-                stderr_thread.join()
-
-                if process.returncode != 0:
-                    logger.error(f"Thumbnail render failed for {file_path}, return code: {process.returncode}")
-                    if self.qt_signal:
-                        self.qt_signal.emit(f"Thumbnail render failed with code {process.returncode}")
-                else:
-                    logger.info(f"Thumbnail render completed successfully for {file_path}")
-                    if self.qt_signal:
-                        self.qt_signal.emit(f"Thumbnail render completed for {file_path}")
-
+            spec_path = job_spec.write_job_spec(run_spec)
+            command = [
+                *affinity_prefix,
+                blender_executable,
+                "--background",  # Запуск в фоновом режиме
+                *(["--threads", str(threads)] if threads else []),
+                # Необработанное исключение в скрипте завершает Blender с кодом 1, а не 0
+                "--python-exit-code", "1",
+                "--python", f"./scripts/{script_name}",  # Скрипт для выполнения
+                "--",  # Разделитель для аргументов скрипта
+                "--job-spec", spec_path,
+            ]
+            logger.debug(f"Executing command: {' '.join(command)}")
+
+            started_at = time.time()
+            log_job_id = self._start_job_log(project, job.kind, started_at)
+            return_code, stats, tail = self._run_blender(job, command, started_at, log_job_id,
+                                                         None if affinity_prefix else slot, upload)
         except subprocess.SubprocessError as e:
-            logger.error(f"Subprocess error rendering thumbnail for {file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Subprocess error rendering thumbnail: {str(e)}")
+            self._fail_job(job, f"Subprocess error running {job.kind} job for {file_path}: {str(e)}",
+                           f"Subprocess error rendering {job.kind}: {str(e)}")
+            return
         except Exception as e:
-            logger.error(f"Unexpected error rendering thumbnail for {file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Unexpected error rendering thumbnail: {str(e)}")
-
-        callback()
-
-    def _on_render_thumbnails_complete(self, projects: List) -> None:
-        """Handle completion of a thumbnail render and proceed to the next."""
-        # Выводим информацию о завершении рендера
-        logger.info("Thumbnail render completed")
-        if self.qt_signal:
-            self.qt_signal.emit("Render ends\n")
-
-        # Запускаем рендер следующего файла
-        self._render_next_thumbnail(projects)
-
-    def _render_next(self, projects_to_render: List) -> None:
-        """Render the next project in the queue."""
-        if not projects_to_render:
-            # Если очередь пуста, завершаем выполнение
-            logger.info("All renders completed")
-            if self.qt_signal:
-                self.qt_signal.emit("All renders completed.\n")
+            self._fail_job(job, f"Unexpected error running {job.kind} job for {file_path}: {str(e)}",
+                           f"Unexpected error rendering {job.kind}: {str(e)}")
             return
-
-        # Берем первый файл из очереди
-        project = projects_to_render.pop(0)
-        if not hasattr(project, 'file_path') or not hasattr(project, 'settings'):
-            logger.error("Invalid project object in render queue")
+        finally:
+            if log_job_id:
+                log_config.stop_job_log(log_job_id)
+            job_spec.remove_job_spec(spec_path)
+            if upload:
+                # Ожидание ограничено upload_timeout; незавершенные копирования дают IO_ERROR ниже
+                uploaded = self.uploader.finish(upload)
+            if staged:
+                self.asset_cache.release(staged)
+
+        failure = None
+        if upload:
+            # Дальше задание работает с файлами в папке вывода; неперенесенные кадры считаются несделанными
+            if return_code == 0 and len(uploaded) < len(stats.saved_outputs):
+                failure = IO_ERROR
+            stats.saved_outputs = [uploaded[path] for path in stats.saved_outputs if path in uploaded]
+
+        job.return_code = return_code
+        job.outputs.extend(stats.saved_outputs)
+        label = "Thumbnail render" if is_thumbnail else "Render"
+        # Ожидание в очереди учитывается только у первой попытки
+        queued_at = job.queued_at if job.attempt == 1 else None
+        if return_code == 0 and failure is None:
+            logger.info(f"{label} completed successfully for {file_path}")
             if self.qt_signal:
-                self.qt_signal.emit("Error: Invalid project object")
-            self._on_render_complete(projects_to_render)
+                self.qt_signal.emit(f"{label} completed for {file_path}")
+            telemetry_id = self._record_telemetry(project, blender_executable, stats, return_code, kind=job.kind,
+                                                  attempt=job.attempt, queued_at=queued_at)
+            if not is_thumbnail:
+                self._post_process(project, job.outputs, telemetry_id)
+            job.state = DONE
             return
 
-        # Выводим информацию о начале рендера
-        logger.info(f"Starting render: {project.file_path}")
+        job.failure = failure or classify_failure(return_code, tail.lines())
+        logger.error(f"{label} failed for {file_path}, return code: {return_code}, failure: {job.failure}")
         if self.qt_signal:
-            self.qt_signal.emit(f"Start render: {project.file_path}")
-
-        try:
-            self._start_render(project, lambda: self._on_render_complete(projects_to_render))
-        except Exception as e:
-            logger.error(f"Error rendering project {project.file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Error rendering project: {str(e)}")
-            self._on_render_complete(projects_to_render)
-
-    def _start_render(self, project, callback: Callable) -> None:
-        """Execute the rendering process for a project."""
+            self.qt_signal.emit(f"{label} failed with code {return_code} ({job.failure})")
+        self._report_output_tail(project, tail)
+        self._record_telemetry(project, blender_executable, stats, return_code, kind=job.kind,
+                               attempt=job.attempt, failure=job.failure, queued_at=queued_at)
+
+        retry_spec = None if is_thumbnail else self._plan_retry(project, spec, stats.saved_outputs, job.failure,
+                                                                 job.attempt)
+        if retry_spec is None:
+            job.state = FAILED
+            return
+        delay = self.retry_policy.delay(job.attempt)
+        logger.warning(f"Retrying {file_path} in {delay:.1f}s "
+                       f"(attempt {job.attempt + 1} of {self.retry_policy.max_attempts})")
+        if self.qt_signal:
+            self.qt_signal.emit(f"Retrying {file_path} in {delay:.0f}s, "
+                                f"attempt {job.attempt + 1} of {self.retry_policy.max_attempts}")
+        job.retry(retry_spec, delay)
+
+    def _run_blender(self, job: RenderJob, command: List[str], started_at: float, log_job_id: str,
+                     slot: Optional[CpuSlot] = None,
+                     upload: Optional[UploadBatch] = None) -> Tuple[int, OutputStats, OutputTail]:
+        """Start Blender, stream its output to the job log, GUI and statistics, and wait for it to exit."""
+        project = job.project
         file_path = project.file_path
-        settings = project.settings
-        logger.debug(f"Preparing to render project: {file_path}")
-
-        # Проверяем существование файлов
-        if not utils.is_path_exists(file_path):
-            logger.error(f"Project file not found: {file_path}")
+        with subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,  # Line buffering
+                universal_newlines=True
+        ) as process:
+            # Версия, память, сохраненные файлы и время кадров для телеметрии
+            stats = OutputStats(started_at)
+            tail = self._new_output_tail(project.unique_name)
+
+            # Function to read output in real time
+            def read_output(pipe, label: str):
+                try:
+                    for line in iter(pipe.readline, ''):
+                        if line:
+                            output_line = f"{label}: {line.rstrip()}"
+                            log_config.log_job_output(log_job_id, output_line)
+                            tail.append(output_line)
+                            if self.qt_signal:
+                                self.qt_signal.emit(output_line)
+                            stats.feed(line)
+                            if upload:
+                                # Кадр уходит в папку вывода, пока Blender рендерит следующий
+                                saved_path = parse_saved_path(line)
+                                if saved_path:
+                                    self.uploader.submit(upload, saved_path)
+                            if job.kind != THUMBNAIL:
+                                self.progress.feed(project.unique_name, line)
+                                continue
+                            # Каждый готовый уровень превью сразу показываем в GUI
+                            tier_name = parse_tier_marker(line)
+                            if tier_name:
+                                logger.info(f"Thumbnail tier {tier_name} ready for {file_path}")
+                                if self.thumbnail_signal:
+                                    self.thumbnail_signal.emit(project.unique_name)
+                except Exception as e:
+                    logger.error(f"Error reading {label} for {file_path}: {str(e)}")
+
+            if slot:
+                apply_affinity(process.pid, slot)
+            logger.info(f"Blender process started for {job.kind}: {file_path}")
             if self.qt_signal:
-                self.qt_signal.emit(f"File {file_path} not found.")
-            callback()
-            return
-
+                self.qt_signal.emit(f"Blender starts with file: {file_path}")
+
+            # Start threads to read stdout and stderr
+            stdout_thread = threading.Thread(target=read_output, args=(process.stdout, "STDOUT"))
+            stderr_thread = threading.Thread(target=read_output, args=(process.stderr, "STDERR"))
+            stdout_thread.start()
+            stderr_thread.start()
+
+            # Wait for process to complete
+            process.wait()
+            stdout_thread.join()
+            stderr_thread.join()
+            return process.returncode, stats, tail
+
+    def _prepare_scratch(self, job: RenderJob, spec: dict) -> Tuple[Optional[UploadBatch], dict]:
+        """Return an upload batch and a copy of the spec that renders into a local scratch directory."""
+        output_path = spec["settings"].get("Output Path")
+        overridden = any("Output Path" in (variant.get("overrides") or {}) for variant in spec.get("variants") or [])
+        if not output_path or overridden:
+            # Свои папки вывода у вариантов не переносятся, такие задания пишут напрямую
+            logger.info(f"Rendering {job.project.file_path} directly to its output folder")
+            return None, spec
+        scratch_dir = os.path.join(self.scratch["directory"],
+                                   f"{job.project.unique_name}_{job.attempt}_{int(time.time())}")
+        try:
+            upload = self.uploader.start_batch(scratch_dir, resolve_output_dir(job.project.file_path, output_path))
+        except OSError as e:
+            logger.warning(f"Unable to create scratch directory {scratch_dir}, rendering to the output folder: "
+                           f"{str(e)}")
+            return None, spec
+        run_spec = copy.deepcopy(spec)
+        run_spec["settings"]["Output Path"] = scratch_dir
+        return upload, run_spec
+
+    def _stage_assets(self, job: RenderJob, spec: dict) -> Tuple[Optional[StagedFiles], dict]:
+        """Return staged local copies and a spec that opens them, or the spec unchanged when staging fails."""
+        try:
+            staged = self.asset_cache.stage(job.project.file_path)
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Unable to stage {job.project.file_path} locally, reading from storage: {str(e)}")
+            return None, spec
+        run_spec = copy.deepcopy(spec)
+        run_spec["blend_file"] = staged.blend_file
+        # Скрипт переназначает абсолютные пути библиотек и изображений на локальные копии
+        run_spec["source_blend_file"] = staged.source_blend_file
+        run_spec["asset_paths"] = staged.path_map
+        return staged, run_spec
+
+    def _preflight(self, jobs: List[RenderJob]) -> List[RenderJob]:
+        """Check queued render jobs in parallel, report every problem at once and return the jobs that passed."""
+        # Неверные объекты проектов отсеивает _execute_job, как и раньше
+        checked = [job for job in jobs if isinstance(getattr(job.project, 'file_path', None), str)
+                   and hasattr(job.project, 'unique_name') and hasattr(job.project, 'settings')]
         script_path = utils.transform_path_to_standard(
-            utils.get_config_value("work_directory") + "\\scripts\\render_script.py"
+            f"{utils.get_config_value('work_directory')}\\scripts\\{JOB_SCRIPTS[RENDER]}"
         )
-        if not utils.is_path_exists(script_path):
-            logger.error(f"Render script not found: {script_path}")
-            if self.qt_signal:
-                self.qt_signal.emit("File render_script.py not found.")
-            callback()
-            return
-
-        # Преобразуем настройки в JSON-строку
-        try:
-            settings_json = json.dumps(settings)
-        except TypeError as e:
-            logger.error(f"Failed to serialize settings for {file_path}: {str(e)}")
+        script_problem = None if utils.is_path_exists(script_path) else f"render script {script_path} not found"
+        results = run_preflight(checked, lambda job: self._preflight_job(job, script_problem))
+
+        rejected = []
+        for result in results:
+            for warning in result.warnings:
+                logger.warning(f"{result.job.project.file_path}: {warning}")
+            if result.passed:
+                continue
+            result.job.state = FAILED
+            self.progress.set_state(result.job.project.unique_name, FAILED)
+            rejected.append(result)
+        if rejected:
+            report = "\n".join(f"{result.job.project.file_path}:\n" + "\n".join(f"  - {problem}"
+                                                                              for problem in result.problems)
+                               for result in rejected)
+            logger.error(f"Pre-flight check rejected {len(rejected)} of {len(jobs)} jobs:\n{report}")
             if self.qt_signal:
-                self.qt_signal.emit(f"Error serializing settings: {str(e)}")
-            callback()
-            return
-
-        # Команда для запуска Blender
-        blender_executable = utils.get_config_value("current_bin")
+                self.qt_signal.emit(f"Pre-flight check rejected {len(rejected)} of {len(jobs)} jobs:\n{report}")
+        return [job for job in jobs if job.state != FAILED]
+
+    def _preflight_job(self, job: RenderJob, script_problem: Optional[str] = None) -> PreflightResult:
+        """Collect every problem of one render job that would make Blender fail."""
+        project = job.project
+        result = PreflightResult(job, [script_problem] if script_problem else [])
+        if not utils.is_path_exists(project.file_path):
+            result.problems.append("project file not found")
+            return result
+
+        spec = None
+        if not project.settings:
+            # Настройки не прочитаны из файла, причину уже сообщил get_settings_from_project
+            result.problems.append("project settings not available")
+        else:
+            try:
+                spec = self._build_render_spec(project)
+            except (TypeError, ValueError, AttributeError) as e:
+                result.problems.append(f"invalid settings: {str(e)}")
+        if spec:
+            try:
+                scene_info = self.scene_info.get(project.file_path)
+            except Exception as e:
+                # Сцены не прочитаны без Blender: камеру и слои проверит сам рендер
+                result.warnings.append(f"scene metadata not read, camera not checked: {str(e)}")
+                scene_info = None
+            result.problems.extend(check_render_spec(project.file_path, spec, scene_info))
+
+        blender_executable = self._select_blender_executable(project)
         if not blender_executable or not utils.is_path_exists(blender_executable):
-            logger.error(f"Blender executable not found: {blender_executable}")
-            if self.qt_signal:
-                self.qt_signal.emit("Blender executable not found.")
-            callback()
-            return
+            result.problems.append(f"Blender executable {blender_executable} not found")
 
-        command = [
-            blender_executable,
-            "--background",  # Запуск в фоновом режиме
-            "--python", "./scripts/render_script.py",  # Скрипт для выполнения
-            "--",  # Разделитель для аргументов скрипта
-            file_path,
-            settings_json,
-        ]
-        logger.debug(f"Executing command: {' '.join(command)}")
+        self._check_dependencies(project, result)
+        return result
 
+    def _check_dependencies(self, project, result: PreflightResult) -> None:
+        """Scan the project's external files, report their size and add the missing ones to the result."""
         try:
-            with subprocess.Popen(
-                    command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1,  # Line buffering
-                    universal_newlines=True
-            ) as process:
-                # Function to read output in real time
-                def read_output(pipe, label: str):
-                    try:
-                        for line in iter(pipe.readline, ''):
-                            if line:
-                                logger.debug(f"{label}: {line.strip()}")
-                                if self.qt_signal:
-                                    self.qt_signal.emit(f"{label}: {line.strip()}")
-                    except Exception as e:
-                        logger.error(f"Error reading {label} for {file_path}: {str(e)}")
-
-                logger.info(f"Blender process started for render: {file_path}")
+            report = self.dependency_scanner.scan(project.file_path)
+        except Exception as e:
+            # Файл не разобран: зависимости проверит сам Blender
+            result.warnings.append(f"dependencies not scanned: {str(e)}")
+            return
+        self.progress.set_input_size(project.unique_name, report.total_size)
+        logger.info(f"Dependencies of {project.file_path}: {report.summary()}")
+
+        missing = [f"missing {dependency.kind} {dependency.name}: {dependency.path}" for dependency in report.missing]
+        if self.dependency_scan["fail_on_missing"]:
+            result.problems.extend(missing)
+        else:
+            result.warnings.extend(missing)
+
+    def _extract_embedded_thumbnail(self, project) -> bool:
+        """Save the preview stored inside the .blend as the project thumbnail."""
+        thumbnail_path = utils.path_to_thumbnail(project.unique_name)
+        if not blend_file.extract_embedded_thumbnail(project.file_path, thumbnail_path):
+            logger.info(f"No embedded thumbnail, rendering: {project.file_path}")
+            return False
+
+        logger.info(f"Used embedded thumbnail for {project.file_path}")
+        if self.qt_signal:
+            self.qt_signal.emit(f"Embedded thumbnail used for {project.file_path}")
+        if self.thumbnail_signal:
+            self.thumbnail_signal.emit(project.unique_name)
+        return True
+
+    @staticmethod
+    def _get_preview_tiers() -> List[dict]:
+        """Return preview tiers from config, falling back to the defaults when invalid."""
+        tiers = utils.get_config_value("preview_tiers")
+        if tiers is None:
+            return DEFAULT_PREVIEW_TIERS
+        try:
+            return validate_preview_tiers(tiers)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid preview_tiers in config, using defaults: {str(e)}")
+            return DEFAULT_PREVIEW_TIERS
+
+    def _select_blender_executable(self, project) -> Optional[str]:
+        """Route the job to the pinned Blender version or the one matching the .blend header."""
+        default = utils.get_config_value("current_bin")
+        bin_paths = utils.get_config_value("bin_paths") or {}
+        if not isinstance(bin_paths, dict):
+            logger.warning(f"Invalid bin_paths in config: {type(bin_paths)}, using current_bin")
+            return default
+        # Неустановленные бинарники не участвуют в выборе
+        bin_paths = {path: label for path, label in bin_paths.items() if utils.is_path_exists(path)}
+
+        pinned = getattr(project, 'pinned_version', None)
+        if pinned:
+            blender_executable = select_binary(bin_paths, pinned=pinned)
+            if not blender_executable:
+                logger.error(f"Pinned Blender {pinned} for {project.file_path} is not installed")
                 if self.qt_signal:
-                    self.qt_signal.emit(f"Blender starts with file: {file_path}")
-
-                # Start threads to read stdout and stderr
-                stdout_thread = threading.Thread(target=read_output, args=(process.stdout, "STDOUT"))
-                stderr_thread = threading.Thread(target=read_output, args=(process.stderr, "STDERR"))
-                stdout_thread.start()
-                stderr_thread.start()
-
-                # Wait for process to complete
-                process.wait()
-                stdout_thread.join()
-                stderr_thread.join()
-
-                if process.returncode != 0:
-                    logger.error(f"Render failed for {file_path}, return code: {process.returncode}")
-                    if self.qt_signal:
-                        self.qt_signal.emit(f"Render failed with code {process.returncode}")
-                else:
-                    logger.info(f"Render completed successfully for {file_path}")
-                    if self.qt_signal:
-                        self.qt_signal.emit(f"Render completed for {file_path}")
-
-        except subprocess.SubprocessError as e:
-            logger.error(f"Subprocess error rendering project {file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Subprocess error rendering project: {str(e)}")
+                    self.qt_signal.emit(f"Pinned Blender {pinned} is not installed for {project.file_path}")
+            return blender_executable
+
+        saved_with = file_version(blend_file.read_blend_version(project.file_path))
+        blender_executable = select_binary(bin_paths, saved_with=saved_with)
+        if not blender_executable:
+            if saved_with:
+                # Файл из более новой версии, чем установленные: пробуем текущий бинарник
+                logger.warning(f"No installed Blender matches {project.file_path} "
+                               f"(saved with {format_version(saved_with)}), using {default}")
+            blender_executable = default
+        logger.info(f"Routing {project.file_path} (saved with "
+                    f"{format_version(saved_with) if saved_with else 'unknown version'}) to {blender_executable}")
+        return blender_executable
+
+    def _plan_retry(self, project, spec: dict, saved_outputs: List[str], failure: str,
+                    attempt: int) -> Optional[dict]:
+        """Return the spec for the next attempt of a failed render, or None when it is not retried."""
+        if not self.retry_policy.should_retry(failure, attempt):
+            if failure in self.retry_policy.retry_on:
+                logger.error(f"Giving up on {project.file_path} after {attempt} attempts")
+                if self.qt_signal:
+                    self.qt_signal.emit(f"Giving up on {project.file_path} after {attempt} attempts")
+            return None
+        try:
+            retry_spec = remaining_render_spec(spec, saved_outputs)
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Unable to narrow the retry of {project.file_path}, rendering all again: {str(e)}")
+            return spec
+        if retry_spec is None:
+            logger.info(f"All outputs of {project.file_path} were saved before the failure, not retrying")
+        return retry_spec
+
+    def _build_job_spec(self, job: RenderJob) -> dict:
+        """Build the spec the job's Blender script reads."""
+        if job.kind == THUMBNAIL:
+            return job_spec.build_job_spec(
+                "thumbnail", job.project.file_path, unique_name=job.project.unique_name, tiers=self._get_preview_tiers()
+            )
+        return self._build_render_spec(job.project)
+
+    @staticmethod
+    def _build_render_spec(project) -> dict:
+        """Build the render job spec with the project's settings and variants."""
+        project.settings.validate()
+        payload = {"settings": project.settings.to_dict()}
+
+        variants = getattr(project, 'variants', None)
+        if variants:
+            # Все варианты рендерятся в одном запуске Blender, файл загружается один раз
+            for variant in variants:
+                variant.validate()
+            payload["variants"] = [variant.to_dict() for variant in variants]
+
+        return job_spec.build_job_spec("render", project.file_path, **payload)
+
+    def _record_telemetry(self, project, blender_executable: str, stats: OutputStats, return_code: int,
+                          kind: str = RENDER, attempt: int = 1, failure: Optional[str] = None,
+                          queued_at: Optional[float] = None) -> Optional[int]:
+        """Store timings of a finished job; failures here never affect rendering."""
+        finished_at = time.time()
+        settings = project.settings
+        durations = self._phase_durations(project, stats, finished_at)
+        bin_paths = utils.get_config_value("bin_paths") or {}
+        try:
+            job = {
+                "project": project.unique_name,
+                "blend_file": project.file_path,
+                "kind": kind,
+                "host": platform.node(),
+                "blender_version": stats.blender_version or bin_paths.get(blender_executable),
+                "frame_count": len(stats.saved_outputs),
+                "queued_at": queued_at,
+                "started_at": stats.started_at,
+                "finished_at": finished_at,
+                "queue_wait": stats.started_at - queued_at if queued_at else None,
+                "peak_memory_mb": stats.peak_memory_mb,
+                "return_code": return_code,
+                "attempt": attempt,
+                "failure": failure,
+                **durations,
+            }
+            if settings and kind == RENDER:
+                job.update({
+                    "engine": settings.render_engine,
+                    "samples": settings.cycles_samples if settings.render_engine == "CYCLES" else settings.eevee_samples,
+                    "resolution_x": settings.resolution_x * settings.resolution_scale // 100,
+                    "resolution_y": settings.resolution_y * settings.resolution_scale // 100,
+                })
+            return self.telemetry.record_job(job, stats.frame_times)
         except Exception as e:
-            logger.error(f"Unexpected error rendering project {file_path}: {str(e)}")
-            if self.qt_signal:
-                self.qt_signal.emit(f"Unexpected error rendering project: {str(e)}")
+            logger.error(f"Failed to record telemetry for {project.file_path}: {str(e)}")
+            return None
 
-        callback()
+    def _phase_durations(self, project, stats: OutputStats, finished_at: float) -> dict:
+        """Turn the scripts' phase markers into per-phase seconds and report them."""
+        if not stats.phases:
+            # Скрипт не прислал меток (старая версия или падение до запуска): грубая оценка по выводу
+            first_output_at = stats.first_output_at or finished_at
+            return {"startup": first_output_at - stats.started_at, "render": finished_at - first_output_at}
 
-    def _on_render_complete(self, projects_to_render: List) -> None:
-        """Handle completion of a project render and proceed to the next."""
-        # Выводим информацию о завершении рендера
-        logger.info("Project render completed")
+        durations = phase_durations(stats.phases, stats.started_at, finished_at)
+        summary = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in durations.items() if seconds is not None)
+        logger.info(f"Phases for {project.file_path}: {summary}")
         if self.qt_signal:
-            self.qt_signal.emit("Render ends\n")
+            self.qt_signal.emit(f"Phases: {summary}")
+        return durations
+
+    def _post_process(self, project, outputs: List[str], telemetry_id: Optional[int] = None) -> None:
+        """Hand the files written by a render to the post-processor without waiting for it."""
+        steps = self._get_post_process_steps()
+        if not steps or not outputs:
+            return
+
+        settings = project.settings
+        fps = settings.fps / settings.fps_base if settings and settings.fps_base else 24.0
+        # Имя как у файлов рендера в render_script.py
+        name = utils.transform_path_to_standard(project.file_path).split("\\")[-1].split(".")[0]
+        try:
+            on_done = None
+            if telemetry_id is not None:
+                def on_done(seconds: float) -> None:
+                    self.telemetry.update_job(telemetry_id, post_process=seconds)
+            self.post_processor.submit(name, os.path.dirname(outputs[0]), outputs, steps, fps=fps, on_done=on_done)
+        except Exception as e:
+            logger.error(f"Failed to queue post-processing for {project.file_path}: {str(e)}")
+            if self.qt_signal:
+                self.qt_signal.emit(f"Error queuing post-processing: {str(e)}")
+
+    @staticmethod
+    def _get_post_process_steps() -> List[dict]:
+        """Return post-processing steps from config, or none when missing or invalid."""
+        steps = utils.get_config_value("post_process")
+        if steps is None:
+            return []
+        try:
+            return validate_post_process_steps(steps)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid post_process in config, skipping post-processing: {str(e)}")
+            return []
+
+    @staticmethod
+    def _get_telemetry_db_path() -> str:
+        """Return the telemetry database path from config, falling back to the default."""
+        db_path = utils.get_config_value("telemetry_db")
+        if db_path is None:
+            return DEFAULT_DB_PATH
+        if not isinstance(db_path, str) or not db_path:
+            logger.warning(f"Invalid telemetry_db in config: {db_path}, using {DEFAULT_DB_PATH}")
+            return DEFAULT_DB_PATH
+        return db_path
+
+    def _start_job_log(self, project, kind: str, started_at: float) -> str:
+        """Open the per-job file that receives the raw Blender output and return the job id."""
+        job_id = f"{project.unique_name}_{kind}_{int(started_at)}"
+        log_path = os.path.join(self._get_job_log_directory(), f"{job_id}.log.gz")
+        log_config.start_job_log(job_id, log_path)
+        logger.info(f"Blender output of {project.file_path} is written to {log_path}")
+        return job_id
+
+    def _report_output_tail(self, project, tail: OutputTail, count: int = FAILURE_TAIL_LINES) -> None:
+        """Log the last output lines of a failed job, which are no longer in the shared log."""
+        lines = tail.lines(count)
+        if not lines:
+            return
+        logger.error(f"Last {len(lines)} of {tail.total_lines} output lines for {project.file_path}:\n"
+                     + "\n".join(lines))
+
+    def _new_output_tail(self, unique_name: str) -> OutputTail:
+        """Start a fresh output tail for a project, dropping the tails of the least recently started ones."""
+        tail = OutputTail()
+        with self._output_tails_lock:
+            self.output_tails.pop(unique_name, None)
+            self.output_tails[unique_name] = tail
+            # Выполняющихся заданий не больше числа слотов, их хвосты не вытесняются
+            while len(self.output_tails) > MAX_OUTPUT_TAILS:
+                self.output_tails.popitem(last=False)
+        return tail
+
+    def shutdown(self) -> None:
+        """Let queued uploads and post-processing finish, stop prefetching and close telemetry before exit."""
+        logger.info("Shutting down BlenderManager")
+        if self.uploader:
+            self.uploader.shutdown(wait=True)
+        # Постобработка пишет время в телеметрию, поэтому база закрывается последней
+        self.post_processor.shutdown(wait=True)
+        if self.asset_cache:
+            self.asset_cache.shutdown(wait=False)
+        self.telemetry.close()
+
+    def get_output_tail(self, unique_name: str, count: Optional[int] = None) -> List[str]:
+        """Return the last output lines kept for a project's most recent job."""
+        tail = self.output_tails.get(unique_name)
+        return tail.lines(count) if tail else []
+
+    @staticmethod
+    def _get_job_log_directory() -> str:
+        """Return the directory for per-job Blender output logs from config, falling back to the default."""
+        directory = utils.get_config_value("job_log_directory")
+        if directory is None:
+            return DEFAULT_JOB_LOG_DIRECTORY
+        if not isinstance(directory, str) or not directory:
+            logger.warning(f"Invalid job_log_directory in config: {directory}, using {DEFAULT_JOB_LOG_DIRECTORY}")
+            return DEFAULT_JOB_LOG_DIRECTORY
+        return directory
+
+    @staticmethod
+    def _get_retry_policy() -> RetryPolicy:
+        """Return the retry policy from config, falling back to the defaults."""
+        retries = utils.get_config_value("render_retries")
+        if retries is None:
+            return RetryPolicy()
+        try:
+            return RetryPolicy.from_dict(retries)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid render_retries in config, using defaults: {str(e)}")
+            return RetryPolicy()
+
+    @staticmethod
+    def _get_scratch_config() -> Optional[dict]:
+        """Return the scratch rendering config, or None to render straight to the output folder."""
+        scratch = utils.get_config_value("scratch_render")
+        if scratch is None:
+            return None
+        try:
+            return validate_scratch_config(scratch)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid scratch_render in config, rendering to the output folder: {str(e)}")
+            return None
 
-        # Запускаем рендер следующего файла
-        self._render_next(projects_to_render)
+    @staticmethod
+    def _create_asset_cache() -> Optional[AssetCache]:
+        """Return the local asset cache from config, or None to read files from storage."""
+        config = utils.get_config_value("asset_cache")
+        if config is None:
+            return None
+        try:
+            config = validate_asset_cache_config(config)
+            return AssetCache(config["directory"], int(config["max_size_gb"] * 1024 ** 3), config["validate"])
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid asset_cache in config, reading files from storage: {str(e)}")
+            return None
 
-    def get_settings_from_project(self, file_path: str) -> Optional[dict]:
+    @staticmethod
+    def _get_dependency_scan_config() -> dict:
+        """Return the dependency scan config, falling back to the defaults when missing or invalid."""
+        config = utils.get_config_value("dependency_scan")
+        try:
+            return validate_dependency_scan_config(config if config is not None else {})
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid dependency_scan in config, using defaults: {str(e)}")
+            return validate_dependency_scan_config({})
+
+    @staticmethod
+    def _get_concurrent_renders() -> int:
+        """Return how many Blender renders may run at once, 1 when unset or invalid."""
+        concurrent_renders = utils.get_config_value("concurrent_renders")
+        if concurrent_renders is None:
+            return 1
+        if not isinstance(concurrent_renders, int) or isinstance(concurrent_renders, bool) or concurrent_renders < 1:
+            logger.warning(f"Invalid concurrent_renders in config: {concurrent_renders}, using 1")
+            return 1
+        return concurrent_renders
+
+    def get_settings_from_project(self, file_path: str) -> Optional[RenderSettings]:
         """Retrieve rendering settings from a Blender project file."""
         if not isinstance(file_path, str):
             logger.error(f"Invalid file path type: {type(file_path)}, expected string")
@@ -395,57 +938,55 @@ class BlenderManager(QObject):
 
         logger.info(f"Retrieving settings from project: {file_path}")
         try:
-            bpy.ops.wm.open_mainfile(filepath=file_path)
-            scene = bpy.context.scene
-
-            file_formats = []
-            enum_formats = scene.render.image_settings.bl_rna.properties['file_format'].enum_items
-            for item in enum_formats:
-                file_formats.append(item.name)
-
-            # Dict
-            settings = {
-                # Scene
-                # "Scene Name": scene.name,
-                # "Camera": scene.camera.name,
-                # "Cameras": cameras,
-
-                # Format
-                "ResolutionX": scene.render.resolution_x,
-                "ResolutionY": scene.render.resolution_y,
-                "Resolution Scale": scene.render.resolution_percentage,
-                "FPS": scene.render.fps,
-                "FPS Base": scene.render.fps_base,
-
-                # Frame range
-                "Frame Start": scene.frame_start,
-                "Frame End": scene.frame_end,
-                "Frame Step": scene.frame_step,
-                "Frame": scene.frame_current,
-
-                # TODO: Only eevee/cycles engines
-                # Engines
-                "Render Engine": scene.render.engine,
-
-                # CYCLES
-                "CYCLES Samples": scene.cycles.samples if hasattr(scene, 'cycles') else 128,
-                "Denoising": scene.cycles.use_denoising if hasattr(scene, 'cycles') else False,
-                "Device": scene.cycles.device if hasattr(scene, 'cycles') else "CPU",
-                "Threads": 0,
-
-                # EEVEE
-                "EEVEE Samples": scene.eevee.taa_render_samples if hasattr(scene, 'eevee') else 64,
-
-                # Output
-                "File Format": scene.render.image_settings.file_format,
-                "File Formats Image": file_formats[:-3],
-                "File Formats Movie": ['AVI_JPEG', 'AVI_RAW', 'FFMPEG'],  # Костыль, тк блендер для видео форматов использует другие названия
-                # "File Formats Movie": file_formats[-3:],
-                "Output Path": scene.render.filepath,
-            }
-
-            logger.info(f"Successfully retrieved settings from {file_path}")
-            return settings
+            with self._bpy_lock:
+                bpy.ops.wm.open_mainfile(filepath=file_path)
+                scene = bpy.context.scene
+
+                file_formats = []
+                enum_formats = scene.render.image_settings.bl_rna.properties['file_format'].enum_items
+                for item in enum_formats:
+                    file_formats.append(item.name)
+                # Список форматов общий для всех проектов, в настройки проекта он не копируется
+                set_image_file_formats(file_formats[:-3])
+
+                settings = RenderSettings(
+                    # Scene
+                    # scene_name=scene.name,
+                    # camera=scene.camera.name,
+
+                    # Format
+                    resolution_x=scene.render.resolution_x,
+                    resolution_y=scene.render.resolution_y,
+                    resolution_scale=scene.render.resolution_percentage,
+                    fps=scene.render.fps,
+                    fps_base=scene.render.fps_base,
+
+                    # Frame range
+                    frame_start=scene.frame_start,
+                    frame_end=scene.frame_end,
+                    frame_step=scene.frame_step,
+                    frame=scene.frame_current,
+
+                    # TODO: Only eevee/cycles engines
+                    # Engines
+                    render_engine=scene.render.engine,
+
+                    # CYCLES
+                    cycles_samples=scene.cycles.samples if hasattr(scene, 'cycles') else 128,
+                    denoising=scene.cycles.use_denoising if hasattr(scene, 'cycles') else False,
+                    device=scene.cycles.device if hasattr(scene, 'cycles') else "CPU",
+                    threads=0,
+
+                    # EEVEE
+                    eevee_samples=scene.eevee.taa_render_samples if hasattr(scene, 'eevee') else 64,
+
+                    # Output
+                    file_format=scene.render.image_settings.file_format,
+                    output_path=scene.render.filepath,
+                )
+
+                logger.info(f"Successfully retrieved settings from {file_path}")
+                return settings
 
         except Exception as e:
             logger.error(f"Error retrieving settings from {file_path}: {str(e)}")
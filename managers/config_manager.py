@@ -1,22 +1,10 @@
 import json
 import os
-import logging
-from logging.handlers import RotatingFileHandler
+
+from util.log_config import get_logger
 
 # Configure logging
-logger = logging.getLogger('ConfigManager')
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# File handler with rotation
-file_handler = RotatingFileHandler('blender_interface.log', maxBytes=1048576, backupCount=5)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Console handler
-# console_handler = logging.StreamHandler()
-# console_handler.setFormatter(formatter)
-# logger.addHandler(console_handler)
+logger = get_logger('ConfigManager')
 
 class ConfigManager:
     def __init__(self, file_path: str = "config.json"):
@@ -0,0 +1,246 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from util import utils
+from util.blend_file import BUILTIN_FONT, BlendReference, read_external_paths
+from util.log_config import get_logger
+
+try:
+    import bpy
+except ImportError:  # Без bpy доступен только разбор файла без Blender
+    bpy = None
+
+# Configure logging
+logger = get_logger('DependencyScanner')
+
+# sdna: разбор .blend без Blender; bpy: файл открывается в Blender, пути разрешает он сам
+BACKENDS = ("sdna", "bpy")
+DEFAULT_BACKEND = "sdna"
+# Вложенные библиотеки глубже этого уровня не разбираются
+MAX_LIBRARY_DEPTH = 8
+# Токены номера тайла в пути изображения UDIM и шаблон имени файла вместо них
+UDIM_TOKENS = {"<UDIM>": r"\d{4}", "<UVTILE>": r"u\d+_v\d+"}
+# Последняя группа цифр в имени файла - номер кадра последовательности
+_FRAME_NUMBER_RE = re.compile(r"\d+(?=\D*$)")
+# Коллекции bpy.data с путями к внешним файлам, виды как в util.blend_file.EXTERNAL_PATH_BLOCKS
+BPY_COLLECTIONS = {
+    "library": "libraries",
+    "image": "images",
+    "sound": "sounds",
+    "cache": "cache_files",
+    "volume": "volumes",
+    "movie_clip": "movieclips",
+    "font": "fonts",
+}
+
+
+def validate_dependency_scan_config(config) -> dict:
+    """Validate the dependency_scan config like {"backend": "sdna", "fail_on_missing": true}."""
+    if not isinstance(config, dict):
+        raise TypeError(f"Dependency scan config must be a dict, got {type(config)}")
+    unknown_keys = set(config) - {"backend", "fail_on_missing"}
+    if unknown_keys:
+        raise ValueError(f"Unknown dependency scan config keys: {sorted(unknown_keys)}")
+    backend = config.get("backend", DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown dependency scan backend: {backend}")
+    fail_on_missing = config.get("fail_on_missing", True)
+    if not isinstance(fail_on_missing, bool):
+        raise ValueError("Dependency scan fail_on_missing must be a boolean")
+    return {"backend": backend, "fail_on_missing": fail_on_missing}
+
+
+def resolve_blend_path(blend_file: str, path: str) -> str:
+    """Return the normalized absolute path of a reference, resolving '//' against the .blend folder."""
+    if path.startswith("//"):
+        path = os.path.join(os.path.dirname(blend_file), path[2:])
+    return utils.normalize_path(path)
+
+
+def expand_sequence(path: str) -> List[str]:
+    """Return the existing files of an image sequence or UDIM set, given the path of one of them or its pattern."""
+    directory, name = os.path.split(path)
+    token = next((token for token in UDIM_TOKENS if token in name), None)
+    if token:
+        prefix, suffix = name.split(token, 1)
+        pattern = re.escape(prefix) + UDIM_TOKENS[token] + re.escape(suffix)
+    else:
+        match = _FRAME_NUMBER_RE.search(name)
+        if not match:
+            return [path] if os.path.isfile(path) else []
+        pattern = re.escape(name[:match.start()]) + r"\d+" + re.escape(name[match.end():])
+    # Пути нормализованы: на Windows в нижнем регистре, имена в папке сравниваются без учета регистра
+    name_re = re.compile(pattern, re.IGNORECASE if os.path.normcase("A") == "a" else 0)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.normcase(os.path.join(directory, file_name)) for file_name in sorted(names)
+            if name_re.fullmatch(file_name)]
+
+
+def reference_files(blend_file: str, reference: BlendReference) -> List[str]:
+    """Return the files a reference of a .blend stands for; for a single file its path even when missing."""
+    path = resolve_blend_path(blend_file, reference.path)
+    if reference.sequence or any(token in path.upper() for token in UDIM_TOKENS):
+        return expand_sequence(path)
+    return [path]
+
+
+def format_size(size: Optional[int]) -> str:
+    """Format a byte count as B, KB, MB, GB or TB, '-' when unknown."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+class Dependency:
+    """One external file or file sequence a .blend needs, with what was found on disk."""
+    __slots__ = ("kind", "name", "path", "files", "size", "owner")
+
+    def __init__(self, kind: str, name: str, path: str, files: List[str], size: int, owner: str):
+        self.kind = kind
+        self.name = name
+        # Нормализованный путь; у последовательности - путь из файла (один кадр или шаблон UDIM)
+        self.path = path
+        # Найденные файлы: один файл или все кадры и тайлы
+        self.files = files
+        self.size = size
+        # Файл, который ссылается на зависимость: сам проект или его библиотека
+        self.owner = owner
+
+    @property
+    def missing(self) -> bool:
+        return not self.files
+
+    def __repr__(self) -> str:
+        return f"Dependency(kind={self.kind}, path={self.path}, files={len(self.files)}, size={self.size})"
+
+
+class DependencyReport:
+    """External dependencies of a .blend with their total size and the missing ones."""
+    __slots__ = ("blend_file", "backend", "dependencies")
+
+    def __init__(self, blend_file: str, backend: str, dependencies: List[Dependency]):
+        self.blend_file = blend_file
+        self.backend = backend
+        self.dependencies = dependencies
+
+    @property
+    def total_size(self) -> int:
+        return sum(dependency.size for dependency in self.dependencies)
+
+    @property
+    def missing(self) -> List[Dependency]:
+        return [dependency for dependency in self.dependencies if dependency.missing]
+
+    def summary(self) -> str:
+        files = sum(len(dependency.files) for dependency in self.dependencies)
+        missing = self.missing
+        return (f"{files} files, {format_size(self.total_size)}"
+                + (f", {len(missing)} missing" if missing else ""))
+
+    def __repr__(self) -> str:
+        return f"DependencyReport(blend_file={self.blend_file}, dependencies={len(self.dependencies)})"
+
+
+class DependencyScanner:
+    """Lists the external files of .blend files; parsed references are cached per file until it changes."""
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, bpy_lock: Optional[threading.Lock] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == "bpy" and bpy is None:
+            raise ValueError("The bpy backend requires the bpy module")
+        self.backend = backend
+        # bpy не потокобезопасен: блокировка общая с остальными открытиями файлов в процессе
+        self._bpy_lock = bpy_lock or threading.Lock()
+        # Нормализованный путь -> (размер, mtime, ссылки с путями, разрешенными от этого файла)
+        self._cache: Dict[str, Tuple[int, float, List[Tuple[BlendReference, List[str]]]]] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, blend_file: str) -> DependencyReport:
+        """Return the dependencies of a .blend and of its linked libraries; sizes are read from disk each time."""
+        source = utils.normalize_path(blend_file)
+        read = self._read_with_bpy if self.backend == "bpy" else self._read_with_sdna
+        dependencies = {}
+        # Библиотеки разбираются итеративно, у каждой свой кэш; bpy сразу отдает пути всех библиотек
+        pending = [(source, 0)]
+        visited = set()
+        while pending:
+            owner, depth = pending.pop()
+            if owner in visited:
+                continue
+            visited.add(owner)
+            for reference, files in read(owner):
+                key = files[0] if files and not reference.sequence else resolve_blend_path(owner, reference.path)
+                if key in dependencies:
+                    continue
+                sizes = [self._file_size(path) for path in files]
+                found = [path for path, size in zip(files, sizes) if size is not None]
+                dependencies[key] = Dependency(reference.kind, reference.name, key, found,
+                                               sum(size for size in sizes if size is not None), owner)
+                if reference.kind == "library" and found and self.backend == "sdna" and depth < MAX_LIBRARY_DEPTH:
+                    pending.append((found[0], depth + 1))
+
+        report = DependencyReport(blend_file, self.backend, list(dependencies.values()))
+        logger.debug(f"Scanned dependencies of {blend_file}: {report.summary()}")
+        return report
+
+    @staticmethod
+    def _file_size(path: str) -> Optional[int]:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return None
+
+    def _cached(self, source: str, read) -> List[Tuple[BlendReference, List[str]]]:
+        stat = os.stat(source)
+        with self._lock:
+            cached = self._cache.get(source)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime):
+            return cached[2]
+        references = read(source)
+        with self._lock:
+            self._cache[source] = (stat.st_size, stat.st_mtime, references)
+        return references
+
+    def _read_with_sdna(self, source: str) -> List[Tuple[BlendReference, List[str]]]:
+        return self._cached(source, lambda path: [(reference, reference_files(path, reference))
+                                                  for reference in read_external_paths(path)])
+
+    def _read_with_bpy(self, source: str) -> List[Tuple[BlendReference, List[str]]]:
+        return self._cached(source, self._open_with_bpy)
+
+    def _open_with_bpy(self, source: str) -> List[Tuple[BlendReference, List[str]]]:
+        references = []
+        with self._bpy_lock:
+            bpy.ops.wm.open_mainfile(filepath=source, load_ui=False)
+            for kind, collection in BPY_COLLECTIONS.items():
+                for datablock in getattr(bpy.data, collection):
+                    if not datablock.filepath or getattr(datablock, "packed_file", None):
+                        continue
+                    source_type = getattr(datablock, "source", None)
+                    if source_type in ("GENERATED", "VIEWER") or datablock.filepath == BUILTIN_FONT:
+                        continue
+                    sequence = source_type in ("SEQUENCE", "TILED") or bool(getattr(datablock, "is_sequence", False))
+                    # Пути внутри связанных библиотек считаются от файла библиотеки
+                    path = bpy.path.abspath(datablock.filepath, library=getattr(datablock, "library", None))
+                    reference = BlendReference(kind, datablock.name, path, sequence)
+                    references.append((reference, reference_files(source, reference)))
+        return references
+
+    def invalidate(self, blend_file: Optional[str] = None) -> None:
+        """Forget the cached references of one file, or of all files."""
+        with self._lock:
+            if blend_file is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(utils.normalize_path(blend_file), None)
@@ -0,0 +1,192 @@
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from managers.resource_allocator import CpuSlot, ResourceAllocator
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('JobEngine')
+
+# Виды заданий
+RENDER = "render"
+THUMBNAIL = "thumbnail"
+JOB_KINDS = (RENDER, THUMBNAIL)
+
+# Состояния задания
+QUEUED = "queued"
+RUNNING = "running"
+RETRY_WAIT = "retry_wait"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+FINAL_STATES = (DONE, FAILED, SKIPPED)
+
+
+class RenderJob:
+    """One Blender job for a project, moving from queued through running to a final state."""
+    __slots__ = ("project", "kind", "force_render", "state", "attempt", "spec", "outputs",
+                 "queued_at", "not_before", "return_code", "failure")
+
+    def __init__(self, project, kind: str = RENDER, force_render: bool = False):
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self.project = project
+        self.kind = kind
+        # Для миниатюр: пропустить встроенное превью и запустить Blender
+        self.force_render = force_render
+        self.state = QUEUED
+        self.attempt = 1
+        # Спецификация повторной попытки, суженная до несделанной работы; None - собрать заново
+        self.spec = None
+        # Файлы, сохраненные всеми попытками
+        self.outputs: List[str] = []
+        self.queued_at = time.time()
+        # Раньше этого момента (time.monotonic) задание не запускается
+        self.not_before = 0.0
+        self.return_code = None
+        self.failure = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINAL_STATES
+
+    def retry(self, spec: Optional[dict], delay: float) -> None:
+        """Send the job back to the queue for its next attempt after delay seconds."""
+        self.attempt += 1
+        self.spec = spec
+        self.not_before = time.monotonic() + delay
+        self.state = RETRY_WAIT
+
+    def __repr__(self) -> str:
+        name = getattr(self.project, 'unique_name', self.project)
+        return f"RenderJob(project={name}, kind={self.kind}, state={self.state}, attempt={self.attempt})"
+
+
+class JobEngine:
+    """Runs a batch of jobs in worker loops, one per lane, instead of chained completion callbacks."""
+
+    def __init__(self, execute: Callable[[RenderJob, Optional[CpuSlot]], None], jobs: Iterable[RenderJob] = (),
+                 lanes: int = 1, allocator: Optional[ResourceAllocator] = None,
+                 on_finished: Optional[Callable[["JobEngine"], None]] = None,
+                 prepare: Optional[Callable[[List[RenderJob]], List[RenderJob]]] = None):
+        if not callable(execute):
+            raise TypeError(f"Execute must be callable, got {type(execute)}")
+        if not isinstance(lanes, int) or lanes < 1:
+            raise ValueError("Lanes must be a positive integer")
+        self.execute = execute
+        self.jobs = list(jobs)
+        self.lanes = lanes
+        self.allocator = allocator
+        self.on_finished = on_finished
+        # Подготовка очереди (проверки, чтение файлов) идет в фоне и возвращает задания, которые можно запускать
+        self.prepare = prepare
+        self._queue = list(self.jobs)
+        self._condition = threading.Condition()
+        self._active_lanes = 0
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, job: RenderJob) -> None:
+        """Add a job to the batch; running lanes pick it up."""
+        with self._condition:
+            self.jobs.append(job)
+            self._queue.append(job)
+            self._condition.notify()
+
+    def start(self) -> List[threading.Thread]:
+        """Start the lane threads, or the prepare thread that starts them, and return immediately."""
+        if self.prepare is None:
+            return self._start_lanes()
+        thread = threading.Thread(target=self._prepare_and_start, name="job_prepare")
+        self._threads.append(thread)
+        thread.start()
+        return [thread]
+
+    def _prepare_and_start(self) -> None:
+        with self._condition:
+            queued = list(self._queue)
+        try:
+            ready = {id(job) for job in self.prepare(queued)}
+            checked = {id(job) for job in queued}
+            with self._condition:
+                # Задания, добавленные через submit во время подготовки, остаются в очереди
+                self._queue = [job for job in self._queue if id(job) in ready or id(job) not in checked]
+        except Exception as e:
+            logger.error(f"Preparing {len(queued)} jobs failed, starting them unchecked: {str(e)}")
+        self._start_lanes()
+
+    def _start_lanes(self) -> List[threading.Thread]:
+        # Потоков не больше, чем заданий
+        lanes = max(1, min(self.lanes, len(self._queue)))
+        with self._condition:
+            self._active_lanes += lanes
+        for index in range(lanes):
+            thread = threading.Thread(target=self.run_lane, name=f"job_lane_{index}")
+            self._threads.append(thread)
+            thread.start()
+        logger.debug(f"Started {lanes} lanes for {len(self._queue)} jobs")
+        return self._threads[-lanes:]
+
+    def run_lane(self) -> None:
+        """Take jobs from the queue one after another until it is empty."""
+        slot = self.allocator.acquire() if self.allocator else None
+        logger.debug(f"Job lane started on {slot}")
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                self._run(job, slot)
+        finally:
+            if slot is not None:
+                self.allocator.release(slot)
+            if self._finish_lane() and self.on_finished:
+                self.on_finished(self)
+
+    def _run(self, job: RenderJob, slot: Optional[CpuSlot]) -> None:
+        job.state = RUNNING
+        try:
+            self.execute(job, slot)
+        except Exception as e:
+            logger.error(f"Job {job} failed with an unexpected error: {str(e)}")
+            job.state = FAILED
+        if job.state == RUNNING:
+            job.state = DONE
+        if job.state == RETRY_WAIT:
+            # Ожидание повтора не занимает поток: пока пауза, лейн берет другие задания
+            with self._condition:
+                self._queue.append(job)
+                self._condition.notify()
+
+    def _next_job(self) -> Optional[RenderJob]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                for index, job in enumerate(self._queue):
+                    if job.not_before <= now:
+                        return self._queue.pop(index)
+                if not self._queue:
+                    return None
+                self._condition.wait(min(job.not_before for job in self._queue) - now)
+
+    def _finish_lane(self) -> bool:
+        with self._condition:
+            self._active_lanes -= 1
+            return self._active_lanes <= 0
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        with self._condition:
+            counts = {}
+            for job in self.jobs:
+                counts[job.state] = counts.get(job.state, 0) + 1
+            return counts
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the lane threads have finished."""
+        # Поток подготовки добавляет потоки лейнов в список, пока его ждут
+        index = 0
+        while index < len(self._threads):
+            self._threads[index].join(timeout)
+            index += 1
@@ -0,0 +1,258 @@
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from managers.job_engine import QUEUED, RUNNING, DONE, FAILED, FINAL_STATES
+from util.blender_output import parse_progress, parse_saved_path, parse_samples
+from util.phase_markers import parse_phase_marker
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('JobProgress')
+
+
+def count_frames(spec: dict) -> int:
+    """Return how many images a render spec produces: one per still variant, the frame range per animation."""
+    total = 0
+    # Без вариантов рендерится один кадр, как в render_script.py
+    for variant in spec.get("variants") or [{"name": ""}]:
+        if not variant.get("animation"):
+            total += 1
+            continue
+        settings = {**spec["settings"], **(variant.get("overrides") or {})}
+        total += len(range(settings["Frame Start"], settings["Frame End"] + 1, settings["Frame Step"]))
+    return total
+
+
+class JobProgress:
+    """Progress of one render job as parsed from its Blender output."""
+    __slots__ = ("key", "name", "state", "frames_done", "frames_total", "frame", "samples_done", "samples_total",
+                 "started_at", "finished_at", "frame_seconds", "input_bytes", "version")
+
+    def __init__(self, key: str, name: str, frames_total: Optional[int] = None,
+                 frame_seconds: Optional[float] = None):
+        self.key = key
+        self.name = name
+        self.state = QUEUED
+        self.frames_done = 0
+        self.frames_total = frames_total
+        self.frame = None
+        self.samples_done = 0
+        self.samples_total = 0
+        self.started_at = None
+        self.finished_at = None
+        # Среднее время кадра проекта из телеметрии, пока нет своих готовых кадров
+        self.frame_seconds = frame_seconds
+        # Объем внешних файлов задания, известен после сканирования зависимостей
+        self.input_bytes = None
+        self.version = 0
+
+    def copy(self) -> "JobProgress":
+        job = JobProgress.__new__(JobProgress)
+        for name in self.__slots__:
+            setattr(job, name, getattr(self, name))
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINAL_STATES
+
+    def _frames_progress(self) -> float:
+        # Готовые кадры плюс доля сэмплов текущего
+        partial = self.samples_done / self.samples_total if self.samples_total and self.state == RUNNING else 0.0
+        return self.frames_done + min(partial, 1.0)
+
+    def fraction(self) -> Optional[float]:
+        """Return the completed share of the job from 0 to 1, or None when the frame count is unknown."""
+        if self.state == DONE:
+            return 1.0
+        if not self.frames_total:
+            return None
+        return min(1.0, self._frames_progress() / self.frames_total)
+
+    def elapsed(self, now: Optional[float] = None) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or (now if now is not None else time.time())) - self.started_at
+
+    def frames_per_minute(self, now: Optional[float] = None) -> Optional[float]:
+        elapsed = self.elapsed(now)
+        if not self.frames_done or elapsed <= 0:
+            return None
+        return self.frames_done * 60.0 / elapsed
+
+    def remaining_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """Estimate the seconds left: from this job's own pace once it has progress, else from history."""
+        if self.finished:
+            return 0.0
+        if self.frames_total is None:
+            return None
+        progress = self._frames_progress()
+        remaining = max(0.0, self.frames_total - progress)
+        elapsed = self.elapsed(now)
+        if self.frames_done and elapsed > 0:
+            return remaining * elapsed / progress
+        if self.frame_seconds:
+            return remaining * self.frame_seconds
+        return None
+
+    def __repr__(self) -> str:
+        return f"JobProgress(key={self.key}, state={self.state}, frames={self.frames_done}/{self.frames_total})"
+
+
+class ProgressTracker:
+    """Thread-safe progress of the queued and running render jobs, read by the GUI as versioned snapshots."""
+
+    def __init__(self):
+        self._jobs: Dict[str, JobProgress] = {}
+        # Растет при каждом изменении; GUI забирает только задания, изменившиеся с прошлого опроса
+        self._version = 0
+        # Номер пачки рендера: таблица в GUI перестраивается, когда задания прошлых пачек удалены
+        self._batch = 0
+        self._frame_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def set_history(self, frame_seconds: Dict[str, float]) -> None:
+        """Set the historical seconds per frame of each project, used before a job has finished frames."""
+        if not isinstance(frame_seconds, dict):
+            raise TypeError(f"Frame seconds must be a dict, got {type(frame_seconds)}")
+        with self._lock:
+            self._frame_seconds = dict(frame_seconds)
+        logger.debug(f"Loaded frame times of {len(frame_seconds)} projects")
+
+    def _history(self, key: str) -> Optional[float]:
+        if key in self._frame_seconds:
+            return self._frame_seconds[key]
+        # Проект без истории: среднее по всем проектам лучше, чем никакой оценки
+        if self._frame_seconds:
+            return sum(self._frame_seconds.values()) / len(self._frame_seconds)
+        return None
+
+    def _touch(self, job: JobProgress) -> None:
+        self._version += 1
+        job.version = self._version
+
+    @property
+    def batch(self) -> int:
+        with self._lock:
+            return self._batch
+
+    def start_batch(self) -> None:
+        """Drop the finished jobs of earlier batches so the table and the summary cover only the new batch."""
+        with self._lock:
+            # Незавершенные задания остаются: предыдущая пачка может еще рендериться
+            finished = [key for key, job in self._jobs.items() if job.finished]
+            for key in finished:
+                del self._jobs[key]
+            self._batch += 1
+            self._version += 1
+        logger.debug(f"Started progress batch, dropped {len(finished)} finished jobs")
+
+    def add(self, key: str, name: str, frames_total: Optional[int] = None) -> None:
+        """Queue a job; a job with the same key from an earlier batch is replaced."""
+        with self._lock:
+            job = self._jobs[key] = JobProgress(key, name, frames_total, self._history(key))
+            self._touch(job)
+
+    def start(self, key: str, frames_total: Optional[int] = None) -> None:
+        """Mark a job as running; frames saved by earlier attempts stay counted."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            job.state = RUNNING
+            if frames_total is not None:
+                job.frames_total = frames_total
+            if job.started_at is None:
+                job.started_at = time.time()
+            self._touch(job)
+
+    def set_input_size(self, key: str, size: int) -> None:
+        """Set the total size of the external files a job reads."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.input_bytes == size:
+                return
+            job.input_bytes = size
+            self._touch(job)
+
+    def feed(self, key: str, line: str) -> None:
+        """Update a running job from one line of its Blender output."""
+        # Разбор строки без блокировки, под блокировкой только запись
+        saved = parse_saved_path(line) is not None
+        samples = None if saved else parse_samples(line)
+        frame = None
+        if not saved:
+            progress = parse_progress(line)
+            if progress:
+                frame = progress[0]
+            else:
+                marker = parse_phase_marker(line)
+                if marker and marker[0] == "frame_start":
+                    frame = marker[2]
+        if not saved and samples is None and frame is None:
+            return
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            if saved:
+                job.frames_done += 1
+                job.samples_done = 0
+            if samples:
+                job.samples_done, job.samples_total = samples
+            if frame is not None:
+                job.frame = frame
+            self._touch(job)
+
+    def set_state(self, key: str, state: str) -> None:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.state == state:
+                return
+            job.state = state
+            if state in FINAL_STATES:
+                job.finished_at = time.time()
+            self._touch(job)
+
+    def is_active(self, key: str) -> bool:
+        """Return whether a job is queued, running or waiting for a retry."""
+        with self._lock:
+            job = self._jobs.get(key)
+            return job is not None and not job.finished
+
+    def changes(self, since: int = 0) -> Tuple[int, List[JobProgress]]:
+        """Return the current version and copies of the jobs changed after the given version."""
+        with self._lock:
+            return self._version, [job.copy() for job in self._jobs.values() if job.version > since]
+
+    def summary(self, lanes: int = 1, now: Optional[float] = None) -> dict:
+        """Aggregate progress of all tracked jobs with the estimated seconds until the batch is done."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            jobs = list(self._jobs.values())
+            frames_done = sum(job.frames_done for job in jobs)
+            frames_total = sum(job.frames_total if job.frames_total is not None else job.frames_done for job in jobs)
+            active = [job for job in jobs if not job.finished]
+            estimates = [job.remaining_seconds(now) for job in active]
+
+        known = [seconds for seconds in estimates if seconds is not None]
+        eta = None
+        if not active:
+            eta = 0.0
+        elif known:
+            # Работа делится между потоками, но пачка не закончится раньше самого долгого задания
+            eta = max(sum(known) / max(1, min(lanes, len(active))), max(known))
+        return {
+            "jobs": len(jobs),
+            "finished": len(jobs) - len(active),
+            "failed": sum(job.state == FAILED for job in jobs),
+            "frames_done": frames_done,
+            "frames_total": frames_total,
+            "input_bytes": sum(job.input_bytes for job in jobs if job.input_bytes is not None),
+            "fraction": frames_done / frames_total if frames_total else None,
+            "eta": eta,
+            # Заданий без оценки: ETA пачки занижен на их время
+            "unestimated": len(estimates) - len(known),
+        }
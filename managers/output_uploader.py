@@ -0,0 +1,177 @@
+import os
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait as wait_for_futures
+from typing import Dict, List, Optional
+
+from util import utils
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('OutputUploader')
+
+DEFAULT_MAX_UPLOADS = 2
+# Проверка копии: размер быстрый, хеш читает файл с сетевого диска еще раз
+VERIFY_MODES = ("none", "size", "hash")
+DEFAULT_VERIFY = "size"
+# Повторы копирования при временных ошибках сетевого хранилища
+UPLOAD_ATTEMPTS = 3
+UPLOAD_RETRY_DELAY = 1.0
+# Сколько секунд после выхода Blender ждать оставшиеся копирования; зависшая сетевая папка не держит слот вечно
+DEFAULT_UPLOAD_TIMEOUT = 600
+# Файл получает окончательное имя только после проверки, недокопированный кадр не выглядит готовым
+PARTIAL_SUFFIX = ".part"
+
+
+def validate_scratch_config(config) -> dict:
+    """Validate the scratch_render config like {"directory": "D:\\scratch", "uploads": 2, "upload_timeout": 600}."""
+    if not isinstance(config, dict):
+        raise TypeError(f"Scratch config must be a dict, got {type(config)}")
+    unknown_keys = set(config) - {"directory", "uploads", "verify", "upload_timeout"}
+    if unknown_keys:
+        raise ValueError(f"Unknown scratch config keys: {sorted(unknown_keys)}")
+    directory = config.get("directory")
+    if not isinstance(directory, str) or not directory:
+        raise ValueError("Scratch directory must be a non-empty string")
+    uploads = config.get("uploads", DEFAULT_MAX_UPLOADS)
+    if not isinstance(uploads, int) or isinstance(uploads, bool) or uploads < 1:
+        raise ValueError("Scratch uploads must be a positive integer")
+    verify = config.get("verify", DEFAULT_VERIFY)
+    if verify not in VERIFY_MODES:
+        raise ValueError(f"Unknown scratch verify mode: {verify}")
+    upload_timeout = config.get("upload_timeout", DEFAULT_UPLOAD_TIMEOUT)
+    if not isinstance(upload_timeout, (int, float)) or isinstance(upload_timeout, bool) or upload_timeout <= 0:
+        raise ValueError("Scratch upload_timeout must be a positive number")
+    return {"directory": directory, "uploads": uploads, "verify": verify, "upload_timeout": upload_timeout}
+
+
+def resolve_output_dir(blend_file: str, output_path: str) -> str:
+    """Return the output directory with Blender's '//' prefix resolved against the .blend folder."""
+    if output_path.startswith("//"):
+        return os.path.join(os.path.dirname(blend_file), output_path[2:])
+    return output_path
+
+
+def upload_file(source: str, destination: str, verify: str = DEFAULT_VERIFY) -> str:
+    """Copy a file to its destination under a temporary name, verify it, rename it and delete the source."""
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    partial = destination + PARTIAL_SUFFIX
+    try:
+        shutil.copyfile(source, partial)
+        if verify in ("size", "hash") and os.path.getsize(partial) != os.path.getsize(source):
+            raise OSError(f"Size mismatch after copying {source}")
+        if verify == "hash" and utils.file_content_hash(partial) != utils.file_content_hash(source):
+            raise OSError(f"Checksum mismatch after copying {source}")
+        os.replace(partial, destination)
+    except Exception:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.remove(source)
+    return destination
+
+
+class UploadBatch:
+    """Files of one render attempt moving from a local scratch directory to the final output directory."""
+    __slots__ = ("scratch_dir", "destination", "uploaded", "failed", "_futures", "_lock")
+
+    def __init__(self, scratch_dir: str, destination: str):
+        self.scratch_dir = scratch_dir
+        self.destination = destination
+        # Локальный путь -> путь в папке вывода
+        self.uploaded: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def destination_of(self, source: str) -> str:
+        """Return where a file from the scratch directory ends up."""
+        return os.path.join(self.destination, os.path.relpath(source, self.scratch_dir))
+
+    def __repr__(self) -> str:
+        return (f"UploadBatch(scratch_dir={self.scratch_dir}, destination={self.destination}, "
+                f"uploaded={len(self.uploaded)}, failed={len(self.failed)})")
+
+
+class OutputUploader:
+    """Moves rendered files from local scratch to shared storage on a bounded pool while Blender keeps rendering."""
+
+    def __init__(self, qt_signal=None, max_workers: int = DEFAULT_MAX_UPLOADS, verify: str = DEFAULT_VERIFY,
+                 upload_timeout: float = DEFAULT_UPLOAD_TIMEOUT):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        if verify not in VERIFY_MODES:
+            raise ValueError(f"Unknown verify mode: {verify}")
+        if not isinstance(upload_timeout, (int, float)) or upload_timeout <= 0:
+            raise ValueError("upload_timeout must be a positive number")
+        self.qt_signal = qt_signal
+        self.max_workers = max_workers
+        self.verify = verify
+        self.upload_timeout = upload_timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def start_batch(self, scratch_dir: str, destination: str) -> UploadBatch:
+        """Create the scratch directory of a render attempt."""
+        os.makedirs(scratch_dir, exist_ok=True)
+        logger.info(f"Rendering to scratch {scratch_dir}, uploading to {destination}")
+        return UploadBatch(scratch_dir, destination)
+
+    def submit(self, batch: UploadBatch, source: str) -> Future:
+        """Queue a saved file for upload and return immediately."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upload")
+            future = self._executor.submit(self._upload, batch, source)
+        with batch._lock:
+            batch._futures.append(future)
+        return future
+
+    def _upload(self, batch: UploadBatch, source: str) -> None:
+        destination = batch.destination_of(source)
+        for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+            try:
+                upload_file(source, destination, self.verify)
+                break
+            except OSError as e:
+                if attempt == UPLOAD_ATTEMPTS:
+                    logger.error(f"Failed to upload {source} to {destination}: {str(e)}")
+                    with batch._lock:
+                        batch.failed[source] = str(e)
+                    return
+                logger.warning(f"Upload of {source} failed (attempt {attempt}), retrying: {str(e)}")
+                time.sleep(UPLOAD_RETRY_DELAY * attempt)
+        with batch._lock:
+            batch.uploaded[source] = destination
+        logger.debug(f"Uploaded {source} to {destination}")
+
+    def finish(self, batch: UploadBatch, timeout: Optional[float] = None) -> Dict[str, str]:
+        """Wait for the batch's uploads up to a timeout, remove the scratch directory and return the uploaded files."""
+        with batch._lock:
+            futures = list(batch._futures)
+        wait_for_futures(futures, timeout if timeout is not None else self.upload_timeout)
+        with batch._lock:
+            uploaded = dict(batch.uploaded)
+            failed = dict(batch.failed)
+        pending = sum(1 for future in futures if not future.done())
+
+        if failed or pending:
+            # Неперенесенные кадры остаются на локальном диске, их можно забрать вручную
+            logger.error(f"{len(failed) + pending} files were not uploaded to {batch.destination}, "
+                         f"kept in {batch.scratch_dir}")
+            if self.qt_signal:
+                self.qt_signal.emit(f"{len(failed) + pending} files were not uploaded to {batch.destination}, "
+                                    f"kept in {batch.scratch_dir}")
+        else:
+            shutil.rmtree(batch.scratch_dir, ignore_errors=True)
+        logger.info(f"Uploaded {len(uploaded)} files to {batch.destination}")
+        return uploaded
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the upload pool, optionally waiting for queued uploads."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+        logger.info("Output uploader shut down")
@@ -0,0 +1,285 @@
+import os
+import re
+import time
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QColor
+
+from util import utils
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('PostProcessor')
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+# Кадр анимации: префикс, номер кадра и расширение, например shot_0001.png
+_FRAME_RE = re.compile(r"^(?P<prefix>.*?)(?P<number>\d+)(?P<ext>\.[^.]+)$")
+
+DEFAULT_MAX_WORKERS = 2
+
+
+class PostProcessContext:
+    """Job data shared by the steps of one post-processing run."""
+    __slots__ = ("name", "output_dir", "fps", "outputs", "files")
+
+    def __init__(self, name: str, output_dir: str, fps: float, outputs: List[str]):
+        self.name = name
+        self.output_dir = output_dir
+        self.fps = fps
+        # Кадры, записанные Blender; шаги обработки работают с ними
+        self.outputs = list(outputs)
+        # Кадры плюс файлы, созданные предыдущими шагами (видео, листы, манифест)
+        self.files = list(outputs)
+
+
+def _image_files(files: List[str]) -> List[str]:
+    return [path for path in files if path.lower().endswith(IMAGE_EXTENSIONS)]
+
+
+def find_sequences(files: List[str]) -> Dict[tuple, List[str]]:
+    """Group numbered frame files into sequences keyed by (prefix, extension, padding)."""
+    sequences = {}
+    for path in sorted(_image_files(files)):
+        match = _FRAME_RE.match(path)
+        if not match:
+            continue
+        key = (match.group("prefix"), match.group("ext"), len(match.group("number")))
+        sequences.setdefault(key, []).append(path)
+    # Один кадр не последовательность
+    return {key: frames for key, frames in sequences.items() if len(frames) > 1}
+
+
+def encode_video(context: PostProcessContext, options: dict) -> List[str]:
+    """Encode every image sequence of the job into a video with ffmpeg."""
+    ffmpeg = options.get("ffmpeg") or utils.get_config_value("ffmpeg_path") or shutil.which("ffmpeg")
+    if not ffmpeg:
+        logger.warning("ffmpeg not found, skipping video encoding")
+        return []
+
+    container = options.get("container", "mp4")
+    produced = []
+    for (prefix, ext, padding), frames in find_sequences(context.outputs).items():
+        start_number = int(_FRAME_RE.match(frames[0]).group("number"))
+        video_path = f"{prefix.rstrip('_-. ')}.{container}"
+        command = [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-framerate", f"{context.fps:g}",
+            "-start_number", str(start_number),
+            "-i", f"{prefix}%0{padding}d{ext}",
+            "-c:v", options.get("codec", "libx264"),
+            "-pix_fmt", options.get("pix_fmt", "yuv420p"),
+            "-crf", str(options.get("crf", 18)),
+            video_path,
+        ]
+        logger.debug(f"Executing command: {' '.join(command)}")
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed for {prefix}: {result.stderr.strip()}")
+        logger.info(f"Encoded {len(frames)} frames to {video_path}")
+        produced.append(video_path)
+    return produced
+
+
+def contact_sheet(context: PostProcessContext, options: dict) -> List[str]:
+    """Tile downscaled copies of the job's images into a single contact sheet."""
+    images = _image_files(context.outputs)
+    if not images:
+        return []
+
+    columns = max(1, min(int(options.get("columns", 4)), len(images)))
+    tile_width = int(options.get("tile_width", 320))
+    spacing = int(options.get("spacing", 4))
+
+    tiles = []
+    for path in images:
+        reader = QImageReader(path)
+        size = reader.size()
+        if size.isValid() and size.width() > tile_width:
+            # Масштабирование при декодировании, полный кадр в память не попадает
+            reader.setScaledSize(QSize(tile_width, max(1, size.height() * tile_width // size.width())))
+        image = reader.read()
+        if image.isNull():
+            logger.warning(f"Unable to read {path} for contact sheet: {reader.errorString()}")
+            continue
+        tiles.append(image)
+    if not tiles:
+        return []
+
+    rows = (len(tiles) + columns - 1) // columns
+    tile_height = max(tile.height() for tile in tiles)
+    sheet = QImage(columns * (tile_width + spacing) + spacing, rows * (tile_height + spacing) + spacing,
+                   QImage.Format_RGB32)
+    sheet.fill(QColor(options.get("background", "#202020")))
+
+    painter = QPainter(sheet)
+    try:
+        for index, tile in enumerate(tiles):
+            row, column = divmod(index, columns)
+            painter.drawImage(spacing + column * (tile_width + spacing), spacing + row * (tile_height + spacing),
+                              tile)
+    finally:
+        painter.end()
+
+    sheet_path = os.path.join(context.output_dir, f"{context.name}_contact_sheet.png")
+    if not sheet.save(sheet_path):
+        raise RuntimeError(f"Unable to save contact sheet {sheet_path}")
+    logger.info(f"Saved contact sheet with {len(tiles)} images to {sheet_path}")
+    return [sheet_path]
+
+
+def convert_format(context: PostProcessContext, options: dict) -> List[str]:
+    """Save copies of the job's images in another format, e.g. {"format": "jpg", "quality": 90}."""
+    target_format = options.get("format")
+    if not target_format:
+        raise ValueError("convert_format requires a target format")
+    target_ext = "." + target_format.lower().lstrip(".")
+    quality = int(options.get("quality", -1))
+
+    keep_original = options.get("keep_original", True)
+    produced = []
+    for path in _image_files(context.outputs):
+        if path.lower().endswith(target_ext):
+            continue
+        image = QImage(path)
+        if image.isNull():
+            logger.warning(f"Unable to read {path} for conversion")
+            continue
+        converted_path = os.path.splitext(path)[0] + target_ext
+        if not image.save(converted_path, None, quality):
+            raise RuntimeError(f"Unable to save {converted_path}")
+        produced.append(converted_path)
+        if not keep_original:
+            # Следующие шаги работают уже с новым форматом
+            os.remove(path)
+            context.outputs[context.outputs.index(path)] = converted_path
+            context.files.remove(path)
+
+    logger.info(f"Converted {len(produced)} images to {target_format}")
+    return produced
+
+
+def checksum_manifest(context: PostProcessContext, options: dict) -> List[str]:
+    """Write a sha256sum-compatible manifest for all files of the job."""
+    algorithm = options.get("algorithm", "sha256")
+    manifest_path = os.path.join(context.output_dir, f"{context.name}.{algorithm}")
+
+    lines = []
+    for path in sorted(set(context.files)):
+        if not os.path.isfile(path):
+            continue
+        digest = utils.file_content_hash(path, algorithm=algorithm)
+        lines.append(f"{digest}  {os.path.relpath(path, context.output_dir)}")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    logger.info(f"Wrote {algorithm} manifest for {len(lines)} files to {manifest_path}")
+    return [manifest_path]
+
+
+STEPS: Dict[str, Callable[[PostProcessContext, dict], List[str]]] = {
+    "encode_video": encode_video,
+    "contact_sheet": contact_sheet,
+    "convert_format": convert_format,
+    "checksum_manifest": checksum_manifest,
+}
+
+
+def validate_post_process_steps(steps) -> List[dict]:
+    """Validate configured post-processing steps like [{"step": "checksum_manifest"}]."""
+    if not isinstance(steps, list):
+        raise TypeError(f"Post-process steps must be a list, got {type(steps)}")
+    for step in steps:
+        if not isinstance(step, dict):
+            raise TypeError(f"Post-process step must be a dict, got {type(step)}")
+        if step.get("step") not in STEPS:
+            raise ValueError(f"Unknown post-process step: {step.get('step')}")
+    return steps
+
+
+class PostProcessor:
+    """Runs post-render steps on a worker pool so they overlap with the next render."""
+
+    def __init__(self, qt_signal=None, max_workers: int = DEFAULT_MAX_WORKERS):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        self.qt_signal = qt_signal
+        self.max_workers = max_workers
+        self.steps = dict(STEPS)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._futures = set()
+
+    def register_step(self, name: str, step: Callable[[PostProcessContext, dict], List[str]]) -> None:
+        """Add or replace a post-processing step available to submitted jobs."""
+        if not isinstance(name, str) or not name:
+            raise ValueError("Step name must be a non-empty string")
+        if not callable(step):
+            raise TypeError(f"Step must be callable, got {type(step)}")
+        self.steps[name] = step
+        logger.info(f"Registered post-process step: {name}")
+
+    def submit(self, name: str, output_dir: str, outputs: List[str], steps: List[dict],
+               fps: float = 24.0, on_done: Optional[Callable[[float], None]] = None) -> Optional[Future]:
+        """Queue the steps for a finished render and return immediately; on_done gets the run time."""
+        if not steps or not outputs:
+            logger.debug(f"Nothing to post-process for {name}")
+            return None
+        for step in steps:
+            if step.get("step") not in self.steps:
+                raise ValueError(f"Unknown post-process step: {step.get('step')}")
+
+        context = PostProcessContext(name, output_dir, fps, outputs)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="post_process")
+            future = self._executor.submit(self._run, context, [dict(step) for step in steps], on_done)
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        logger.info(f"Queued post-processing for {name}: {[step['step'] for step in steps]}")
+        return future
+
+    def _run(self, context: PostProcessContext, steps: List[dict],
+             on_done: Optional[Callable[[float], None]] = None) -> List[str]:
+        """Execute the steps in order; a failed step is reported and the rest still run."""
+        started_at = time.monotonic()
+        produced = []
+        for step in steps:
+            step_name = step.pop("step")
+            try:
+                files = self.steps[step_name](context, step)
+            except Exception as e:
+                logger.error(f"Post-process step {step_name} failed for {context.name}: {str(e)}")
+                if self.qt_signal:
+                    self.qt_signal.emit(f"Post-process {step_name} failed for {context.name}: {str(e)}")
+                continue
+            context.files.extend(files)
+            produced.extend(files)
+
+        if on_done:
+            try:
+                on_done(time.monotonic() - started_at)
+            except Exception as e:
+                logger.error(f"Post-process completion callback failed for {context.name}: {str(e)}")
+        logger.info(f"Post-processing completed for {context.name}, produced {len(produced)} files")
+        if self.qt_signal:
+            self.qt_signal.emit(f"Post-processing completed for {context.name}")
+        return produced
+
+    def pending(self) -> int:
+        """Return the number of jobs that are queued or running."""
+        return sum(1 for future in list(self._futures) if not future.done())
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool, optionally waiting for queued jobs."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+        logger.info("Post-processor shut down")
@@ -0,0 +1,161 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dto.render_settings import MOVIE_FILE_FORMATS
+from managers.job_engine import RenderJob
+from managers.output_uploader import resolve_output_dir
+from util import utils
+from util.blend_file import SceneInfo, read_scene_info
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('Preflight')
+
+# Движки, с которыми работают скрипты рендера и превью
+SUPPORTED_ENGINES = ("CYCLES", "BLENDER_EEVEE", "BLENDER_EEVEE_NEXT")
+# Проверки в основном ждут диск, потоков может быть больше, чем ядер
+DEFAULT_MAX_WORKERS = 8
+
+
+class PreflightResult:
+    """Problems that stop a job from being rendered and warnings that do not."""
+    __slots__ = ("job", "problems", "warnings")
+
+    def __init__(self, job: RenderJob, problems: Optional[List[str]] = None, warnings: Optional[List[str]] = None):
+        self.job = job
+        self.problems = problems or []
+        self.warnings = warnings or []
+
+    @property
+    def passed(self) -> bool:
+        return not self.problems
+
+    def __repr__(self) -> str:
+        return f"PreflightResult(job={self.job}, problems={len(self.problems)}, warnings={len(self.warnings)})"
+
+
+def check_output_path(blend_file: str, output_path: str) -> Optional[str]:
+    """Return a problem when the output folder is empty, a file, or cannot be created or written."""
+    if not output_path:
+        return "output path is empty"
+    directory = resolve_output_dir(blend_file, output_path)
+    if os.path.isfile(directory):
+        return f"output path {directory} is a file"
+    # Blender создает недостающие папки, достаточно записи в ближайшую существующую
+    existing = directory
+    while not os.path.exists(existing):
+        parent = os.path.dirname(existing)
+        if parent == existing:
+            break
+        existing = parent
+    if not os.path.isdir(existing) or not os.access(existing, os.W_OK):
+        return f"output path {directory} is not writable"
+    return None
+
+
+def check_render_engine(engine: str) -> Optional[str]:
+    """Return a problem when the render scripts cannot set up the engine."""
+    if engine not in SUPPORTED_ENGINES:
+        return f"render engine {engine or 'none'} is not supported, use Cycles or EEVEE"
+    return None
+
+
+def check_file_format(file_format: str, animation: bool) -> Optional[str]:
+    """Return a problem when the file format does not fit a still or animation render."""
+    if not file_format:
+        return "file format is empty"
+    # Видео пишется только анимацией, одиночный кадр в него не сохранить
+    if file_format in MOVIE_FILE_FORMATS and not animation:
+        return f"movie format {file_format} cannot be used for a still image"
+    return None
+
+
+def check_frame_range(settings: dict) -> Optional[str]:
+    """Return a problem when an animation has no frames to render."""
+    if settings["Frame End"] < settings["Frame Start"]:
+        return f"frame range {settings['Frame Start']}-{settings['Frame End']} is empty"
+    return None
+
+
+def check_scene(scene_info: SceneInfo, variant: dict) -> List[str]:
+    """Return problems with the scene, view layer and camera a variant renders."""
+    scene_name = variant.get("scene") or scene_info.active_scene
+    scene = scene_info.scenes.get(scene_name)
+    if scene is None:
+        return [f"scene {scene_name} not found"]
+    problems = []
+    view_layer = variant.get("view_layer")
+    if view_layer and view_layer not in scene.view_layers:
+        problems.append(f"view layer {view_layer} not found in scene {scene_name}")
+    camera = variant.get("camera")
+    if camera:
+        if camera not in scene_info.objects:
+            problems.append(f"camera {camera} not found")
+    elif not scene.camera:
+        problems.append(f"scene {scene_name} has no camera")
+    return problems
+
+
+def check_render_spec(blend_file: str, spec: dict, scene_info: Optional[SceneInfo] = None) -> List[str]:
+    """Return every problem of a render spec, checking each variant with its overrides like render_script.py."""
+    problems = []
+    for variant in spec.get("variants") or [{"name": ""}]:
+        settings = {**spec["settings"], **(variant.get("overrides") or {})}
+        animation = bool(variant.get("animation"))
+        variant_problems = [
+            check_output_path(blend_file, settings["Output Path"]),
+            check_render_engine(settings["Render Engine"]),
+            check_file_format(settings["File Format"], animation),
+            check_frame_range(settings) if animation else None,
+            *(check_scene(scene_info, variant) if scene_info else []),
+        ]
+        prefix = f"variant {variant['name']}: " if variant.get("name") else ""
+        for problem in variant_problems:
+            # Одинаковая ошибка у нескольких вариантов сообщается один раз
+            if problem and prefix + problem not in problems:
+                problems.append(prefix + problem)
+    return problems
+
+
+def run_preflight(jobs: List[RenderJob], check: Callable[[RenderJob], PreflightResult],
+                  max_workers: int = DEFAULT_MAX_WORKERS) -> List[PreflightResult]:
+    """Check all jobs in parallel and return their results in queue order."""
+    if not jobs:
+        return []
+
+    def safe_check(job: RenderJob) -> PreflightResult:
+        try:
+            return check(job)
+        except Exception as e:
+            logger.error(f"Pre-flight check of {job} failed: {str(e)}")
+            return PreflightResult(job, [f"pre-flight check failed: {str(e)}"])
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="preflight") as executor:
+        results = list(executor.map(safe_check, jobs))
+    rejected = sum(not result.passed for result in results)
+    logger.info(f"Pre-flight checked {len(results)} jobs, {rejected} rejected")
+    return results
+
+
+class SceneInfoCache:
+    """Scene metadata read from .blend files without Blender, cached per file until it changes."""
+
+    def __init__(self):
+        # Нормализованный путь -> (размер, mtime, сведения о сценах)
+        self._cache: Dict[str, Tuple[int, float, SceneInfo]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, blend_file: str) -> SceneInfo:
+        """Return the scene info of a file; raises OSError, ValueError or EOFError when it cannot be read."""
+        source = utils.normalize_path(blend_file)
+        stat = os.stat(source)
+        with self._lock:
+            cached = self._cache.get(source)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime):
+            return cached[2]
+        scene_info = read_scene_info(source)
+        with self._lock:
+            self._cache[source] = (stat.st_size, stat.st_mtime, scene_info)
+        return scene_info
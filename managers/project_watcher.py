@@ -0,0 +1,126 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('ProjectWatcher')
+
+
+class ProjectWatcher(QObject):
+    """Watch project files for changes and report them in debounced batches."""
+    projects_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None, debounce_ms: int = 1000, poll_interval_ms: int = 5000,
+                 use_polling: bool = False):
+        """Initialize the watcher; polling is used when forced or when native watching fails."""
+        super().__init__(parent)
+        self._snapshots: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._pending = set()
+        self._polled_paths = set()
+        self._use_polling = use_polling
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self._flush_pending)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self._poll)
+        logger.info(f"Initializing ProjectWatcher, debounce: {debounce_ms} ms, polling: {use_polling}")
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of a file or None when it is missing."""
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def watch(self, paths: List[str]) -> None:
+        """Start watching the given project files and their folders."""
+        new_paths = [path for path in paths if path not in self._snapshots]
+        if not new_paths:
+            return
+
+        for path in new_paths:
+            self._snapshots[path] = self._stat(path)
+
+        if self._use_polling:
+            self._polled_paths.update(new_paths)
+        else:
+            # Папки отслеживаем тоже: Blender сохраняет через временный файл и переименование
+            directories = {os.path.dirname(path) for path in new_paths}
+            watched = set(self._watcher.files()) | set(self._watcher.directories())
+            to_add = [path for path in new_paths + sorted(directories) if path and path not in watched]
+            failed = set(self._watcher.addPaths(to_add)) if to_add else set()
+            fallback = [path for path in new_paths if path in failed]
+            if fallback:
+                logger.warning(f"Native watching failed for {len(fallback)} files, using polling")
+                self._polled_paths.update(fallback)
+
+        if self._polled_paths and not self._poll_timer.isActive():
+            self._poll_timer.start()
+        logger.info(f"Watching {len(new_paths)} new project files, total: {len(self._snapshots)}")
+
+    def unwatch(self, paths: List[str]) -> None:
+        """Stop watching the given project files."""
+        for path in paths:
+            self._snapshots.pop(path, None)
+            self._pending.discard(path)
+            self._polled_paths.discard(path)
+        watched = set(self._watcher.files())
+        to_remove = [path for path in paths if path in watched]
+        if to_remove:
+            self._watcher.removePaths(to_remove)
+        if not self._polled_paths:
+            self._poll_timer.stop()
+
+    def watched_paths(self) -> List[str]:
+        return list(self._snapshots)
+
+    def _schedule(self, paths) -> None:
+        self._pending.update(path for path in paths if path in self._snapshots)
+        if self._pending:
+            # Перезапуск таймера склеивает серию событий от одного сохранения в одно
+            self._debounce_timer.start()
+
+    def _on_file_changed(self, path: str) -> None:
+        self._schedule([path])
+
+    def _on_directory_changed(self, directory: str) -> None:
+        self._schedule(path for path in self._snapshots if os.path.dirname(path) == directory)
+
+    def _poll(self) -> None:
+        """Compare stored snapshots of polled files with the file system."""
+        changed = [path for path in self._polled_paths if self._stat(path) != self._snapshots.get(path)]
+        if changed:
+            self._schedule(changed)
+
+    def _flush_pending(self) -> List[str]:
+        """Emit the paths whose contents actually changed since the last snapshot."""
+        pending, self._pending = self._pending, set()
+        changed = []
+        for path in sorted(pending):
+            snapshot = self._stat(path)
+            if snapshot == self._snapshots.get(path):
+                continue
+            self._snapshots[path] = snapshot
+            changed.append(path)
+
+            # Файл, замененный переименованием, выпадает из QFileSystemWatcher
+            if snapshot is not None and path not in self._polled_paths and path not in self._watcher.files():
+                self._watcher.addPath(path)
+
+        if changed:
+            logger.info(f"Detected changes in {len(changed)} project files")
+            self.projects_changed.emit(changed)
+        return changed
@@ -0,0 +1,176 @@
+import os
+import glob
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from util.log_config import get_logger
+
+try:
+    import psutil
+except ImportError:  # Без psutil привязка к ядрам на Windows не выполняется
+    psutil = None
+
+# Configure logging
+logger = get_logger('ResourceAllocator')
+
+NUMA_NODES_GLOB = "/sys/devices/system/node/node[0-9]*"
+
+
+class CpuSlot:
+    """A share of the machine given to one concurrent Blender process."""
+    __slots__ = ("index", "cores", "numa_node")
+
+    def __init__(self, index: int, cores: Tuple[int, ...], numa_node: Optional[int] = None):
+        self.index = index
+        self.cores = cores
+        self.numa_node = numa_node
+
+    def threads_for(self, requested: int) -> int:
+        """Return the render thread count: the requested value capped to the slot, 0 means all slot cores."""
+        if requested <= 0 or requested > len(self.cores):
+            return len(self.cores)
+        return requested
+
+    def __repr__(self) -> str:
+        return f"CpuSlot(index={self.index}, cores={list(self.cores)}, numa_node={self.numa_node})"
+
+
+def parse_cpu_list(cpu_list: str) -> List[int]:
+    """Parse a Linux cpulist like '0-3,8,10-11'."""
+    cores = []
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cores.extend(range(int(start), int(end) + 1))
+        else:
+            cores.append(int(part))
+    return cores
+
+
+def available_cores() -> List[int]:
+    """Return the cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if psutil is not None:
+        try:
+            return sorted(psutil.Process().cpu_affinity())
+        except (AttributeError, psutil.Error):
+            pass
+    return list(range(os.cpu_count() or 1))
+
+
+def read_numa_nodes(nodes_glob: str = NUMA_NODES_GLOB) -> Dict[int, List[int]]:
+    """Return {node: cores} from sysfs; empty when the topology is unknown."""
+    nodes = {}
+    for node_path in sorted(glob.glob(nodes_glob)):
+        try:
+            node = int(os.path.basename(node_path)[4:])
+            with open(os.path.join(node_path, "cpulist"), "r") as f:
+                cores = parse_cpu_list(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to read NUMA node {node_path}: {str(e)}")
+            continue
+        if cores:
+            nodes[node] = cores
+    return nodes
+
+
+def _split(cores: List[int], parts: int) -> List[List[int]]:
+    # Непрерывные куски: соседние ядра обычно делят кэш
+    size, extra = divmod(len(cores), parts)
+    chunks, start = [], 0
+    for part in range(parts):
+        end = start + size + (1 if part < extra else 0)
+        chunks.append(cores[start:end])
+        start = end
+    return chunks
+
+
+def plan_slots(job_count: int, cores: Optional[List[int]] = None,
+               numa_nodes: Optional[Dict[int, List[int]]] = None) -> List[CpuSlot]:
+    """Split cores evenly between concurrent jobs, keeping each job inside one NUMA node when the split allows it."""
+    if not isinstance(job_count, int) or job_count < 1:
+        raise ValueError("Job count must be a positive integer")
+    cores = sorted(cores if cores is not None else available_cores())
+    numa_nodes = numa_nodes if numa_nodes is not None else read_numa_nodes()
+    # Не больше задач, чем ядер: иначе у кого-то окажется пустой набор
+    job_count = min(job_count, len(cores))
+
+    allowed = set(cores)
+    nodes = {node: [core for core in node_cores if core in allowed] for node, node_cores in numa_nodes.items()}
+    nodes = {node: node_cores for node, node_cores in sorted(nodes.items()) if node_cores}
+    node_of = {core: node for node, node_cores in nodes.items() for core in node_cores}
+
+    # Ядра идут по узлам подряд: при числе задач, кратном узлам, куски совпадают с узлами,
+    # при меньшем числе задач каждая получает целые узлы, одна задача - все ядра
+    ordered = [core for node_cores in nodes.values() for core in node_cores]
+    ordered += [core for core in cores if core not in node_of]
+
+    slots = []
+    for index, chunk in enumerate(_split(ordered, job_count)):
+        chunk_nodes = {node_of.get(core) for core in chunk}
+        numa_node = chunk_nodes.pop() if len(nodes) > 1 and len(chunk_nodes) == 1 else None
+        slots.append(CpuSlot(index, tuple(chunk), numa_node))
+    return slots
+
+
+def affinity_command_prefix(slot: CpuSlot) -> List[str]:
+    """Return a numactl or taskset prefix that pins the process to the slot's cores from its start."""
+    cpu_list = ",".join(str(core) for core in slot.cores)
+    numactl = shutil.which("numactl")
+    if numactl:
+        # Память привязывается к узлу, только если слот целиком в нем
+        membind = [f"--membind={slot.numa_node}"] if slot.numa_node is not None else []
+        return [numactl, f"--physcpubind={cpu_list}", *membind]
+    taskset = shutil.which("taskset")
+    if taskset:
+        return [taskset, "-c", cpu_list]
+    logger.debug("numactl and taskset not found, affinity is set after the process starts")
+    return []
+
+
+def apply_affinity(pid: int, slot: CpuSlot) -> bool:
+    """Pin a running process to the slot's cores; report whether it succeeded."""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(pid, slot.cores)
+        elif psutil is not None:
+            psutil.Process(pid).cpu_affinity(list(slot.cores))
+        else:
+            logger.debug("CPU affinity is not supported on this platform without psutil")
+            return False
+    except Exception as e:
+        logger.warning(f"Unable to set CPU affinity for process {pid}: {str(e)}")
+        return False
+
+    logger.debug(f"Pinned process {pid} to cores {list(slot.cores)}")
+    return True
+
+
+class ResourceAllocator:
+    """Hands out CPU slots to concurrent render jobs."""
+
+    def __init__(self, job_count: int = 1, cores: Optional[List[int]] = None,
+                 numa_nodes: Optional[Dict[int, List[int]]] = None):
+        self.slots = plan_slots(job_count, cores, numa_nodes)
+        self._free = list(self.slots)
+        self._condition = threading.Condition()
+        logger.info(f"Planned {len(self.slots)} CPU slots: {self.slots}")
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[CpuSlot]:
+        """Take a free slot, waiting for one if all are busy; None on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._free, timeout=timeout):
+                return None
+            return self._free.pop(0)
+
+    def release(self, slot: CpuSlot) -> None:
+        """Return a slot taken with acquire."""
+        with self._condition:
+            if slot in self.slots and slot not in self._free:
+                self._free.append(slot)
+                self._free.sort(key=lambda free_slot: free_slot.index)
+                self._condition.notify()
@@ -0,0 +1,255 @@
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from util.log_config import get_logger
+
+# Configure logging
+logger = get_logger('TelemetryStore')
+
+DEFAULT_DB_PATH = "render_telemetry.db"
+
+# Длительности в секундах, память в мегабайтах, отметки времени в секундах epoch
+JOB_COLUMNS = (
+    "project", "blend_file", "kind", "host", "blender_version", "engine", "samples",
+    "resolution_x", "resolution_y", "frame_count",
+    "queued_at", "started_at", "finished_at",
+    "queue_wait", "startup", "file_load", "setup", "render", "shutdown", "post_process",
+    "peak_memory_mb", "return_code", "attempt", "failure",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    blend_file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    host TEXT,
+    blender_version TEXT,
+    engine TEXT,
+    samples INTEGER,
+    resolution_x INTEGER,
+    resolution_y INTEGER,
+    frame_count INTEGER,
+    queued_at REAL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    queue_wait REAL,
+    startup REAL,
+    file_load REAL,
+    setup REAL,
+    render REAL,
+    shutdown REAL,
+    post_process REAL,
+    peak_memory_mb REAL,
+    return_code INTEGER,
+    attempt INTEGER,
+    failure TEXT
+);
+CREATE TABLE IF NOT EXISTS frames (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    frame INTEGER NOT NULL,
+    render_time REAL NOT NULL,
+    PRIMARY KEY (job_id, frame)
+);
+CREATE INDEX IF NOT EXISTS jobs_project_started ON jobs(project, started_at);
+CREATE INDEX IF NOT EXISTS jobs_version_started ON jobs(blender_version, started_at);
+"""
+
+# Колонки, добавленные после первой версии схемы: база из старой версии дополняется при открытии
+_ADDED_COLUMNS = {"setup": "REAL", "shutdown": "REAL", "attempt": "INTEGER", "failure": "TEXT"}
+
+
+class TelemetryStore:
+    """Local SQLite store of per-job render timings with a small query API."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        if not isinstance(db_path, str) or not db_path:
+            raise ValueError("Database path must be a non-empty string")
+        self.db_path = db_path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Файл базы создается при первой записи, а не при запуске приложения
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(_SCHEMA)
+            existing = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+                    logger.info(f"Added telemetry column {column}")
+            self._connection = connection
+            logger.info(f"Opened telemetry database {self.db_path}")
+        return self._connection
+
+    def record_job(self, job: dict, frame_times: Optional[Dict[int, float]] = None) -> int:
+        """Store one finished job and its per-frame times, returning the job id."""
+        unknown_keys = set(job) - set(JOB_COLUMNS)
+        if unknown_keys:
+            raise ValueError(f"Unknown telemetry columns: {sorted(unknown_keys)}")
+        for key in ("project", "blend_file", "kind", "started_at"):
+            if job.get(key) is None:
+                raise ValueError(f"Telemetry record requires {key}")
+
+        columns = [column for column in JOB_COLUMNS if column in job]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                cursor = connection.execute(
+                    f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    [job[column] for column in columns]
+                )
+                job_id = cursor.lastrowid
+                if frame_times:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO frames (job_id, frame, render_time) VALUES (?, ?, ?)",
+                        [(job_id, frame, seconds) for frame, seconds in sorted(frame_times.items())]
+                    )
+        logger.debug(f"Recorded telemetry job {job_id} for {job['project']}")
+        return job_id
+
+    def update_job(self, job_id: int, **values) -> None:
+        """Fill in values that become known later, such as post_process."""
+        unknown_keys = set(values) - set(JOB_COLUMNS)
+        if unknown_keys:
+            raise ValueError(f"Unknown telemetry columns: {sorted(unknown_keys)}")
+        if not values:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in values)} WHERE id = ?",
+                    [*values.values(), job_id]
+                )
+
+    def _query(self, sql: str, parameters: Sequence = ()) -> List[dict]:
+        with self._lock:
+            return [dict(row) for row in self._connect().execute(sql, parameters)]
+
+    @staticmethod
+    def _filters(project: Optional[str] = None, blender_version: Optional[str] = None,
+                 engine: Optional[str] = None, since: Optional[float] = None, kind: Optional[str] = None):
+        clauses, parameters = [], []
+        for column, value in (("project", project), ("blender_version", blender_version), ("engine", engine),
+                              ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            parameters.append(since)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", parameters
+
+    def jobs(self, project: Optional[str] = None, blender_version: Optional[str] = None,
+             engine: Optional[str] = None, since: Optional[float] = None, kind: Optional[str] = None,
+             limit: int = 100) -> List[dict]:
+        """Return the most recent jobs matching the filters."""
+        where, parameters = self._filters(project, blender_version, engine, since, kind)
+        return self._query(f"SELECT * FROM jobs{where} ORDER BY started_at DESC LIMIT ?", [*parameters, limit])
+
+    def frame_times(self, job_id: int) -> List[dict]:
+        """Return per-frame render times of a job."""
+        return self._query("SELECT frame, render_time FROM frames WHERE job_id = ? ORDER BY frame", [job_id])
+
+    def project_summary(self, since: Optional[float] = None, kind: Optional[str] = "render") -> List[dict]:
+        """Aggregate jobs per project, most expensive first."""
+        where, parameters = self._filters(since=since, kind=kind)
+        return self._query(
+            "SELECT project, COUNT(*) AS jobs, SUM(frame_count) AS frames, "
+            "AVG(queue_wait) AS avg_queue_wait, AVG(startup) AS avg_startup, AVG(file_load) AS avg_file_load, "
+            "AVG(setup) AS avg_setup, AVG(render) AS avg_render, AVG(render / NULLIF(frame_count, 0)) AS avg_frame, "
+            "AVG(post_process) AS avg_post_process, MAX(peak_memory_mb) AS peak_memory_mb, "
+            "SUM(return_code != 0) AS failures, SUM(attempt > 1 AND return_code = 0) AS recovered "
+            f"FROM jobs{where} GROUP BY project ORDER BY SUM(render) DESC",
+            parameters
+        )
+
+    def average_frame_seconds(self, kind: Optional[str] = "render") -> Dict[str, float]:
+        """Return the average render seconds per frame of successful jobs for each project."""
+        where, parameters = self._filters(kind=kind)
+        rows = self._query(
+            "SELECT project, AVG(render / frame_count) AS frame_seconds "
+            f"FROM jobs{where}{' AND' if where else ' WHERE'} return_code = 0 AND frame_count > 0 "
+            "AND render IS NOT NULL GROUP BY project",
+            parameters
+        )
+        return {row["project"]: row["frame_seconds"] for row in rows}
+
+    def version_comparison(self, project: Optional[str] = None, kind: Optional[str] = "render") -> List[dict]:
+        """Compare average timings between Blender versions and engines."""
+        where, parameters = self._filters(project=project, kind=kind)
+        return self._query(
+            "SELECT blender_version, engine, COUNT(*) AS jobs, AVG(startup) AS avg_startup, "
+            "AVG(file_load) AS avg_file_load, AVG(render / NULLIF(frame_count, 0)) AS avg_frame, "
+            "AVG(samples) AS avg_samples, MAX(peak_memory_mb) AS peak_memory_mb "
+            f"FROM jobs{where} GROUP BY blender_version, engine ORDER BY blender_version, engine",
+            parameters
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def format_table(rows: List[dict], columns: Optional[Sequence[str]] = None) -> str:
+    """Render query rows as a plain-text table."""
+    if not rows:
+        return "No data"
+    columns = list(columns or rows[0].keys())
+
+    def cell(value) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+
+    table = [columns] + [[cell(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(line[index]) for line in table) for index in range(len(columns))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(line, widths)) for line in table]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print telemetry reports: python -m managers.telemetry_store {projects,versions,jobs}."""
+    parser = argparse.ArgumentParser(prog="python -m managers.telemetry_store", description="Render telemetry report")
+    parser.add_argument("report", choices=("projects", "versions", "jobs"))
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the telemetry database")
+    parser.add_argument("--project", help="Only jobs of this project (unique name)")
+    parser.add_argument("--days", type=float, help="Only jobs started in the last N days")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    store = TelemetryStore(args.db)
+    since = time.time() - args.days * 86400 if args.days else None
+    try:
+        if args.report == "projects":
+            print(format_table(store.project_summary(since=since)))
+        elif args.report == "versions":
+            print(format_table(store.version_comparison(project=args.project)))
+        else:
+            print(format_table(
+                store.jobs(project=args.project, since=since, limit=args.limit),
+                ("id", "project", "kind", "blender_version", "engine", "samples", "frame_count", "queue_wait",
+                 "startup", "file_load", "setup", "render", "shutdown", "post_process", "peak_memory_mb",
+                 "return_code", "attempt", "failure")
+            ))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,85 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(project_root)
 
 import util.utils as utils
+from util.job_spec import parse_script_args, read_job_spec
+from util.preview_tiers import DEFAULT_PREVIEW_TIERS, validate_preview_tiers, format_tier_marker
+from util.phase_markers import emit_phase
+
+emit_phase("script_start")
+
+
+def get_fast_engine():
+    available_engines = [
+        engine.identifier for engine in bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items
+    ]
+    # Костыль потому что в 3.6 BLENDER_EEVEE, а в 4.2 BLENDER_EEVEE_NEXT
+    for engine in ("BLENDER_EEVEE_NEXT", "BLENDER_EEVEE"):
+        if engine in available_engines:
+            return engine
+    return None
+
+
+def set_samples(scene, samples):
+    render_engine = scene.render.engine
+    if render_engine == 'CYCLES':
+        scene.cycles.samples = samples
+    elif render_engine == 'BLENDER_EEVEE' or render_engine == 'BLENDER_EEVEE_NEXT':
+        scene.eevee.taa_render_samples = samples
+    else:
+        raise ValueError(f"Неподдерживаемый движок рендера: {render_engine}")
+
+
+def render_tier(scene, tier, original, thumbnail_path):
+    # Изменяем размер изображения
+    if scene.render.resolution_x >= scene.render.resolution_y:
+        percentage = 100 * round(tier["width"] / scene.render.resolution_x, 2)
+    else:
+        percentage = 100 * round(tier["height"] / scene.render.resolution_y, 2)
+    scene.render.resolution_percentage = max(1, int(percentage))
+
+    # Упрощение включаем только для своего уровня, следующий получает исходные значения
+    if tier["simplify"]:
+        scene.render.use_simplify = True
+        scene.render.simplify_subdivision_render = 0
+        scene.render.simplify_child_particles_render = 0.1
+    else:
+        scene.render.use_simplify = original["use_simplify"]
+        scene.render.simplify_subdivision_render = original["simplify_subdivision_render"]
+        scene.render.simplify_child_particles_render = original["simplify_child_particles_render"]
+
+    original_engine = original["engine"]
+    scene.render.engine = original_engine
+    fast_engine = get_fast_engine() if tier["fast_engine"] else None
+    if fast_engine:
+        scene.render.engine = fast_engine
+    set_samples(scene, tier["samples"])
+
+    # Пишем во временный файл и подменяем миниатюру целиком, чтобы GUI не прочитал недописанный PNG
+    temp_path = f"{thumbnail_path}.{tier['name']}.tmp.png"
+    scene.render.filepath = temp_path
+    print(f"Запуск рендера миниатюры, уровень {tier['name']}...")
+    try:
+        bpy.ops.render.render(write_still=True)
+    except RuntimeError as e:
+        if not fast_engine:
+            raise
+        # Без GPU-контекста EEVEE может не запуститься, тогда рендерим исходным движком
+        print(f"Быстрый движок недоступен ({e}), использую {original_engine}")
+        scene.render.engine = original_engine
+        set_samples(scene, tier["samples"])
+        bpy.ops.render.render(write_still=True)
+
+    os.replace(temp_path, thumbnail_path)
+    print(format_tier_marker(tier["name"]), flush=True)
+
 
 if __name__ == "__main__":
     try:
-        # Получаем параметры из аргументов командной строки
-        file_path = sys.argv[5]
-        unique_name = sys.argv[6]
+        # Получаем параметры из файла спецификации задания
+        args = parse_script_args(sys.argv)
+        spec = read_job_spec(args.job_spec, expected_kind="thumbnail")
+        file_path = spec["blend_file"]
+        unique_name = spec["unique_name"]
 
         # work_directory = config_manager.get_variable("work_directory")
         work_directory = utils.get_config_value("work_directory")
@@ -22,40 +95,39 @@ if __name__ == "__main__":
             raise ValueError("Не задана рабочая директория (work_directory)")
 
         # Генерация пути к миниатюре
-        result_thumbnail_path = utils.path_to_thumbnail(unique_name)
+        result_thumbnail_path = bpy.path.native_pathsep(utils.path_to_thumbnail(unique_name))
 
         # Открываем файл в Blender
         print(f"Открываю файл: {file_path}")
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Файл '{file_path}' не найден")
+        emit_phase("file_load_start")
         bpy.ops.wm.open_mainfile(filepath=file_path)
+        emit_phase("file_load_end")
 
         # Настройка параметров рендера
         print(f"Настройка параметров рендера миниатюры {unique_name}...")
-        bpy.context.scene.render.image_settings.file_format = 'PNG'
-        bpy.context.scene.render.filepath = result_thumbnail_path
-
-        # Изменяем размер изображения
-        if bpy.context.scene.render.resolution_x >= bpy.context.scene.render.resolution_y:
-            percentage = 100 * round(512 / bpy.context.scene.render.resolution_x, 2)
-        else:
-            percentage = 100 * round(288 / bpy.context.scene.render.resolution_y, 2)
-
-        bpy.context.scene.render.resolution_percentage = int(percentage)
-
-        # Настройка движка рендера
-        render_engine = bpy.context.scene.render.engine
-        if render_engine == 'CYCLES':
-            bpy.context.scene.cycles.samples = 16
-        elif render_engine == 'BLENDER_EEVEE' or render_engine == 'BLENDER_EEVEE_NEXT':
-            bpy.context.scene.eevee.taa_render_samples = 16
-        else:
-            raise ValueError(f"Неподдерживаемый движок рендера: {render_engine}")
-
-        # Рендеринг миниатюры
-        print(f"Запуск рендера миниатюры {unique_name}...")
-        bpy.ops.render.render(write_still=True)
+        scene = bpy.context.scene
+        scene.render.image_settings.file_format = 'PNG'
+        os.makedirs(os.path.dirname(result_thumbnail_path) or ".", exist_ok=True)
+
+        original = {
+            "engine": scene.render.engine,
+            "use_simplify": scene.render.use_simplify,
+            "simplify_subdivision_render": scene.render.simplify_subdivision_render,
+            "simplify_child_particles_render": scene.render.simplify_child_particles_render,
+        }
+        # Проверяем движок до первого рендера, даже если быстрый уровень его заменит
+        set_samples(scene, 1)
+
+        tiers = validate_preview_tiers(spec.get("tiers") or DEFAULT_PREVIEW_TIERS)
+        emit_phase("render_start")
+        for tier in tiers:
+            render_tier(scene, tier, original, result_thumbnail_path)
+        emit_phase("render_end")
+
         print(f"Рендер миниатюры {unique_name} завершен!")
+        emit_phase("script_end")
 
     except FileNotFoundError as e:
         # Обработка ошибки, если файл не найден
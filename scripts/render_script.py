@@ -1,28 +1,33 @@
+import os
 import bpy
 import sys
-import json
+import traceback
 
-if __name__ == "__main__":
-    file_path = sys.argv[5]
-    settings = json.loads(sys.argv[6])
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(project_root)
+
+from util.job_spec import parse_script_args, read_job_spec
+from util.phase_markers import emit_phase
+
+emit_phase("script_start")
 
-    print(f"Открываю файл: {file_path}")
-    bpy.ops.wm.open_mainfile(filepath=file_path)
 
-    print("Настройка параметров рендера...")
-    bpy.context.scene.frame_start = settings["Frame Start"]
-    bpy.context.scene.frame_end = settings["Frame End"]
-    bpy.context.scene.frame_step = settings["Frame Step"]
-    bpy.context.scene.frame_current = settings["Frame"]
+def apply_settings(scene, settings):
+    scene.frame_start = settings["Frame Start"]
+    scene.frame_end = settings["Frame End"]
+    scene.frame_step = settings["Frame Step"]
+    scene.frame_current = settings["Frame"]
 
-    bpy.context.scene.render.resolution_x = settings["ResolutionX"]
-    bpy.context.scene.render.resolution_y = settings["ResolutionY"]
-    bpy.context.scene.render.resolution_percentage = settings["Resolution Scale"]
+    scene.render.resolution_x = settings["ResolutionX"]
+    scene.render.resolution_y = settings["ResolutionY"]
+    scene.render.resolution_percentage = settings["Resolution Scale"]
 
-    bpy.context.scene.render.image_settings.file_format = settings["File Format"]
+    scene.render.image_settings.file_format = settings["File Format"]
 
-    file_name = file_path.split("\\")[-1].split(".")[0]
-    bpy.context.scene.render.filepath = f'{settings["Output Path"]}/{file_name}.png'
+    # Число потоков менеджер ограничивает ядрами, выделенными этому процессу
+    if settings.get("Threads"):
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = settings["Threads"]
 
     available_engines = ", ".join(
         engine.identifier for engine in bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items
@@ -31,19 +36,117 @@ if __name__ == "__main__":
     # Костыль потому что в 3.6 BLENDER_EEVEE, а в 4.2 BLENDER_EEVEE_NEXT
     if settings["Render Engine"] == "BLENDER_EEVEE":
         if "BLENDER_EEVEE_NEXT" in available_engines:
-            bpy.context.scene.render.engine = "BLENDER_EEVEE_NEXT"
+            scene.render.engine = "BLENDER_EEVEE_NEXT"
         else:
-            bpy.context.scene.render.engine = "BLENDER_EEVEE"
+            scene.render.engine = "BLENDER_EEVEE"
 
-        bpy.context.scene.eevee.taa_render_samples = settings.get("EEVEE Samples", 128)
+        scene.eevee.taa_render_samples = settings.get("EEVEE Samples", 128)
 
     elif settings["Render Engine"] == "CYCLES":
-        bpy.context.scene.render.engine = "CYCLES"
+        scene.render.engine = "CYCLES"
+
+        scene.cycles.samples = settings.get("CYCLES Samples", 64)
+        scene.cycles.use_denoising = settings.get("Denoising", True)
+        scene.cycles.device = settings.get("Device", "GPU")
+
+
+def on_render_pre(scene, *args):
+    emit_phase("frame_start", frame=scene.frame_current)
+
+
+def on_render_post(scene, *args):
+    emit_phase("frame_end", frame=scene.frame_current)
+
+
+def remap_asset_paths(asset_paths, source_blend_file):
+    # Файл открыт из локального кэша: пути считаем от исходного .blend и подменяем на локальные копии
+    source_dir = os.path.dirname(source_blend_file)
+    for datablocks in (bpy.data.libraries, bpy.data.images):
+        for datablock in datablocks:
+            # Пути внутри связанных библиотек не редактируются, упакованные изображения не читаются с диска
+            if getattr(datablock, "library", None) or getattr(datablock, "packed_file", None) or not datablock.filepath:
+                continue
+            source = os.path.normcase(os.path.normpath(bpy.path.abspath(datablock.filepath, start=source_dir)))
+            local = asset_paths.get(source)
+            if not local or os.path.normcase(os.path.normpath(bpy.path.abspath(datablock.filepath))) == \
+                    os.path.normcase(os.path.normpath(local)):
+                continue
+            datablock.filepath = local
+            if isinstance(datablock, bpy.types.Library):
+                datablock.reload()
+
+
+def render_variant(file_name, settings, variant):
+    # Сцена варианта, по умолчанию активная
+    scene = bpy.data.scenes[variant["scene"]] if variant.get("scene") else bpy.context.scene
+    variant_settings = dict(settings)
+    variant_settings.update(variant.get("overrides") or {})
+    apply_settings(scene, variant_settings)
+
+    if variant.get("camera"):
+        scene.camera = bpy.data.objects[variant["camera"]]
+
+    # Рендерим только выбранный слой, остальные временно выключаем
+    layer_states = {}
+    if variant.get("view_layer"):
+        target_layer = scene.view_layers[variant["view_layer"]]
+        for view_layer in scene.view_layers:
+            layer_states[view_layer.name] = view_layer.use
+            view_layer.use = view_layer == target_layer
+
+    suffix = f'_{variant["name"]}' if variant.get("name") else ""
+    output_base = f'{variant_settings["Output Path"]}/{file_name}{suffix}'
+    try:
+        print(f"Запуск рендера {variant.get('name') or file_name}...")
+        if variant.get("animation"):
+            scene.render.filepath = f"{output_base}_####"
+            bpy.ops.render.render(animation=True, scene=scene.name)
+        else:
+            scene.render.filepath = f"{output_base}.png"
+            bpy.ops.render.render(write_still=True, scene=scene.name)
+    finally:
+        for layer_name, use in layer_states.items():
+            scene.view_layers[layer_name].use = use
+
+
+if __name__ == "__main__":
+    try:
+        # Параметры задания читаем из файла спецификации, путь к нему передается именованным аргументом
+        args = parse_script_args(sys.argv)
+        spec = read_job_spec(args.job_spec, expected_kind="render")
+        file_path = spec["blend_file"]
+        settings = spec["settings"]
+        # Без вариантов рендерится один кадр с настройками проекта
+        variants = spec.get("variants") or [{"name": ""}]
+
+        print(f"Открываю файл: {file_path}")
+        emit_phase("file_load_start")
+        bpy.ops.wm.open_mainfile(filepath=file_path)
+        if spec.get("asset_paths"):
+            remap_asset_paths(spec["asset_paths"], spec["source_blend_file"])
+        emit_phase("file_load_end")
+        # Обработчики регистрируются после загрузки: open_mainfile сбрасывает не постоянные обработчики
+        bpy.app.handlers.render_pre.append(on_render_pre)
+        bpy.app.handlers.render_post.append(on_render_post)
+
+        # Имена файлов вывода по исходному .blend, даже если открыта локальная копия
+        file_name = spec.get("source_blend_file", file_path).split("\\")[-1].split(".")[0]
+
+        print("Настройка параметров рендера...")
+        if len(variants) > 1:
+            # Cycles сохраняет BVH и данные сцены между рендерами одного запуска
+            for scene in bpy.data.scenes:
+                scene.render.use_persistent_data = True
 
-        bpy.context.scene.cycles.samples = settings.get("CYCLES Samples", 64)
-        bpy.context.scene.cycles.use_denoising = settings.get("Denoising", True)
-        bpy.context.scene.cycles.device = settings.get("Device", "GPU")
+        emit_phase("render_start")
+        for variant in variants:
+            render_variant(file_name, settings, variant)
+        emit_phase("render_end")
 
-    print("Запуск рендера...")
-    bpy.ops.render.render(write_still=True)
-    print("Рендер завершен!")
+        print("Рендер завершен!")
+        emit_phase("script_end")
+    except Exception:
+        # Без ненулевого кода Blender завершится с 0, и задание с ошибкой будет засчитано как готовое;
+        # Traceback в выводе нужен менеджеру для классификации ошибки
+        traceback.print_exc()
+        sys.exit(1)
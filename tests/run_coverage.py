@@ -17,7 +17,11 @@ def run_coverage():
     # Generate and display coverage report
     subprocess.check_call([
         sys.executable, "-m", "coverage", "report", "-m",
-        "../dto/project.py", "../managers/blender_manager.py", "../managers/config_manager.py", "../util/utils.py"
+        "../dto/project.py", "../dto/project_index.py", "../dto/render_settings.py", "../dto/render_variant.py",
+        "../gui/project_list_model.py", "../gui/thumbnail_loader.py",
+        "../managers/asset_cache.py", "../managers/blender_manager.py", "../managers/config_manager.py", "../managers/dependency_scanner.py", "../managers/job_engine.py", "../managers/job_progress.py", "../managers/output_uploader.py",
+        "../managers/post_processor.py", "../managers/preflight.py", "../managers/project_watcher.py", "../managers/resource_allocator.py", "../managers/telemetry_store.py",
+        "../scripts/render_script.py", "../util/blend_file.py", "../util/log_config.py", "../util/utils.py"
     ])
 
 
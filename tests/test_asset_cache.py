@@ -0,0 +1,216 @@
+import os
+import json
+import tempfile
+import unittest
+import logging
+from unittest.mock import patch
+from managers import asset_cache
+from managers.asset_cache import AssetCache, validate_asset_cache_config
+from util import utils
+from util.blend_file import BlendReference
+
+
+class TestAssetCache(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('AssetCache').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = os.path.join(self.temp_dir.name, "storage")
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.references = {}
+        patcher = patch("managers.asset_cache.read_external_paths", side_effect=self._read_external_paths)
+        self.mock_read_external_paths = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read_external_paths(self, file_path):
+        # Локальная копия называется так же, как файл в хранилище
+        return self.references.get(os.path.basename(file_path), [])
+
+    def _write(self, relative_path: str, content: bytes = b"data") -> str:
+        path = os.path.join(self.storage, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def _make_project(self) -> str:
+        blend_file = self._write(os.path.join("scenes", "shot.blend"), b"shot")
+        self._write(os.path.join("scenes", "tex", "wood.png"), b"wood")
+        self._write(os.path.join("lib", "lib.blend"), b"library")
+        self._write(os.path.join("tex", "lib.png"), b"lib texture")
+        self.references = {
+            "shot.blend": [BlendReference("image", "wood", "//tex/wood.png"),
+                           BlendReference("library", "lib", "//../lib/lib.blend"),
+                           BlendReference("image", "missing", "//tex/missing.png")],
+            "lib.blend": [BlendReference("image", "lib", "//../tex/lib.png")],
+        }
+        return blend_file
+
+    def test_validate_asset_cache_config(self):
+        # Act
+        config = validate_asset_cache_config({"directory": "D:\\cache", "max_size_gb": 2.5})
+
+        # Assert
+        self.assertEqual(config, {"directory": "D:\\cache", "max_size_gb": 2.5, "validate": "mtime"})
+
+    def test_validate_asset_cache_config_invalid(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            validate_asset_cache_config("D:\\cache")
+        with self.assertRaises(ValueError):
+            validate_asset_cache_config({"directory": ""})
+        with self.assertRaises(ValueError):
+            validate_asset_cache_config({"directory": "D:\\cache", "max_size_gb": 0})
+        with self.assertRaises(ValueError):
+            validate_asset_cache_config({"directory": "D:\\cache", "validate": "size"})
+        with self.assertRaises(ValueError):
+            validate_asset_cache_config({"directory": "D:\\cache", "limit": 10})
+
+    def test_stage_copies_blend_and_dependencies(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024)
+
+        # Act
+        staged = cache.stage(blend_file)
+
+        # Assert
+        self.assertEqual(staged.source_blend_file, blend_file)
+        self.assertEqual(staged.blend_file, cache.local_path(utils.normalize_path(blend_file)))
+        self.assertEqual(len(staged.path_map), 4)
+        for source, local in staged.path_map.items():
+            self.assertTrue(local.startswith(os.path.join(self.cache_dir, asset_cache.FILES_DIRECTORY)))
+            with open(source, "rb") as original, open(local, "rb") as copy:
+                self.assertEqual(original.read(), copy.read())
+        # Относительные пути внутри копии ведут к копиям зависимостей
+        self.assertTrue(os.path.isfile(os.path.join(os.path.dirname(staged.blend_file), "tex", "wood.png")))
+        self.assertEqual(cache.size, len(b"shot") + len(b"wood") + len(b"library") + len(b"lib texture"))
+
+    def test_stage_missing_blend(self):
+        # Arrange
+        cache = AssetCache(self.cache_dir, 1024)
+
+        # Act & Assert
+        with self.assertRaises(FileNotFoundError):
+            cache.stage(os.path.join(self.storage, "missing.blend"))
+        self.assertEqual(cache._pins, {})
+
+    def test_stage_reuses_valid_copies(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024)
+        cache.release(cache.stage(blend_file))
+
+        # Act
+        with patch("managers.asset_cache.shutil.copyfile") as mock_copyfile:
+            staged = cache.stage(blend_file)
+
+        # Assert
+        mock_copyfile.assert_not_called()
+        self.assertEqual(len(staged.path_map), 4)
+
+    def test_stage_copies_changed_file_again(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024)
+        staged = cache.stage(blend_file)
+        cache.release(staged)
+        texture = self._write(os.path.join("scenes", "tex", "wood.png"), b"new wood")
+
+        # Act
+        staged = cache.stage(blend_file)
+
+        # Assert
+        with open(staged.path_map[utils.normalize_path(texture)], "rb") as f:
+            self.assertEqual(f.read(), b"new wood")
+
+    def test_hash_mode_keeps_copy_of_touched_file(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024, validate="hash")
+        cache.release(cache.stage(blend_file))
+        texture = os.path.join(self.storage, "scenes", "tex", "wood.png")
+        os.utime(texture, (1000000000, 1000000000))
+
+        # Act
+        with patch("managers.asset_cache.shutil.copyfile") as mock_copyfile:
+            cache.stage(blend_file)
+
+        # Assert
+        mock_copyfile.assert_not_called()
+        self.assertEqual(cache._entries[utils.normalize_path(texture)].mtime, 1000000000)
+
+    def test_eviction_skips_pinned_files(self):
+        # Arrange
+        first = self._write("first.blend", b"a" * 40)
+        second = self._write("second.blend", b"b" * 40)
+        third = self._write("third.blend", b"c" * 40)
+        cache = AssetCache(self.cache_dir, 100)
+        cache.release(cache.stage(first))
+        pinned = cache.stage(second)
+
+        # Act
+        cache.stage(third)
+
+        # Assert
+        self.assertNotIn(utils.normalize_path(first), cache._entries)
+        self.assertIn(utils.normalize_path(second), cache._entries)
+        self.assertTrue(os.path.isfile(pinned.blend_file))
+        self.assertFalse(os.path.exists(cache.local_path(utils.normalize_path(first))))
+
+    def test_stage_raises_when_pinned_files_fill_cache(self):
+        # Arrange
+        first = self._write("first.blend", b"a" * 60)
+        second = self._write("second.blend", b"b" * 60)
+        cache = AssetCache(self.cache_dir, 100)
+        cache.stage(first)
+
+        # Act & Assert
+        with self.assertRaises(OSError):
+            cache.stage(second)
+        self.assertNotIn(utils.normalize_path(second), cache._pins)
+
+    def test_index_is_persisted(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024)
+        cache.release(cache.stage(blend_file))
+
+        # Act
+        reopened = AssetCache(self.cache_dir, 1024)
+
+        # Assert
+        with open(os.path.join(self.cache_dir, asset_cache.INDEX_FILE), "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 4)
+        self.assertEqual(set(reopened._entries), set(cache._entries))
+        self.assertEqual(reopened._entries[utils.normalize_path(blend_file)].references,
+                         cache._entries[utils.normalize_path(blend_file)].references)
+
+    def test_prefetch(self):
+        # Arrange
+        blend_file = self._make_project()
+        cache = AssetCache(self.cache_dir, 1024)
+
+        # Act
+        cache.prefetch([blend_file, os.path.join(self.storage, "missing.blend")])
+        cache.shutdown()
+
+        # Assert
+        self.assertEqual(len(cache._entries), 4)
+        self.assertEqual(cache._pins, {})
+
+    def test_init_invalid(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            AssetCache("", 1024)
+        with self.assertRaises(ValueError):
+            AssetCache(self.cache_dir, 0)
+        with self.assertRaises(ValueError):
+            AssetCache(self.cache_dir, 1024, validate="size")
+
+
+if __name__ == "__main__":
+    unittest.main()
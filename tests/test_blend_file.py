@@ -0,0 +1,333 @@
+import gzip
+import os
+import struct
+import tempfile
+import unittest
+import logging
+from util.blend_file import (
+    BlendReference,
+    SceneData,
+    read_blend_version,
+    read_embedded_thumbnail,
+    read_external_paths,
+    read_scene_info,
+    extract_embedded_thumbnail,
+    format_version,
+    parse_sdna,
+    read_header,
+    zstandard
+)
+
+
+def make_thumbnail_block(width, height, big_header=False):
+    # Нижняя строка красная, верхняя синяя: в файле строки идут снизу вверх
+    pixels = b""
+    for y in range(height):
+        color = b"\xff\x00\x00\xff" if y == 0 else b"\x00\x00\xff\xff"
+        pixels += color * width
+    data = struct.pack("<ii", width, height) + pixels
+    return make_block(b"TEST", data, big_header)
+
+
+def make_block(code, data, big_header=False, sdna=0, address=1):
+    if big_header:
+        return struct.pack("<4siQqq", code, sdna, address, len(data), 1) + data
+    return struct.pack("<4siQii", code, len(data), address, sdna, 1) + data
+
+
+def pad(data):
+    return data + b"\x00" * (-len(data) % 4)
+
+
+def make_sdna():
+    # Упрощенное SDNA: Library (0), Image (1), ID (2), Volume (3), bSound (4) с короткими строками
+    names = [b"name[8]", b"id", b"filepath[16]", b"*packedfile", b"source", b"pad[2]", b"is_sequence", b"pad2[7]"]
+    types = [b"char", b"short", b"ID", b"Library", b"Image", b"PackedFile", b"Volume", b"bSound"]
+    lengths = [1, 2, 8, 24, 36, 0, 40, 32]
+    structs = [
+        (3, [(2, 1), (0, 2)]),
+        (4, [(2, 1), (0, 2), (5, 3), (1, 4), (0, 5)]),
+        (2, [(0, 0)]),
+        (6, [(2, 1), (0, 2), (5, 3), (0, 6), (0, 7)]),
+        (7, [(2, 1), (0, 2), (5, 3)]),
+    ]
+    return build_sdna(names, types, lengths, structs)
+
+
+def make_scene_sdna():
+    # ID (0), Scene (1), RenderData (2), ViewLayer (3), Object (4), FileGlobal (5)
+    names = [b"name[8]", b"id", b"*camera", b"r", b"engine[8]", b"type", b"pad[6]", b"*curscene"]
+    types = [b"char", b"short", b"ID", b"Scene", b"RenderData", b"ViewLayer", b"Object", b"FileGlobal"]
+    lengths = [1, 2, 8, 24, 8, 8, 16, 8]
+    structs = [
+        (2, [(0, 0)]),
+        (3, [(2, 1), (6, 2), (4, 3)]),
+        (4, [(0, 4)]),
+        (5, [(0, 0)]),
+        (6, [(2, 1), (1, 5), (0, 6)]),
+        (7, [(3, 7)]),
+    ]
+    return build_sdna(names, types, lengths, structs)
+
+
+def make_scene_block(name, camera, engine, address):
+    data = name.ljust(8, b"\x00") + struct.pack("<Q", camera) + engine.ljust(8, b"\x00")
+    return make_block(b"SC\x00\x00", data, sdna=1, address=address)
+
+
+def build_sdna(names, types, lengths, structs):
+    data = b"SDNA" + b"NAME" + struct.pack("<i", len(names)) + pad(b"".join(name + b"\x00" for name in names))
+    data += b"TYPE" + struct.pack("<i", len(types)) + pad(b"".join(name + b"\x00" for name in types))
+    data += b"TLEN" + pad(struct.pack(f"<{len(lengths)}h", *lengths))
+    data += b"STRC" + struct.pack("<i", len(structs))
+    for type_index, fields in structs:
+        data += struct.pack("<hh", type_index, len(fields))
+        data += b"".join(struct.pack("<hh", *field) for field in fields)
+    return make_block(b"DNA1", data)
+
+
+def make_id_block(code, sdna, name, path, packed=False, source=1, sequence=False):
+    data = name.ljust(8, b"\x00") + path.ljust(16, b"\x00")
+    if code == b"IM\x00\x00":
+        data += struct.pack("<Qh2x", 1 if packed else 0, source)
+    elif code == b"VO\x00\x00":
+        data += struct.pack("<Q?7x", 1 if packed else 0, sequence)
+    elif code == b"SO\x00\x00":
+        data += struct.pack("<Q", 1 if packed else 0)
+    return make_block(code, data, sdna=sdna)
+
+
+def make_blend(blocks, big_header=False):
+    header = b"BLENDER17-01v0500" if big_header else b"BLENDER-v402"
+    return header + b"".join(blocks) + make_block(b"ENDB", b"", big_header)
+
+
+class TestBlendFile(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('BlendFile').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_read_version_legacy_header(self):
+        # Arrange
+        path = self._write("legacy.blend", make_blend([]))
+
+        # Act
+        version = read_blend_version(path)
+
+        # Assert
+        self.assertEqual(version, 402)
+        self.assertEqual(format_version(version), "4.2")
+
+    def test_read_version_large_header(self):
+        # Arrange
+        path = self._write("large.blend", make_blend([], big_header=True))
+
+        # Act
+        version = read_blend_version(path)
+
+        # Assert
+        self.assertEqual(version, 500)
+
+    def test_read_version_not_blend(self):
+        # Arrange
+        path = self._write("notes.blend", b"not a blend file")
+
+        # Act & Assert
+        self.assertIsNone(read_blend_version(path))
+
+    def test_read_embedded_thumbnail_flips_rows(self):
+        # Arrange
+        blocks = [make_block(b"REND", b"\x00" * 16), make_thumbnail_block(2, 2), make_block(b"GLOB", b"\x00" * 8)]
+        path = self._write("thumb.blend", make_blend(blocks))
+
+        # Act
+        width, height, rgba = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertEqual((width, height), (2, 2))
+        self.assertEqual(rgba[:4], b"\x00\x00\xff\xff")
+        self.assertEqual(rgba[-4:], b"\xff\x00\x00\xff")
+
+    def test_read_embedded_thumbnail_large_header(self):
+        # Arrange
+        blocks = [make_block(b"REND", b"\x00" * 16, True), make_thumbnail_block(3, 1, True)]
+        path = self._write("thumb.blend", make_blend(blocks, big_header=True))
+
+        # Act
+        result = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertEqual(result[:2], (3, 1))
+
+    def test_read_embedded_thumbnail_gzip(self):
+        # Arrange
+        path = self._write("thumb.blend", gzip.compress(make_blend([make_thumbnail_block(2, 2)])))
+
+        # Act
+        result = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertEqual(result[:2], (2, 2))
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_read_embedded_thumbnail_zstd(self):
+        # Arrange
+        content = zstandard.ZstdCompressor().compress(make_blend([make_thumbnail_block(2, 2, True)], big_header=True))
+        path = self._write("thumb.blend", content)
+
+        # Act
+        result = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertEqual(result[:2], (2, 2))
+
+    def test_read_embedded_thumbnail_stops_after_leading_blocks(self):
+        # Arrange
+        blocks = [make_block(b"REND", b"\x00" * 16), make_block(b"GLOB", b"\x00" * 8), make_thumbnail_block(2, 2)]
+        path = self._write("late.blend", make_blend(blocks))
+
+        # Act
+        result = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_read_embedded_thumbnail_truncated(self):
+        # Arrange
+        path = self._write("broken.blend", make_blend([make_thumbnail_block(4, 4)])[:40])
+
+        # Act
+        result = read_embedded_thumbnail(path)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_extract_embedded_thumbnail_writes_png(self):
+        # Arrange
+        path = self._write("thumb.blend", make_blend([make_thumbnail_block(2, 2)]))
+        png_path = os.path.join(self.temp_dir.name, "thumbnails", "thumb.png")
+
+        # Act
+        result = extract_embedded_thumbnail(path, png_path)
+
+        # Assert
+        self.assertTrue(result)
+        with open(png_path, "rb") as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_parse_sdna(self):
+        # Arrange
+        path = self._write("dna.blend", make_blend([]))
+        with open(path, "rb") as f:
+            header = read_header(f)
+        data = make_sdna()[24:]
+
+        # Act
+        structs = parse_sdna(data, header)
+
+        # Assert
+        self.assertEqual([name for name, _fields in structs], ["Library", "Image", "ID", "Volume", "bSound"])
+        image_fields = structs[1][1]
+        self.assertEqual((image_fields["filepath"].offset, image_fields["filepath"].size), (8, 16))
+        self.assertEqual((image_fields["packedfile"].offset, image_fields["packedfile"].pointer), (24, True))
+        self.assertEqual(image_fields["source"].offset, 32)
+
+    def test_read_external_paths(self):
+        # Arrange
+        blocks = [
+            make_block(b"GLOB", b"\x00" * 8),
+            make_id_block(b"LI\x00\x00", 0, b"LIlib", b"//lib/lib.blend"),
+            make_id_block(b"IM\x00\x00", 1, b"IMwood", b"//tex/wood.png"),
+            make_id_block(b"IM\x00\x00", 1, b"IMpacked", b"//tex/packed.png", packed=True),
+            make_id_block(b"IM\x00\x00", 1, b"IMnoise", b"", source=4),
+            make_id_block(b"IM\x00\x00", 1, b"IMviewer", b"Viewer", source=5),
+            make_sdna(),
+        ]
+        path = self._write("shot.blend", make_blend(blocks))
+
+        # Act
+        references = read_external_paths(path)
+
+        # Assert
+        self.assertEqual(references, [BlendReference("library", "lib", "//lib/lib.blend"),
+                                      BlendReference("image", "wood", "//tex/wood.png")])
+
+    def test_read_external_paths_sequences_and_packed_files(self):
+        # Arrange
+        blocks = [
+            make_id_block(b"IM\x00\x00", 1, b"IMfire", b"//s/f_0001.png", source=2),
+            make_id_block(b"IM\x00\x00", 1, b"IMcolor", b"//c.<UDIM>.png", source=6),
+            make_id_block(b"VO\x00\x00", 3, b"VOsmoke", b"//v/s_0001.vdb", sequence=True),
+            make_id_block(b"VO\x00\x00", 3, b"VOcloud", b"//v/cloud.vdb", packed=True),
+            make_id_block(b"SO\x00\x00", 4, b"SOmusic", b"//a/music.wav"),
+            make_sdna(),
+        ]
+        path = self._write("fx.blend", make_blend(blocks))
+
+        # Act
+        references = read_external_paths(path)
+
+        # Assert
+        self.assertEqual(references, [BlendReference("image", "fire", "//s/f_0001.png", True),
+                                      BlendReference("image", "color", "//c.<UDIM>.png", True),
+                                      BlendReference("volume", "smoke", "//v/s_0001.vdb", True),
+                                      BlendReference("sound", "music", "//a/music.wav", False)])
+
+    def test_read_scene_info(self):
+        # Arrange
+        blocks = [
+            make_block(b"GLOB", struct.pack("<Q", 0x200), sdna=5),
+            make_scene_block(b"SCMain", 0x500, b"CYCLES", 0x100),
+            make_block(b"DATA", b"ViewLay".ljust(8, b"\x00"), sdna=3),
+            make_scene_block(b"SCEmpty", 0, b"WB", 0x200),
+            make_block(b"DATA", b"Layer".ljust(8, b"\x00"), sdna=3),
+            make_block(b"DATA", b"Extra".ljust(8, b"\x00"), sdna=3),
+            make_block(b"OB\x00\x00", b"OBCam".ljust(8, b"\x00") + struct.pack("<h6x", 11), sdna=4),
+            make_block(b"OB\x00\x00", b"OBCube".ljust(8, b"\x00") + struct.pack("<h6x", 1), sdna=4),
+            make_block(b"ID\x00\x00", b"OBRig".ljust(8, b"\x00"), sdna=0),
+            make_scene_sdna(),
+        ]
+        path = self._write("scenes.blend", make_blend(blocks))
+
+        # Act
+        scene_info = read_scene_info(path)
+
+        # Assert
+        self.assertEqual(scene_info.active_scene, "Empty")
+        self.assertEqual(scene_info.scenes, {"Main": SceneData(True, "CYCLES", ["ViewLay"]),
+                                             "Empty": SceneData(False, "WB", ["Layer", "Extra"])})
+        self.assertEqual(scene_info.objects, {"Cam": True, "Cube": False, "Rig": None})
+
+    def test_read_external_paths_without_sdna(self):
+        # Arrange
+        path = self._write("broken.blend", make_blend([make_id_block(b"IM\x00\x00", 1, b"IMwood", b"wood.png")]))
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            read_external_paths(path)
+
+    def test_extract_embedded_thumbnail_missing(self):
+        # Arrange
+        path = self._write("empty.blend", make_blend([make_block(b"REND", b"\x00" * 16)]))
+        png_path = os.path.join(self.temp_dir.name, "empty.png")
+
+        # Act
+        result = extract_embedded_thumbnail(path, png_path)
+
+        # Assert
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(png_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,23 @@
 import subprocess
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, call
 import logging
 from PyQt5.QtCore import QObject
 from managers.blender_manager import BlenderManager
 from dto.project import Project
+from dto.render_settings import RenderSettings
+from dto.render_variant import RenderVariant
+from util.preview_tiers import DEFAULT_PREVIEW_TIERS
+from managers.resource_allocator import CpuSlot, ResourceAllocator
+from managers.job_engine import JobEngine, RenderJob, RENDER, THUMBNAIL, QUEUED, DONE, FAILED, SKIPPED, RETRY_WAIT
+from managers.telemetry_store import TelemetryStore
+from managers.asset_cache import StagedFiles
+from managers.dependency_scanner import Dependency, DependencyReport
+from managers.preflight import PreflightResult
+from util.blend_file import SceneData, SceneInfo
+from util.blender_output import OutputStats, OutputTail
+from util.render_failures import RetryPolicy, OUT_OF_MEMORY, SCRIPT_ERROR, IO_ERROR
 
 
 class MockQObject(QObject):
@@ -21,6 +34,10 @@ class TestBlenderManager(unittest.TestCase):
         logging.getLogger('BlenderManager').setLevel(logging.CRITICAL)
         # Create a mock parent as a proper QObject
         self.mock_parent = MockQObject()
+        # Телеметрия в памяти: тесты не создают render_telemetry.db в рабочей папке
+        patcher = patch.object(BlenderManager, "_get_telemetry_db_path", return_value=":memory:")
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_init_with_parent(self):
         # Arrange
@@ -54,26 +71,22 @@ class TestBlenderManager(unittest.TestCase):
         # Assert
         self.mock_parent.signal.emit.assert_called_once_with("Error: Invalid project object")
 
-    @patch("threading.Thread")
-    def test_render_project_thumbnail_valid_project(self, mock_thread):
+    def test_render_project_thumbnail_valid_project(self):
         # Arrange
         manager = BlenderManager(self.mock_parent)
         project = MagicMock(spec=Project)
         project.file_path = "C:\\project.blend"
         project.unique_name = "project_1234"
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
 
-        # Act
-        manager.render_project_thumbnail(project)
+        with patch.object(manager, "_start_engine") as mock_start_engine:
+            # Act
+            manager.render_project_thumbnail(project)
 
-        # Assert
-        mock_thread.assert_called_once_with(
-            target=manager._start_render_thumbnail,
-            args=(project, unittest.mock.ANY)
-        )
-        mock_thread_instance.start.assert_called_once()
-        self.mock_parent.signal.emit.assert_called_with(f"Start render thumbnail: {project.file_path}")
+            # Assert
+            jobs = mock_start_engine.call_args.args[0]
+            self.assertEqual([(job.project, job.kind, job.force_render) for job in jobs],
+                             [(project, THUMBNAIL, False)])
+            self.assertTrue(mock_start_engine.call_args.kwargs["thumbnails"])
 
     def test_start_render_projects_invalid_type(self):
         # Arrange
@@ -101,100 +114,827 @@ class TestBlenderManager(unittest.TestCase):
     def test_start_render_projects_thumbnail_mode(self, mock_thread):
         # Arrange
         manager = BlenderManager(self.mock_parent)
-        projects = [MagicMock(spec=Project)]
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
+        manager.resource_allocator = ResourceAllocator(2, cores=[0, 1, 2, 3], numa_nodes={})
+        projects = [MagicMock(spec=Project), MagicMock(spec=Project)]
 
         # Act
         manager.start_render_projects(projects, isCreatingThumbnails=True)
 
         # Assert
-        mock_thread.assert_called_once_with(
-            target=manager._render_next_thumbnail,
-            args=(projects,)
-        )
-        mock_thread_instance.start.assert_called_once()
+        engine = manager._engines[0]
+        self.assertEqual([job.kind for job in engine.jobs], [THUMBNAIL, THUMBNAIL])
+        self.assertIsNone(engine.allocator)
+        mock_thread.assert_called_once_with(target=engine.run_lane, name="job_lane_0")
+        mock_thread.return_value.start.assert_called_once()
 
     @patch("threading.Thread")
     def test_start_render_projects_render_mode(self, mock_thread):
         # Arrange
         manager = BlenderManager(self.mock_parent)
         projects = [MagicMock(spec=Project)]
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
 
         # Act
         manager.start_render_projects(projects, isCreatingThumbnails=False)
 
         # Assert
-        mock_thread.assert_called_once_with(
-            target=manager._render_next,
-            args=(projects,)
-        )
-        mock_thread_instance.start.assert_called_once()
+        engine = manager._engines[0]
+        self.assertEqual([(job.project, job.kind) for job in engine.jobs], [(projects[0], RENDER)])
+        self.assertIs(engine.allocator, manager.resource_allocator)
+        # Проверки заданий идут в отдельном потоке, вызывающий (GUI) поток не ждет их
+        mock_thread.assert_called_once_with(target=engine._prepare_and_start, name="job_prepare")
 
-    def test_render_next_thumbnail_empty_list(self):
+    @patch("threading.Thread")
+    def test_start_render_projects_concurrent_lanes(self, mock_thread):
         # Arrange
         manager = BlenderManager(self.mock_parent)
-        projects = []
+        manager.resource_allocator = ResourceAllocator(2, cores=[0, 1, 2, 3], numa_nodes={})
+        projects = [MagicMock(spec=Project), MagicMock(spec=Project), MagicMock(spec=Project)]
 
         # Act
-        manager._render_next_thumbnail(projects)
+        manager.start_render_projects(projects, isCreatingThumbnails=False)
+        mock_thread.call_args.kwargs["target"]()
 
         # Assert
-        self.mock_parent.signal.emit.assert_called_once_with("All thumbnail renders completed.\n")
+        self.assertEqual(mock_thread.call_count, 3)
+        self.assertEqual(mock_thread.call_args.kwargs["name"], "job_lane_1")
 
-    def test_render_next_thumbnail_invalid_project(self):
+    def test_render_queue_runs_without_recursion(self):
         # Arrange
         manager = BlenderManager(self.mock_parent)
-        projects = [MagicMock(spec=[])]  # No attributes to fail hasattr checks
-        with patch.object(manager, "_on_render_thumbnails_complete") as mock_complete:
+        # Больше заданий, чем предел рекурсии; сигналы не нужны
+        manager.qt_signal = None
+        projects = [SimpleNamespace(file_path=f"C:\\scenes\\shot_{index}.blend", unique_name=f"shot_{index}",
+                                    settings=None, source_changed=False) for index in range(1500)]
+        finished = MagicMock()
+        with patch.object(manager, "_run_job") as mock_run_job:
+            engine = JobEngine(manager._execute_job, [RenderJob(project) for project in projects],
+                               on_finished=finished)
+
             # Act
-            manager._render_next_thumbnail(projects)
+            engine.run_lane()
 
-            # Assert
-            self.mock_parent.signal.emit.assert_called_once_with("Error: Invalid project object")
-            mock_complete.assert_called_once_with(projects)
+        # Assert
+        self.assertEqual(mock_run_job.call_count, 1500)
+        self.assertEqual(engine.counts(), {DONE: 1500})
+        finished.assert_called_once_with(engine)
+
+    def test_thumbnails_finished(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+
+        # Act
+        manager._on_thumbnails_finished(JobEngine(manager._execute_job))
+
+        # Assert
+        self.mock_parent.signal.emit.assert_called_once_with("All thumbnail renders completed.\n")
+
+    def test_execute_job_invalid_thumbnail_project(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        job = RenderJob(MagicMock(spec=[]), THUMBNAIL)  # No attributes to fail hasattr checks
+
+        # Act
+        manager._execute_job(job)
+
+        # Assert
+        self.mock_parent.signal.emit.assert_called_once_with("Error: Invalid project object")
+        self.assertEqual(job.state, SKIPPED)
 
     @patch("managers.blender_manager.utils")
-    def test_start_render_thumbnail_file_not_found(self, mock_utils):
+    def test_run_job_thumbnail_file_not_found(self, mock_utils):
         # Arrange
         manager = BlenderManager(self.mock_parent)
         project = MagicMock(spec=Project)
         project.file_path = "C:\\project.blend"
         project.unique_name = "project_1234"
         mock_utils.is_path_exists.return_value = False
-        callback = MagicMock()
+        job = RenderJob(project, THUMBNAIL)
 
         # Act
-        manager._start_render_thumbnail(project, callback)
+        manager._run_job(job)
 
         # Assert
         self.mock_parent.signal.emit.assert_called_once_with(f"File {project.file_path} not found.")
-        callback.assert_called_once()
+        self.assertEqual(job.state, FAILED)
 
-    def test_render_next_empty_list(self):
+    @patch("managers.blender_manager.subprocess.Popen")
+    @patch("managers.blender_manager.blend_file.extract_embedded_thumbnail", return_value=True)
+    @patch("managers.blender_manager.utils")
+    def test_run_job_thumbnail_uses_embedded(self, mock_utils, mock_extract, mock_popen):
         # Arrange
         manager = BlenderManager(self.mock_parent)
-        projects = []
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\project.blend"
+        project.unique_name = "project_1234"
+        mock_utils.is_path_exists.return_value = True
+        mock_utils.path_to_thumbnail.return_value = "C:\\thumbnails\\project_1234.png"
+        job = RenderJob(project, THUMBNAIL)
+
+        # Act
+        manager._run_job(job)
+
+        # Assert
+        mock_extract.assert_called_once_with(project.file_path, "C:\\thumbnails\\project_1234.png")
+        mock_popen.assert_not_called()
+        self.assertEqual(job.state, DONE)
+
+    @patch("managers.blender_manager.blend_file.extract_embedded_thumbnail")
+    @patch("managers.blender_manager.utils")
+    def test_run_job_thumbnail_force_render_skips_embedded(self, mock_utils, mock_extract):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\project.blend"
+        project.unique_name = "project_1234"
+        # Файл проекта есть, скрипта превью нет
+        mock_utils.is_path_exists.side_effect = [True, False]
+        mock_utils.get_config_value.return_value = "C:\\work"
+        job = RenderJob(project, THUMBNAIL, force_render=True)
 
         # Act
-        manager._render_next(projects)
+        manager._run_job(job)
+
+        # Assert
+        mock_extract.assert_not_called()
+        self.mock_parent.signal.emit.assert_called_once_with("File render_preview_script.py not found.")
+        self.assertEqual(job.state, FAILED)
+
+    def test_renders_finished(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+
+        # Act
+        manager._on_renders_finished(JobEngine(manager._execute_job))
 
         # Assert
         self.mock_parent.signal.emit.assert_called_once_with("All renders completed.\n")
 
-    def test_render_next_invalid_project(self):
+    def test_execute_job_invalid_render_project(self):
         # Arrange
         manager = BlenderManager(self.mock_parent)
-        projects = [MagicMock(spec=[])]  # No attributes to fail hasattr checks
-        with patch.object(manager, "_on_render_complete") as mock_complete:
+        job = RenderJob(MagicMock(spec=[]))  # No attributes to fail hasattr checks
+
+        with patch.object(manager, "_run_job") as mock_run_job:
             # Act
-            manager._render_next(projects)
+            manager._execute_job(job)
 
             # Assert
             self.mock_parent.signal.emit.assert_called_once_with("Error: Invalid project object")
-            mock_complete.assert_called_once_with(projects)
+            mock_run_job.assert_not_called()
+            self.assertEqual(job.state, SKIPPED)
+
+    @patch("managers.blender_manager.job_spec.write_job_spec", return_value="C:\\tmp\\job.json")
+    @patch("managers.blender_manager.job_spec.remove_job_spec")
+    @patch("managers.blender_manager.utils")
+    def test_run_job_render_failure_is_retried(self, mock_utils, mock_remove_job_spec, mock_write_job_spec):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.retry_policy = RetryPolicy(max_attempts=2, base_delay=0, jitter=0)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.unique_name = "shot_1234"
+        project.settings = RenderSettings(frame_start=1, frame_end=3)
+        project.variants = [RenderVariant("wide", animation=True)]
+        mock_utils.is_path_exists.return_value = True
+        mock_utils.get_config_value.side_effect = {"work_directory": "C:\\work"}.get
+        mock_utils.transform_path_to_standard.side_effect = lambda path: path
+        stats = OutputStats()
+        stats.feed("Saved: 'C:\\out\\shot_wide_0001.png'")
+        tail = OutputTail()
+        tail.append("STDERR: CUDA error: Out of memory in cuMemAlloc")
+        job = RenderJob(project)
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"), \
+                patch.object(manager, "_run_blender", return_value=(1, stats, tail)), \
+                patch.object(manager, "_record_telemetry") as mock_record_telemetry:
+            # Act
+            manager._run_job(job)
+
+        # Assert
+        self.assertEqual((job.state, job.attempt, job.failure), (RETRY_WAIT, 2, OUT_OF_MEMORY))
+        self.assertEqual(job.spec["variants"][0]["overrides"]["Frame Start"], 2)
+        self.assertEqual(job.outputs, ["C:\\out\\shot_wide_0001.png"])
+        mock_record_telemetry.assert_called_once_with(project, "C:\\blender.exe", stats, 1, kind=RENDER, attempt=1,
+                                                      failure=OUT_OF_MEMORY, queued_at=job.queued_at)
+        mock_remove_job_spec.assert_called_once_with("C:\\tmp\\job.json")
+
+    def test_prepare_scratch(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.scratch = {"directory": "D:\\scratch", "uploads": 2, "verify": "size"}
+        manager.uploader = MagicMock()
+        project = SimpleNamespace(file_path="C:\\scenes\\shot.blend", unique_name="shot_1234")
+        spec = {"settings": {"Output Path": "C:\\out"}, "variants": [{"name": "wide"}]}
+
+        # Act
+        upload, run_spec = manager._prepare_scratch(RenderJob(project), spec)
+
+        # Assert
+        self.assertIs(upload, manager.uploader.start_batch.return_value)
+        scratch_dir = manager.uploader.start_batch.call_args[0][0]
+        self.assertTrue(scratch_dir.startswith("D:\\scratch"))
+        self.assertEqual(manager.uploader.start_batch.call_args[0][1], "C:\\out")
+        self.assertEqual(run_spec["settings"]["Output Path"], scratch_dir)
+        self.assertEqual(spec["settings"]["Output Path"], "C:\\out")
+
+    def test_prepare_scratch_skips_variant_output_paths(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.scratch = {"directory": "D:\\scratch", "uploads": 2, "verify": "size"}
+        manager.uploader = MagicMock()
+        project = SimpleNamespace(file_path="C:\\scenes\\shot.blend", unique_name="shot_1234")
+        spec = {"settings": {"Output Path": "C:\\out"},
+                "variants": [{"name": "wide", "overrides": {"Output Path": "C:\\wide"}}]}
+
+        # Act
+        upload, run_spec = manager._prepare_scratch(RenderJob(project), spec)
+
+        # Assert
+        self.assertIsNone(upload)
+        self.assertIs(run_spec, spec)
+        manager.uploader.start_batch.assert_not_called()
+
+    def _make_preflight_manager(self, dependencies=(), fail_on_missing=True):
+        manager = BlenderManager(self.mock_parent)
+        manager.dependency_scan = {"backend": "sdna", "fail_on_missing": fail_on_missing}
+        manager.dependency_scanner = MagicMock()
+        manager.dependency_scanner.scan.return_value = DependencyReport("C:\\scenes\\shot.blend", "sdna",
+                                                                        list(dependencies))
+        manager.scene_info = MagicMock()
+        manager.scene_info.get.return_value = SceneInfo("Scene", {"Scene": SceneData(True, "CYCLES", ["ViewLayer"])},
+                                                        {"Camera": True})
+        return manager
+
+    @patch("managers.blender_manager.check_render_spec", return_value=[])
+    @patch("managers.blender_manager.utils.is_path_exists", return_value=True)
+    def test_preflight_job_reports_missing_dependencies(self, mock_is_path_exists, mock_check_render_spec):
+        # Arrange
+        manager = self._make_preflight_manager([
+            Dependency("image", "wood", "c:\\scenes\\tex\\wood.png", ["c:\\scenes\\tex\\wood.png"], 2048,
+                       "c:\\scenes\\shot.blend"),
+            Dependency("library", "props", "c:\\lib\\props.blend", [], 0, "c:\\scenes\\shot.blend"),
+        ])
+        project = Project("C:\\scenes\\shot.blend")
+        project.settings = RenderSettings(output_path="C:\\out")
+        manager.progress.add(project.unique_name, "shot.blend")
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"):
+            # Act
+            result = manager._preflight_job(RenderJob(project))
+
+        # Assert
+        self.assertEqual(result.problems, ["missing library props: c:\\lib\\props.blend"])
+        self.assertEqual(manager.progress.changes()[1][0].input_bytes, 2048)
+        mock_check_render_spec.assert_called_once_with(project.file_path, manager._build_render_spec(project),
+                                                       manager.scene_info.get.return_value)
+
+    @patch("managers.blender_manager.utils.is_path_exists", return_value=True)
+    def test_preflight_job_collects_every_problem(self, mock_is_path_exists):
+        # Arrange
+        manager = self._make_preflight_manager(
+            [Dependency("sound", "music", "c:\\audio\\music.wav", [], 0, "c:\\scenes\\shot.blend")],
+            fail_on_missing=False)
+        manager.scene_info.get.return_value = SceneInfo("Scene", {"Scene": SceneData(False, "CYCLES", [])}, {})
+        project = Project("C:\\scenes\\shot.blend")
+        project.settings = RenderSettings(output_path="", render_engine="BLENDER_WORKBENCH", file_format="FFMPEG")
+
+        with patch.object(manager, "_select_blender_executable", return_value=None):
+            # Act
+            result = manager._preflight_job(RenderJob(project), "render script C:\\work\\render_script.py not found")
+
+        # Assert
+        self.assertEqual(result.problems, [
+            "render script C:\\work\\render_script.py not found",
+            "output path is empty",
+            "render engine BLENDER_WORKBENCH is not supported, use Cycles or EEVEE",
+            "movie format FFMPEG cannot be used for a still image",
+            "scene Scene has no camera",
+            "Blender executable None not found",
+        ])
+        self.assertEqual(result.warnings, ["missing sound music: c:\\audio\\music.wav"])
+
+    @patch("managers.blender_manager.utils.is_path_exists", return_value=True)
+    def test_preflight_job_unreadable_file_is_not_fatal(self, mock_is_path_exists):
+        # Arrange
+        manager = self._make_preflight_manager()
+        manager.scene_info.get.side_effect = ValueError("No SDNA block in .blend file")
+        manager.dependency_scanner.scan.side_effect = ValueError("No SDNA block in .blend file")
+        project = Project("C:\\scenes\\shot.blend")
+        project.settings = RenderSettings(output_path="C:\\out")
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"), \
+                patch("managers.blender_manager.check_render_spec", return_value=[]):
+            # Act
+            result = manager._preflight_job(RenderJob(project))
+
+        # Assert
+        self.assertTrue(result.passed)
+        self.assertEqual(len(result.warnings), 2)
+
+    def test_prepare_renders(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.asset_cache = MagicMock()
+        jobs = [RenderJob(SimpleNamespace(file_path="C:\\scenes\\shot.blend", unique_name="shot", settings=None))]
+
+        with patch.object(manager, "_track_progress") as mock_track_progress, \
+                patch.object(manager, "_preflight", return_value=jobs) as mock_preflight, \
+                patch.object(manager, "get_settings_from_project", return_value=None) as mock_get_settings:
+            # Act
+            ready = manager._prepare_renders(jobs + [RenderJob(object())])
+
+        # Assert
+        self.assertEqual(ready, jobs)
+        mock_get_settings.assert_called_once_with("C:\\scenes\\shot.blend")
+        mock_track_progress.assert_called_once()
+        mock_preflight.assert_called_once()
+        manager.asset_cache.prefetch.assert_called_once_with(["C:\\scenes\\shot.blend"])
+
+    def test_load_missing_settings(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        loaded = Project("C:\\scenes\\loaded.blend")
+        loaded.settings = RenderSettings(output_path="C:\\out")
+        missing = Project("C:\\scenes\\missing.blend")
+        unreadable = Project("C:\\scenes\\unreadable.blend")
+        settings = RenderSettings(output_path="C:\\renders")
+
+        def get_settings(file_path):
+            return settings if file_path == missing.file_path else None
+
+        with patch.object(manager, "get_settings_from_project", side_effect=get_settings) as mock_get_settings:
+            # Act
+            manager._load_missing_settings([RenderJob(loaded), RenderJob(missing), RenderJob(unreadable),
+                                            RenderJob(object())])
+
+        # Assert
+        self.assertEqual([c.args[0] for c in mock_get_settings.call_args_list],
+                         [missing.file_path, unreadable.file_path])
+        self.assertEqual(missing.settings.output_path, "C:\\renders")
+        self.assertEqual(loaded.settings.output_path, "C:\\out")
+        self.assertIsNone(unreadable.settings)
+
+    @patch("managers.blender_manager.utils.is_path_exists", return_value=True)
+    def test_preflight_job_rejects_project_without_settings(self, mock_is_path_exists):
+        # Arrange
+        manager = self._make_preflight_manager()
+        project = Project("C:\\scenes\\shot.blend")
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"):
+            # Act
+            result = manager._preflight_job(RenderJob(project))
+
+        # Assert
+        self.assertEqual(result.problems, ["project settings not available"])
+        manager.scene_info.get.assert_not_called()
+
+    def test_preflight_rejects_jobs_before_start(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        good = RenderJob(SimpleNamespace(file_path="C:\\scenes\\good.blend", unique_name="good", settings=None))
+        bad = RenderJob(SimpleNamespace(file_path="C:\\scenes\\bad.blend", unique_name="bad", settings=None))
+        invalid = RenderJob(object())
+        manager._track_progress([good, bad])
+
+        def preflight_job(job, script_problem=None):
+            problems = ["scene Scene has no camera", "output path is empty"] if job is bad else []
+            return PreflightResult(job, problems)
+
+        with patch.object(manager, "_preflight_job", side_effect=preflight_job):
+            # Act
+            jobs = manager._preflight([good, bad, invalid])
+
+        # Assert
+        self.assertEqual(jobs, [good, invalid])
+        self.assertEqual(bad.state, FAILED)
+        report = self.mock_parent.signal.emit.call_args[0][0]
+        self.assertIn("rejected 1 of 3 jobs", report)
+        self.assertIn("scene Scene has no camera", report)
+        self.assertIn("output path is empty", report)
+        self.assertEqual({job.key: job.state for job in manager.progress.changes()[1]},
+                         {"good": QUEUED, "bad": FAILED})
+
+    def test_stage_assets(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.asset_cache = MagicMock()
+        manager.asset_cache.stage.return_value = StagedFiles(
+            "D:\\cache\\files\\c\\scenes\\shot.blend", "C:\\scenes\\shot.blend",
+            {"c:\\scenes\\shot.blend": "D:\\cache\\files\\c\\scenes\\shot.blend",
+             "c:\\tex\\wood.png": "D:\\cache\\files\\c\\tex\\wood.png"})
+        project = SimpleNamespace(file_path="C:\\scenes\\shot.blend", unique_name="shot_1234")
+        spec = {"blend_file": "C:\\scenes\\shot.blend", "settings": {}}
+
+        # Act
+        staged, run_spec = manager._stage_assets(RenderJob(project), spec)
+
+        # Assert
+        self.assertIs(staged, manager.asset_cache.stage.return_value)
+        self.assertEqual(run_spec["blend_file"], "D:\\cache\\files\\c\\scenes\\shot.blend")
+        self.assertEqual(run_spec["source_blend_file"], "C:\\scenes\\shot.blend")
+        self.assertEqual(run_spec["asset_paths"], staged.path_map)
+        self.assertEqual(spec["blend_file"], "C:\\scenes\\shot.blend")
+
+    def test_stage_assets_falls_back_to_storage(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.asset_cache = MagicMock()
+        manager.asset_cache.stage.side_effect = OSError("Asset cache is full")
+        project = SimpleNamespace(file_path="C:\\scenes\\shot.blend", unique_name="shot_1234")
+        spec = {"blend_file": "C:\\scenes\\shot.blend", "settings": {}}
+
+        # Act
+        staged, run_spec = manager._stage_assets(RenderJob(project), spec)
+
+        # Assert
+        self.assertIsNone(staged)
+        self.assertIs(run_spec, spec)
+
+    @patch("managers.blender_manager.job_spec.write_job_spec", return_value="C:\\tmp\\job.json")
+    @patch("managers.blender_manager.job_spec.remove_job_spec")
+    @patch("managers.blender_manager.utils")
+    def test_run_job_failed_upload_is_retried(self, mock_utils, mock_remove_job_spec, mock_write_job_spec):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.retry_policy = RetryPolicy(max_attempts=2, base_delay=0, jitter=0)
+        upload = MagicMock()
+        manager.uploader = MagicMock()
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.unique_name = "shot_1234"
+        project.settings = RenderSettings(frame_start=1, frame_end=2, output_path="C:\\out")
+        project.variants = [RenderVariant("wide", animation=True)]
+        mock_utils.is_path_exists.return_value = True
+        mock_utils.get_config_value.side_effect = {"work_directory": "C:\\work"}.get
+        mock_utils.transform_path_to_standard.side_effect = lambda path: path
+        stats = OutputStats()
+        stats.feed("Saved: 'D:\\scratch\\shot_wide_0001.png'")
+        stats.feed("Saved: 'D:\\scratch\\shot_wide_0002.png'")
+        manager.uploader.finish.return_value = {"D:\\scratch\\shot_wide_0001.png": "C:\\out\\shot_wide_0001.png"}
+        job = RenderJob(project)
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"), \
+                patch.object(manager, "_prepare_scratch", side_effect=lambda job, spec: (upload, spec)), \
+                patch.object(manager, "_run_blender", return_value=(0, stats, OutputTail())) as mock_run_blender, \
+                patch.object(manager, "_record_telemetry"):
+            # Act
+            manager._run_job(job)
+
+        # Assert
+        self.assertIs(mock_run_blender.call_args[0][5], upload)
+        manager.uploader.finish.assert_called_once_with(upload)
+        self.assertEqual((job.state, job.failure), (RETRY_WAIT, IO_ERROR))
+        self.assertEqual(job.outputs, ["C:\\out\\shot_wide_0001.png"])
+        self.assertEqual(job.spec["variants"][0]["overrides"]["Frame Start"], 2)
+
+    @patch("managers.blender_manager.affinity_command_prefix", return_value=["/usr/bin/taskset", "-c", "0,1"])
+    @patch("managers.blender_manager.job_spec.write_job_spec", return_value="C:\\work\\job.json")
+    @patch("managers.blender_manager.job_spec.remove_job_spec")
+    @patch("managers.blender_manager.utils")
+    def test_run_job_pins_blender_at_spawn(self, mock_utils, mock_remove_job_spec, mock_write_job_spec,
+                                           mock_affinity_command_prefix):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.uploader = None
+        manager.asset_cache = None
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.unique_name = "shot_1234"
+        project.settings = RenderSettings(threads=0)
+        project.variants = []
+        mock_utils.is_path_exists.return_value = True
+        mock_utils.get_config_value.side_effect = {"work_directory": "C:\\work"}.get
+        mock_utils.transform_path_to_standard.side_effect = lambda path: path
+        slot = CpuSlot(0, (0, 1))
+
+        with patch.object(manager, "_select_blender_executable", return_value="C:\\blender.exe"), \
+                patch.object(manager, "_run_blender", return_value=(0, OutputStats(), OutputTail())) as mock_run_blender, \
+                patch.object(manager, "_record_telemetry"):
+            # Act
+            manager._run_job(RenderJob(project), slot)
+
+        # Assert
+        command = mock_run_blender.call_args[0][1]
+        self.assertEqual(command[:4], ["/usr/bin/taskset", "-c", "0,1", "C:\\blender.exe"])
+        self.assertEqual(command[command.index("--threads") + 1], "2")
+        self.assertEqual(command[command.index("--python-exit-code") + 1], "1")
+        # Процесс уже привязан командой, повторно после запуска не привязывается
+        self.assertIsNone(mock_run_blender.call_args[0][4])
+
+    def test_track_progress(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.telemetry = MagicMock(spec=TelemetryStore)
+        manager.telemetry.average_frame_seconds.return_value = {"shot_1234": 4.0}
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.unique_name = "shot_1234"
+        project.settings = RenderSettings(frame_start=1, frame_end=3)
+        project.variants = [RenderVariant("wide", animation=True), RenderVariant("still")]
+        unread = SimpleNamespace(file_path="C:\\scenes\\new.blend", unique_name="new_1", settings=None)
+
+        # Act
+        manager._track_progress([RenderJob(project), RenderJob(unread)])
+        _, (shot, new) = manager.progress.changes()
+
+        # Assert
+        self.assertEqual((shot.frames_total, shot.frame_seconds), (4, 4.0))
+        self.assertEqual(shot.remaining_seconds(), 16.0)
+        self.assertIsNone(new.frames_total)
+
+    def test_build_render_spec_without_variants(self):
+        # Arrange
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\project.blend"
+        project.settings = RenderSettings()
+        project.variants = []
+
+        # Act
+        spec = BlenderManager._build_render_spec(project)
+
+        # Assert
+        self.assertEqual(spec["kind"], "render")
+        self.assertEqual(spec["blend_file"], project.file_path)
+        self.assertEqual(spec["settings"], project.settings.to_dict())
+        self.assertNotIn("variants", spec)
+
+    def test_build_render_spec_with_variants(self):
+        # Arrange
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\project.blend"
+        project.settings = RenderSettings()
+        project.variants = [RenderVariant("front", camera="CamFront"), RenderVariant("side", camera="CamSide")]
+
+        # Act
+        spec = BlenderManager._build_render_spec(project)
+
+        # Assert
+        self.assertEqual([variant["camera"] for variant in spec["variants"]], ["CamFront", "CamSide"])
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=None)
+    def test_get_preview_tiers_default(self, mock_get_config_value):
+        # Act
+        tiers = BlenderManager._get_preview_tiers()
+
+        # Assert
+        self.assertEqual(tiers, DEFAULT_PREVIEW_TIERS)
+        mock_get_config_value.assert_called_once_with("preview_tiers")
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=[{"name": "bad"}])
+    def test_get_preview_tiers_invalid_config(self, mock_get_config_value):
+        # Act
+        tiers = BlenderManager._get_preview_tiers()
+
+        # Assert
+        self.assertEqual(tiers, DEFAULT_PREVIEW_TIERS)
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=[{"step": "checksum_manifest"}])
+    def test_post_process_submits_outputs(self, mock_get_config_value):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.settings = RenderSettings(fps=50, fps_base=2.0)
+        outputs = ["/out/shot_0001.png", "/out/shot_0002.png"]
+
+        with patch.object(manager.post_processor, "submit") as mock_submit:
+            # Act
+            manager._post_process(project, outputs)
+
+            # Assert
+            mock_submit.assert_called_once_with("shot", "/out", outputs, [{"step": "checksum_manifest"}], fps=25.0,
+                                                on_done=None)
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=None)
+    def test_record_telemetry(self, mock_get_config_value):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.telemetry = TelemetryStore(":memory:")
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.unique_name = "shot_1234"
+        project.settings = RenderSettings(render_engine="CYCLES", cycles_samples=32, resolution_scale=50)
+        stats = OutputStats(started_at=100.0)
+        stats.feed("Blender 4.2.7 LTS (hash 123)", timestamp=101.0)
+        stats.feed("Saved: 'C:\\out\\shot.png'", timestamp=105.0)
+
+        # Act
+        job_id = manager._record_telemetry(project, "C:\\blender.exe", stats, 0, queued_at=90.0)
+
+        # Assert
+        job = manager.telemetry.jobs()[0]
+        self.assertEqual(job["id"], job_id)
+        self.assertEqual((job["blender_version"], job["engine"], job["samples"]), ("4.2.7", "CYCLES", 32))
+        self.assertEqual((job["queue_wait"], job["startup"], job["frame_count"]), (10.0, 1.0, 1))
+        self.assertEqual(job["resolution_x"], 960)
+
+    def test_phase_durations_from_markers(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        stats = OutputStats(started_at=10.0)
+        for line in ("BLENDER_PHASE script_start 12.0", "BLENDER_PHASE file_load_start 12.0",
+                     "BLENDER_PHASE file_load_end 14.0", "BLENDER_PHASE render_start 14.5",
+                     "BLENDER_PHASE render_end 20.5", "BLENDER_PHASE script_end 21.0"):
+            stats.feed(line)
+
+        # Act
+        durations = manager._phase_durations(project, stats, finished_at=21.5)
+
+        # Assert
+        self.assertEqual(durations, {"startup": 2.0, "file_load": 2.0, "setup": 0.5, "render": 6.0, "shutdown": 0.5})
+        self.mock_parent.signal.emit.assert_called_once_with(
+            "Phases: startup 2.00s, file_load 2.00s, setup 0.50s, render 6.00s, shutdown 0.50s"
+        )
+
+    def test_shutdown_waits_for_background_work(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.uploader = MagicMock()
+        manager.post_processor = MagicMock()
+        manager.asset_cache = MagicMock()
+        manager.telemetry = MagicMock(spec=TelemetryStore)
+
+        # Act
+        manager.shutdown()
+
+        # Assert
+        manager.uploader.shutdown.assert_called_once_with(wait=True)
+        manager.post_processor.shutdown.assert_called_once_with(wait=True)
+        manager.asset_cache.shutdown.assert_called_once_with(wait=False)
+        manager.telemetry.close.assert_called_once_with()
+
+    def test_get_output_tail(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        tail = manager.output_tails["shot_1234"] = OutputTail(max_lines=2)
+        for line in ("STDOUT: Blender 4.2.7", "STDOUT: Fra:1", "STDERR: Error: out of memory"):
+            tail.append(line)
+
+        # Act
+        lines = manager.get_output_tail("shot_1234")
+
+        # Assert
+        self.assertEqual(lines, ["STDOUT: Fra:1", "STDERR: Error: out of memory"])
+        self.assertEqual(manager.get_output_tail("missing_1234"), [])
+
+    @patch("managers.blender_manager.MAX_OUTPUT_TAILS", 2)
+    def test_output_tails_are_capped(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        first = manager._new_output_tail("first_1234")
+        manager._new_output_tail("second_1234")
+
+        # Act
+        restarted = manager._new_output_tail("first_1234")
+        manager._new_output_tail("third_1234")
+
+        # Assert
+        self.assertEqual(list(manager.output_tails), ["first_1234", "third_1234"])
+        self.assertIsNot(restarted, first)
+        self.assertEqual(manager.get_output_tail("second_1234"), [])
+
+    @patch("managers.blender_manager.blend_file.read_blend_version", return_value=306)
+    @patch("managers.blender_manager.utils")
+    def test_select_blender_executable_by_file_version(self, mock_utils, mock_read_blend_version):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\old.blend"
+        project.pinned_version = None
+        config = {
+            "current_bin": "C:\\Blender\\4.2\\blender.exe",
+            "bin_paths": {"C:\\Blender\\3.6\\blender.exe": "Blender 3.6.22",
+                          "C:\\Blender\\4.2\\blender.exe": "Blender 4.2.7 LTS"},
+        }
+        mock_utils.get_config_value.side_effect = config.get
+        mock_utils.is_path_exists.return_value = True
+
+        # Act
+        blender_executable = manager._select_blender_executable(project)
+
+        # Assert
+        self.assertEqual(blender_executable, "C:\\Blender\\3.6\\blender.exe")
+
+    @patch("managers.blender_manager.blend_file.read_blend_version")
+    @patch("managers.blender_manager.utils")
+    def test_select_blender_executable_pinned_missing(self, mock_utils, mock_read_blend_version):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        project.pinned_version = "2.93"
+        config = {"current_bin": "C:\\Blender\\4.2\\blender.exe",
+                  "bin_paths": {"C:\\Blender\\4.2\\blender.exe": "Blender 4.2.7 LTS"}}
+        mock_utils.get_config_value.side_effect = config.get
+        mock_utils.is_path_exists.return_value = True
+
+        # Act
+        blender_executable = manager._select_blender_executable(project)
+
+        # Assert
+        self.assertIsNone(blender_executable)
+        mock_read_blend_version.assert_not_called()
+        self.mock_parent.signal.emit.assert_called_once_with(
+            "Pinned Blender 2.93 is not installed for C:\\scenes\\shot.blend"
+        )
+
+    def test_plan_retry_narrows_frames(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.retry_policy = RetryPolicy(max_attempts=2)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        spec = {
+            "blend_file": "C:\\scenes\\shot.blend",
+            "settings": {"Frame Start": 1, "Frame End": 3, "Frame Step": 1},
+            "variants": [{"name": "", "overrides": {}, "animation": True}],
+        }
+
+        # Act
+        retry_spec = manager._plan_retry(project, spec, ["C:\\out\\shot_0001.png"], OUT_OF_MEMORY, 1)
+
+        # Assert
+        self.assertEqual(retry_spec["variants"][0]["overrides"], {"Frame Start": 2})
+
+    def test_plan_retry_stops(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        manager.retry_policy = RetryPolicy(max_attempts=2)
+        project = MagicMock(spec=Project)
+        project.file_path = "C:\\scenes\\shot.blend"
+        spec = {"blend_file": "C:\\scenes\\shot.blend", "settings": {}}
+
+        # Act & Assert
+        self.assertIsNone(manager._plan_retry(project, spec, [], SCRIPT_ERROR, 1))
+        self.assertIsNone(manager._plan_retry(project, spec, [], OUT_OF_MEMORY, 2))
+        self.mock_parent.signal.emit.assert_called_with("Giving up on C:\\scenes\\shot.blend after 2 attempts")
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value={"max_attempts": "three"})
+    def test_get_retry_policy_invalid_config(self, mock_get_config_value):
+        # Act
+        policy = BlenderManager._get_retry_policy()
+
+        # Assert
+        self.assertEqual(policy.max_attempts, RetryPolicy().max_attempts)
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=0)
+    def test_get_concurrent_renders_invalid_config(self, mock_get_config_value):
+        # Act
+        concurrent_renders = BlenderManager._get_concurrent_renders()
+
+        # Assert
+        self.assertEqual(concurrent_renders, 1)
+
+    @patch("managers.blender_manager.utils.get_config_value", return_value=[{"step": "unknown"}])
+    def test_get_post_process_steps_invalid_config(self, mock_get_config_value):
+        # Act
+        steps = BlenderManager._get_post_process_steps()
+
+        # Assert
+        self.assertEqual(steps, [])
+
+    def test_extract_settings_in_background(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        loaded = MagicMock(spec=Project)
+        loaded.file_path = "C:\\loaded.blend"
+        loaded.settings = {"Frame": 1}
+        pending = MagicMock(spec=Project)
+        pending.file_path = "C:\\pending.blend"
+        pending.settings = {}
+        expected_settings = {"Frame": 5}
+        with patch.object(manager, "get_settings_from_project", return_value=expected_settings) as mock_get:
+            # Act
+            manager.extract_settings_in_background([loaded, pending])
+            manager._metadata_queue.join()
+
+            # Assert
+            mock_get.assert_called_once_with(pending.file_path)
+            pending.apply_source_settings.assert_called_once_with(expected_settings)
+            loaded.apply_source_settings.assert_not_called()
+
+    def test_extract_settings_in_background_refresh(self):
+        # Arrange
+        manager = BlenderManager(self.mock_parent)
+        loaded = MagicMock(spec=Project)
+        loaded.file_path = "C:\\loaded.blend"
+        loaded.settings = RenderSettings()
+        unreadable = MagicMock(spec=Project)
+        unreadable.file_path = "C:\\unreadable.blend"
+        unreadable.settings = RenderSettings()
+        fresh_settings = RenderSettings(frame_end=10)
+        with patch.object(manager, "get_settings_from_project",
+                          side_effect=lambda path: fresh_settings if path == loaded.file_path else None):
+            # Act
+            manager.extract_settings_in_background([loaded, unreadable], refresh=True)
+            manager._metadata_queue.join()
+
+        # Assert
+        loaded.apply_source_settings.assert_called_once_with(fresh_settings)
+        # Пока новые настройки не прочитаны, у проекта остаются старые
+        unreadable.apply_source_settings.assert_not_called()
 
     def test_get_settings_from_project_invalid_path_type(self):
         # Arrange
@@ -0,0 +1,147 @@
+import unittest
+from util.blender_output import (
+    OutputStats,
+    OutputTail,
+    parse_saved_path,
+    parse_duration,
+    parse_version_banner,
+    parse_progress,
+    parse_samples,
+    parse_frame_time
+)
+
+
+class TestBlenderOutput(unittest.TestCase):
+    def test_parse_saved_path_legacy(self):
+        # Arrange
+        line = "Saved: 'C:\\renders\\shot_0001.png'\n"
+
+        # Act
+        result = parse_saved_path(line)
+
+        # Assert
+        self.assertEqual(result, "C:\\renders\\shot_0001.png")
+
+    def test_parse_saved_path_with_log_prefix(self):
+        # Arrange
+        line = "00:01.099  render           | Saved: '/tmp/out/shot_0002.png'"
+
+        # Act
+        result = parse_saved_path(line)
+
+        # Assert
+        self.assertEqual(result, "/tmp/out/shot_0002.png")
+
+    def test_parse_saved_path_other_output(self):
+        # Arrange
+        line = "Fra:1 Mem:12.00M (Peak 14.00M) | Time:00:00.10 | Rendering 1 / 64 samples"
+
+        # Act
+        result = parse_saved_path(line)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_parse_duration(self):
+        # Act & Assert
+        self.assertAlmostEqual(parse_duration("00:01.51"), 1.51)
+        self.assertAlmostEqual(parse_duration("01:02:03.50"), 3723.5)
+
+    def test_parse_version_banner(self):
+        # Act & Assert
+        self.assertEqual(parse_version_banner("Blender 4.2.7 LTS (hash 1234 built 2025-01-01)"), "4.2.7")
+        self.assertIsNone(parse_version_banner("Read blend: C:\\scene.blend"))
+
+    def test_parse_progress(self):
+        # Arrange
+        line = "Fra:12 Mem:512.00M (Peak 1.50G) | Time:00:02.25 | Mem:0.00M, Peak:0.00M | Scene | Sample 1/64"
+
+        # Act
+        frame, memory, peak, elapsed = parse_progress(line)
+
+        # Assert
+        self.assertEqual(frame, 12)
+        self.assertEqual(memory, 512.0)
+        self.assertEqual(peak, 1536.0)
+        self.assertAlmostEqual(elapsed, 2.25)
+
+    def test_parse_samples(self):
+        # Act & Assert
+        self.assertEqual(parse_samples("Fra:3 Mem:9.40M (Peak 9.93M) | Time:00:02.50 | Scene, ViewLayer | Sample 16/128"),
+                         (16, 128))
+        self.assertEqual(parse_samples("Fra:1 Mem:9.40M (Peak 9.93M) | Time:00:00.50 | Rendering 12 / 64 samples"),
+                         (12, 64))
+        self.assertIsNone(parse_samples("Fra:1 Mem:9.40M (Peak 9.93M) | Time:00:00.14 | Synchronizing object | Cube"))
+
+    def test_parse_frame_time(self):
+        # Act & Assert
+        self.assertAlmostEqual(parse_frame_time(" Time: 00:01.51 (Saving: 00:00.00)"), 1.51)
+        self.assertIsNone(parse_frame_time("Time:00:00.14 | Rendering"))
+
+    def test_output_stats_with_progress_lines(self):
+        # Arrange
+        stats = OutputStats(started_at=0.0)
+
+        # Act
+        stats.feed("Blender 3.6.22 (hash 1)", timestamp=1.0)
+        stats.feed("Fra:5 Mem:10.00M (Peak 20.00M) | Time:00:00.50 | Rendering 1 / 64 samples", timestamp=2.0)
+        stats.feed("Saved: '/out/shot_0005.png'", timestamp=3.0)
+        stats.feed(" Time: 00:01.75 (Saving: 00:00.01)", timestamp=3.0)
+
+        # Assert
+        self.assertEqual(stats.blender_version, "3.6.22")
+        self.assertEqual(stats.peak_memory_mb, 20.0)
+        self.assertEqual(stats.saved_outputs, ["/out/shot_0005.png"])
+        self.assertEqual(stats.frame_times, {5: 1.75})
+
+    def test_output_stats_without_progress_lines(self):
+        # Arrange
+        stats = OutputStats(started_at=0.0)
+
+        # Act
+        stats.feed("Read blend: \"/tmp/scene.blend\"", timestamp=1.0)
+        stats.feed("Saved: '/out/shot_0001.png'", timestamp=4.0)
+        stats.feed("Saved: '/out/shot_0002.png'", timestamp=6.5)
+
+        # Assert
+        self.assertEqual(stats.first_output_at, 1.0)
+        self.assertEqual(stats.frame_times, {1: 3.0, 2: 2.5})
+
+    def test_output_stats_phase_markers(self):
+        # Arrange
+        stats = OutputStats(started_at=0.0)
+
+        # Act
+        stats.feed("BLENDER_PHASE script_start 2.0", timestamp=2.1)
+        stats.feed("BLENDER_PHASE render_start 5.0", timestamp=5.1)
+        stats.feed("BLENDER_PHASE frame_start 5.0 7", timestamp=5.1)
+        stats.feed("BLENDER_PHASE frame_end 9.0 7", timestamp=9.1)
+        stats.feed("Saved: '/out/shot_0007.png'", timestamp=9.2)
+        stats.feed(" Time: 00:04.50 (Saving: 00:00.01)", timestamp=9.2)
+        stats.feed("BLENDER_PHASE render_end 9.5", timestamp=9.6)
+
+        # Assert
+        self.assertEqual(stats.phases, {"script_start": 2.0, "render_start": 5.0, "render_end": 9.5})
+        self.assertEqual(stats.frame_times, {7: 4.0})
+
+    def test_output_tail_keeps_last_lines(self):
+        # Arrange
+        tail = OutputTail(max_lines=3)
+
+        # Act
+        for index in range(10):
+            tail.append(f"STDOUT: line {index}")
+
+        # Assert
+        self.assertEqual(tail.lines(), ["STDOUT: line 7", "STDOUT: line 8", "STDOUT: line 9"])
+        self.assertEqual(tail.lines(2), ["STDOUT: line 8", "STDOUT: line 9"])
+        self.assertEqual(tail.total_lines, 10)
+
+    def test_output_tail_invalid_size(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            OutputTail(max_lines=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
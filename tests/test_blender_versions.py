@@ -0,0 +1,70 @@
+import unittest
+from util.blender_versions import parse_version, file_version, format_version, select_binary
+
+BIN_PATHS = {
+    "C:\\Blender\\3.6\\blender.exe": "Blender 3.6.22",
+    "C:\\Blender\\4.2.1\\blender.exe": "Blender 4.2.1 LTS",
+    "C:\\Blender\\4.2.7\\blender.exe": "Blender 4.2.7 LTS",
+    "C:\\Blender\\4.4\\blender.exe": "Blender 4.4.3",
+    "C:\\Blender\\broken\\blender.exe": "Path does not exist",
+}
+
+
+class TestBlenderVersions(unittest.TestCase):
+    def test_parse_version(self):
+        # Act & Assert
+        self.assertEqual(parse_version("Blender 4.2.7 LTS"), (4, 2, 7))
+        self.assertEqual(parse_version("3.6"), (3, 6, None))
+        self.assertIsNone(parse_version("Invalid path"))
+        self.assertIsNone(parse_version(None))
+
+    def test_file_version(self):
+        # Act & Assert
+        self.assertEqual(file_version(402), (4, 2))
+        self.assertEqual(file_version(306), (3, 6))
+        self.assertIsNone(file_version(None))
+
+    def test_format_version(self):
+        # Act & Assert
+        self.assertEqual(format_version((4, 2)), "4.2")
+        self.assertEqual(format_version((3, 6, None)), "3.6")
+
+    def test_select_binary_same_minor_latest_patch(self):
+        # Act
+        path = select_binary(BIN_PATHS, saved_with=(4, 2))
+
+        # Assert
+        self.assertEqual(path, "C:\\Blender\\4.2.7\\blender.exe")
+
+    def test_select_binary_closest_newer(self):
+        # Act
+        path = select_binary(BIN_PATHS, saved_with=(4, 0))
+
+        # Assert
+        self.assertEqual(path, "C:\\Blender\\4.2.7\\blender.exe")
+
+    def test_select_binary_file_newer_than_installed(self):
+        # Act
+        path = select_binary(BIN_PATHS, saved_with=(5, 0), default="C:\\Blender\\4.4\\blender.exe")
+
+        # Assert
+        self.assertEqual(path, "C:\\Blender\\4.4\\blender.exe")
+
+    def test_select_binary_unknown_file_version(self):
+        # Act
+        path = select_binary(BIN_PATHS, default="C:\\Blender\\4.4\\blender.exe")
+
+        # Assert
+        self.assertEqual(path, "C:\\Blender\\4.4\\blender.exe")
+
+    def test_select_binary_pinned(self):
+        # Act & Assert
+        self.assertEqual(select_binary(BIN_PATHS, saved_with=(4, 2), pinned="3.6"), "C:\\Blender\\3.6\\blender.exe")
+        self.assertEqual(select_binary(BIN_PATHS, pinned="4.2.1"), "C:\\Blender\\4.2.1\\blender.exe")
+        self.assertEqual(select_binary(BIN_PATHS, pinned="C:\\Blender\\4.4\\blender.exe"),
+                         "C:\\Blender\\4.4\\blender.exe")
+        self.assertIsNone(select_binary(BIN_PATHS, pinned="2.93", default="C:\\Blender\\4.4\\blender.exe"))
+
+
+if __name__ == '__main__':
+    unittest.main()
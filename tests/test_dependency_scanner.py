@@ -0,0 +1,196 @@
+import os
+import tempfile
+import unittest
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from managers.dependency_scanner import (
+    DependencyScanner,
+    expand_sequence,
+    format_size,
+    reference_files,
+    resolve_blend_path,
+    validate_dependency_scan_config
+)
+from util import utils
+from util.blend_file import BlendReference
+
+
+class TestDependencyScanner(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('DependencyScanner').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = self.temp_dir.name
+        self.references = {}
+        patcher = patch("managers.dependency_scanner.read_external_paths", side_effect=self._read_external_paths)
+        self.mock_read_external_paths = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read_external_paths(self, file_path):
+        return self.references.get(os.path.basename(file_path), [])
+
+    def _write(self, relative_path: str, content: bytes = b"data") -> str:
+        path = os.path.join(self.storage, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_validate_dependency_scan_config(self):
+        # Act & Assert
+        self.assertEqual(validate_dependency_scan_config({}), {"backend": "sdna", "fail_on_missing": True})
+        self.assertEqual(validate_dependency_scan_config({"backend": "bpy", "fail_on_missing": False}),
+                         {"backend": "bpy", "fail_on_missing": False})
+
+    def test_validate_dependency_scan_config_invalid(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            validate_dependency_scan_config("sdna")
+        with self.assertRaises(ValueError):
+            validate_dependency_scan_config({"backend": "blender"})
+        with self.assertRaises(ValueError):
+            validate_dependency_scan_config({"fail_on_missing": "yes"})
+        with self.assertRaises(ValueError):
+            validate_dependency_scan_config({"workers": 4})
+
+    def test_resolve_blend_path(self):
+        # Act & Assert
+        self.assertEqual(resolve_blend_path(os.path.join(self.storage, "scenes", "shot.blend"), "//tex/wood.png"),
+                         utils.normalize_path(os.path.join(self.storage, "scenes", "tex", "wood.png")))
+
+    def test_expand_sequence(self):
+        # Arrange
+        frames = [self._write(os.path.join("seq", f"fire_{frame:04d}.png")) for frame in (1, 2, 10)]
+        self._write(os.path.join("seq", "fire_0001.exr"))
+        self._write(os.path.join("seq", "smoke_0001.png"))
+
+        # Act
+        files = expand_sequence(utils.normalize_path(frames[0]))
+
+        # Assert
+        self.assertEqual(files, [utils.normalize_path(frame) for frame in frames])
+
+    def test_expand_udim_tiles(self):
+        # Arrange
+        tiles = [self._write(os.path.join("tex", f"color.{tile}.png")) for tile in (1001, 1002)]
+        self._write(os.path.join("tex", "color.png"))
+
+        # Act
+        files = expand_sequence(utils.normalize_path(os.path.join(self.storage, "tex", "color.<UDIM>.png")))
+
+        # Assert
+        self.assertEqual(files, [utils.normalize_path(tile) for tile in tiles])
+
+    def test_reference_files(self):
+        # Arrange
+        blend_file = os.path.join(self.storage, "shot.blend")
+        missing = BlendReference("image", "wood", "//tex/wood.png")
+        sequence = BlendReference("image", "fire", "//seq/fire_0001.png", True)
+
+        # Act & Assert
+        self.assertEqual(reference_files(blend_file, missing),
+                         [utils.normalize_path(os.path.join(self.storage, "tex", "wood.png"))])
+        self.assertEqual(reference_files(blend_file, sequence), [])
+
+    def test_format_size(self):
+        # Act & Assert
+        self.assertEqual(format_size(None), "-")
+        self.assertEqual(format_size(512), "512 B")
+        self.assertEqual(format_size(1536), "1.5 KB")
+        self.assertEqual(format_size(3 * 1024 ** 3), "3.0 GB")
+
+    def test_scan_reports_sizes_and_missing_files(self):
+        # Arrange
+        blend_file = self._write(os.path.join("scenes", "shot.blend"))
+        self._write(os.path.join("scenes", "tex", "wood.png"), b"x" * 100)
+        library = self._write(os.path.join("lib", "lib.blend"), b"x" * 50)
+        for frame in (1, 2):
+            self._write(os.path.join("scenes", "seq", f"fire_{frame:04d}.png"), b"x" * 10)
+        self.references = {
+            "shot.blend": [BlendReference("image", "wood", "//tex/wood.png"),
+                           BlendReference("image", "fire", "//seq/fire_0001.png", True),
+                           BlendReference("library", "lib", "//../lib/lib.blend"),
+                           BlendReference("sound", "music", "//audio/music.wav")],
+            "lib.blend": [BlendReference("cache", "sim", "//cache/sim.abc"),
+                          BlendReference("image", "wood", "//../scenes/tex/wood.png")],
+        }
+        scanner = DependencyScanner()
+
+        # Act
+        report = scanner.scan(blend_file)
+
+        # Assert
+        self.assertEqual(len(report.dependencies), 5)
+        self.assertEqual(report.total_size, 100 + 20 + 50)
+        self.assertEqual(sorted(dependency.name for dependency in report.missing), ["music", "sim"])
+        sim = next(dependency for dependency in report.dependencies if dependency.name == "sim")
+        self.assertEqual(sim.owner, utils.normalize_path(library))
+        self.assertEqual(report.summary(), "4 files, 170 B, 2 missing")
+
+    def test_scan_caches_references_until_file_changes(self):
+        # Arrange
+        blend_file = self._write("shot.blend")
+        texture = self._write("wood.png", b"x" * 10)
+        self.references = {"shot.blend": [BlendReference("image", "wood", "//wood.png")]}
+        scanner = DependencyScanner()
+        scanner.scan(blend_file)
+
+        # Act
+        self._write("wood.png", b"x" * 20)
+        cached = scanner.scan(blend_file)
+        self._write("shot.blend", b"changed")
+        rescanned = scanner.scan(blend_file)
+
+        # Assert
+        self.assertEqual(cached.total_size, 20)
+        self.assertEqual(rescanned.dependencies[0].files, [utils.normalize_path(texture)])
+        self.assertEqual(self.mock_read_external_paths.call_count, 2)
+
+    def test_scan_missing_blend(self):
+        # Act & Assert
+        with self.assertRaises(OSError):
+            DependencyScanner().scan(os.path.join(self.storage, "missing.blend"))
+
+    def test_scan_with_bpy(self):
+        # Arrange
+        blend_file = self._write("shot.blend")
+        self._write(os.path.join("tex", "wood.png"), b"x" * 10)
+        mock_bpy = MagicMock()
+        mock_bpy.data.images = [
+            SimpleNamespace(name="wood", filepath="//tex/wood.png", packed_file=None, source="FILE", library=None),
+            SimpleNamespace(name="Render Result", filepath="", packed_file=None, source="VIEWER", library=None),
+            SimpleNamespace(name="logo", filepath="//tex/logo.png", packed_file=object(), source="FILE", library=None),
+        ]
+        mock_bpy.data.volumes = [SimpleNamespace(name="smoke", filepath="//vdb/smoke_0001.vdb", is_sequence=True)]
+        for collection in ("libraries", "sounds", "cache_files", "movieclips", "fonts"):
+            setattr(mock_bpy.data, collection, [])
+        mock_bpy.path.abspath.side_effect = lambda path, library=None: path
+
+        with patch("managers.dependency_scanner.bpy", mock_bpy):
+            scanner = DependencyScanner("bpy")
+
+            # Act
+            report = scanner.scan(blend_file)
+
+        # Assert
+        mock_bpy.ops.wm.open_mainfile.assert_called_once_with(filepath=utils.normalize_path(blend_file), load_ui=False)
+        self.assertEqual([(dependency.kind, dependency.name) for dependency in report.dependencies],
+                         [("image", "wood"), ("volume", "smoke")])
+        self.assertEqual(report.total_size, 10)
+        self.assertEqual([dependency.name for dependency in report.missing], ["smoke"])
+
+    def test_init_invalid(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            DependencyScanner("blender")
+        with patch("managers.dependency_scanner.bpy", None):
+            with self.assertRaises(ValueError):
+                DependencyScanner("bpy")
+
+
+if __name__ == "__main__":
+    unittest.main()
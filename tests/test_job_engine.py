@@ -0,0 +1,178 @@
+import time
+import unittest
+import logging
+from unittest.mock import MagicMock
+from managers.job_engine import (
+    JobEngine,
+    RenderJob,
+    RENDER,
+    THUMBNAIL,
+    QUEUED,
+    DONE,
+    FAILED,
+    RETRY_WAIT
+)
+from managers.resource_allocator import ResourceAllocator
+
+
+class TestJobEngine(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('JobEngine').setLevel(logging.CRITICAL)
+
+    def test_render_job_init(self):
+        # Act
+        job = RenderJob("project", THUMBNAIL, force_render=True)
+
+        # Assert
+        self.assertEqual((job.kind, job.state, job.attempt, job.force_render), (THUMBNAIL, QUEUED, 1, True))
+        self.assertFalse(job.finished)
+
+    def test_render_job_invalid_kind(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderJob("project", "movie")
+
+    def test_render_job_retry(self):
+        # Arrange
+        job = RenderJob("project")
+
+        # Act
+        job.retry({"kind": "render"}, delay=60)
+
+        # Assert
+        self.assertEqual((job.state, job.attempt, job.spec), (RETRY_WAIT, 2, {"kind": "render"}))
+        self.assertGreater(job.not_before, time.monotonic() + 50)
+
+    def test_run_lane_runs_jobs_in_order(self):
+        # Arrange
+        executed = []
+        jobs = [RenderJob(name) for name in ("a", "b", "c")]
+        on_finished = MagicMock()
+        engine = JobEngine(lambda job, slot: executed.append(job.project), jobs, on_finished=on_finished)
+
+        # Act
+        engine.run_lane()
+
+        # Assert
+        self.assertEqual(executed, ["a", "b", "c"])
+        self.assertEqual(engine.counts(), {DONE: 3})
+        on_finished.assert_called_once_with(engine)
+
+    def test_failed_execute_marks_job_failed(self):
+        # Arrange
+        def execute(job, slot):
+            raise RuntimeError("boom")
+
+        engine = JobEngine(execute, [RenderJob("a")])
+
+        # Act
+        engine.run_lane()
+
+        # Assert
+        self.assertEqual(engine.jobs[0].state, FAILED)
+
+    def test_retry_is_requeued_after_other_jobs(self):
+        # Arrange
+        executed = []
+
+        def execute(job, slot):
+            executed.append((job.project, job.attempt))
+            if job.project == "a" and job.attempt == 1:
+                job.retry(None, delay=0.05)
+
+        engine = JobEngine(execute, [RenderJob("a"), RenderJob("b")])
+
+        # Act
+        engine.run_lane()
+
+        # Assert
+        self.assertEqual(executed, [("a", 1), ("b", 1), ("a", 2)])
+        self.assertEqual(engine.counts(), {DONE: 2})
+
+    def test_lanes_share_queue_and_slots(self):
+        # Arrange
+        allocator = ResourceAllocator(2, cores=[0, 1, 2, 3], numa_nodes={})
+        slots = []
+        on_finished = MagicMock()
+        engine = JobEngine(lambda job, slot: slots.append(slot.index), [RenderJob(index) for index in range(6)],
+                           lanes=2, allocator=allocator, on_finished=on_finished)
+
+        # Act
+        engine.start()
+        engine.wait(timeout=5)
+
+        # Assert
+        self.assertEqual(len(slots), 6)
+        self.assertLessEqual(set(slots), {0, 1})
+        self.assertEqual(len(allocator._free), 2)
+        on_finished.assert_called_once_with(engine)
+
+    def test_start_limits_lanes_to_jobs(self):
+        # Arrange
+        engine = JobEngine(lambda job, slot: None, [RenderJob("a")], lanes=4)
+
+        # Act
+        threads = engine.start()
+        engine.wait(timeout=5)
+
+        # Assert
+        self.assertEqual(len(threads), 1)
+
+    def test_prepare_runs_before_lanes_in_background(self):
+        # Arrange
+        executed = []
+        jobs = [RenderJob("a"), RenderJob("b"), RenderJob("c")]
+        added = RenderJob("d")
+
+        def prepare(queued):
+            engine.submit(added)
+            jobs[1].state = FAILED
+            return [job for job in queued if job.state != FAILED]
+
+        engine = JobEngine(lambda job, slot: executed.append(job.project), jobs, lanes=2, prepare=prepare)
+
+        # Act
+        threads = engine.start()
+        engine.wait(timeout=5)
+
+        # Assert
+        self.assertEqual([thread.name for thread in threads], ["job_prepare"])
+        self.assertEqual(sorted(executed), ["a", "c", "d"])
+        self.assertEqual(engine.counts(), {DONE: 3, FAILED: 1})
+
+    def test_failed_prepare_starts_jobs_unchecked(self):
+        # Arrange
+        on_finished = MagicMock()
+        engine = JobEngine(lambda job, slot: None, [RenderJob("a")], on_finished=on_finished,
+                           prepare=MagicMock(side_effect=OSError("share offline")))
+
+        # Act
+        engine.start()
+        engine.wait(timeout=5)
+
+        # Assert
+        self.assertEqual(engine.counts(), {DONE: 1})
+        on_finished.assert_called_once_with(engine)
+
+    def test_invalid_lanes(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            JobEngine(lambda job, slot: None, lanes=0)
+        with self.assertRaises(TypeError):
+            JobEngine("execute")
+
+    def test_submit_adds_job(self):
+        # Arrange
+        engine = JobEngine(lambda job, slot: None)
+
+        # Act
+        engine.submit(RenderJob("a", RENDER))
+        engine.run_lane()
+
+        # Assert
+        self.assertEqual(engine.counts(), {DONE: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
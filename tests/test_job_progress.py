@@ -0,0 +1,206 @@
+import unittest
+import logging
+from managers.job_engine import QUEUED, RUNNING, DONE, FAILED
+from managers.job_progress import JobProgress, ProgressTracker, count_frames
+from util.phase_markers import format_phase_marker
+
+
+def make_spec(variants=None):
+    spec = {
+        "blend_file": "C:\\scenes\\shot.blend",
+        "settings": {"Frame Start": 1, "Frame End": 10, "Frame Step": 1},
+    }
+    if variants is not None:
+        spec["variants"] = variants
+    return spec
+
+
+class TestJobProgress(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('JobProgress').setLevel(logging.CRITICAL)
+        self.tracker = ProgressTracker()
+
+    def test_count_frames(self):
+        # Act & Assert
+        self.assertEqual(count_frames(make_spec()), 1)
+        self.assertEqual(count_frames(make_spec([
+            {"name": "still"},
+            {"name": "anim", "animation": True},
+            {"name": "half", "animation": True, "overrides": {"Frame Start": 5, "Frame Step": 2}},
+        ])), 1 + 10 + 3)
+
+    def test_feed_counts_frames_and_samples(self):
+        # Arrange
+        self.tracker.add("shot", "shot.blend", frames_total=4)
+        self.tracker.start("shot")
+
+        # Act
+        self.tracker.feed("shot", "Fra:1 Mem:9.40M (Peak 9.93M) | Time:00:01.00 | Scene, ViewLayer | Sample 32/128")
+        self.tracker.feed("shot", "Saved: 'C:\\out\\shot_0001.png'")
+        self.tracker.feed("shot", format_phase_marker("frame_start", 10.0, 2))
+        self.tracker.feed("shot", "Fra:2 Mem:9.40M (Peak 9.93M) | Time:00:01.00 | Scene, ViewLayer | Sample 64/128")
+        _, (job,) = self.tracker.changes()
+
+        # Assert
+        self.assertEqual((job.state, job.frames_done, job.frame), (RUNNING, 1, 2))
+        self.assertEqual((job.samples_done, job.samples_total), (64, 128))
+        self.assertAlmostEqual(job.fraction(), 1.5 / 4)
+
+    def test_feed_ignores_other_output_and_unknown_jobs(self):
+        # Arrange
+        self.tracker.add("shot", "shot.blend", frames_total=1)
+        version, _ = self.tracker.changes()
+
+        # Act
+        self.tracker.feed("shot", "Открываю файл: shot.blend")
+        self.tracker.feed("other", "Saved: 'C:\\out\\other.png'")
+
+        # Assert
+        self.assertEqual(self.tracker.changes(version), (version, []))
+
+    def test_changes_returns_only_updated_copies(self):
+        # Arrange
+        self.tracker.add("a", "a.blend", frames_total=1)
+        self.tracker.add("b", "b.blend", frames_total=1)
+        version, jobs = self.tracker.changes()
+
+        # Act
+        self.tracker.set_state("b", FAILED)
+        new_version, changed = self.tracker.changes(version)
+        changed[0].state = DONE
+
+        # Assert
+        self.assertEqual(len(jobs), 2)
+        self.assertGreater(new_version, version)
+        self.assertEqual([job.key for job in changed], ["b"])
+        self.assertEqual(self.tracker.changes(version)[1][0].state, FAILED)
+
+    def test_remaining_seconds_from_history_then_own_pace(self):
+        # Arrange
+        self.tracker.set_history({"shot": 5.0})
+        self.tracker.add("shot", "shot.blend", frames_total=10)
+        self.tracker.add("new", "new.blend", frames_total=2)
+        self.tracker.add("unknown", "unknown.blend")
+        _, (shot, new, unknown) = self.tracker.changes()
+
+        # Act
+        history_estimate = shot.remaining_seconds()
+        shot.state = RUNNING
+        shot.started_at = 100.0
+        shot.frames_done = 4
+
+        # Assert
+        self.assertEqual(history_estimate, 50.0)
+        self.assertEqual(shot.remaining_seconds(now=120.0), 30.0)
+        self.assertEqual(shot.frames_per_minute(now=120.0), 12.0)
+        self.assertEqual(new.remaining_seconds(), 10.0)
+        self.assertIsNone(unknown.remaining_seconds())
+        self.assertIsNone(unknown.fraction())
+
+    def test_summary(self):
+        # Arrange
+        self.tracker.set_history({"a": 10.0, "b": 10.0, "c": 10.0})
+        for key in ("a", "b", "c"):
+            self.tracker.add(key, f"{key}.blend", frames_total=3)
+        self.tracker.start("a")
+        for _ in range(3):
+            self.tracker.feed("a", "Saved: 'C:\\out\\a.png'")
+        self.tracker.set_state("a", DONE)
+
+        # Act
+        summary = self.tracker.summary(lanes=2)
+
+        # Assert
+        self.assertEqual((summary["jobs"], summary["finished"], summary["failed"]), (3, 1, 0))
+        self.assertEqual((summary["frames_done"], summary["frames_total"]), (3, 9))
+        self.assertEqual(summary["eta"], 30.0)
+        self.assertEqual(summary["unestimated"], 0)
+
+    def test_start_batch_drops_finished_jobs(self):
+        # Arrange
+        self.tracker.set_history({"a": 10.0, "b": 10.0, "c": 10.0})
+        for key in ("a", "b"):
+            self.tracker.add(key, f"{key}.blend", frames_total=3)
+        self.tracker.start("a")
+        for _ in range(3):
+            self.tracker.feed("a", "Saved: 'C:\\out\\a.png'")
+        self.tracker.set_state("a", DONE)
+        self.tracker.set_state("b", FAILED)
+        batch = self.tracker.batch
+
+        # Act
+        self.tracker.start_batch()
+        self.tracker.add("c", "c.blend", frames_total=2)
+        summary = self.tracker.summary(lanes=2)
+
+        # Assert
+        self.assertEqual(self.tracker.batch, batch + 1)
+        self.assertEqual([job.key for job in self.tracker.changes()[1]], ["c"])
+        self.assertEqual((summary["jobs"], summary["finished"], summary["failed"]), (1, 0, 0))
+        self.assertEqual((summary["frames_done"], summary["frames_total"], summary["fraction"]), (0, 2, 0.0))
+        self.assertEqual(summary["eta"], 20.0)
+
+    def test_start_batch_keeps_active_jobs(self):
+        # Arrange
+        self.tracker.add("running", "running.blend", frames_total=4)
+        self.tracker.start("running")
+
+        # Act
+        self.tracker.start_batch()
+
+        # Assert
+        self.assertTrue(self.tracker.is_active("running"))
+        self.assertEqual(self.tracker.summary()["jobs"], 1)
+
+    def test_set_input_size(self):
+        # Arrange
+        self.tracker.add("a", "a.blend")
+        self.tracker.add("b", "b.blend")
+        version, _ = self.tracker.changes()
+
+        # Act
+        self.tracker.set_input_size("a", 2048)
+        self.tracker.set_input_size("unknown", 1024)
+        _, changed = self.tracker.changes(version)
+
+        # Assert
+        self.assertEqual([(job.key, job.input_bytes) for job in changed], [("a", 2048)])
+        self.assertEqual(self.tracker.summary()["input_bytes"], 2048)
+
+    def test_is_active(self):
+        # Arrange
+        self.tracker.add("queued", "queued.blend")
+        self.tracker.add("done", "done.blend")
+        self.tracker.set_state("done", DONE)
+
+        # Act & Assert
+        self.assertTrue(self.tracker.is_active("queued"))
+        self.assertFalse(self.tracker.is_active("done"))
+        self.assertFalse(self.tracker.is_active("unknown"))
+
+    def test_summary_empty(self):
+        # Act
+        summary = self.tracker.summary()
+
+        # Assert
+        self.assertEqual((summary["jobs"], summary["eta"], summary["fraction"]), (0, 0.0, None))
+
+    def test_set_state_keeps_finished_time(self):
+        # Arrange
+        self.tracker.add("shot", "shot.blend")
+        self.tracker.start("shot")
+
+        # Act
+        self.tracker.set_state("shot", DONE)
+        _, (job,) = self.tracker.changes()
+
+        # Assert
+        self.assertTrue(job.finished)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.fraction(), 1.0)
+        self.assertEqual(JobProgress("x", "x.blend").state, QUEUED)
+
+
+if __name__ == "__main__":
+    unittest.main()
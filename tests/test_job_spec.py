@@ -0,0 +1,110 @@
+import json
+import os
+import unittest
+from util.job_spec import (
+    JOB_SPEC_VERSION,
+    build_job_spec,
+    write_job_spec,
+    read_job_spec,
+    remove_job_spec,
+    parse_script_args
+)
+
+
+class TestJobSpec(unittest.TestCase):
+    def test_build_job_spec(self):
+        # Act
+        spec = build_job_spec("render", "C:\\project.blend", settings={"Frame": 1})
+
+        # Assert
+        self.assertEqual(spec, {
+            "version": JOB_SPEC_VERSION,
+            "kind": "render",
+            "blend_file": "C:\\project.blend",
+            "settings": {"Frame": 1},
+        })
+
+    def test_build_job_spec_unknown_kind(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            build_job_spec("bake", "C:\\project.blend")
+
+    def test_write_and_read_round_trip(self):
+        # Arrange
+        spec = build_job_spec("thumbnail", "C:\\project.blend", unique_name="project_1")
+
+        # Act
+        spec_path = write_job_spec(spec)
+        try:
+            result = read_job_spec(spec_path, expected_kind="thumbnail")
+        finally:
+            remove_job_spec(spec_path)
+
+        # Assert
+        self.assertEqual(result, spec)
+        self.assertFalse(os.path.exists(spec_path))
+
+    def test_read_job_spec_unsupported_version(self):
+        # Arrange
+        spec_path = write_job_spec({"version": JOB_SPEC_VERSION + 1, "kind": "render", "blend_file": "a.blend"})
+
+        # Act & Assert
+        try:
+            with self.assertRaises(ValueError):
+                read_job_spec(spec_path)
+        finally:
+            remove_job_spec(spec_path)
+
+    def test_read_job_spec_wrong_kind(self):
+        # Arrange
+        spec_path = write_job_spec(build_job_spec("render", "a.blend", settings={}))
+
+        # Act & Assert
+        try:
+            with self.assertRaises(ValueError):
+                read_job_spec(spec_path, expected_kind="thumbnail")
+        finally:
+            remove_job_spec(spec_path)
+
+    def test_write_job_spec_is_compact_json(self):
+        # Arrange
+        spec = build_job_spec("render", "a.blend", settings={"Frame": 1})
+
+        # Act
+        spec_path = write_job_spec(spec)
+        try:
+            with open(spec_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        finally:
+            remove_job_spec(spec_path)
+
+        # Assert
+        self.assertNotIn(" ", content)
+        self.assertEqual(json.loads(content), spec)
+
+    def test_remove_job_spec_missing_file(self):
+        # Act & Assert
+        remove_job_spec("missing_job_spec.json")
+        remove_job_spec(None)
+
+    def test_parse_script_args(self):
+        # Arrange
+        argv = ["blender", "--background", "--python", "script.py", "--", "--job-spec", "job.json"]
+
+        # Act
+        args = parse_script_args(argv)
+
+        # Assert
+        self.assertEqual(args.job_spec, "job.json")
+
+    def test_parse_script_args_missing_spec(self):
+        # Arrange
+        argv = ["blender", "--background", "--python", "script.py"]
+
+        # Act & Assert
+        with self.assertRaises(SystemExit):
+            parse_script_args(argv)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import gzip
+import tempfile
+import unittest
+import logging
+from logging.handlers import QueueHandler
+from util import log_config
+
+
+class TestLogConfig(unittest.TestCase):
+    def setUp(self):
+        self.saved_levels = dict(log_config._levels)
+
+    def tearDown(self):
+        log_config._levels.clear()
+        log_config._levels.update(self.saved_levels)
+
+    def test_get_logger_adds_single_queue_handler(self):
+        # Act
+        log_config.get_logger('TestLogConfigSubsystem')
+        logger = log_config.get_logger('TestLogConfigSubsystem')
+
+        # Assert
+        queue_handlers = [handler for handler in logger.handlers if isinstance(handler, QueueHandler)]
+        self.assertEqual(len(queue_handlers), 1)
+        self.assertEqual(logger.level, logging.DEBUG)
+
+    def test_configure_levels(self):
+        # Arrange
+        logger = log_config.get_logger('TestLogConfigLevels')
+        other_logger = log_config.get_logger('TestLogConfigOther')
+
+        # Act
+        log_config.configure_levels({"default": "WARNING", "TestLogConfigLevels": "debug"})
+
+        # Assert
+        self.assertEqual(logger.level, logging.DEBUG)
+        self.assertEqual(other_logger.level, logging.WARNING)
+        self.assertEqual(log_config.get_logger('TestLogConfigNew').level, logging.WARNING)
+
+    def test_configure_levels_invalid(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            log_config.configure_levels({"default": "LOUD"})
+        with self.assertRaises(TypeError):
+            log_config.configure_levels(["DEBUG"])
+        self.assertNotIn("default", log_config._levels)
+
+    def test_job_log_written_to_own_file(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "jobs", "job_1.log.gz")
+            log_config.start_job_log("job_1", path)
+
+            # Act
+            log_config.log_job_output("job_1", "STDOUT: Blender 4.2.0")
+            log_config.log_job_output("job_1", "STDOUT: Saved: '/out/shot_0001.png'")
+            log_config.stop_job_log("job_1")
+            log_config.stop_logging()
+
+            # Assert
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.assertEqual(f.read().splitlines(),
+                                 ["STDOUT: Blender 4.2.0", "STDOUT: Saved: '/out/shot_0001.png'"])
+            self.assertNotIn("job_1", log_config.job_log_handler._files)
+
+    def test_job_output_without_registration_is_dropped(self):
+        # Arrange
+        log_config.get_logger('TestLogConfigSubsystem')
+
+        # Act
+        log_config.log_job_output("unknown_job", "STDOUT: line")
+        log_config.stop_logging()
+
+        # Assert
+        self.assertNotIn("unknown_job", log_config.job_log_handler._files)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import threading
+import unittest
+import logging
+from unittest.mock import MagicMock, patch
+from managers import output_uploader
+from managers.output_uploader import (
+    OutputUploader,
+    UploadBatch,
+    resolve_output_dir,
+    upload_file,
+    validate_scratch_config
+)
+
+
+class TestOutputUploader(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('OutputUploader').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.scratch_dir = os.path.join(self.temp_dir.name, "scratch", "shot_1")
+        self.output_dir = os.path.join(self.temp_dir.name, "share", "renders")
+        self.signal = MagicMock()
+        self.uploader = OutputUploader(self.signal, max_workers=2)
+
+    def tearDown(self):
+        self.uploader.shutdown()
+        self.temp_dir.cleanup()
+
+    def _write_frame(self, name: str, content: bytes = b"frame") -> str:
+        path = os.path.join(self.scratch_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_validate_scratch_config(self):
+        # Act
+        config = validate_scratch_config({"directory": "D:\\scratch"})
+
+        # Assert
+        self.assertEqual(config, {"directory": "D:\\scratch", "uploads": 2, "verify": "size", "upload_timeout": 600})
+
+    def test_validate_scratch_config_invalid(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            validate_scratch_config("D:\\scratch")
+        with self.assertRaises(ValueError):
+            validate_scratch_config({"directory": ""})
+        with self.assertRaises(ValueError):
+            validate_scratch_config({"directory": "D:\\scratch", "uploads": 0})
+        with self.assertRaises(ValueError):
+            validate_scratch_config({"directory": "D:\\scratch", "verify": "md5"})
+        with self.assertRaises(ValueError):
+            validate_scratch_config({"directory": "D:\\scratch", "threads": 2})
+        with self.assertRaises(ValueError):
+            validate_scratch_config({"directory": "D:\\scratch", "upload_timeout": 0})
+
+    def test_resolve_output_dir(self):
+        # Act & Assert
+        self.assertEqual(resolve_output_dir(os.path.join("scenes", "shot.blend"), "//renders"),
+                         os.path.join("scenes", "renders"))
+        self.assertEqual(resolve_output_dir("shot.blend", "D:\\renders"), "D:\\renders")
+
+    def test_upload_file_with_hash(self):
+        # Arrange
+        os.makedirs(self.scratch_dir)
+        source = self._write_frame("shot_0001.png")
+        destination = os.path.join(self.output_dir, "shot_0001.png")
+
+        # Act
+        result = upload_file(source, destination, verify="hash")
+
+        # Assert
+        self.assertEqual(result, destination)
+        self.assertFalse(os.path.exists(source))
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), b"frame")
+        self.assertFalse(os.path.exists(destination + output_uploader.PARTIAL_SUFFIX))
+
+    def test_upload_file_size_mismatch_keeps_source(self):
+        # Arrange
+        os.makedirs(self.scratch_dir)
+        source = self._write_frame("shot_0001.png")
+        destination = os.path.join(self.output_dir, "shot_0001.png")
+
+        with patch("managers.output_uploader.shutil.copyfile",
+                   side_effect=lambda src, dst: open(dst, "wb").close()):
+            # Act & Assert
+            with self.assertRaises(OSError):
+                upload_file(source, destination)
+
+        self.assertTrue(os.path.exists(source))
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_batch_uploads_and_cleans_scratch(self):
+        # Arrange
+        batch = self.uploader.start_batch(self.scratch_dir, self.output_dir)
+        sources = [self._write_frame(f"shot_{frame:04d}.png") for frame in range(1, 4)]
+
+        # Act
+        for source in sources:
+            self.uploader.submit(batch, source)
+        uploaded = self.uploader.finish(batch)
+
+        # Assert
+        self.assertEqual(uploaded, {source: os.path.join(self.output_dir, os.path.basename(source))
+                                    for source in sources})
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["shot_0001.png", "shot_0002.png", "shot_0003.png"])
+        self.assertFalse(os.path.exists(self.scratch_dir))
+        self.signal.emit.assert_not_called()
+
+    @patch("managers.output_uploader.UPLOAD_RETRY_DELAY", 0)
+    def test_batch_keeps_scratch_on_failure(self):
+        # Arrange
+        batch = self.uploader.start_batch(self.scratch_dir, self.output_dir)
+        source = self._write_frame("shot_0001.png")
+
+        with patch("managers.output_uploader.upload_file", side_effect=OSError("Stale file handle")) as mock_upload:
+            # Act
+            self.uploader.submit(batch, source)
+            uploaded = self.uploader.finish(batch)
+
+        # Assert
+        self.assertEqual(uploaded, {})
+        self.assertEqual(mock_upload.call_count, output_uploader.UPLOAD_ATTEMPTS)
+        self.assertIn(source, batch.failed)
+        self.assertTrue(os.path.exists(source))
+        self.signal.emit.assert_called_once()
+
+    def test_finish_gives_up_on_stalled_upload(self):
+        # Arrange
+        uploader = OutputUploader(self.signal, upload_timeout=0.05)
+        batch = uploader.start_batch(self.scratch_dir, self.output_dir)
+        source = self._write_frame("shot_0001.png")
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with patch("managers.output_uploader.upload_file", side_effect=lambda *args: release.wait(5)):
+            uploader.submit(batch, source)
+
+            # Act
+            uploaded = uploader.finish(batch)
+
+        # Assert
+        self.assertEqual(uploaded, {})
+        self.assertTrue(os.path.exists(self.scratch_dir))
+        self.signal.emit.assert_called_once()
+
+    def test_destination_of(self):
+        # Arrange
+        batch = UploadBatch(self.scratch_dir, self.output_dir)
+
+        # Act & Assert
+        self.assertEqual(batch.destination_of(os.path.join(self.scratch_dir, "shot_0001.png")),
+                         os.path.join(self.output_dir, "shot_0001.png"))
+
+    def test_init_invalid(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            OutputUploader(max_workers=0)
+        with self.assertRaises(ValueError):
+            OutputUploader(verify="crc")
+        with self.assertRaises(ValueError):
+            OutputUploader(upload_timeout=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
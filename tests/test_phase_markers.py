@@ -0,0 +1,60 @@
+import unittest
+from util.phase_markers import format_phase_marker, parse_phase_marker, phase_durations
+
+
+class TestPhaseMarkers(unittest.TestCase):
+    def test_format_and_parse_round_trip(self):
+        # Arrange
+        line = format_phase_marker("frame_end", timestamp=1718000000.5, frame=12)
+
+        # Act
+        result = parse_phase_marker(line + "\n")
+
+        # Assert
+        self.assertEqual(result, ("frame_end", 1718000000.5, 12))
+
+    def test_parse_without_frame(self):
+        # Act
+        result = parse_phase_marker("BLENDER_PHASE file_load_start 100.25")
+
+        # Assert
+        self.assertEqual(result, ("file_load_start", 100.25, None))
+
+    def test_parse_other_output(self):
+        # Act & Assert
+        self.assertIsNone(parse_phase_marker("Открываю файл: C:\\scene.blend"))
+        self.assertIsNone(parse_phase_marker("BLENDER_PHASE unknown_phase 100.0"))
+
+    def test_format_unknown_phase(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            format_phase_marker("compile_shaders")
+
+    def test_phase_durations(self):
+        # Arrange
+        phases = {
+            "script_start": 12.0,
+            "file_load_start": 12.5,
+            "file_load_end": 15.0,
+            "render_start": 15.5,
+            "render_end": 45.5,
+            "script_end": 46.0,
+        }
+
+        # Act
+        durations = phase_durations(phases, spawned_at=10.0, exited_at=47.0)
+
+        # Assert
+        self.assertEqual(durations, {"startup": 2.0, "file_load": 2.5, "setup": 0.5, "render": 30.0, "shutdown": 1.0})
+
+    def test_phase_durations_missing_markers(self):
+        # Act
+        durations = phase_durations({"script_start": 11.0}, spawned_at=10.0, exited_at=12.0)
+
+        # Assert
+        self.assertEqual(durations["startup"], 1.0)
+        self.assertIsNone(durations["render"])
+
+
+if __name__ == '__main__':
+    unittest.main()
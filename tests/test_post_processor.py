@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+from PyQt5.QtGui import QImage, QColor
+from managers.post_processor import (
+    PostProcessor,
+    PostProcessContext,
+    find_sequences,
+    checksum_manifest,
+    contact_sheet,
+    convert_format,
+    encode_video,
+    validate_post_process_steps
+)
+
+
+class TestPostProcessor(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('PostProcessor').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.frames = []
+        for frame in range(1, 4):
+            path = os.path.join(self.temp_dir.name, f"shot_{frame:04d}.png")
+            image = QImage(64, 36, QImage.Format_RGB32)
+            image.fill(QColor(frame * 60, 0, 0))
+            image.save(path)
+            self.frames.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _context(self):
+        return PostProcessContext("shot", self.temp_dir.name, 24.0, self.frames)
+
+    def test_find_sequences(self):
+        # Arrange
+        files = self.frames + [os.path.join(self.temp_dir.name, "still.png")]
+
+        # Act
+        sequences = find_sequences(files)
+
+        # Assert
+        prefix = os.path.join(self.temp_dir.name, "shot_")
+        self.assertEqual(sequences, {(prefix, ".png", 4): self.frames})
+
+    def test_checksum_manifest(self):
+        # Arrange
+        context = self._context()
+
+        # Act
+        produced = checksum_manifest(context, {})
+
+        # Assert
+        with open(produced[0], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith("  shot_0001.png"))
+        self.assertEqual(len(lines[0].split()[0]), 64)
+
+    def test_contact_sheet(self):
+        # Arrange
+        context = self._context()
+
+        # Act
+        produced = contact_sheet(context, {"columns": 2, "tile_width": 32, "spacing": 2})
+
+        # Assert
+        sheet = QImage(produced[0])
+        self.assertEqual((sheet.width(), sheet.height()), (2 * 34 + 2, 2 * 20 + 2))
+
+    def test_convert_format_replaces_outputs(self):
+        # Arrange
+        context = self._context()
+
+        # Act
+        produced = convert_format(context, {"format": "jpg", "keep_original": False})
+
+        # Assert
+        self.assertEqual(len(produced), 3)
+        self.assertEqual(context.outputs, produced)
+        self.assertFalse(os.path.exists(self.frames[0]))
+
+    def test_convert_format_requires_format(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            convert_format(self._context(), {})
+
+    @patch("managers.post_processor.subprocess.run")
+    def test_encode_video_builds_ffmpeg_command(self, mock_run):
+        # Arrange
+        mock_run.return_value = MagicMock(returncode=0)
+        context = self._context()
+
+        # Act
+        produced = encode_video(context, {"ffmpeg": "ffmpeg"})
+
+        # Assert
+        command = mock_run.call_args[0][0]
+        prefix = os.path.join(self.temp_dir.name, "shot_")
+        self.assertIn(f"{prefix}%04d.png", command)
+        self.assertEqual(command[command.index("-start_number") + 1], "1")
+        self.assertEqual(produced, [os.path.join(self.temp_dir.name, "shot.mp4")])
+
+    def test_validate_post_process_steps_unknown(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            validate_post_process_steps([{"step": "upload"}])
+
+    def test_submit_runs_steps_in_order(self):
+        # Arrange
+        signal = MagicMock()
+        processor = PostProcessor(signal)
+        calls = []
+        processor.register_step("first", lambda context, options: calls.append("first") or ["a"])
+        processor.register_step("second", lambda context, options: calls.append(context.files[-1]) or [])
+
+        # Act
+        future = processor.submit("shot", self.temp_dir.name, self.frames, [{"step": "first"}, {"step": "second"}])
+        produced = future.result(timeout=5)
+        processor.shutdown()
+
+        # Assert
+        self.assertEqual(calls, ["first", "a"])
+        self.assertEqual(produced, ["a"])
+        signal.emit.assert_called_with("Post-processing completed for shot")
+
+    def test_submit_failed_step_continues(self):
+        # Arrange
+        signal = MagicMock()
+        processor = PostProcessor(signal)
+        processor.register_step("broken", MagicMock(side_effect=RuntimeError("boom")))
+        processor.register_step("ok", lambda context, options: ["done"])
+
+        # Act
+        produced = processor.submit("shot", self.temp_dir.name, self.frames,
+                                    [{"step": "broken"}, {"step": "ok"}]).result(timeout=5)
+        processor.shutdown()
+
+        # Assert
+        self.assertEqual(produced, ["done"])
+        signal.emit.assert_any_call("Post-process broken failed for shot: boom")
+
+    def test_submit_nothing_to_do(self):
+        # Arrange
+        processor = PostProcessor()
+
+        # Act
+        future = processor.submit("shot", self.temp_dir.name, [], [{"step": "checksum_manifest"}])
+
+        # Assert
+        self.assertIsNone(future)
+
+
+if __name__ == '__main__':
+    unittest.main()
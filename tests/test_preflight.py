@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+import logging
+from unittest.mock import MagicMock, patch
+from managers.preflight import (
+    PreflightResult,
+    SceneInfoCache,
+    check_file_format,
+    check_frame_range,
+    check_output_path,
+    check_render_engine,
+    check_render_spec,
+    check_scene,
+    run_preflight
+)
+from util.blend_file import SceneData, SceneInfo
+
+
+class TestPreflight(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('Preflight').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.blend_file = os.path.join(self.temp_dir.name, "shot.blend")
+        with open(self.blend_file, "wb") as f:
+            f.write(b"BLENDER")
+        self.scene_info = SceneInfo(
+            "Main",
+            {"Main": SceneData(True, "CYCLES", ["ViewLayer"]), "Empty": SceneData(False, "CYCLES", ["ViewLayer"])},
+            {"Camera": True, "Cube": False},
+        )
+        self.spec = {
+            "settings": {
+                "Output Path": "//render/",
+                "Render Engine": "CYCLES",
+                "File Format": "PNG",
+                "Frame Start": 1,
+                "Frame End": 10,
+            },
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_check_output_path(self):
+        # Act & Assert
+        self.assertIsNone(check_output_path(self.blend_file, "//render/"))
+        self.assertIsNone(check_output_path(self.blend_file, os.path.join(self.temp_dir.name, "a", "b")))
+        self.assertEqual(check_output_path(self.blend_file, ""), "output path is empty")
+        self.assertIn("is a file", check_output_path(self.blend_file, "//shot.blend"))
+
+    @patch("managers.preflight.os.access", return_value=False)
+    def test_check_output_path_not_writable(self, mock_access):
+        # Act
+        problem = check_output_path(self.blend_file, "//render/")
+
+        # Assert
+        self.assertIn("is not writable", problem)
+        mock_access.assert_called_once_with(self.temp_dir.name, os.W_OK)
+
+    def test_check_render_engine(self):
+        # Act & Assert
+        self.assertIsNone(check_render_engine("BLENDER_EEVEE_NEXT"))
+        self.assertIn("BLENDER_WORKBENCH is not supported", check_render_engine("BLENDER_WORKBENCH"))
+        self.assertIn("none is not supported", check_render_engine(""))
+
+    def test_check_file_format(self):
+        # Act & Assert
+        self.assertIsNone(check_file_format("PNG", False))
+        self.assertIsNone(check_file_format("FFMPEG", True))
+        self.assertIn("cannot be used for a still image", check_file_format("FFMPEG", False))
+        self.assertEqual(check_file_format("", True), "file format is empty")
+
+    def test_check_frame_range(self):
+        # Act & Assert
+        self.assertIsNone(check_frame_range({"Frame Start": 5, "Frame End": 5}))
+        self.assertEqual(check_frame_range({"Frame Start": 10, "Frame End": 1}), "frame range 10-1 is empty")
+
+    def test_check_scene(self):
+        # Act & Assert
+        self.assertEqual(check_scene(self.scene_info, {}), [])
+        self.assertEqual(check_scene(self.scene_info, {"scene": "Empty", "camera": "Camera"}), [])
+        self.assertEqual(check_scene(self.scene_info, {"scene": "Missing"}), ["scene Missing not found"])
+        self.assertEqual(check_scene(self.scene_info, {"scene": "Empty", "view_layer": "Fg"}),
+                         ["view layer Fg not found in scene Empty", "scene Empty has no camera"])
+        self.assertEqual(check_scene(self.scene_info, {"camera": "Closeup"}), ["camera Closeup not found"])
+
+    def test_check_render_spec(self):
+        # Act
+        problems = check_render_spec(self.blend_file, self.spec, self.scene_info)
+
+        # Assert
+        self.assertEqual(problems, [])
+
+    def test_check_render_spec_variants(self):
+        # Arrange
+        self.spec["settings"]["Render Engine"] = "BLENDER_WORKBENCH"
+        self.spec["variants"] = [
+            {"name": "beauty", "overrides": {"Render Engine": "CYCLES"}, "animation": True,
+             "camera": "Closeup"},
+            {"name": "clay"},
+            {"name": "preview", "overrides": {"File Format": "FFMPEG"}, "scene": "Empty"},
+        ]
+
+        # Act
+        problems = check_render_spec(self.blend_file, self.spec, self.scene_info)
+
+        # Assert
+        self.assertEqual(problems, [
+            "variant beauty: camera Closeup not found",
+            "variant clay: render engine BLENDER_WORKBENCH is not supported, use Cycles or EEVEE",
+            "variant preview: render engine BLENDER_WORKBENCH is not supported, use Cycles or EEVEE",
+            "variant preview: movie format FFMPEG cannot be used for a still image",
+            "variant preview: scene Empty has no camera",
+        ])
+
+    def test_check_render_spec_without_scene_info(self):
+        # Arrange
+        self.spec["variants"] = [{"name": "", "animation": True, "overrides": {"Frame End": 0}, "scene": "Missing"}]
+
+        # Act
+        problems = check_render_spec(self.blend_file, self.spec)
+
+        # Assert
+        self.assertEqual(problems, ["frame range 1-0 is empty"])
+
+    def test_run_preflight(self):
+        # Arrange
+        jobs = [MagicMock(name=f"job{index}") for index in range(3)]
+
+        def check(job):
+            if job is jobs[1]:
+                raise RuntimeError("disk error")
+            return PreflightResult(job, warnings=["slow share"])
+
+        # Act
+        results = run_preflight(jobs, check, max_workers=2)
+
+        # Assert
+        self.assertEqual([result.job for result in results], jobs)
+        self.assertEqual([result.passed for result in results], [True, False, True])
+        self.assertEqual(results[1].problems, ["pre-flight check failed: disk error"])
+        self.assertEqual(results[0].warnings, ["slow share"])
+        self.assertEqual(run_preflight([], check), [])
+
+    @patch("managers.preflight.read_scene_info")
+    def test_scene_info_cache(self, mock_read_scene_info):
+        # Arrange
+        mock_read_scene_info.return_value = self.scene_info
+        cache = SceneInfoCache()
+        cache.get(self.blend_file)
+
+        # Act
+        cached = cache.get(self.blend_file)
+        with open(self.blend_file, "ab") as f:
+            f.write(b"changed")
+        cache.get(self.blend_file)
+
+        # Assert
+        self.assertIs(cached, self.scene_info)
+        self.assertEqual(mock_read_scene_info.call_count, 2)
+
+    def test_scene_info_cache_missing_file(self):
+        # Act & Assert
+        with self.assertRaises(OSError):
+            SceneInfoCache().get(os.path.join(self.temp_dir.name, "missing.blend"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from util.preview_tiers import (
+    DEFAULT_PREVIEW_TIERS,
+    validate_preview_tiers,
+    format_tier_marker,
+    parse_tier_marker
+)
+
+
+class TestPreviewTiers(unittest.TestCase):
+    def test_default_tiers_are_valid(self):
+        # Act
+        tiers = validate_preview_tiers(DEFAULT_PREVIEW_TIERS)
+
+        # Assert
+        self.assertEqual([tier["name"] for tier in tiers], ["draft", "final"])
+
+    def test_missing_flags_are_filled(self):
+        # Arrange
+        tiers = [{"name": "only", "width": 64, "height": 36, "samples": 1}]
+
+        # Act
+        result = validate_preview_tiers(tiers)
+
+        # Assert
+        self.assertFalse(result[0]["simplify"])
+        self.assertFalse(result[0]["fast_engine"])
+
+    def test_empty_tiers(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            validate_preview_tiers([])
+
+    def test_unknown_key(self):
+        # Arrange
+        tiers = [{"name": "draft", "width": 64, "height": 36, "samples": 1, "denoise": True}]
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            validate_preview_tiers(tiers)
+
+    def test_invalid_samples_type(self):
+        # Arrange
+        tiers = [{"name": "draft", "width": 64, "height": 36, "samples": "4"}]
+
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            validate_preview_tiers(tiers)
+
+    def test_non_positive_size(self):
+        # Arrange
+        tiers = [{"name": "draft", "width": 0, "height": 36, "samples": 1}]
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            validate_preview_tiers(tiers)
+
+    def test_marker_round_trip(self):
+        # Act
+        result = parse_tier_marker(format_tier_marker("draft") + "\n")
+
+        # Assert
+        self.assertEqual(result, "draft")
+
+    def test_parse_tier_marker_other_output(self):
+        # Act & Assert
+        self.assertIsNone(parse_tier_marker("Fra:1 Mem:10M | Rendering"))
+
+
+if __name__ == '__main__':
+    unittest.main()
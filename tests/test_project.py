@@ -1,18 +1,19 @@
+import os
 import unittest
 from unittest.mock import patch
 from dto.project import Project
+from dto.render_settings import RenderSettings
 
 
 class TestProject(unittest.TestCase):
     def test_project_init(self):
         # Arrange
         file_path = "C:\\projects\\test.blend"
-        expected_unique_name_pattern = r"test\.blend_\d{4}"
-        expected_preview_path = "C:\\work\\thumbnails\\test.blend_1234.png"
+        expected_unique_name_pattern = r"test\.blend_[0-9a-f]{12}"
+        expected_preview_path = "C:\\work\\thumbnails\\test.blend_0123456789ab.png"
 
         with patch("dto.project.os.path.basename", return_value="test.blend"), \
-                patch("dto.project.utils.path_to_thumbnail", return_value=expected_preview_path), \
-                patch("random.randint", return_value=1234):
+                patch("dto.project.utils.path_to_thumbnail", return_value=expected_preview_path):
             # Act
             project = Project(file_path)
 
@@ -20,28 +21,49 @@ class TestProject(unittest.TestCase):
             self.assertEqual(project.file_path, file_path)
             self.assertRegex(project.unique_name, expected_unique_name_pattern)
             self.assertEqual(project.preview_path, expected_preview_path)
-            self.assertEqual(project.settings, {})
+            self.assertIsNone(project.settings)
 
     def test_generate_unique_name(self):
         # Arrange
         file_path = "C:\\projects\\test.blend"
         with patch("dto.project.os.path.basename", return_value="test.blend"), \
-                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"), \
-                patch("random.randint", return_value=5678):
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
             project = Project(file_path)
 
             # Act
             unique_name = project.generate_unique_name()
 
             # Assert
-            self.assertEqual(unique_name, "test.blend_5678")
+            self.assertEqual(unique_name, project.unique_name)
+            self.assertEqual(unique_name, Project(file_path).unique_name)
+
+    def test_generate_unique_name_differs_by_folder(self):
+        # Arrange
+        with patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            first = Project(os.path.join("shots", "sh010", "scene.blend"))
+            second = Project(os.path.join("shots", "sh020", "scene.blend"))
+
+        # Act & Assert
+        self.assertNotEqual(first.unique_name, second.unique_name)
+        self.assertTrue(first.unique_name.startswith("scene.blend_"))
+
+    def test_generate_unique_name_with_content_hash(self):
+        # Arrange
+        file_path = "C:\\projects\\test.blend"
+        with patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"), \
+                patch("dto.project.utils.file_content_hash", side_effect=["aaa", "bbb"]):
+            # Act
+            first = Project(file_path, use_content_hash=True)
+            second = Project(file_path, use_content_hash=True)
+
+        # Assert
+        self.assertNotEqual(first.unique_name, second.unique_name)
 
     def test_get_thumbnail_path(self):
         # Arrange
         file_path = "C:\\projects\\test.blend"
         expected_thumbnail = "C:\\work\\thumbnails\\test.blend_1234.png"
         with patch("dto.project.os.path.basename", return_value="test.blend"), \
-                patch("random.randint", return_value=1234), \
                 patch("dto.project.utils.path_to_thumbnail", return_value=expected_thumbnail) as mock_path_to_thumbnail:
             project = Project(file_path)
             mock_path_to_thumbnail.reset_mock()  # Reset calls from __init__
@@ -56,9 +78,8 @@ class TestProject(unittest.TestCase):
     def test_set_settings(self):
         # Arrange
         file_path = "C:\\projects\\test.blend"
-        new_settings = {"resolution": "1080p", "format": "png"}
+        new_settings = RenderSettings(resolution_x=1280, resolution_y=720, file_format="PNG")
         with patch("dto.project.os.path.basename", return_value="test.blend"), \
-                patch("random.randint", return_value=1234), \
                 patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
             project = Project(file_path)
 
@@ -68,11 +89,111 @@ class TestProject(unittest.TestCase):
             # Assert
             self.assertEqual(project.settings, new_settings)
 
+    def test_apply_source_settings_keeps_user_changes(self):
+        # Arrange
+        with patch("dto.project.os.path.basename", return_value="test.blend"), \
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project("C:\\projects\\test.blend")
+        project.apply_source_settings(RenderSettings(frame_end=100, cycles_samples=64))
+        project.settings.cycles_samples = 512
+        edited = project.settings
+
+        # Act
+        project.apply_source_settings(RenderSettings(frame_end=200, cycles_samples=32))
+
+        # Assert
+        self.assertEqual((project.settings.frame_end, project.settings.cycles_samples), (200, 512))
+        self.assertEqual(project.source_settings, RenderSettings(frame_end=200, cycles_samples=32))
+        # Старый объект не меняется: задания, которые его уже прочитали, видят прежние значения
+        self.assertIsNot(project.settings, edited)
+        self.assertEqual(edited.frame_end, 100)
+
+    def test_apply_source_settings_without_known_source(self):
+        # Arrange
+        with patch("dto.project.os.path.basename", return_value="test.blend"), \
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project("C:\\projects\\test.blend")
+        restored = RenderSettings(frame_end=100)
+        project.settings = restored
+
+        # Act
+        project.apply_source_settings(RenderSettings(frame_end=200))
+
+        # Assert
+        self.assertIs(project.settings, restored)
+        self.assertEqual(project.source_settings.frame_end, 200)
+        with self.assertRaises(TypeError):
+            project.apply_source_settings({"Frame End": 200})
+
+    def test_set_settings_from_dict(self):
+        # Arrange
+        file_path = "C:\\projects\\test.blend"
+        new_settings = {"ResolutionX": 1280, "ResolutionY": 720, "File Formats Image": ["PNG"]}
+        with patch("dto.project.os.path.basename", return_value="test.blend"), \
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project(file_path)
+
+            # Act
+            project.set_settings(new_settings)
+
+            # Assert
+            self.assertEqual(project.settings, RenderSettings(resolution_x=1280, resolution_y=720))
+
+    def test_set_settings_invalid_type(self):
+        # Arrange
+        file_path = "C:\\projects\\test.blend"
+        with patch("dto.project.os.path.basename", return_value="test.blend"), \
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project(file_path)
+
+            # Act & Assert
+            with self.assertRaises(TypeError):
+                project.set_settings("1080p")
+
+    def test_json_round_trip(self):
+        # Arrange
+        file_path = "C:\\projects\\test.blend"
+        with patch("dto.project.os.path.basename", return_value="test.blend"), \
+                patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project(file_path)
+            project.set_settings(RenderSettings(frame_end=100))
+            project.pinned_version = "3.6"
+
+            # Act
+            restored = Project.from_json(project.to_json())
+
+            # Assert
+            self.assertEqual(restored.file_path, project.file_path)
+            self.assertEqual(restored.unique_name, project.unique_name)
+            self.assertEqual(restored.settings, project.settings)
+            self.assertEqual(restored.pinned_version, "3.6")
+
+    def test_add_variant(self):
+        # Arrange
+        with patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project("C:\\projects\\test.blend")
+
+        # Act
+        project.add_variant({"name": "side", "camera": "CamSide"})
+
+        # Assert
+        self.assertEqual(project.variants[0].camera, "CamSide")
+        with self.assertRaises(ValueError):
+            project.add_variant({"name": "side"})
+
+    def test_slots_reject_unknown_attributes(self):
+        # Arrange
+        with patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
+            project = Project("C:\\projects\\test.blend")
+
+        # Act & Assert
+        with self.assertRaises(AttributeError):
+            project.extra = "value"
+
     def test_repr(self):
         # Arrange
         file_path = "C:\\projects\\test.blend"
         with patch("dto.project.os.path.basename", return_value="test.blend"), \
-                patch("random.randint", return_value=1234), \
                 patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path"):
             project = Project(file_path)
 
@@ -82,7 +203,7 @@ class TestProject(unittest.TestCase):
             # Assert
             self.assertEqual(
                 repr_string,
-                "Project(name=test.blend_1234, unique_name=test.blend_1234, file_path=C:\\projects\\test.blend)"
+                f"Project(name={project.unique_name}, unique_name={project.unique_name}, file_path=C:\\projects\\test.blend)"
             )
 
 
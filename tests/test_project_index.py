@@ -0,0 +1,103 @@
+import os
+import unittest
+from unittest.mock import patch
+from dto.project import Project
+from dto.project_index import ProjectIndex
+from dto.render_settings import RenderSettings
+
+
+class TestProjectIndex(unittest.TestCase):
+    def setUp(self):
+        self.patcher = patch("dto.project.utils.path_to_thumbnail", return_value="mocked_path")
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_add_and_lookup(self):
+        # Arrange
+        index = ProjectIndex()
+        project = Project(os.path.join("shots", "sh010", "scene.blend"))
+
+        # Act
+        added = index.add(project)
+
+        # Assert
+        self.assertTrue(added)
+        self.assertIs(index[project.unique_name], project)
+        self.assertIs(index.by_path(os.path.join("shots", "sh010", "scene.blend")), project)
+        self.assertIn(project.unique_name, index)
+        self.assertEqual(len(index), 1)
+
+    def test_add_duplicate_path(self):
+        # Arrange
+        index = ProjectIndex()
+        index.add(Project(os.path.join("shots", "sh010", "scene.blend")))
+
+        # Act
+        added = index.add(Project(os.path.join("shots", "sh010", "..", "sh010", "scene.blend")))
+
+        # Assert
+        self.assertFalse(added)
+        self.assertEqual(len(index), 1)
+
+    def test_by_output_dir(self):
+        # Arrange
+        index = ProjectIndex()
+        project = Project(os.path.join("shots", "sh010", "scene.blend"))
+        project.set_settings(RenderSettings(output_path=os.path.join("renders", "sh010")))
+        index.add(project)
+
+        # Act
+        result = index.by_output_dir(os.path.join("renders", "sh010"))
+
+        # Assert
+        self.assertEqual(result, [project])
+
+    def test_by_output_dir_relative_to_blend(self):
+        # Arrange
+        index = ProjectIndex()
+        project = Project(os.path.join("shots", "sh010", "scene.blend"))
+        project.set_settings(RenderSettings(output_path="//render"))
+        index.add(project)
+
+        # Act
+        result = index.by_output_dir(os.path.join("shots", "sh010", "render"))
+
+        # Assert
+        self.assertEqual(result, [project])
+
+    def test_refresh_output_dir(self):
+        # Arrange
+        index = ProjectIndex()
+        project = Project(os.path.join("shots", "sh010", "scene.blend"))
+        project.set_settings(RenderSettings(output_path="old"))
+        index.add(project)
+
+        # Act
+        project.settings.output_path = "new"
+        index.refresh_output_dir(project)
+
+        # Assert
+        self.assertEqual(index.by_output_dir("old"), [])
+        self.assertEqual(index.by_output_dir("new"), [project])
+
+    def test_remove(self):
+        # Arrange
+        index = ProjectIndex()
+        project = Project(os.path.join("shots", "sh010", "scene.blend"))
+        project.set_settings(RenderSettings(output_path="out"))
+        index.add(project)
+
+        # Act
+        removed = index.remove(project.unique_name)
+
+        # Assert
+        self.assertIs(removed, project)
+        self.assertIsNone(index.by_path(project.file_path))
+        self.assertEqual(index.by_output_dir("out"), [])
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
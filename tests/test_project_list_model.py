@@ -0,0 +1,183 @@
+import os
+import tempfile
+import unittest
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from PyQt5.QtCore import QModelIndex, QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication
+from gui.project_list_model import ProjectListModel
+
+
+class FakeThumbnailLoader(QObject):
+    """ThumbnailLoader stand-in that records requests and finishes them on demand."""
+    thumbnail_ready = pyqtSignal(str, QPixmap)
+    thumbnail_failed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.pixmaps = {}
+        self.requests = []
+
+    def cached(self, path, size):
+        return self.pixmaps.get(path)
+
+    def request(self, path, size):
+        self.requests.append((path, size.width(), size.height()))
+        return None
+
+    def finish(self, path):
+        self.pixmaps[path] = QPixmap(4, 4)
+        self.thumbnail_ready.emit(path, self.pixmaps[path])
+
+
+class TestProjectListModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('ProjectListModel').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projects = {}
+        for index in range(5):
+            preview_path = os.path.join(self.temp_dir.name, f"shot{index}.png")
+            with open(preview_path, "wb") as f:
+                f.write(b"png")
+            self.projects[f"shot{index}"] = SimpleNamespace(
+                file_path=os.path.join(self.temp_dir.name, f"shot{index}.blend"),
+                unique_name=f"shot{index}",
+                preview_path=preview_path,
+            )
+        self.loader = FakeThumbnailLoader()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _make_model(self, batch_size=2):
+        model = ProjectListModel(self.projects, thumbnail_loader=self.loader)
+        model.BATCH_SIZE = batch_size
+        return model
+
+    def test_fetch_more_exposes_rows_in_batches(self):
+        # Arrange
+        model = self._make_model()
+
+        # Act
+        added = model.add_projects(list(self.projects))
+
+        # Assert
+        self.assertEqual(added, 5)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertTrue(model.canFetchMore())
+        model.fetchMore()
+        model.fetchMore()
+        self.assertEqual(model.rowCount(), 5)
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.project_ids(), list(self.projects))
+
+    def test_add_projects_skips_known_ids(self):
+        # Arrange
+        model = self._make_model()
+        model.add_projects(["shot0", "shot1"])
+
+        # Act
+        added = model.add_projects(["shot1", "shot2", "shot2"])
+
+        # Assert
+        self.assertEqual(added, 1)
+        self.assertEqual(model.project_ids(), ["shot0", "shot1", "shot2"])
+
+    def test_data_for_fetched_rows_only(self):
+        # Arrange
+        model = self._make_model()
+        model.add_projects(list(self.projects))
+
+        # Act & Assert
+        self.assertEqual(model.data(model.index(0), Qt.DisplayRole), "shot0.blend")
+        self.assertEqual(model.data(model.index(1), Qt.UserRole), "shot1")
+        self.assertIsNone(model.data(model.createIndex(3, 0), Qt.DisplayRole))
+        self.assertIsNone(model.project_at(3))
+        self.assertIs(model.project_at(1), self.projects["shot1"])
+        self.assertEqual(model.rowCount(model.index(0)), 0)
+
+    def test_icons_are_loaded_only_for_requested_rows(self):
+        # Arrange
+        model = self._make_model(batch_size=5)
+        model.add_projects(list(self.projects))
+        changed = []
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append((top_left.row(), roles)))
+
+        # Act
+        first = model.data(model.index(1), Qt.DecorationRole)
+        model.data(model.index(1), Qt.DecorationRole)
+        self.loader.finish(self.projects["shot1"].preview_path)
+        ready = model.data(model.index(1), Qt.DecorationRole)
+
+        # Assert
+        self.assertIsNone(first)
+        size = ProjectListModel.ICON_SIZE
+        self.assertEqual(self.loader.requests, [(self.projects["shot1"].preview_path, size.width(), size.height())])
+        self.assertEqual(changed, [(1, [Qt.DecorationRole])])
+        self.assertIsInstance(ready, QPixmap)
+
+    def test_missing_or_failed_icon_is_not_requested_again(self):
+        # Arrange
+        model = self._make_model(batch_size=5)
+        model.add_projects(list(self.projects))
+        os.remove(self.projects["shot0"].preview_path)
+
+        # Act
+        model.data(model.index(0), Qt.DecorationRole)
+        model.data(model.index(2), Qt.DecorationRole)
+        self.loader.thumbnail_failed.emit(self.projects["shot2"].preview_path)
+        model.data(model.index(2), Qt.DecorationRole)
+
+        # Assert
+        self.assertEqual([request[0] for request in self.loader.requests], [self.projects["shot2"].preview_path])
+
+    def test_refresh_thumbnail_retries_failed_icon(self):
+        # Arrange
+        model = self._make_model(batch_size=5)
+        model.add_projects(list(self.projects))
+        model.data(model.index(3), Qt.DecorationRole)
+        self.loader.thumbnail_failed.emit(self.projects["shot3"].preview_path)
+        changed = MagicMock()
+        model.dataChanged.connect(changed)
+
+        # Act
+        model.refresh_thumbnail("shot3")
+        model.refresh_thumbnail("unknown")
+        model.data(model.index(3), Qt.DecorationRole)
+
+        # Assert
+        self.assertEqual(changed.call_count, 1)
+        self.assertEqual(len(self.loader.requests), 2)
+
+    def test_refresh_thumbnail_requests_pending_icon_again(self):
+        # Arrange
+        model = self._make_model(batch_size=5)
+        model.add_projects(list(self.projects))
+        model.data(model.index(3), Qt.DecorationRole)
+
+        # Act
+        model.refresh_thumbnail("shot3")
+        model.data(model.index(3), Qt.DecorationRole)
+
+        # Assert
+        self.assertEqual(len(self.loader.requests), 2)
+
+    def test_icons_without_loader(self):
+        # Arrange
+        model = ProjectListModel(self.projects)
+        model.add_projects(["shot0"])
+
+        # Act & Assert
+        self.assertIsNone(model.data(model.index(0), Qt.DecorationRole))
+        self.assertIsNone(model.data(QModelIndex(), Qt.DisplayRole))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import logging
+from managers.project_watcher import ProjectWatcher
+
+
+class TestProjectWatcher(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('ProjectWatcher').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "scene.blend")
+        with open(self.file_path, "wb") as f:
+            f.write(b"BLENDER")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _touch(self, content: bytes):
+        with open(self.file_path, "wb") as f:
+            f.write(content)
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_poll_detects_changed_file(self):
+        # Arrange
+        watcher = ProjectWatcher(use_polling=True)
+        watcher.watch([self.file_path])
+        listener = MagicMock()
+        watcher.projects_changed.connect(listener)
+        self._touch(b"BLENDER-changed")
+
+        # Act
+        watcher._poll()
+        changed = watcher._flush_pending()
+
+        # Assert
+        self.assertEqual(changed, [self.file_path])
+        listener.assert_called_once_with([self.file_path])
+
+    def test_flush_ignores_unchanged_file(self):
+        # Arrange
+        watcher = ProjectWatcher(use_polling=True)
+        watcher.watch([self.file_path])
+        listener = MagicMock()
+        watcher.projects_changed.connect(listener)
+
+        # Act
+        watcher._on_file_changed(self.file_path)
+        changed = watcher._flush_pending()
+
+        # Assert
+        self.assertEqual(changed, [])
+        listener.assert_not_called()
+
+    def test_events_are_batched_until_flush(self):
+        # Arrange
+        watcher = ProjectWatcher(use_polling=True)
+        watcher.watch([self.file_path])
+        self._touch(b"BLENDER-changed")
+
+        # Act
+        watcher._on_file_changed(self.file_path)
+        watcher._on_directory_changed(self.temp_dir.name)
+        changed = watcher._flush_pending()
+
+        # Assert
+        self.assertEqual(changed, [self.file_path])
+        self.assertEqual(watcher._flush_pending(), [])
+
+    def test_unwatch_drops_pending_changes(self):
+        # Arrange
+        watcher = ProjectWatcher(use_polling=True)
+        watcher.watch([self.file_path])
+        self._touch(b"BLENDER-changed")
+        watcher._poll()
+
+        # Act
+        watcher.unwatch([self.file_path])
+
+        # Assert
+        self.assertEqual(watcher._flush_pending(), [])
+        self.assertEqual(watcher.watched_paths(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import patch
+from util.render_failures import (
+    RetryPolicy,
+    classify_failure,
+    remaining_render_spec,
+    saved_frames,
+    OUT_OF_MEMORY,
+    GPU_ERROR,
+    MISSING_FILE,
+    IO_ERROR,
+    CRASH,
+    SCRIPT_ERROR,
+    UNKNOWN
+)
+
+
+def make_spec(variants=None):
+    spec = {
+        "version": 1,
+        "kind": "render",
+        "blend_file": "C:\\scenes\\shot.blend",
+        "settings": {"Frame Start": 1, "Frame End": 5, "Frame Step": 1, "Output Path": "C:\\out"},
+    }
+    if variants is not None:
+        spec["variants"] = variants
+    return spec
+
+
+class TestRenderFailures(unittest.TestCase):
+    def test_classify_failure_out_of_memory(self):
+        # Act & Assert
+        self.assertEqual(classify_failure(-9, []), OUT_OF_MEMORY)
+        self.assertEqual(classify_failure(1, ["STDERR: Error: System is out of GPU memory"]), OUT_OF_MEMORY)
+
+    def test_classify_failure_gpu_error(self):
+        # Act
+        failure = classify_failure(1, ["STDOUT: Fra:3", "STDERR: CUDA error: Launch failed in cuCtxSynchronize()"])
+
+        # Assert
+        self.assertEqual(failure, GPU_ERROR)
+
+    def test_classify_failure_missing_file_wins_over_traceback(self):
+        # Arrange
+        lines = [
+            "STDERR: Traceback (most recent call last):",
+            "STDERR: RuntimeError: Error: Cannot read file \"\\\\nas\\scenes\\shot.blend\": No such file or directory",
+        ]
+
+        # Act
+        failure = classify_failure(1, lines)
+
+        # Assert
+        self.assertEqual(failure, MISSING_FILE)
+
+    def test_classify_failure_network_error_is_io_error(self):
+        # Act & Assert
+        self.assertEqual(classify_failure(1, ["STDERR: The network path was not found"]), IO_ERROR)
+        self.assertEqual(classify_failure(1, ["STDERR: Unable to open \"\\\\nas\\shot.blend\": Stale file handle"]),
+                         IO_ERROR)
+
+    def test_classify_failure_lookup_error_is_not_missing_file(self):
+        # Act & Assert
+        self.assertEqual(classify_failure(1, ["STDERR: Traceback (most recent call last):",
+                                              "STDERR: KeyError: 'bpy_prop_collection[key]: key \"Cam\" not found'"]),
+                         SCRIPT_ERROR)
+        self.assertEqual(classify_failure(1, ["STDERR: Error: view layer \"Fg\" not found"]), UNKNOWN)
+
+    def test_classify_failure_script_error(self):
+        # Act
+        failure = classify_failure(1, ["STDERR: Traceback (most recent call last):",
+                                       "STDERR: KeyError: 'Camera'"])
+
+        # Assert
+        self.assertEqual(failure, SCRIPT_ERROR)
+
+    def test_classify_failure_by_return_code(self):
+        # Act & Assert
+        self.assertEqual(classify_failure(-11, ["STDOUT: Fra:1"]), CRASH)
+        self.assertEqual(classify_failure(0xC0000005, []), CRASH)
+        self.assertEqual(classify_failure(1, ["STDOUT: Fra:1"]), UNKNOWN)
+
+    def test_retry_policy_should_retry(self):
+        # Arrange
+        policy = RetryPolicy(max_attempts=3)
+
+        # Act & Assert
+        self.assertTrue(policy.should_retry(OUT_OF_MEMORY, 1))
+        self.assertTrue(policy.should_retry(OUT_OF_MEMORY, 2))
+        self.assertFalse(policy.should_retry(OUT_OF_MEMORY, 3))
+        self.assertFalse(policy.should_retry(SCRIPT_ERROR, 1))
+
+    def test_retry_policy_delay(self):
+        # Arrange
+        policy = RetryPolicy(base_delay=10, max_delay=30, jitter=0)
+
+        # Act & Assert
+        self.assertEqual([policy.delay(attempt) for attempt in (1, 2, 3)], [10.0, 20.0, 30.0])
+
+    @patch("util.render_failures.random.uniform", return_value=0.1)
+    def test_retry_policy_delay_jitter(self, mock_uniform):
+        # Arrange
+        policy = RetryPolicy(base_delay=10, jitter=0.1)
+
+        # Act
+        delay = policy.delay(1)
+
+        # Assert
+        self.assertAlmostEqual(delay, 11.0)
+        mock_uniform.assert_called_once_with(-0.1, 0.1)
+
+    def test_retry_policy_from_dict_invalid(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RetryPolicy.from_dict({"max_attempts": 0})
+        with self.assertRaises(ValueError):
+            RetryPolicy.from_dict({"retry_on": ["cosmic_ray"]})
+        with self.assertRaises(TypeError):
+            RetryPolicy.from_dict([3])
+        with self.assertRaises(TypeError):
+            RetryPolicy.from_dict({"attempts": 3})
+
+    def test_saved_frames(self):
+        # Arrange
+        outputs = ["C:\\out\\shot_wide_0001.png", "C:\\out\\shot_wide_0002.png", "C:\\out\\shot_close_0001.png"]
+
+        # Act
+        frames = saved_frames("shot_wide", outputs)
+
+        # Assert
+        self.assertEqual(frames, {1, 2})
+
+    def test_remaining_render_spec_narrows_animation(self):
+        # Arrange
+        spec = make_spec([{"name": "wide", "overrides": {"Frame End": 4}, "animation": True}])
+        outputs = ["C:\\out\\shot_wide_0001.png", "C:\\out\\shot_wide_0002.png"]
+
+        # Act
+        remaining = remaining_render_spec(spec, outputs)
+
+        # Assert
+        self.assertEqual(remaining["variants"][0]["overrides"], {"Frame End": 4, "Frame Start": 3})
+        self.assertNotIn("Frame Start", spec["variants"][0]["overrides"])
+
+    def test_remaining_render_spec_drops_finished_variants(self):
+        # Arrange
+        spec = make_spec([
+            {"name": "still", "overrides": {}, "animation": False},
+            {"name": "anim", "overrides": {"Frame End": 2}, "animation": True},
+            {"name": "other", "overrides": {}, "animation": False},
+        ])
+        outputs = ["C:\\out\\shot_still.png", "C:\\out\\shot_anim_0001.png", "C:\\out\\shot_anim_0002.png"]
+
+        # Act
+        remaining = remaining_render_spec(spec, outputs)
+
+        # Assert
+        self.assertEqual([variant["name"] for variant in remaining["variants"]], ["other"])
+
+    def test_remaining_render_spec_all_done(self):
+        # Arrange
+        spec = make_spec()
+
+        # Act
+        remaining = remaining_render_spec(spec, ["C:\\out\\shot.png"])
+
+        # Assert
+        self.assertIsNone(remaining)
+
+
+if __name__ == '__main__':
+    unittest.main()
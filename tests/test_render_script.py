@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+import importlib.util
+import subprocess
+from util.job_spec import JOB_SPEC_VERSION
+from util.render_failures import classify_failure, MISSING_FILE, SCRIPT_ERROR
+
+RENDER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts", "render_script.py")
+# Blender без --python-exit-code печатает исключение скрипта и завершается с 0; код выхода задает только сам скрипт
+BLENDER_DRIVER = """
+import sys, runpy, traceback
+script, spec_path = sys.argv[1:3]
+sys.argv = ["blender", "--background", "--python", script, "--", "--job-spec", spec_path]
+try:
+    runpy.run_path(script, run_name="__main__")
+except Exception:
+    traceback.print_exc()
+sys.exit(0)
+"""
+
+
+@unittest.skipIf(importlib.util.find_spec("bpy") is None, "bpy module is not installed")
+class TestRenderScript(unittest.TestCase):
+    """Runs scripts/render_script.py with the bpy module, exiting like Blender does after a --python script."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, spec: dict):
+        spec_path = os.path.join(self.temp_dir.name, "job.json")
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump({"version": JOB_SPEC_VERSION, "kind": "render", **spec}, f)
+        result = subprocess.run([sys.executable, "-c", BLENDER_DRIVER, RENDER_SCRIPT, spec_path],
+                                capture_output=True, text=True, timeout=120)
+        lines = [f"STDOUT: {line}" for line in result.stdout.splitlines()]
+        lines += [f"STDERR: {line}" for line in result.stderr.splitlines()]
+        return result.returncode, lines
+
+    def test_missing_blend_fails_with_missing_file(self):
+        # Act
+        return_code, lines = self._run({"blend_file": os.path.join(self.temp_dir.name, "missing.blend"),
+                                        "settings": {}})
+
+        # Assert
+        self.assertEqual(return_code, 1)
+        self.assertEqual(classify_failure(return_code, lines), MISSING_FILE)
+
+    def test_unknown_scene_fails_with_script_error(self):
+        # Arrange
+        blend_file = os.path.join(self.temp_dir.name, "empty.blend")
+        subprocess.run([sys.executable, "-c", f"import bpy; bpy.ops.wm.save_as_mainfile(filepath={blend_file!r})"],
+                       check=True, capture_output=True, timeout=120)
+
+        # Act
+        return_code, lines = self._run({"blend_file": blend_file, "settings": {},
+                                        "variants": [{"name": "wide", "scene": "Missing"}]})
+
+        # Assert
+        self.assertEqual(return_code, 1)
+        self.assertEqual(classify_failure(return_code, lines), SCRIPT_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import unittest
+from dto.render_settings import (
+    RenderSettings,
+    MOVIE_FILE_FORMATS,
+    set_image_file_formats,
+    get_image_file_formats
+)
+
+
+class TestRenderSettings(unittest.TestCase):
+    def test_defaults_are_valid(self):
+        # Act
+        settings = RenderSettings()
+
+        # Assert
+        self.assertEqual(settings.render_engine, "CYCLES")
+        self.assertEqual(settings.threads, 0)
+
+    def test_invalid_type(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            RenderSettings(resolution_x="1920")
+
+    def test_bool_is_not_integer(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            RenderSettings(cycles_samples=True)
+
+    def test_invalid_range(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderSettings(frame_step=0)
+
+    def test_invalid_device(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderSettings(device="TPU")
+
+    def test_validate_after_assignment(self):
+        # Arrange
+        settings = RenderSettings()
+        settings.threads = -1
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            settings.validate()
+
+    def test_to_dict_uses_script_keys(self):
+        # Arrange
+        settings = RenderSettings(resolution_x=1280, output_path="C:\\out")
+
+        # Act
+        result = settings.to_dict()
+
+        # Assert
+        self.assertEqual(result["ResolutionX"], 1280)
+        self.assertEqual(result["Output Path"], "C:\\out")
+        self.assertNotIn("File Formats Image", result)
+
+    def test_from_dict_ignores_legacy_format_lists(self):
+        # Arrange
+        data = {"Frame": 10, "File Formats Image": ["PNG"], "File Formats Movie": ["FFMPEG"]}
+
+        # Act
+        settings = RenderSettings.from_dict(data)
+
+        # Assert
+        self.assertEqual(settings.frame, 10)
+
+    def test_from_dict_unknown_key(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderSettings.from_dict({"Resolution": "1080p"})
+
+    def test_json_round_trip(self):
+        # Arrange
+        settings = RenderSettings(fps_base=1.001, denoising=True)
+
+        # Act
+        restored = RenderSettings.from_json(settings.to_json())
+
+        # Assert
+        self.assertEqual(restored, settings)
+        self.assertEqual(json.loads(settings.to_json())["FPS Base"], 1.001)
+
+    def test_copy_is_independent(self):
+        # Arrange
+        settings = RenderSettings()
+
+        # Act
+        copied = settings.copy()
+        copied.frame = 42
+
+        # Assert
+        self.assertEqual(settings.frame, 1)
+
+    def test_image_formats_are_shared(self):
+        # Arrange
+        first = set_image_file_formats(["PNG", "JPEG"])
+
+        # Act
+        second = set_image_file_formats(["PNG", "JPEG"])
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertIs(RenderSettings().file_formats_image, get_image_file_formats())
+        self.assertIs(RenderSettings().file_formats_movie, MOVIE_FILE_FORMATS)
+
+    def test_slots(self):
+        # Arrange
+        settings = RenderSettings()
+
+        # Act & Assert
+        self.assertFalse(hasattr(settings, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from dto.render_variant import RenderVariant
+
+
+class TestRenderVariant(unittest.TestCase):
+    def test_defaults(self):
+        # Act
+        variant = RenderVariant("main")
+
+        # Assert
+        self.assertIsNone(variant.scene)
+        self.assertEqual(variant.overrides, {})
+        self.assertFalse(variant.animation)
+
+    def test_empty_name(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderVariant("")
+
+    def test_unknown_override_key(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            RenderVariant("4k", overrides={"Width": 3840})
+
+    def test_invalid_camera_type(self):
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            RenderVariant("cam", camera=1)
+
+    def test_round_trip(self):
+        # Arrange
+        variant = RenderVariant("cam_b", scene="Main", camera="CamB", view_layer="FG",
+                                overrides={"ResolutionX": 3840}, animation=True)
+
+        # Act
+        restored = RenderVariant.from_dict(variant.to_dict())
+
+        # Assert
+        self.assertEqual(restored, variant)
+
+
+if __name__ == '__main__':
+    unittest.main()
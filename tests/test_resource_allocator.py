@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import logging
+from managers.resource_allocator import (
+    CpuSlot,
+    ResourceAllocator,
+    parse_cpu_list,
+    plan_slots,
+    read_numa_nodes,
+    affinity_command_prefix
+)
+
+
+class TestResourceAllocator(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('ResourceAllocator').setLevel(logging.CRITICAL)
+
+    def test_parse_cpu_list(self):
+        # Act
+        cores = parse_cpu_list("0-3,8,10-11\n")
+
+        # Assert
+        self.assertEqual(cores, [0, 1, 2, 3, 8, 10, 11])
+
+    def test_read_numa_nodes(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for node, cpu_list in ((0, "0-1"), (1, "2-3")):
+                os.makedirs(os.path.join(temp_dir, f"node{node}"))
+                with open(os.path.join(temp_dir, f"node{node}", "cpulist"), "w") as f:
+                    f.write(cpu_list)
+
+            # Act
+            nodes = read_numa_nodes(os.path.join(temp_dir, "node[0-9]*"))
+
+        # Assert
+        self.assertEqual(nodes, {0: [0, 1], 1: [2, 3]})
+
+    def test_plan_slots_without_numa(self):
+        # Act
+        slots = plan_slots(3, cores=list(range(8)), numa_nodes={})
+
+        # Assert
+        self.assertEqual([slot.cores for slot in slots], [(0, 1, 2), (3, 4, 5), (6, 7)])
+        self.assertTrue(all(slot.numa_node is None for slot in slots))
+
+    def test_plan_slots_keeps_jobs_inside_numa_nodes(self):
+        # Arrange
+        numa_nodes = {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+
+        # Act
+        slots = plan_slots(4, cores=list(range(8)), numa_nodes=numa_nodes)
+
+        # Assert
+        self.assertEqual([(slot.numa_node, slot.cores) for slot in slots],
+                         [(0, (0, 1)), (0, (2, 3)), (1, (4, 5)), (1, (6, 7))])
+
+    def test_plan_slots_single_job_gets_all_numa_nodes(self):
+        # Arrange
+        numa_nodes = {0: list(range(8)), 1: list(range(8, 16))}
+
+        # Act
+        slots = plan_slots(1, cores=list(range(16)), numa_nodes=numa_nodes)
+
+        # Assert
+        self.assertEqual(len(slots), 1)
+        self.assertEqual(slots[0].cores, tuple(range(16)))
+        self.assertIsNone(slots[0].numa_node)
+        self.assertEqual(slots[0].threads_for(0), 16)
+
+    def test_plan_slots_fewer_jobs_than_numa_nodes(self):
+        # Arrange
+        numa_nodes = {node: [node * 2, node * 2 + 1] for node in range(4)}
+
+        # Act
+        slots = plan_slots(2, cores=list(range(8)), numa_nodes=numa_nodes)
+
+        # Assert
+        self.assertEqual([(slot.numa_node, slot.cores) for slot in slots], [(None, (0, 1, 2, 3)), (None, (4, 5, 6, 7))])
+
+    def test_plan_slots_balances_cores_across_numa_nodes(self):
+        # Arrange
+        numa_nodes = {0: list(range(8)), 1: list(range(8, 16))}
+
+        # Act
+        slots = plan_slots(3, cores=list(range(16)), numa_nodes=numa_nodes)
+
+        # Assert
+        self.assertEqual([len(slot.cores) for slot in slots], [6, 5, 5])
+        self.assertEqual([slot.numa_node for slot in slots], [0, None, 1])
+
+    def test_plan_slots_more_jobs_than_cores(self):
+        # Act
+        slots = plan_slots(4, cores=[0, 1], numa_nodes={})
+
+        # Assert
+        self.assertEqual(len(slots), 2)
+
+    def test_plan_slots_invalid_job_count(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            plan_slots(0, cores=[0, 1], numa_nodes={})
+
+    def test_threads_for(self):
+        # Arrange
+        slot = CpuSlot(0, (0, 1, 2, 3))
+
+        # Act & Assert
+        self.assertEqual(slot.threads_for(0), 4)
+        self.assertEqual(slot.threads_for(2), 2)
+        self.assertEqual(slot.threads_for(16), 4)
+
+    def test_acquire_release(self):
+        # Arrange
+        allocator = ResourceAllocator(2, cores=[0, 1], numa_nodes={})
+
+        # Act
+        first = allocator.acquire()
+        second = allocator.acquire()
+        exhausted = allocator.acquire(timeout=0.01)
+        allocator.release(first)
+        again = allocator.acquire(timeout=0.01)
+
+        # Assert
+        self.assertNotEqual(first, second)
+        self.assertIsNone(exhausted)
+        self.assertIs(again, first)
+
+    @patch("managers.resource_allocator.shutil.which", return_value="/usr/bin/numactl")
+    def test_affinity_command_prefix_numactl(self, mock_which):
+        # Act
+        prefix = affinity_command_prefix(CpuSlot(0, (4, 5), numa_node=1))
+
+        # Assert
+        self.assertEqual(prefix, ["/usr/bin/numactl", "--physcpubind=4,5", "--membind=1"])
+        self.assertEqual(affinity_command_prefix(CpuSlot(0, (0, 1))), ["/usr/bin/numactl", "--physcpubind=0,1"])
+
+    @patch("managers.resource_allocator.shutil.which")
+    def test_affinity_command_prefix_taskset(self, mock_which):
+        # Arrange
+        mock_which.side_effect = {"taskset": "/usr/bin/taskset"}.get
+
+        # Act & Assert
+        self.assertEqual(affinity_command_prefix(CpuSlot(0, (2, 3), numa_node=0)), ["/usr/bin/taskset", "-c", "2,3"])
+        mock_which.side_effect = None
+        mock_which.return_value = None
+        self.assertEqual(affinity_command_prefix(CpuSlot(0, (2, 3))), [])
+
+if __name__ == '__main__':
+    unittest.main()
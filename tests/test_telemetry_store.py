@@ -0,0 +1,180 @@
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import logging
+from managers.telemetry_store import TelemetryStore, format_table, main, _SCHEMA
+
+
+def make_job(**values):
+    job = {
+        "project": "shot_1234",
+        "blend_file": "C:\\scenes\\shot.blend",
+        "kind": "render",
+        "blender_version": "4.2.7",
+        "engine": "CYCLES",
+        "samples": 64,
+        "frame_count": 2,
+        "started_at": 100.0,
+        "startup": 2.0,
+        "render": 10.0,
+        "return_code": 0,
+    }
+    job.update(values)
+    return job
+
+
+class TestTelemetryStore(unittest.TestCase):
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('TelemetryStore').setLevel(logging.CRITICAL)
+        self.store = TelemetryStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_record_job_with_frames(self):
+        # Act
+        job_id = self.store.record_job(make_job(), {1: 4.0, 2: 6.0})
+
+        # Assert
+        self.assertEqual(self.store.jobs()[0]["id"], job_id)
+        self.assertEqual(self.store.frame_times(job_id),
+                         [{"frame": 1, "render_time": 4.0}, {"frame": 2, "render_time": 6.0}])
+
+    def test_record_job_unknown_column(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            self.store.record_job(make_job(gpu="RTX"))
+
+    def test_record_job_missing_required(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            self.store.record_job(make_job(project=None))
+
+    def test_update_job(self):
+        # Arrange
+        job_id = self.store.record_job(make_job())
+
+        # Act
+        self.store.update_job(job_id, post_process=3.5)
+
+        # Assert
+        self.assertEqual(self.store.jobs()[0]["post_process"], 3.5)
+
+    def test_jobs_filters(self):
+        # Arrange
+        self.store.record_job(make_job(blender_version="3.6.22", started_at=50.0))
+        self.store.record_job(make_job(project="other_5678", started_at=200.0))
+
+        # Act
+        by_project = self.store.jobs(project="shot_1234")
+        by_version = self.store.jobs(blender_version="3.6.22")
+        recent = self.store.jobs(since=150.0)
+
+        # Assert
+        self.assertEqual(len(by_project), 1)
+        self.assertEqual(by_version[0]["started_at"], 50.0)
+        self.assertEqual(recent[0]["project"], "other_5678")
+
+    def test_project_summary(self):
+        # Arrange
+        self.store.record_job(make_job(render=10.0))
+        self.store.record_job(make_job(render=20.0, return_code=1))
+        self.store.record_job(make_job(project="cheap_1", render=1.0))
+
+        # Act
+        summary = self.store.project_summary()
+
+        # Assert
+        self.assertEqual(summary[0]["project"], "shot_1234")
+        self.assertEqual(summary[0]["jobs"], 2)
+        self.assertEqual(summary[0]["avg_frame"], 7.5)
+        self.assertEqual(summary[0]["failures"], 1)
+
+    def test_average_frame_seconds(self):
+        # Arrange
+        self.store.record_job(make_job(render=10.0))
+        self.store.record_job(make_job(render=30.0))
+        self.store.record_job(make_job(render=100.0, return_code=1))
+        self.store.record_job(make_job(project="still_1", render=4.0, frame_count=1))
+        self.store.record_job(make_job(project="empty_1", frame_count=0))
+        self.store.record_job(make_job(project="thumb_1", kind="thumbnail"))
+
+        # Act
+        frame_seconds = self.store.average_frame_seconds()
+
+        # Assert
+        self.assertEqual(frame_seconds, {"shot_1234": 10.0, "still_1": 4.0})
+
+    def test_version_comparison(self):
+        # Arrange
+        self.store.record_job(make_job(blender_version="3.6.22", render=20.0))
+        self.store.record_job(make_job(blender_version="4.2.7", render=10.0))
+
+        # Act
+        versions = self.store.version_comparison(project="shot_1234")
+
+        # Assert
+        self.assertEqual([(row["blender_version"], row["avg_frame"]) for row in versions],
+                         [("3.6.22", 10.0), ("4.2.7", 5.0)])
+
+    def test_opens_database_without_added_columns(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "telemetry.db")
+            # Схема первой версии, без колонок setup и shutdown
+            connection = sqlite3.connect(db_path)
+            connection.executescript(_SCHEMA.replace("    setup REAL,\n", "").replace("    shutdown REAL,\n", ""))
+            connection.close()
+            store = TelemetryStore(db_path)
+
+            # Act
+            job_id = store.record_job({"project": "shot", "blend_file": "shot.blend", "kind": "render",
+                                       "started_at": 1.0, "setup": 0.5})
+            job = store.jobs()[0]
+            store.close()
+
+        # Assert
+        self.assertEqual((job["id"], job["setup"]), (job_id, 0.5))
+
+    def test_project_summary_ignores_thumbnails(self):
+        # Arrange
+        self.store.record_job(make_job(kind="thumbnail"))
+
+        # Act
+        summary = self.store.project_summary()
+
+        # Assert
+        self.assertEqual(summary, [])
+
+    def test_format_table(self):
+        # Act
+        table = format_table([{"project": "shot", "avg_render": 1.234, "failures": None}])
+
+        # Assert
+        self.assertEqual(table.splitlines()[2].split(), ["shot", "1.23", "-"])
+        self.assertEqual(format_table([]), "No data")
+
+    def test_main_report(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "telemetry.db")
+            store = TelemetryStore(db_path)
+            store.record_job(make_job())
+            store.close()
+            output = io.StringIO()
+
+            # Act
+            with redirect_stdout(output):
+                result = main(["projects", "--db", db_path])
+
+        # Assert
+        self.assertEqual(result, 0)
+        self.assertIn("shot_1234", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import time
+import tempfile
+import unittest
+import logging
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+from gui.thumbnail_loader import ThumbnailLoader
+
+
+class TestThumbnailLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # Disable logging during tests to avoid clutter
+        logging.getLogger('ThumbnailLoader').setLevel(logging.CRITICAL)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ready = []
+        self.failed = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _make_loader(self, cache_size: int = 8) -> ThumbnailLoader:
+        loader = ThumbnailLoader(cache_size=cache_size)
+        loader.thumbnail_ready.connect(lambda path, pixmap: self.ready.append((path, pixmap)))
+        loader.thumbnail_failed.connect(self.failed.append)
+        return loader
+
+    def _write_image(self, name: str, width: int = 400, height: int = 200) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(Qt.red)
+        self.assertTrue(image.save(path, "PNG"))
+        return path
+
+    def _wait_for(self, condition, timeout: float = 5.0) -> None:
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_request_decodes_scaled_pixmap_in_background(self):
+        # Arrange
+        loader = self._make_loader()
+        path = self._write_image("wide.png")
+        size = QSize(100, 100)
+
+        # Act
+        first = loader.request(path, size)
+        self._wait_for(lambda: self.ready)
+
+        # Assert
+        self.assertIsNone(first)
+        ready_path, pixmap = self.ready[0]
+        self.assertEqual(ready_path, path)
+        # Пропорции сохраняются, изображение вписано в запрошенный размер
+        self.assertEqual((pixmap.width(), pixmap.height()), (100, 50))
+        self.assertIs(loader.request(path, size), loader.cached(path, size))
+
+    def test_pending_request_is_scheduled_once(self):
+        # Arrange
+        loader = self._make_loader()
+        path = self._write_image("shot.png")
+
+        # Act
+        loader.request(path, QSize(64, 64))
+        loader.request(path, QSize(64, 64))
+        self._wait_for(lambda: self.ready)
+        time.sleep(0.1)
+        QApplication.processEvents()
+
+        # Assert
+        self.assertEqual(len(self.ready), 1)
+
+    def test_least_recently_used_pixmap_is_evicted(self):
+        # Arrange
+        loader = self._make_loader(cache_size=2)
+        paths = [self._write_image(f"shot{index}.png") for index in range(3)]
+        size = QSize(32, 32)
+        for path in paths[:2]:
+            loader.request(path, size)
+        self._wait_for(lambda: len(self.ready) == 2)
+        loader.cached(paths[0], size)
+
+        # Act
+        loader.request(paths[2], size)
+        self._wait_for(lambda: len(self.ready) == 3)
+
+        # Assert
+        self.assertIsNotNone(loader.cached(paths[0], size))
+        self.assertIsNone(loader.cached(paths[1], size))
+        self.assertIsNotNone(loader.cached(paths[2], size))
+
+    def test_invalidate_drops_every_size(self):
+        # Arrange
+        loader = self._make_loader()
+        path = self._write_image("shot.png")
+        loader.request(path, QSize(32, 32))
+        loader.request(path, QSize(64, 64))
+        self._wait_for(lambda: len(self.ready) == 2)
+
+        # Act
+        loader.invalidate(path)
+
+        # Assert
+        self.assertIsNone(loader.cached(path, QSize(32, 32)))
+        self.assertIsNone(loader.cached(path, QSize(64, 64)))
+
+    def test_invalidate_drops_decode_in_flight(self):
+        # Arrange
+        loader = self._make_loader()
+        path = self._write_image("shot.png")
+        size = QSize(100, 100)
+        loader.request(path, size)
+
+        # Act
+        loader.invalidate(path)
+        self._write_image("shot.png", width=200, height=400)
+        second = loader.request(path, size)
+        self._wait_for(lambda: self.ready)
+        time.sleep(0.1)
+        QApplication.processEvents()
+
+        # Assert
+        self.assertIsNone(second)
+        # Результат старого декодирования отброшен, в кэше только новое изображение
+        self.assertEqual(len(self.ready), 1)
+        pixmap = loader.cached(path, size)
+        self.assertEqual((pixmap.width(), pixmap.height()), (50, 100))
+
+    def test_invalid_image_reports_failure(self):
+        # Arrange
+        loader = self._make_loader()
+        path = os.path.join(self.temp_dir.name, "broken.png")
+        with open(path, "wb") as f:
+            f.write(b"not an image")
+
+        # Act
+        loader.request(path, QSize(32, 32))
+        self._wait_for(lambda: self.failed)
+
+        # Assert
+        self.assertEqual(self.failed, [path])
+        self.assertIsNone(loader.cached(path, QSize(32, 32)))
+        # После ошибки файл можно запросить снова
+        self.assertIsNone(loader.request(path, QSize(32, 32)))
+        self._wait_for(lambda: len(self.failed) == 2)
+
+    def test_init_invalid_cache_size(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            ThumbnailLoader(cache_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
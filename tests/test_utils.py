@@ -3,12 +3,16 @@ from unittest.mock import patch, MagicMock
 import logging
 import os
 import subprocess
+import tempfile
 from util.utils import (
     transform_path_to_standard,
     path_to_thumbnail,
     set_config_value,
     get_config_value,
     get_file_name_from_path,
+    normalize_path,
+    file_content_hash,
+    scan_blend_files,
     is_path_exists,
     get_cpu_count,
     set_blender_in_path,
@@ -146,6 +150,62 @@ class TestUtils(unittest.TestCase):
         # Assert
         self.assertEqual(result, "")
 
+    def test_normalize_path_collapses_relative_parts(self):
+        # Arrange
+        path = os.path.join("shots", "sh010", "..", "sh010", "scene.blend")
+
+        # Act
+        result = normalize_path(path)
+
+        # Assert
+        self.assertEqual(result, normalize_path(os.path.join("shots", "sh010", "scene.blend")))
+        self.assertTrue(os.path.isabs(result))
+
+    def test_normalize_path_empty(self):
+        # Act
+        result = normalize_path("")
+
+        # Assert
+        self.assertEqual(result, "")
+
+    def test_file_content_hash(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "scene.blend")
+            with open(file_path, "wb") as f:
+                f.write(b"BLENDER")
+
+            # Act
+            result = file_content_hash(file_path)
+
+        # Assert
+        self.assertEqual(result, "e706dcd77d1d2f4110ab33916adcbf655e0e3652")
+
+    def test_scan_blend_files_recursive(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as root:
+            nested = os.path.join(root, "shot_010", "anim")
+            os.makedirs(nested)
+            expected = {os.path.join(root, "scene.blend"), os.path.join(nested, "scene.BLEND")}
+            for path in expected | {os.path.join(nested, "scene.blend1"), os.path.join(root, "notes.txt")}:
+                open(path, "w").close()
+
+            # Act
+            result = set(scan_blend_files(root))
+
+        # Assert
+        self.assertEqual(result, expected)
+
+    def test_scan_blend_files_missing_directory(self):
+        # Arrange
+        directory = os.path.join(tempfile.gettempdir(), "missing_blend_directory")
+
+        # Act
+        result = list(scan_blend_files(directory))
+
+        # Assert
+        self.assertEqual(result, [])
+
     @patch('os.path.exists')
     def test_is_path_exists_valid(self, mock_exists):
         # Arrange
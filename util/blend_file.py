@@ -0,0 +1,441 @@
+import os
+import re
+import gzip
+import struct
+import zlib
+from collections import namedtuple
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from util.log_config import get_logger
+
+try:
+    import zstandard
+except ImportError:  # Сжатые zstd файлы (Blender 3.0+) без пакета не читаются
+    zstandard = None
+
+# Configure logging
+logger = get_logger('BlendFile')
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+BLEND_MAGIC = b"BLENDER"
+
+# Блоки, которые Blender пишет перед GLOB; миниатюра всегда среди них
+THUMBNAIL_BLOCK = b"TEST"
+LEADING_BLOCKS = (b"REND", THUMBNAIL_BLOCK)
+
+# Описание структур файла (SDNA), Blender пишет его в конце
+DNA_BLOCK = b"DNA1"
+# Блоки ID, которые ссылаются на внешние файлы
+EXTERNAL_PATH_BLOCKS = {
+    b"LI\x00\x00": "library",
+    b"IM\x00\x00": "image",
+    b"SO\x00\x00": "sound",
+    b"CF\x00\x00": "cache",
+    b"VO\x00\x00": "volume",
+    b"MC\x00\x00": "movie_clip",
+    b"VF\x00\x00": "font",
+}
+# Image.source: сгенерированные изображения и окна просмотра не читаются с диска
+IMAGE_SOURCE_SEQUENCE = 2
+IMAGE_SOURCE_GENERATED = 4
+IMAGE_SOURCE_VIEWER = 5
+IMAGE_SOURCE_TILED = 6
+# MovieClip.source
+MOVIE_CLIP_SOURCE_SEQUENCE = 1
+# Шрифт по умолчанию встроен в Blender
+BUILTIN_FONT = "<builtin>"
+
+# Блоки, из которых собираются сведения о сценах
+SCENE_BLOCK = b"SC\x00\x00"
+OBJECT_BLOCK = b"OB\x00\x00"
+GLOBAL_BLOCK = b"GLOB"
+DATA_BLOCK = b"DATA"
+# Заглушка ID, связанного из библиотеки: известно только имя
+LINKED_ID_BLOCK = b"ID\x00\x00"
+# Object.type камеры
+OBJECT_TYPE_CAMERA = 11
+
+BlendHeader = namedtuple("BlendHeader", ["version", "pointer_size", "little_endian", "bhead_format"])
+# address - адрес структуры в памяти при сохранении, по нему указатели ссылаются на блок
+BlendBlock = namedtuple("BlendBlock", ["code", "length", "count", "data", "sdna", "address"], defaults=(None, None))
+# Поле структуры SDNA: смещение, размер, имя типа, указатель ли
+SdnaField = namedtuple("SdnaField", ["offset", "size", "type", "pointer"])
+# Внешний файл, на который ссылается .blend: путь в том виде, как он записан (может начинаться с //);
+# sequence - путь задает последовательность кадров или тайлы UDIM
+BlendReference = namedtuple("BlendReference", ["kind", "name", "path", "sequence"], defaults=(False,))
+# Сцена: есть ли камера, движок рендера, имена слоев
+SceneData = namedtuple("SceneData", ["camera", "engine", "view_layers"])
+# Сцены файла по имени, активная сцена и объекты: имя -> камера ли (None для связанных из библиотек)
+SceneInfo = namedtuple("SceneInfo", ["active_scene", "scenes", "objects"])
+
+_FIELD_NAME_RE = re.compile(r"[*()]|\[.*$")
+_ARRAY_SIZE_RE = re.compile(r"\[(\d+)\]")
+
+
+def open_blend_stream(file_path: str) -> BinaryIO:
+    """Open a .blend file for reading, transparently decompressing gzip or zstd files."""
+    f = open(file_path, "rb")
+    try:
+        magic = f.read(4)
+        f.seek(0)
+        if magic.startswith(GZIP_MAGIC):
+            return gzip.GzipFile(fileobj=f, mode="rb")
+        if magic == ZSTD_MAGIC:
+            if zstandard is None:
+                raise ValueError("zstd compressed .blend requires the zstandard package")
+            return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+        return f
+    except Exception:
+        f.close()
+        raise
+
+
+def read_header(stream: BinaryIO) -> BlendHeader:
+    """Read the file header, supporting both the legacy and the Blender 5.0 layouts."""
+    start = _read_exact(stream, 12)
+    if len(start) < 12 or not start.startswith(BLEND_MAGIC):
+        raise ValueError("Not a .blend file")
+
+    if start[7:8] in (b"_", b"-"):
+        # BLENDER-v402: размер указателя, порядок байт, версия из трех цифр
+        pointer_size = 8 if start[7:8] == b"-" else 4
+        little_endian = start[8:9] == b"v"
+        version = int(start[9:12])
+        return BlendHeader(version, pointer_size, little_endian, "legacy")
+
+    # BLENDER17-01v0500: длина заголовка, версия формата, порядок байт, версия из четырех цифр
+    header_size = int(start[7:9])
+    rest = _read_exact(stream, header_size - 12)
+    header = start + rest
+    if header[9:10] != b"-" or int(header[10:12]) != 1:
+        raise ValueError(f"Unsupported .blend header: {header!r}")
+    little_endian = header[12:13] == b"v"
+    version = int(header[13:17])
+    return BlendHeader(version, 8, little_endian, "large")
+
+
+def format_version(version: int) -> str:
+    """Convert a header version like 402 to '4.2'."""
+    return f"{version // 100}.{version % 100}"
+
+
+def _read_exact(stream: BinaryIO, length: int) -> bytes:
+    # Потоки zstd могут отдавать данные частями меньше запрошенного
+    chunks = []
+    while length > 0:
+        chunk = stream.read(length)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b"".join(chunks)
+
+
+def _skip(stream: BinaryIO, length: int) -> None:
+    try:
+        stream.seek(length, 1)
+    except (OSError, ValueError, AttributeError):
+        while length > 0:
+            chunk = stream.read(min(length, 1048576))
+            if not chunk:
+                raise EOFError("Unexpected end of .blend file")
+            length -= len(chunk)
+
+
+def iter_blocks(stream: BinaryIO, header: BlendHeader,
+                read_data: Callable[[bytes], bool] = lambda code: False) -> Iterator[BlendBlock]:
+    """Yield file blocks after the header; data is read only for codes accepted by read_data."""
+    endian = "<" if header.little_endian else ">"
+    if header.bhead_format == "large":
+        bhead = struct.Struct(endian + "4siQqq")
+    elif header.pointer_size == 8:
+        bhead = struct.Struct(endian + "4siQii")
+    else:
+        bhead = struct.Struct(endian + "4siIii")
+
+    while True:
+        raw = _read_exact(stream, bhead.size)
+        if len(raw) < bhead.size:
+            return
+        if header.bhead_format == "large":
+            code, sdna, address, length, count = bhead.unpack(raw)
+        else:
+            code, length, address, sdna, count = bhead.unpack(raw)
+
+        if code == b"ENDB":
+            return
+        if read_data(code):
+            data = _read_exact(stream, length)
+            if len(data) < length:
+                raise EOFError("Unexpected end of .blend file")
+        else:
+            data = None
+            _skip(stream, length)
+        yield BlendBlock(code, length, count, data, sdna, address)
+
+
+def parse_sdna(data: bytes, header: BlendHeader) -> List[Tuple[str, Dict[str, SdnaField]]]:
+    """Parse the DNA1 block into (struct name, fields by name) for each struct index."""
+    endian = "<" if header.little_endian else ">"
+    if data[:4] != b"SDNA":
+        raise ValueError("Invalid SDNA block")
+    offset = 4
+
+    def section(tag: bytes) -> int:
+        nonlocal offset
+        # Секции выровнены по 4 байта
+        offset = (offset + 3) & ~3
+        if data[offset:offset + 4] != tag:
+            raise ValueError(f"Missing {tag.decode()} section in SDNA")
+        count = struct.unpack_from(endian + "i", data, offset + 4)[0]
+        offset += 8
+        return count
+
+    def strings(count: int) -> List[str]:
+        nonlocal offset
+        result = []
+        for _ in range(count):
+            end = data.index(b"\x00", offset)
+            result.append(data[offset:end].decode("latin-1"))
+            offset = end + 1
+        return result
+
+    names = strings(section(b"NAME"))
+    types = strings(section(b"TYPE"))
+    offset = (offset + 3) & ~3
+    if data[offset:offset + 4] != b"TLEN":
+        raise ValueError("Missing TLEN section in SDNA")
+    lengths = struct.unpack_from(endian + f"{len(types)}h", data, offset + 4)
+    offset += 4 + 2 * len(types)
+
+    structs = []
+    for _ in range(section(b"STRC")):
+        type_index, field_count = struct.unpack_from(endian + "hh", data, offset)
+        members = struct.unpack_from(endian + f"{2 * field_count}h", data, offset + 4)
+        offset += 4 + 4 * field_count
+
+        fields = {}
+        field_offset = 0
+        for field_type, field_name in zip(members[::2], members[1::2]):
+            name = names[field_name]
+            pointer = name.startswith(("*", "(*"))
+            size = header.pointer_size if pointer else lengths[field_type]
+            for dimension in _ARRAY_SIZE_RE.findall(name):
+                size *= int(dimension)
+            fields[_FIELD_NAME_RE.sub("", name)] = SdnaField(field_offset, size, types[field_type], pointer)
+            field_offset += size
+        structs.append((types[type_index], fields))
+    return structs
+
+
+def _read_string(data: bytes, field: SdnaField) -> str:
+    raw = data[field.offset:field.offset + field.size]
+    return raw.split(b"\x00", 1)[0].decode("utf-8", errors="replace")
+
+
+def _read_int(data: bytes, field: SdnaField, endian: str, offset: int = 0) -> int:
+    formats = {1: "b", 2: "h", 4: "i", 8: "q"}
+    return struct.unpack_from(endian + formats[field.size], data, offset + field.offset)[0]
+
+
+def _read_pointer(data: bytes, field: SdnaField, endian: str) -> int:
+    return struct.unpack_from(endian + ("Q" if field.size == 8 else "I"), data, field.offset)[0]
+
+
+def _read_id_name(data: bytes, fields: Dict[str, SdnaField], id_fields: Dict[str, SdnaField]) -> str:
+    # Первые два символа имени ID - код типа (OB, IM, ...)
+    return _read_string(data[fields["id"].offset:], id_fields["name"])[2:]
+
+
+def read_external_paths(file_path: str) -> List[BlendReference]:
+    """Return the external files a .blend refers to (libraries, images, sounds, caches, volumes, clips, fonts)."""
+    with open_blend_stream(file_path) as stream:
+        header = read_header(stream)
+        endian = "<" if header.little_endian else ">"
+        id_blocks = []
+        structs = None
+        for block in iter_blocks(stream, header,
+                                 read_data=lambda code: code in EXTERNAL_PATH_BLOCKS or code == DNA_BLOCK):
+            if block.code == DNA_BLOCK:
+                structs = parse_sdna(block.data, header)
+            elif block.code in EXTERNAL_PATH_BLOCKS:
+                # SDNA лежит в конце файла, блоки ID разбираем после него
+                id_blocks.append(block)
+    if structs is None:
+        raise ValueError("No SDNA block in .blend file")
+
+    id_fields = next(fields for name, fields in structs if name == "ID")
+    references = []
+    for block in id_blocks:
+        _struct_name, fields = structs[block.sdna]
+        # В файле путь хранится под старым именем name, в новых версиях filepath
+        path_field = fields.get("filepath") or fields.get("name")
+        if path_field is None or path_field.type != "char":
+            continue
+        path = _read_string(block.data, path_field)
+        # Упакованные в .blend данные с диска не читаются
+        if not path or path == BUILTIN_FONT or _is_packed(block.data, fields, header.pointer_size):
+            continue
+        source = _read_int(block.data, fields["source"], endian) if "source" in fields else None
+        if block.code == b"IM\x00\x00":
+            if source in (IMAGE_SOURCE_GENERATED, IMAGE_SOURCE_VIEWER):
+                continue
+            sequence = source in (IMAGE_SOURCE_SEQUENCE, IMAGE_SOURCE_TILED)
+        elif block.code == b"MC\x00\x00":
+            sequence = source == MOVIE_CLIP_SOURCE_SEQUENCE
+        else:
+            sequence = "is_sequence" in fields and bool(_read_int(block.data, fields["is_sequence"], endian))
+        id_name = _read_id_name(block.data, fields, id_fields)
+        references.append(BlendReference(EXTERNAL_PATH_BLOCKS[block.code], id_name, path, sequence))
+
+    logger.debug(f"Found {len(references)} external paths in {file_path}")
+    return references
+
+
+def read_scene_info(file_path: str) -> SceneInfo:
+    """Return the scenes of a .blend with their cameras, engines and view layers, and the objects in the file."""
+    with open_blend_stream(file_path) as stream:
+        header = read_header(stream)
+        endian = "<" if header.little_endian else ">"
+        blocks = []
+        structs = None
+        in_scene = False
+
+        def read_data(code: bytes) -> bool:
+            nonlocal in_scene
+            # Слои сцены записываются блоками DATA сразу за блоком сцены
+            if code != DATA_BLOCK:
+                in_scene = code == SCENE_BLOCK
+            return code in (SCENE_BLOCK, OBJECT_BLOCK, GLOBAL_BLOCK, LINKED_ID_BLOCK, DNA_BLOCK) or \
+                (code == DATA_BLOCK and in_scene)
+
+        for block in iter_blocks(stream, header, read_data=read_data):
+            if block.code == DNA_BLOCK:
+                structs = parse_sdna(block.data, header)
+            elif block.data is not None:
+                blocks.append(block)
+    if structs is None:
+        raise ValueError("No SDNA block in .blend file")
+
+    fields_of = dict(structs)
+    id_fields = fields_of["ID"]
+    render_fields = fields_of["RenderData"]
+    scenes = {}
+    addresses = {}
+    objects = {}
+    active_address = None
+    scene_name = None
+    for block in blocks:
+        struct_name, fields = structs[block.sdna]
+        if block.code == SCENE_BLOCK:
+            scene_name = _read_id_name(block.data, fields, id_fields)
+            engine = _read_string(block.data[fields["r"].offset:], render_fields["engine"])
+            scenes[scene_name] = SceneData(bool(_read_pointer(block.data, fields["camera"], endian)), engine, [])
+            addresses[block.address] = scene_name
+        elif block.code == DATA_BLOCK:
+            if struct_name == "ViewLayer" and scene_name is not None:
+                scenes[scene_name].view_layers.append(_read_string(block.data, fields["name"]))
+        elif block.code == OBJECT_BLOCK:
+            objects[_read_id_name(block.data, fields, id_fields)] = \
+                _read_int(block.data, fields["type"], endian) == OBJECT_TYPE_CAMERA
+        elif block.code == LINKED_ID_BLOCK:
+            name = _read_string(block.data, id_fields["name"])
+            if name.startswith("OB"):
+                objects.setdefault(name[2:], None)
+        elif block.code == GLOBAL_BLOCK and "curscene" in fields:
+            active_address = _read_pointer(block.data, fields["curscene"], endian)
+
+    # Без GLOB (старые или урезанные файлы) активной считается первая сцена
+    active_scene = addresses.get(active_address) or next(iter(scenes), None)
+    logger.debug(f"Found {len(scenes)} scenes and {len(objects)} objects in {file_path}")
+    return SceneInfo(active_scene, scenes, objects)
+
+
+def _is_packed(data: bytes, fields: Dict[str, SdnaField], pointer_size: int) -> bool:
+    # Старые версии: указатель packedfile, новые: список packedfiles (первый указатель ListBase)
+    for name in ("packedfile", "packedfiles"):
+        field = fields.get(name)
+        if field is not None and data[field.offset:field.offset + pointer_size].strip(b"\x00"):
+            return True
+    return False
+
+
+def read_blend_version(file_path: str) -> Optional[int]:
+    """Return the Blender version that saved the file (e.g. 402) or None if unreadable."""
+    try:
+        with open_blend_stream(file_path) as stream:
+            return read_header(stream).version
+    except (OSError, ValueError, EOFError) as e:
+        logger.warning(f"Unable to read .blend header of {file_path}: {str(e)}")
+        return None
+
+
+def read_embedded_thumbnail(file_path: str) -> Optional[Tuple[int, int, bytes]]:
+    """Return (width, height, top-down RGBA bytes) of the embedded preview or None."""
+    try:
+        with open_blend_stream(file_path) as stream:
+            header = read_header(stream)
+            endian = "<" if header.little_endian else ">"
+            for block in iter_blocks(stream, header, read_data=lambda code: code == THUMBNAIL_BLOCK):
+                if block.code != THUMBNAIL_BLOCK:
+                    # Миниатюра пишется в самом начале файла, дальше искать незачем
+                    if block.code not in LEADING_BLOCKS:
+                        break
+                    continue
+
+                width, height = struct.unpack_from(endian + "ii", block.data)
+                pixels = block.data[8:]
+                row_size = width * 4
+                if width <= 0 or height <= 0 or len(pixels) < row_size * height:
+                    logger.warning(f"Corrupted embedded thumbnail in {file_path}")
+                    return None
+
+                # Строки хранятся снизу вверх
+                rows = [pixels[y * row_size:(y + 1) * row_size] for y in range(height - 1, -1, -1)]
+                return width, height, b"".join(rows)
+    except (OSError, ValueError, EOFError, struct.error) as e:
+        logger.warning(f"Unable to read embedded thumbnail of {file_path}: {str(e)}")
+        return None
+
+    logger.debug(f"No embedded thumbnail in {file_path}")
+    return None
+
+
+def write_png(file_path: str, width: int, height: int, rgba: bytes) -> None:
+    """Write top-down RGBA pixels to a PNG file."""
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + chunk_type + data
+                + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    row_size = width * 4
+    raw = b"".join(b"\x00" + rgba[y * row_size:(y + 1) * row_size] for y in range(height))
+    png = (b"\x89PNG\r\n\x1a\n"
+           + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+           + chunk(b"IDAT", zlib.compress(raw, 6))
+           + chunk(b"IEND", b""))
+    with open(file_path, "wb") as f:
+        f.write(png)
+
+
+def extract_embedded_thumbnail(file_path: str, png_path: str) -> bool:
+    """Save the embedded preview of a .blend as PNG and report whether it existed."""
+    thumbnail = read_embedded_thumbnail(file_path)
+    if thumbnail is None:
+        return False
+
+    width, height, rgba = thumbnail
+    try:
+        directory = os.path.dirname(png_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Подменяем файл целиком, чтобы GUI не прочитал недописанный PNG
+        temp_path = f"{png_path}.embedded.tmp"
+        write_png(temp_path, width, height, rgba)
+        os.replace(temp_path, png_path)
+    except OSError as e:
+        logger.error(f"Unable to write thumbnail {png_path}: {str(e)}")
+        return False
+
+    logger.info(f"Extracted embedded thumbnail {width}x{height} from {file_path}")
+    return True
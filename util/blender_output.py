@@ -0,0 +1,186 @@
+import re
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from util.phase_markers import parse_phase_marker
+
+# Строка о записанном файле: "Saved: '/out/shot_0001.png'"; Blender 4.5+ добавляет префикс "00:01.099  render  | "
+_SAVED_RE = re.compile(r"(?:^|\|)\s*Saved:\s*'(?P<path>.+)'\s*$")
+# Первая строка фонового запуска: "Blender 4.2.7 LTS (hash 1234 built 2025-01-01)"
+_BANNER_RE = re.compile(r"^Blender (?P<version>\d+\.\d+(?:\.\d+)?)")
+# Прогресс рендера: "Fra:1 Mem:9.40M (Peak 9.93M) | Time:00:00.14 | ..."
+_PROGRESS_RE = re.compile(
+    r"Fra:\s*(?P<frame>-?\d+)\s+Mem:\s*(?P<mem>[\d.]+)(?P<mem_unit>[KMG])\s+"
+    r"\(Peak\s+(?P<peak>[\d.]+)(?P<peak_unit>[KMG])\)\s*\|\s*Time:\s*(?P<time>[\d:.]+)"
+)
+# Сэмплы текущего кадра: Cycles "| Sample 16/128", EEVEE "| Rendering 12 / 64 samples"
+_SAMPLES_RE = re.compile(r"\|\s*(?:Sample\s+(?P<done>\d+)\s*/\s*(?P<total>\d+)|"
+                         r"Rendering\s+(?P<eevee_done>\d+)\s*/\s*(?P<eevee_total>\d+)\s+samples)")
+# Итог кадра после сохранения: " Time: 00:01.51 (Saving: 00:00.00)"
+_FRAME_TIME_RE = re.compile(r"^\s*Time:\s*(?P<time>[\d:.]+)\s*\(Saving")
+
+_UNIT_TO_MB = {"K": 1 / 1024, "M": 1.0, "G": 1024.0}
+
+# Сколько последних строк вывода задания держится в памяти
+DEFAULT_TAIL_LINES = 200
+
+
+def parse_saved_path(line: str) -> Optional[str]:
+    """Return the path of a file Blender reported as saved or None for other output."""
+    match = _SAVED_RE.search(line)
+    return match.group("path") if match else None
+
+
+def parse_duration(value: str) -> float:
+    """Convert Blender's 'MM:SS.ss' or 'HH:MM:SS.ss' timer to seconds."""
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_version_banner(line: str) -> Optional[str]:
+    """Return the version from Blender's startup banner, e.g. '4.2.7'."""
+    match = _BANNER_RE.match(line)
+    return match.group("version") if match else None
+
+
+def parse_progress(line: str) -> Optional[Tuple[int, float, float, float]]:
+    """Return (frame, memory MB, peak memory MB, elapsed seconds) from a render progress line."""
+    match = _PROGRESS_RE.search(line)
+    if not match:
+        return None
+    return (
+        int(match.group("frame")),
+        float(match.group("mem")) * _UNIT_TO_MB[match.group("mem_unit")],
+        float(match.group("peak")) * _UNIT_TO_MB[match.group("peak_unit")],
+        parse_duration(match.group("time")),
+    )
+
+
+def parse_samples(line: str) -> Optional[Tuple[int, int]]:
+    """Return (samples done, samples total) of the frame being rendered from a progress line."""
+    match = _SAMPLES_RE.search(line)
+    if not match:
+        return None
+    if match.group("done") is not None:
+        return int(match.group("done")), int(match.group("total"))
+    return int(match.group("eevee_done")), int(match.group("eevee_total"))
+
+
+def parse_frame_time(line: str) -> Optional[float]:
+    """Return the total render time of a frame from the line printed after it is saved."""
+    match = _FRAME_TIME_RE.match(line)
+    return parse_duration(match.group("time")) if match else None
+
+
+class OutputStats:
+    """Collects version, memory and per-frame timings from one Blender process's output."""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.time()
+        self.first_output_at = None
+        self.blender_version = None
+        self.peak_memory_mb = None
+        self.saved_outputs: List[str] = []
+        # Номер кадра -> время рендера в секундах
+        self.frame_times: Dict[int, float] = {}
+        # Фаза -> отметка времени из меток скрипта; для *_start первая, для *_end последняя
+        self.phases: Dict[str, float] = {}
+        self._current_frame = None
+        self._last_saved_at = None
+        self._frame_started_at = None
+        # Кадры со временем по меткам render_pre/render_post, их оценки не перезаписывают
+        self._marked_frames = set()
+        # stdout и stderr читаются разными потоками
+        self._lock = threading.Lock()
+
+    def feed(self, line: str, timestamp: Optional[float] = None) -> None:
+        """Process one line of stdout or stderr."""
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            self._feed(line, timestamp)
+
+    def _feed(self, line: str, timestamp: float) -> None:
+        if self.first_output_at is None:
+            self.first_output_at = timestamp
+
+        if self.blender_version is None:
+            self.blender_version = parse_version_banner(line)
+
+        marker = parse_phase_marker(line)
+        if marker:
+            self._feed_phase(*marker)
+            return
+
+        progress = parse_progress(line)
+        if progress:
+            frame, _memory, peak, _elapsed = progress
+            self._current_frame = frame
+            self.peak_memory_mb = max(self.peak_memory_mb or 0.0, peak)
+            return
+
+        saved_path = parse_saved_path(line)
+        if saved_path:
+            self.saved_outputs.append(saved_path)
+            frame = self._frame_key()
+            # Без строк прогресса (Blender 4.5+ как модуль) время кадра считаем по интервалам между сохранениями
+            self.frame_times.setdefault(frame, timestamp - (self._last_saved_at or self.first_output_at))
+            self._last_saved_at = timestamp
+            return
+
+        frame_time = parse_frame_time(line)
+        if frame_time is not None and self.frame_times:
+            # Точное время из вывода Blender заменяет оценку по интервалу
+            frame = self._frame_key(saved=True)
+            if frame not in self._marked_frames:
+                self.frame_times[frame] = frame_time
+
+    def _feed_phase(self, phase: str, timestamp: float, frame: Optional[int]) -> None:
+        if phase == "frame_start":
+            self._current_frame = frame
+            self._frame_started_at = timestamp
+        elif phase == "frame_end":
+            if self._frame_started_at is not None and frame is not None:
+                self.frame_times[frame] = timestamp - self._frame_started_at
+                self._marked_frames.add(frame)
+            self._frame_started_at = None
+        elif phase.endswith("_end"):
+            self.phases[phase] = timestamp
+        else:
+            self.phases.setdefault(phase, timestamp)
+
+    def _frame_key(self, saved: bool = False) -> int:
+        if self._current_frame is not None:
+            return self._current_frame
+        # Номер кадра неизвестен: нумеруем сохраненные файлы по порядку
+        return len(self.frame_times) if saved else len(self.frame_times) + 1
+
+
+class OutputTail:
+    """Keeps only the last lines of a job's output; the full output goes to the job log file."""
+
+    def __init__(self, max_lines: int = DEFAULT_TAIL_LINES):
+        if not isinstance(max_lines, int) or max_lines < 1:
+            raise ValueError("max_lines must be a positive integer")
+        # deque с maxlen вытесняет старые строки, память не растет с длиной рендера
+        self._lines = deque(maxlen=max_lines)
+        self.total_lines = 0
+        # stdout и stderr читаются разными потоками
+        self._lock = threading.Lock()
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            self.total_lines += 1
+
+    def lines(self, count: Optional[int] = None) -> List[str]:
+        """Return the kept lines, or only the last count of them."""
+        with self._lock:
+            lines = list(self._lines)
+        return lines[-count:] if count else lines
+
+    def text(self, count: Optional[int] = None) -> str:
+        return "\n".join(self.lines(count))
@@ -0,0 +1,68 @@
+import re
+from typing import Dict, Optional, Tuple
+
+# Версия в подписи бинарника или закреплении проекта: "Blender 4.2.7 LTS", "3.6", "4.2.1"
+_VERSION_RE = re.compile(r"(?P<major>\d+)\.(?P<minor>\d+)(?:\.(?P<patch>\d+))?")
+
+
+def parse_version(text: str) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Return (major, minor, patch or None) from a version label like 'Blender 4.2.7 LTS'."""
+    if not isinstance(text, str):
+        return None
+    match = _VERSION_RE.search(text)
+    if not match:
+        return None
+    patch = match.group("patch")
+    return int(match.group("major")), int(match.group("minor")), int(patch) if patch is not None else None
+
+
+def file_version(version_code: Optional[int]) -> Optional[Tuple[int, int]]:
+    """Convert the version from a .blend header (e.g. 402) to (major, minor)."""
+    if not isinstance(version_code, int) or version_code <= 0:
+        return None
+    return divmod(version_code, 100)
+
+
+def format_version(version: Tuple[int, ...]) -> str:
+    return ".".join(str(part) for part in version if part is not None)
+
+
+def _installed_versions(bin_paths: Dict[str, str]) -> Dict[str, Tuple[int, int, int]]:
+    installed = {}
+    for path, label in bin_paths.items():
+        version = parse_version(label)
+        if version:
+            installed[path] = (version[0], version[1], version[2] or 0)
+    return installed
+
+
+def select_binary(bin_paths: Dict[str, str], saved_with: Optional[Tuple[int, int]] = None,
+                  pinned: Optional[str] = None, default: Optional[str] = None) -> Optional[str]:
+    """Pick the Blender binary for a file: the pinned version, else the one that saved it, else the closest newer."""
+    installed = _installed_versions(bin_paths)
+
+    if pinned:
+        # Закрепить можно путь к бинарнику или версию "3.6"/"3.6.22"
+        if pinned in bin_paths:
+            return pinned
+        pinned_version = parse_version(pinned)
+        if not pinned_version:
+            return None
+        candidates = [
+            (version, path) for path, version in installed.items()
+            if version[:2] == pinned_version[:2] and pinned_version[2] in (None, version[2])
+        ]
+        return max(candidates)[1] if candidates else None
+
+    if saved_with is None:
+        return default
+
+    # Та же major.minor с последним патчем
+    same = [(version, path) for path, version in installed.items() if version[:2] == tuple(saved_with)]
+    if same:
+        return max(same)[1]
+    # Иначе ближайшая более новая: старые файлы открываются новыми версиями, обратное не гарантировано
+    newer = [(version, path) for path, version in installed.items() if version[:2] > tuple(saved_with)]
+    if newer:
+        return min(newer, key=lambda item: (item[0][:2], -item[0][2]))[1]
+    return default
@@ -0,0 +1,73 @@
+import os
+import json
+import argparse
+import tempfile
+from typing import List, Optional
+
+# Версия схемы; скрипт отказывается работать со спецификацией, которую не понимает
+JOB_SPEC_VERSION = 1
+
+JOB_KINDS = ("render", "thumbnail")
+
+
+def build_job_spec(kind: str, blend_file: str, **payload) -> dict:
+    """Build a versioned job spec for one of the Blender scripts."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if not isinstance(blend_file, str) or not blend_file:
+        raise ValueError("Blend file must be a non-empty string")
+
+    spec = {"version": JOB_SPEC_VERSION, "kind": kind, "blend_file": blend_file}
+    spec.update(payload)
+    return spec
+
+
+def write_job_spec(spec: dict, directory: Optional[str] = None) -> str:
+    """Write a job spec to a temporary JSON file and return its path."""
+    if not isinstance(spec, dict):
+        raise TypeError(f"Job spec must be a dict, got {type(spec)}")
+
+    fd, spec_path = tempfile.mkstemp(prefix="job_", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(spec, f, separators=(",", ":"))
+    except Exception:
+        os.remove(spec_path)
+        raise
+    return spec_path
+
+
+def read_job_spec(spec_path: str, expected_kind: Optional[str] = None) -> dict:
+    """Read and validate a job spec written by write_job_spec."""
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    if not isinstance(spec, dict):
+        raise ValueError("Job spec must contain a JSON object")
+    if spec.get("version") != JOB_SPEC_VERSION:
+        raise ValueError(f"Unsupported job spec version: {spec.get('version')}")
+    if spec.get("kind") not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {spec.get('kind')}")
+    if expected_kind and spec["kind"] != expected_kind:
+        raise ValueError(f"Expected {expected_kind} job spec, got {spec['kind']}")
+    if not spec.get("blend_file"):
+        raise ValueError("Job spec has no blend_file")
+    return spec
+
+
+def remove_job_spec(spec_path: Optional[str]) -> None:
+    """Delete a job spec file, ignoring files that are already gone."""
+    if not spec_path:
+        return
+    try:
+        os.remove(spec_path)
+    except FileNotFoundError:
+        pass
+
+
+def parse_script_args(argv: List[str]) -> argparse.Namespace:
+    """Parse the named script arguments that follow Blender's '--' separator."""
+    script_args = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="blender --python <script> --")
+    parser.add_argument("--job-spec", required=True, help="Path to the JSON job spec")
+    return parser.parse_args(script_args)
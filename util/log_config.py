@@ -0,0 +1,197 @@
+import io
+import os
+import gzip
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+LOG_FILE = 'blender_interface.log'
+LOG_MAX_BYTES = 1048576
+LOG_BACKUP_COUNT = 5
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Построчный вывод Blender пишется в отдельный файл задания, а не в общий лог
+JOB_OUTPUT_LOGGER = 'BlenderOutput'
+# Файлы заданий сжимаются и пишутся крупными блоками, а не по строке
+JOB_LOG_BUFFER_SIZE = 1048576
+JOB_LOG_COMPRESS_LEVEL = 6
+
+_queue = queue.SimpleQueue()
+_listener = None
+_lock = threading.Lock()
+# Уровни по подсистемам (имя логгера -> уровень), "default" для остальных
+_levels: Dict[str, int] = {}
+_console_loggers = set()
+
+
+class _JobRecordFilter(logging.Filter):
+    """Pass only raw job output records, or only everything else."""
+
+    def __init__(self, job_records: bool):
+        super().__init__()
+        self.job_records = job_records
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return hasattr(record, 'job_id') == self.job_records
+
+
+class _ConsoleFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name in _console_loggers
+
+
+def open_job_log_file(path: str, buffer_size: int = JOB_LOG_BUFFER_SIZE):
+    """Open a gzip text stream for appending job output with a large write buffer."""
+    compressed = gzip.GzipFile(path, 'ab', compresslevel=JOB_LOG_COMPRESS_LEVEL)
+    return io.TextIOWrapper(io.BufferedWriter(compressed, buffer_size=buffer_size), encoding='utf-8',
+                            write_through=False)
+
+
+class JobLogHandler(logging.Handler):
+    """Write raw Blender output to one gzip file per job from the listener thread."""
+
+    def __init__(self):
+        super().__init__()
+        self._paths: Dict[str, str] = {}
+        self._files = {}
+        self._paths_lock = threading.Lock()
+
+    def register(self, job_id: str, path: str) -> None:
+        with self._paths_lock:
+            self._paths[job_id] = path
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            job_id = record.job_id
+            if getattr(record, 'job_log_close', False):
+                stream = self._files.pop(job_id, None)
+                if stream:
+                    stream.close()
+                with self._paths_lock:
+                    self._paths.pop(job_id, None)
+                return
+
+            stream = self._files.get(job_id)
+            if stream is None:
+                with self._paths_lock:
+                    path = self._paths.get(job_id)
+                if path is None:
+                    return
+                # Файл открывает поток записи, а не читатель пайпа
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                stream = open_job_log_file(path)
+                self._files[job_id] = stream
+            stream.write(record.getMessage() + '\n')
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        for stream in self._files.values():
+            stream.close()
+        self._files.clear()
+        super().close()
+
+
+job_log_handler = JobLogHandler()
+job_log_handler.addFilter(_JobRecordFilter(job_records=True))
+
+
+def _start_listener() -> None:
+    global _listener
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Единственный писатель общего лога: ротация больше не конкурирует между модулями
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+    file_handler.setFormatter(formatter)
+    file_handler.addFilter(_JobRecordFilter(job_records=False))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    console_handler.addFilter(_JobRecordFilter(job_records=False))
+    console_handler.addFilter(_ConsoleFilter())
+
+    _listener = QueueListener(_queue, file_handler, console_handler, job_log_handler)
+    _listener.start()
+
+
+def _ensure_listener() -> None:
+    with _lock:
+        if _listener is None:
+            _start_listener()
+
+
+def _level_for(name: str) -> int:
+    return _levels.get(name, _levels.get('default', logging.DEBUG))
+
+
+def get_logger(name: str, console: bool = False) -> logging.Logger:
+    """Return a subsystem logger that hands records to the shared background writer."""
+    _ensure_listener()
+    logger = logging.getLogger(name)
+    logger.setLevel(_level_for(name))
+    if console:
+        _console_loggers.add(name)
+    if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        logger.addHandler(QueueHandler(_queue))
+    return logger
+
+
+def configure_levels(levels: Optional[dict]) -> None:
+    """Set per-subsystem levels, e.g. {"default": "INFO", "BlenderManager": "DEBUG"}."""
+    if not levels:
+        return
+    if not isinstance(levels, dict):
+        raise TypeError(f"Log levels must be a dict, got {type(levels)}")
+
+    parsed = {}
+    for name, level in levels.items():
+        numeric_level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        if not isinstance(numeric_level, int):
+            raise ValueError(f"Unknown log level for {name}: {level}")
+        parsed[name] = numeric_level
+
+    _levels.update(parsed)
+    for name in list(logging.root.manager.loggerDict):
+        logger = logging.root.manager.loggerDict[name]
+        if isinstance(logger, logging.Logger) and any(isinstance(h, QueueHandler) for h in logger.handlers):
+            logger.setLevel(_level_for(name))
+
+
+def start_job_log(job_id: str, path: str) -> None:
+    """Route raw output of a job to its own file; the file is created on the first line."""
+    _ensure_listener()
+    job_log_handler.register(job_id, path)
+
+
+def log_job_output(job_id: str, line: str) -> None:
+    """Queue one raw line of Blender output for the job's file without blocking the caller."""
+    record = logging.LogRecord(JOB_OUTPUT_LOGGER, logging.DEBUG, '', 0, line, None, None)
+    record.job_id = job_id
+    _queue.put_nowait(record)
+
+
+def stop_job_log(job_id: str) -> None:
+    """Close the job's file after all lines queued before this call are written."""
+    record = logging.LogRecord(JOB_OUTPUT_LOGGER, logging.DEBUG, '', 0, '', None, None)
+    record.job_id = job_id
+    record.job_log_close = True
+    _queue.put_nowait(record)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+atexit.register(stop_logging)
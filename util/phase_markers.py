@@ -0,0 +1,61 @@
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+# Метка фазы в stdout скриптов: "BLENDER_PHASE file_load_end 1718000000.123456"
+PHASE_MARKER = "BLENDER_PHASE"
+
+PHASES = (
+    "script_start",     # Blender запущен, скрипт начал выполняться
+    "file_load_start",
+    "file_load_end",
+    "render_start",     # Настройки применены, начинается рендер
+    "frame_start",      # Обработчики render_pre/render_post, с номером кадра
+    "frame_end",
+    "render_end",
+    "script_end",
+)
+
+_PHASE_RE = re.compile(
+    rf"{PHASE_MARKER} (?P<phase>[a-z_]+) (?P<timestamp>\d+(?:\.\d+)?)(?: (?P<frame>-?\d+))?\s*$"
+)
+
+
+def format_phase_marker(phase: str, timestamp: Optional[float] = None, frame: Optional[int] = None) -> str:
+    if phase not in PHASES:
+        raise ValueError(f"Unknown phase: {phase}")
+    timestamp = timestamp if timestamp is not None else time.time()
+    marker = f"{PHASE_MARKER} {phase} {timestamp:.6f}"
+    return marker if frame is None else f"{marker} {frame}"
+
+
+def emit_phase(phase: str, frame: Optional[int] = None) -> None:
+    """Print a phase marker immediately so the manager sees it with an accurate timestamp."""
+    print(format_phase_marker(phase, frame=frame), flush=True)
+
+
+def parse_phase_marker(line: str) -> Optional[Tuple[str, float, Optional[int]]]:
+    """Return (phase, timestamp, frame) from a marker line or None for other output."""
+    match = _PHASE_RE.search(line)
+    if not match or match.group("phase") not in PHASES:
+        return None
+    frame = match.group("frame")
+    return match.group("phase"), float(match.group("timestamp")), int(frame) if frame is not None else None
+
+
+def phase_durations(phases: Dict[str, float], spawned_at: float, exited_at: float) -> Dict[str, Optional[float]]:
+    """Split a job's wall time into startup, file load, setup, render and shutdown seconds."""
+    def between(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None:
+            return None
+        return max(0.0, end - start)
+
+    return {
+        # Запуск процесса и загрузка Blender до выполнения скрипта
+        "startup": between(spawned_at, phases.get("script_start")),
+        "file_load": between(phases.get("file_load_start"), phases.get("file_load_end")),
+        # Применение настроек между загрузкой файла и рендером
+        "setup": between(phases.get("file_load_end"), phases.get("render_start")),
+        "render": between(phases.get("render_start"), phases.get("render_end")),
+        "shutdown": between(phases.get("script_end"), exited_at),
+    }
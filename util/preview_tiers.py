@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+# Метка в stdout скрипта превью: после нее файл миниатюры уже обновлен
+PREVIEW_TIER_MARKER = "PREVIEW_TIER_READY"
+
+# От дешевого к качественному; каждый следующий уровень перезаписывает миниатюру
+DEFAULT_PREVIEW_TIERS = [
+    {"name": "draft", "width": 128, "height": 72, "samples": 2, "simplify": True, "fast_engine": True},
+    {"name": "final", "width": 512, "height": 288, "samples": 16, "simplify": False, "fast_engine": False},
+]
+
+_TIER_TYPES = {
+    "name": str,
+    "width": int,
+    "height": int,
+    "samples": int,
+    "simplify": bool,
+    "fast_engine": bool,
+}
+
+
+def validate_preview_tiers(tiers) -> List[dict]:
+    """Validate preview tiers and return them with missing flags filled in."""
+    if not isinstance(tiers, list) or not tiers:
+        raise ValueError("Preview tiers must be a non-empty list")
+
+    validated = []
+    for tier in tiers:
+        if not isinstance(tier, dict):
+            raise TypeError(f"Preview tier must be a dict, got {type(tier)}")
+        tier = {"simplify": False, "fast_engine": False, **tier}
+
+        unknown_keys = set(tier) - set(_TIER_TYPES)
+        if unknown_keys:
+            raise ValueError(f"Unknown preview tier keys: {sorted(unknown_keys)}")
+        for key, expected_type in _TIER_TYPES.items():
+            value = tier.get(key)
+            if not isinstance(value, expected_type) or (expected_type is int and isinstance(value, bool)):
+                raise TypeError(f"Preview tier {key} must be {expected_type.__name__}, got {type(value)}")
+        if tier["width"] < 1 or tier["height"] < 1 or tier["samples"] < 1:
+            raise ValueError(f"Preview tier {tier['name']} must have positive size and samples")
+        validated.append(tier)
+
+    return validated
+
+
+def format_tier_marker(tier_name: str) -> str:
+    return f"{PREVIEW_TIER_MARKER} {tier_name}"
+
+
+def parse_tier_marker(line: str) -> Optional[str]:
+    """Return the tier name from a marker line or None for other output."""
+    line = line.strip()
+    if not line.startswith(PREVIEW_TIER_MARKER + " "):
+        return None
+    return line[len(PREVIEW_TIER_MARKER) + 1:] or None
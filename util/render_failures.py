@@ -0,0 +1,148 @@
+import re
+import copy
+import random
+from typing import Iterable, List, Optional, Set
+
+# Классы ошибок рендера
+OUT_OF_MEMORY = "out_of_memory"
+GPU_ERROR = "gpu_error"
+MISSING_FILE = "missing_file"
+IO_ERROR = "io_error"
+LICENSE_ERROR = "license_error"
+CRASH = "crash"
+SCRIPT_ERROR = "script_error"
+UNKNOWN = "unknown"
+
+FAILURE_CLASSES = (OUT_OF_MEMORY, GPU_ERROR, MISSING_FILE, IO_ERROR, LICENSE_ERROR, CRASH, SCRIPT_ERROR, UNKNOWN)
+
+# Временные сбои: память, драйвер, сетевое хранилище, лицензия; ошибка в скрипте повторится и при перезапуске
+DEFAULT_RETRY_ON = (OUT_OF_MEMORY, GPU_ERROR, MISSING_FILE, IO_ERROR, LICENSE_ERROR, CRASH)
+
+# Шаблоны вывода в порядке приоритета: Traceback часто сопровождает ошибку чтения файла,
+# сетевая ошибка проверяется раньше отсутствующего файла; голое "not found" пишут и ошибки скрипта
+_FAILURE_PATTERNS = (
+    (OUT_OF_MEMORY, re.compile(
+        r"out of (?:gpu |device )?memory|MemoryError|std::bad_alloc|CUDA_ERROR_OUT_OF_MEMORY|Killed", re.I)),
+    (GPU_ERROR, re.compile(
+        r"CUDA error|OptiX error|HIP error|Metal error|oneAPI error|device lost|"
+        r"failed to (?:create|initialize) (?:CUDA|OptiX|HIP) context", re.I)),
+    (IO_ERROR, re.compile(
+        r"Input/output error|Stale file handle|Connection (?:reset|refused|timed out)|"
+        r"network (?:path|name) (?:was )?not found|Resource temporarily unavailable", re.I)),
+    (MISSING_FILE, re.compile(r"No such file|Cannot read file|Unable to open|can't open file", re.I)),
+    (LICENSE_ERROR, re.compile(r"licen[cs]e", re.I)),
+    (SCRIPT_ERROR, re.compile(r"^Traceback \(most recent call last\)|Error: Python", re.I | re.M)),
+)
+
+# Завершение по сигналу: SIGKILL от OOM killer (-9 или 137 через оболочку)
+_OOM_RETURN_CODES = (-9, 137)
+# Падение процесса: сигнал на POSIX или код исключения Windows (0xC0000005 и т.п.)
+_WINDOWS_EXCEPTION_CODE_MIN = 0xC0000000
+
+# Номер кадра в имени файла анимации: shot_0007.png
+_FRAME_NUMBER_RE = re.compile(r"_(?P<frame>\d+)\.[^.\\/]+$")
+
+
+def classify_failure(return_code: int, output_lines: Iterable[str]) -> str:
+    """Classify a failed Blender run by its exit code and the last lines of its output."""
+    text = "\n".join(line.split(": ", 1)[-1] if line.startswith(("STDOUT: ", "STDERR: ")) else line
+                     for line in output_lines)
+    if return_code in _OOM_RETURN_CODES:
+        return OUT_OF_MEMORY
+    for failure_class, pattern in _FAILURE_PATTERNS:
+        if pattern.search(text):
+            return failure_class
+    if return_code < 0 or return_code >= _WINDOWS_EXCEPTION_CODE_MIN:
+        return CRASH
+    return UNKNOWN
+
+
+class RetryPolicy:
+    """How many times and how soon a failed render is started again."""
+    __slots__ = ("max_attempts", "base_delay", "max_delay", "jitter", "retry_on")
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 10.0, max_delay: float = 300.0,
+                 jitter: float = 0.1, retry_on: Iterable[str] = DEFAULT_RETRY_ON):
+        if not isinstance(max_attempts, int) or isinstance(max_attempts, bool) or max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+        for name, value in (("base_delay", base_delay), ("max_delay", max_delay), ("jitter", jitter)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number")
+        retry_on = tuple(retry_on)
+        unknown_classes = set(retry_on) - set(FAILURE_CLASSES)
+        if unknown_classes:
+            raise ValueError(f"Unknown failure classes: {sorted(unknown_classes)}")
+        self.max_attempts = max_attempts
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.jitter = float(jitter)
+        self.retry_on = retry_on
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RetryPolicy":
+        if not isinstance(data, dict):
+            raise TypeError(f"Retry policy must be a dict, got {type(data)}")
+        return cls(**data)
+
+    def should_retry(self, failure_class: str, attempt: int) -> bool:
+        """Return whether a run that failed on the given attempt (starting at 1) is started again."""
+        return failure_class in self.retry_on and attempt < self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """Return the pause before the next attempt: doubled after each failure, capped, with jitter."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        # Разброс не дает одновременно упавшим рендерам стартовать в одну секунду
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def __repr__(self) -> str:
+        return (f"RetryPolicy(max_attempts={self.max_attempts}, base_delay={self.base_delay}, "
+                f"max_delay={self.max_delay}, retry_on={list(self.retry_on)})")
+
+
+def _file_name(path: str) -> str:
+    return re.split(r"[\\/]", path)[-1]
+
+
+def saved_frames(output_base: str, saved_outputs: Iterable[str]) -> Set[int]:
+    """Return the frame numbers of animation outputs saved for the output base name."""
+    frames = set()
+    for path in saved_outputs:
+        name = _file_name(path)
+        match = _FRAME_NUMBER_RE.search(name)
+        if match and name[:match.start()] == output_base:
+            frames.add(int(match.group("frame")))
+    return frames
+
+
+def remaining_render_spec(spec: dict, saved_outputs: List[str]) -> Optional[dict]:
+    """Return a copy of a render spec reduced to the work without saved outputs, or None when all is done."""
+    # Имена файлов строятся так же, как в render_script.py
+    file_name = spec["blend_file"].split("\\")[-1].split(".")[0]
+    file_name = _file_name(file_name)
+    saved_names = {_file_name(path) for path in saved_outputs}
+
+    remaining = []
+    for variant in spec.get("variants") or [{"name": ""}]:
+        suffix = f'_{variant["name"]}' if variant.get("name") else ""
+        output_base = f"{file_name}{suffix}"
+        if not variant.get("animation"):
+            if f"{output_base}.png" not in saved_names:
+                remaining.append(variant)
+            continue
+
+        settings = {**spec["settings"], **(variant.get("overrides") or {})}
+        done = saved_frames(output_base, saved_outputs)
+        frames = [frame for frame in range(settings["Frame Start"], settings["Frame End"] + 1,
+                                           settings["Frame Step"]) if frame not in done]
+        if not frames:
+            continue
+        # Кадры рендерятся по порядку: начинаем с первого несохраненного
+        variant = copy.deepcopy(variant)
+        variant["overrides"] = {**(variant.get("overrides") or {}), "Frame Start": frames[0]}
+        remaining.append(variant)
+
+    if not remaining:
+        return None
+    remaining_spec = copy.deepcopy(spec)
+    remaining_spec["variants"] = remaining
+    return remaining_spec
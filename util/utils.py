@@ -1,25 +1,14 @@
 import os
 import shutil
+import hashlib
 import subprocess
-import logging
-from logging.handlers import RotatingFileHandler
+from typing import Iterator
 
 from managers.config_manager import config_manager
+from util.log_config import get_logger
 
 # Configure logging
-logger = logging.getLogger('BlenderUtils')
-logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# File handler with rotation
-file_handler = RotatingFileHandler('blender_interface.log', maxBytes=1048576, backupCount=5)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
-
-# Console handler
-# console_handler = logging.StreamHandler()
-# console_handler.setFormatter(formatter)
-# logger.addHandler(console_handler)
+logger = get_logger('BlenderUtils')
 
 
 def transform_path_to_standard(path: str) -> str:
@@ -97,6 +86,36 @@ def get_config_value(key: str):
         raise
 
 
+def normalize_path(file_path: str) -> str:
+    """Return an absolute, normalized and case-normalized form of a path for comparisons and ids."""
+    if not isinstance(file_path, str):
+        logger.error(f"Invalid file path type: {type(file_path)}, expected string")
+        raise TypeError("File path must be a string")
+    if not file_path:
+        logger.warning("Empty file path provided")
+        return ""
+
+    return os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1048576, algorithm: str = "sha1") -> str:
+    """Return the hex digest of a file's contents, SHA-1 unless another hashlib algorithm is given."""
+    if not isinstance(file_path, str):
+        logger.error(f"Invalid file path type: {type(file_path)}, expected string")
+        raise TypeError("File path must be a string")
+
+    try:
+        digest = hashlib.new(algorithm)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        logger.debug(f"Content hash of {file_path}: {digest.hexdigest()}")
+        return digest.hexdigest()
+    except OSError as e:
+        logger.error(f"Error hashing file {file_path}: {str(e)}")
+        raise
+
+
 def get_file_name_from_path(file_path: str) -> str:
     """Extract the file name from a file path."""
     if not isinstance(file_path, str):
@@ -115,6 +134,38 @@ def get_file_name_from_path(file_path: str) -> str:
         raise
 
 
+def scan_blend_files(root_directory: str) -> Iterator[str]:
+    """Recursively yield .blend files under a directory as they are found."""
+    if not isinstance(root_directory, str):
+        logger.error(f"Invalid directory type: {type(root_directory)}, expected string")
+        raise TypeError("Directory must be a string")
+    if not root_directory:
+        logger.warning("Empty directory provided")
+        return
+
+    # Обходим дерево без рекурсии, чтобы глубина вложенности не упиралась в стек
+    directories = [root_directory]
+    found_count = 0
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        # Бэкапы .blend1, .blend2 отсекаются проверкой точного расширения
+                        elif entry.name.lower().endswith(".blend") and entry.is_file():
+                            found_count += 1
+                            yield entry.path
+                    except OSError as e:
+                        logger.warning(f"Skipping entry {entry.path}: {str(e)}")
+        except OSError as e:
+            logger.warning(f"Unable to scan directory {directory}: {str(e)}")
+
+    logger.info(f"Found {found_count} .blend files in {root_directory}")
+
+
 def is_path_exists(file_path: str) -> bool:
     """Check if a file or directory path exists."""
     if not isinstance(file_path, str):